@@ -16,11 +16,12 @@ import gc
 import multiprocessing
 import os
 import sys
+import threading
 import warnings
 from dataclasses import asdict, dataclass
 from io import TextIOWrapper
 from pathlib import Path
-from typing import TextIO, TypeVar
+from typing import Literal, TextIO, TypeVar
 
 import sentry_sdk
 import uvicorn
@@ -29,15 +30,24 @@ from pydantic import TypeAdapter
 from voicevox_engine import __version__
 from voicevox_engine.aivm_manager import AivmManager
 from voicevox_engine.app.application import generate_app
-from voicevox_engine.cancellable_engine import CancellableEngine
-from voicevox_engine.core.core_initializer import MOCK_VER, initialize_cores
+from voicevox_engine.app.startup_application import StartupApplication
+from voicevox_engine.core.core_initializer import (
+    MOCK_VER,
+    CoreManager,
+    initialize_cores,
+)
 from voicevox_engine.engine_manifest import load_manifest
 from voicevox_engine.library.library_manager import LibraryManager
 from voicevox_engine.logging import LOGGING_CONFIG, logger
 from voicevox_engine.preset.preset_manager import PresetManager
 from voicevox_engine.setting.model import CorsPolicyMode
 from voicevox_engine.setting.setting_manager import USER_SETTING_PATH, SettingHandler
-from voicevox_engine.tts_pipeline.song_engine import make_song_engines_from_cores
+from voicevox_engine.startup_orchestrator import StartupOrchestrator
+from voicevox_engine.tts_pipeline.inference_queue import InferenceQueue
+from voicevox_engine.tts_pipeline.song_engine import (
+    SongEngineManager,
+    make_song_engines_from_cores,
+)
 from voicevox_engine.tts_pipeline.tts_engine import TTSEngineManager
 from voicevox_engine.user_dict.user_dict_manager import UserDictionary
 from voicevox_engine.utility.path_utility import (
@@ -158,6 +168,28 @@ class _CLIArgs:
     port: int
     use_gpu: bool
     load_all_models: bool
+    inference_slots: int
+    max_inference_slots_per_model: int | None
+    coalesce_identical_requests: bool
+    max_queue_size: int | None
+    model_memory_budget_mb: int | None
+    model_idle_ttl: float | None
+    pinned_models: list[str] | None
+    preload_models: int
+    restore_resident_models: bool
+    watch_models_dir: bool
+    synthesis_cache_memory_mb: int
+    synthesis_cache_disk_mb: int
+    bert_feature_cache_mb: int
+    g2p_cache_size: int
+    synthesis_workers: int
+    warm_up_models: bool
+    onnx_intra_op_num_threads: int | None
+    onnx_inter_op_num_threads: int | None
+    onnx_execution_mode: Literal["sequential", "parallel"] | None
+    onnx_graph_optimization_level: Literal["disable", "basic", "extended", "all"] | None
+    onnx_disable_mem_pattern: bool
+    onnx_optimized_model_cache: bool
     output_log_utf8: bool
     cors_policy_mode: CorsPolicyMode | None
     allow_origins: list[str] | None
@@ -171,8 +203,6 @@ class _CLIArgs:
     voicelib_dirs: list[Path] | None = None  # 常に None
     runtime_dirs: list[Path] | None = None  # 常に None
     enable_mock: bool = True  # 常にモック版 VOICEVOX CORE を利用する
-    enable_cancellable_synthesis: bool = False  # 常に False
-    init_processes: int = 2  # 常に 2
     cpu_num_threads: int | None = 4  # 常に 4
 
 
@@ -242,6 +272,195 @@ def read_cli_arguments(envs: Envs) -> _CLIArgs:
         action="store_true",
         help="起動時に全ての音声合成モデルを読み込みます。",
     )
+    parser.add_argument(
+        "--inference_slots",
+        type=int,
+        default=1,
+        help=(
+            "同時に実行できる音声合成モデルの推論処理の数です。デフォルトは 1 (すべての推論処理を直列に実行) です。"
+            "2 以上を指定した場合、CPU 推論時の推論スレッド数は推論処理の数に応じて等分されます。"
+        ),
+    )
+    parser.add_argument(
+        "--max_inference_slots_per_model",
+        type=int,
+        default=None,
+        help=(
+            "同一の音声合成モデルで同時に実行できる推論処理の数です。"
+            "指定しない場合、--inference_slots と同じ値が使われます。"
+        ),
+    )
+    parser.add_argument(
+        "--coalesce_identical_requests",
+        action="store_true",
+        help=(
+            "推論中のリクエストとまったく同じ内容の音声合成リクエストが届いた場合に、推論を 1 回にまとめて同じ音声を返します。"
+            "まとめられるよう、推論処理の数の 2 倍までのリクエストを同時に受け付けます。"
+            "ワーカープロセスを利用する場合は無効です。"
+        ),
+    )
+    parser.add_argument(
+        "--max_queue_size",
+        type=int,
+        default=None,
+        help=(
+            "実行順を待機できる音声合成リクエストの数です。"
+            "待機数が上限に達している間、新たな音声合成リクエストには Retry-After ヘッダー付きの 503 Service Unavailable を返します。"
+            "指定しない場合、待機数は制限されません。"
+        ),
+    )
+    parser.add_argument(
+        "--model_memory_budget_mb",
+        type=int,
+        default=None,
+        help=(
+            "ロード済みの音声合成モデルに割り当てるメモリ (GPU 推論時は VRAM) 使用量の上限 (MB) です。"
+            "上限を超える場合、最も長く使われていないモデルから順に自動的にアンロードされます。"
+            "指定しない場合、モデルは明示的にアンロードされるまでロードされたままになります。"
+        ),
+    )
+    parser.add_argument(
+        "--model_idle_ttl",
+        type=float,
+        default=None,
+        help=(
+            "音声合成モデルが最後に使われてから自動的にアンロードされるまでの時間 (秒) です。"
+            "指定しない場合、使われていないモデルも自動的にはアンロードされません。"
+        ),
+    )
+    parser.add_argument(
+        "--pinned_models",
+        nargs="*",
+        help=(
+            "自動的にアンロードせず、常にロードしたままにする音声合成モデルの UUID を指定します。"
+            "スペースで区切ることで複数指定できます。指定されたモデルは起動時にロードされます。"
+        ),
+    )
+    parser.add_argument(
+        "--preload_models",
+        type=int,
+        default=0,
+        help=(
+            "起動時に、これまでの利用回数・最終利用時刻・時間帯ごとの利用傾向に基づいて優先度が上位の音声合成モデルを、"
+            "指定された数だけバックグラウンドで事前にロードします。デフォルトは 0 (事前ロードしない) です。"
+        ),
+    )
+    parser.add_argument(
+        "--restore_resident_models",
+        action="store_true",
+        help="起動時に、前回終了時にロードされていた音声合成モデルをバックグラウンドで事前にロードします。",
+    )
+    parser.add_argument(
+        "--watch_models_dir",
+        action="store_true",
+        help=(
+            "音声合成モデルのインストール先ディレクトリを監視し、API を経由せずに追加・変更・削除された AIVMX ファイルを、"
+            "エンジンを再起動せずに反映します。削除・変更された音声合成モデルはアンロードされます。"
+        ),
+    )
+    parser.add_argument(
+        "--synthesis_cache_memory_mb",
+        type=int,
+        default=0,
+        help=(
+            "同一内容の音声合成結果をメモリ上にキャッシュする際の容量上限 (MB) です。"
+            "0 を指定した場合 (デフォルト) 、メモリ上にはキャッシュしません。"
+        ),
+    )
+    parser.add_argument(
+        "--synthesis_cache_disk_mb",
+        type=int,
+        default=0,
+        help=(
+            "同一内容の音声合成結果をディスク上にキャッシュする際の容量上限 (MB) です。"
+            "0 を指定した場合 (デフォルト) 、ディスク上にはキャッシュしません。"
+        ),
+    )
+    parser.add_argument(
+        "--bert_feature_cache_mb",
+        type=int,
+        default=0,
+        help=(
+            "同じ文章を話速などのパラメータを変えて音声合成する際に再利用する、BERT 特徴量のキャッシュの容量上限 (MB) です。"
+            "0 を指定した場合 (デフォルト) 、BERT 特徴量はキャッシュしません。"
+        ),
+    )
+    parser.add_argument(
+        "--g2p_cache_size",
+        type=int,
+        default=0,
+        help=(
+            "テキストから生成したアクセント句系列をキャッシュする件数の上限です。"
+            "ユーザー辞書が更新されるとキャッシュは自動的に無効化されます。"
+            "0 を指定した場合 (デフォルト) 、アクセント句系列はキャッシュしません。"
+        ),
+    )
+    parser.add_argument(
+        "--synthesis_workers",
+        type=int,
+        default=0,
+        help=(
+            "音声合成を並列に実行するワーカープロセスの数です。"
+            "1 以上を指定した場合、モデルのロード後に指定された数のワーカープロセスを起動し、"
+            "ロード済みのモデルをワーカープロセス間で共有しながら、複数の CPU コアで音声合成を並列に実行します。"
+            "0 を指定した場合 (デフォルト) 、ワーカープロセスは起動しません。"
+            "ワーカープロセスを起動する場合、起動処理がすべて完了してから HTTP サーバーのポートをバインドします。"
+            "Windows および GPU 推論時は利用できません。"
+        ),
+    )
+    parser.add_argument(
+        "--warm_up_models",
+        action="store_true",
+        help=(
+            "BERT モデルや音声合成モデルのロード直後に、ダミーの文章で推論してウォームアップします。"
+            "ロードに時間がかかる代わりに、ロード直後の音声合成も定常時と同じ速度で行えるようになります。"
+        ),
+    )
+    parser.add_argument(
+        "--onnx_intra_op_num_threads",
+        type=int,
+        default=None,
+        help=(
+            "BERT モデル・音声合成モデルの 1 回の推論処理の中で並列に演算を行うスレッド数です。"
+            "指定しない場合、推論スロット数に応じて自動的に決定されます。"
+        ),
+    )
+    parser.add_argument(
+        "--onnx_inter_op_num_threads",
+        type=int,
+        default=None,
+        help=(
+            "--onnx_execution_mode に parallel を指定した場合に、独立した演算を並列に行うスレッド数です。"
+            "指定しない場合、ONNX Runtime が自動的に決定します。"
+        ),
+    )
+    parser.add_argument(
+        "--onnx_execution_mode",
+        type=str,
+        default=None,
+        choices=["sequential", "parallel"],
+        help="推論処理のグラフ内の独立した演算を、逐次実行 (sequential) するか並列実行 (parallel) するかです。",
+    )
+    parser.add_argument(
+        "--onnx_graph_optimization_level",
+        type=str,
+        default=None,
+        choices=["disable", "basic", "extended", "all"],
+        help="モデルのロード時に行うグラフ最適化のレベルです。指定しない場合は all です。",
+    )
+    parser.add_argument(
+        "--onnx_disable_mem_pattern",
+        action="store_true",
+        help="入力の形状に基づいてメモリ割り当てを事前に計画する、メモリパターン最適化を無効にします。",
+    )
+    parser.add_argument(
+        "--onnx_optimized_model_cache",
+        action="store_true",
+        help=(
+            "グラフ最適化を行った後のモデルをユーザーデータディレクトリにキャッシュし、次回以降のモデルのロード時間を短縮します。"
+            "キャッシュには実行環境の CPU に固有の最適化が含まれることがあります。"
+        ),
+    )
 
     # 引数へcpu_num_threadsの指定がなければ、環境変数をロールします。
     # 環境変数にもない場合は、Noneのままとします。
@@ -381,47 +600,111 @@ def main() -> None:
         logger.info(f"Engine root directory: {engine_root()}")
         logger.info(f"User data directory: {get_save_dir()}")
 
-        # AivmManager を初期化
-        aivm_manager = AivmManager(get_save_dir() / "Models")
+        # 起動処理の各段階を、依存関係に従って並行に実行するオーケストレーターを初期化
+        ## 音声合成モデルのスキャン・BERT モデルのロード・ユーザー辞書のコンパイルなどは互いに独立しているため、並行に実行して起動時間を短縮する
+        ## BERT モデルのロードなどの重い処理は GIL 外のネイティブコードで行われるため、スレッドでも並行に実行できる
+        orchestrator = StartupOrchestrator()
 
-        # ごく稀に style_bert_vits2_tts_engine.py (が依存する onnxruntime) のインポート自体に失敗し
-        # 例外が発生する環境があるようなので、例外をキャッチしてエラーログに出力できるよう、敢えてルーター初期化時にインポートする
-        from voicevox_engine.tts_pipeline.style_bert_vits2_tts_engine import (
-            StyleBertVITS2TTSEngine,
+        # AivmManager を初期化
+        orchestrator.add_stage(
+            "aivm_manager", lambda: AivmManager(get_save_dir() / "Models")
         )
 
-        # AivisSpeech Engine 独自の StyleBertVITS2TTSEngine を通常の TTSEngine の代わりに利用
-        tts_engines = TTSEngineManager()
-        tts_engines.register_engine(
-            StyleBertVITS2TTSEngine(aivm_manager, args.use_gpu, args.load_all_models),
-            MOCK_VER,
-        )
+        # ユーザー辞書を初期化 (OpenJTalk の辞書をコンパイルする)
+        orchestrator.add_stage("user_dict", UserDictionary)
 
-        core_manager = initialize_cores(
-            use_gpu=args.use_gpu,
-            voicelib_dirs=args.voicelib_dirs,
-            voicevox_dir=args.voicevox_dir,
-            runtime_dirs=args.runtime_dirs,
-            cpu_num_threads=args.cpu_num_threads,
-            enable_mock=args.enable_mock,
-            load_all_models=args.load_all_models,
+        def create_tts_engines(aivm_manager: AivmManager, *_: object) -> TTSEngineManager:  # fmt: skip
+            # ごく稀に style_bert_vits2_tts_engine.py (が依存する onnxruntime) のインポート自体に失敗し
+            # 例外が発生する環境があるようなので、例外をキャッチしてエラーログに出力できるよう、敢えてルーター初期化時にインポートする
+            from voicevox_engine.tts_pipeline.onnx_session_settings import (
+                OnnxSessionSettings,
+            )
+            from voicevox_engine.tts_pipeline.style_bert_vits2_tts_engine import (
+                StyleBertVITS2TTSEngine,
+            )
+
+            # AivisSpeech Engine 独自の StyleBertVITS2TTSEngine を通常の TTSEngine の代わりに利用
+            tts_engines = TTSEngineManager()
+            tts_engines.register_engine(
+                StyleBertVITS2TTSEngine(
+                    aivm_manager,
+                    args.use_gpu,
+                    args.load_all_models,
+                    inference_slots=args.inference_slots,
+                    max_inference_slots_per_model=args.max_inference_slots_per_model,
+                    coalesce_identical_requests=args.coalesce_identical_requests,
+                    model_memory_budget=(
+                        args.model_memory_budget_mb * 1024 * 1024
+                        if args.model_memory_budget_mb is not None
+                        else None
+                    ),
+                    model_idle_ttl=args.model_idle_ttl,
+                    pinned_models=args.pinned_models,
+                    preload_models=args.preload_models,
+                    restore_resident_models=args.restore_resident_models,
+                    synthesis_cache_memory_size=(
+                        args.synthesis_cache_memory_mb * 1024 * 1024
+                    ),
+                    synthesis_cache_disk_size=args.synthesis_cache_disk_mb
+                    * 1024
+                    * 1024,
+                    bert_feature_cache_size=args.bert_feature_cache_mb * 1024 * 1024,
+                    g2p_cache_size=args.g2p_cache_size,
+                    synthesis_workers=args.synthesis_workers,
+                    warm_up_models=args.warm_up_models,
+                    onnx_session_settings=OnnxSessionSettings(
+                        intra_op_num_threads=args.onnx_intra_op_num_threads,
+                        inter_op_num_threads=args.onnx_inter_op_num_threads,
+                        execution_mode=args.onnx_execution_mode,
+                        graph_optimization_level=args.onnx_graph_optimization_level,
+                        enable_mem_pattern=(
+                            False if args.onnx_disable_mem_pattern else None
+                        ),
+                        optimized_model_cache_dir=(
+                            StyleBertVITS2TTSEngine.OPTIMIZED_MODEL_CACHE_DIR
+                            if args.onnx_optimized_model_cache
+                            else None
+                        ),
+                    ),
+                ),
+                MOCK_VER,
+            )
+            return tts_engines
+
+        # 音声合成エンジンを初期化 (BERT モデルをロードする)
+        ## ウォームアップでは OpenJTalk で読みを取得し、ワーカープロセスは起動時点のユーザー辞書を引き継ぐため、
+        ## これらが有効な場合はユーザー辞書の初期化の完了を待ってから初期化する
+        orchestrator.add_stage(
+            "tts_engine",
+            create_tts_engines,
+            (
+                ["aivm_manager", "user_dict"]
+                if args.warm_up_models or args.synthesis_workers > 0
+                else ["aivm_manager"]
+            ),
         )
-        # tts_engines = make_tts_engines_from_cores(core_manager)
-        song_engines = make_song_engines_from_cores(core_manager)
-        # assert len(tts_engines.versions()) != 0, "音声合成エンジンがありません。"
-        assert len(song_engines.versions()) != 0, "音声合成エンジンがありません。"
-
-        cancellable_engine: CancellableEngine | None = None
-        if args.enable_cancellable_synthesis:
-            cancellable_engine = CancellableEngine(
-                init_processes=args.init_processes,
+
+        def create_cores() -> tuple[CoreManager, SongEngineManager]:
+            core_manager = initialize_cores(
                 use_gpu=args.use_gpu,
                 voicelib_dirs=args.voicelib_dirs,
                 voicevox_dir=args.voicevox_dir,
                 runtime_dirs=args.runtime_dirs,
                 cpu_num_threads=args.cpu_num_threads,
                 enable_mock=args.enable_mock,
+                load_all_models=args.load_all_models,
             )
+            # tts_engines = make_tts_engines_from_cores(core_manager)
+            song_engines = make_song_engines_from_cores(core_manager)
+            # assert len(tts_engines.versions()) != 0, "音声合成エンジンがありません。"
+            assert len(song_engines.versions()) != 0, "音声合成エンジンがありません。"
+
+            # /cancellable_synthesis は StyleBertVITS2TTSEngine のプロセス内で音声合成をキャンセルするため、
+            # VOICEVOX CORE をサブプロセスで実行する CancellableEngine は生成しない
+            return core_manager, song_engines
+
+        # VOICEVOX CORE (AivisSpeech Engine では常にモック版) を初期化
+        orchestrator.add_stage("cores", create_cores)
 
         setting_loader = SettingHandler(args.setting_file)
         settings = setting_loader.load()
@@ -447,20 +730,22 @@ def main() -> None:
         preset_path = select_first_not_none(
             [args.preset_file, env_preset_path, default_preset_path]
         )
-        preset_manager = PresetManager(preset_path)
-
-        user_dict = UserDictionary()
+        orchestrator.add_stage("preset_manager", lambda: PresetManager(preset_path))
 
         engine_manifest = load_manifest(engine_manifest_path())
 
-        library_manager = LibraryManager(
-            # get_save_dir() / "installed_libraries",
-            # AivisSpeech では利用しない LibraryManager によるディレクトリ作成を防ぐため、get_save_dir() 直下を指定
-            get_save_dir(),
-            engine_manifest.supported_vvlib_manifest_version,
-            engine_manifest.brand_name,
-            engine_manifest.name,
-            engine_manifest.uuid,
+        # LibraryManager を初期化
+        orchestrator.add_stage(
+            "library_manager",
+            lambda: LibraryManager(
+                # get_save_dir() / "installed_libraries",
+                # AivisSpeech では利用しない LibraryManager によるディレクトリ作成を防ぐため、get_save_dir() 直下を指定
+                get_save_dir(),
+                engine_manifest.supported_vvlib_manifest_version,
+                engine_manifest.brand_name,
+                engine_manifest.name,
+                engine_manifest.uuid,
+            ),
         )
 
         root_dir = select_first_not_none([args.voicevox_dir, engine_root()])
@@ -474,30 +759,92 @@ def main() -> None:
         else:
             disable_mutable_api = envs.disable_mutable_api
 
-        # ASGI に準拠した AivisSpeech Engine アプリケーションを生成する
-        app = generate_app(
-            tts_engines,
-            song_engines,
-            aivm_manager,
-            core_manager,
-            setting_loader,
-            preset_manager,
-            user_dict,
-            engine_manifest,
-            library_manager,
-            cancellable_engine,
-            character_info_dir,
-            cors_policy_mode,
-            allow_origin,
-            disable_mutable_api=disable_mutable_api,
+        # 起動処理の完了前から接続を受け付けられるよう、先に HTTP サーバーを起動してポートをバインドする
+        ## 起動処理の完了前に届いたリクエストは、起動処理の完了まで待機させてから処理する
+        ## 起動処理の各段階の状態は /startup_status で確認できる
+        startup_app = StartupApplication(orchestrator.get_status)
+        server = uvicorn.Server(
+            uvicorn.Config(
+                startup_app, host=args.host, port=args.port, log_config=LOGGING_CONFIG
+            )
         )
+        startup_errors: list[BaseException] = []
 
-        # 起動処理にのみに要したメモリを開放
-        gc.collect()
+        def start_engine() -> None:
+            try:
+                results = orchestrator.run()
+                core_manager, song_engines = results["cores"]
+
+                # 音声合成のワーカープロセスを利用する場合は、起動処理のスレッドがすべて終了した時点でワーカープロセスを起動する
+                ## ワーカープロセスの起動時はメインスレッドで起動処理を行い、HTTP サーバーのスレッドもまだ動作していない
+                from voicevox_engine.tts_pipeline.style_bert_vits2_tts_engine import (
+                    StyleBertVITS2TTSEngine,
+                )
+
+                tts_engine = results["tts_engine"].get_tts_engine(MOCK_VER)
+                if isinstance(tts_engine, StyleBertVITS2TTSEngine):
+                    tts_engine.start_synthesis_workers()
+
+                # ASGI に準拠した AivisSpeech Engine アプリケーションを生成する
+                app = generate_app(
+                    results["tts_engine"],
+                    song_engines,
+                    results["aivm_manager"],
+                    core_manager,
+                    setting_loader,
+                    results["preset_manager"],
+                    results["user_dict"],
+                    engine_manifest,
+                    results["library_manager"],
+                    character_info_dir,
+                    cors_policy_mode,
+                    allow_origin,
+                    disable_mutable_api=disable_mutable_api,
+                    inference_queue=InferenceQueue(
+                        # 同時に推論できるリクエストの数 (ワーカープロセス数、またはワーカープロセスを利用しない場合は推論スロット数) まで同時に実行する
+                        ## リクエストコアレッサーが有効な場合は、推論中のリクエストと同一内容のリクエストが推論の完了を待たずに
+                        ## 結果を共有できるよう、推論スロット数の 2 倍まで同時に受け付ける (受け付けたリクエストは推論スロットの確保を待つ)
+                        max_concurrency=(
+                            args.synthesis_workers
+                            if args.synthesis_workers > 0
+                            else args.inference_slots
+                            * (2 if args.coalesce_identical_requests else 1)
+                        ),
+                        max_queue_size=args.max_queue_size,
+                    ),
+                )
+
+                # 音声合成モデルのインストール先ディレクトリの監視を開始する
+                ## ワーカープロセスの起動後に監視用のスレッドを開始するため、音声合成エンジンの初期化後に開始する
+                if args.watch_models_dir:
+                    results["aivm_manager"].start_models_dir_watcher()
+
+                # 起動処理にのみに要したメモリを開放
+                gc.collect()
+
+                startup_app.set_app(app)
+                logger.info("AivisSpeech Engine is ready.")
+            except BaseException as ex:
+                # 起動処理に失敗した場合は、HTTP サーバーを停止してエンジンを終了する
+                startup_errors.append(ex)
+                startup_app.set_startup_error(ex)
+                server.should_exit = True
+
+        # 音声合成のワーカープロセスは他のスレッドが動作していない状態で fork() する必要があるため、
+        # ワーカープロセスを利用する場合は、HTTP サーバーを起動する前にメインスレッドで起動処理を完了させる
+        ## この場合、ポートは起動処理の完了後にバインドされ、/startup_status で起動処理の状態を確認することはできない
+        if args.synthesis_workers > 0:
+            start_engine()
+            if len(startup_errors) > 0:
+                raise startup_errors[0]
+        else:
+            threading.Thread(target=start_engine, name="startup", daemon=True).start()
 
         # AivisSpeech Engine サーバーを起動
         # NOTE: デフォルトは ASGI に準拠した HTTP/1.1 サーバー
-        uvicorn.run(app, host=args.host, port=args.port, log_config=LOGGING_CONFIG)
+        server.run()
+        if len(startup_errors) > 0:
+            raise startup_errors[0]
 
     except Exception as e:
         logger.error("Unexpected error occurred during engine startup:", exc_info=e)
@@ -1,30 +1,15 @@
 """/cancellable_synthesis API のテスト。"""
 
-from typing import Any
-
-import pytest
 from fastapi.testclient import TestClient
 from syrupy.assertion import SnapshotAssertion
 
 from test.e2e.single_api.utils import gen_mora
-from test.utility import hash_wave_floats_from_wav_bytes
-from voicevox_engine.app.application import generate_app
-from voicevox_engine.cancellable_engine import CancellableEngine
-
 
-@pytest.fixture()
-def cancellable_client(app_params: dict[str, Any]) -> TestClient:
-    app_params["cancellable_engine"] = CancellableEngine(
-        init_processes=1,
-        use_gpu=False,
-        enable_mock=True,
-    )
-    cancellable_app = generate_app(**app_params)
-    return TestClient(cancellable_app)
+# from test.utility import hash_wave_floats_from_wav_bytes
 
 
 def test_post_cancellable_synthesis_200(
-    cancellable_client: TestClient, snapshot: SnapshotAssertion
+    client: TestClient, snapshot: SnapshotAssertion
 ) -> None:
     query = {
         "accent_phrases": [
@@ -51,17 +36,15 @@ def test_post_cancellable_synthesis_200(
         "outputStereo": False,
         "kana": "テ'_スト",
     }
-    response = cancellable_client.post(
-        "/cancellable_synthesis", params={"speaker": 0}, json=query
+    response = client.post(
+        "/cancellable_synthesis", params={"speaker": 888753760}, json=query
     )
-    # AivisSpeech Engine では未実装 (501 Not Implemented を返す)
-    assert response.status_code == 501
-    return
     assert response.status_code == 200
 
     # 音声波形が一致する
     assert response.headers["content-type"] == "audio/wav"
-    assert snapshot == hash_wave_floats_from_wav_bytes(response.read())
+    # AivisSpeech Engine の音声合成は常にある程度のランダム性があるため、テストではハッシュ値の比較は行わない
+    # assert snapshot == hash_wave_floats_from_wav_bytes(response.read())
 
 
 # TODO: キャンセルするテストを追加する
@@ -1,13 +1,14 @@
 """/multi_synthesis API のテスト。"""
 
-# import io
-# import zipfile
+import io
 
+import soundfile
 from fastapi.testclient import TestClient
 from syrupy.assertion import SnapshotAssertion
 
 from test.e2e.single_api.utils import gen_mora
 
+# import zipfile
 # from test.utility import hash_wave_floats_from_wav_bytes
 
 
@@ -80,3 +81,43 @@ def test_post_multi_synthesis_200(
     #     wav_files = (zip_file.read(name) for name in zip_file.namelist())
     #     for wav in wav_files:
     #         assert snapshot == hash_wave_floats_from_wav_bytes(wav)
+
+
+def test_post_multi_synthesis_concatenate_200(client: TestClient) -> None:
+    query = {
+        "accent_phrases": [
+            {
+                "moras": [
+                    gen_mora("テ", "t", 0.0, "e", 0.0, 0.0),
+                    gen_mora("ス", "s", 0.0, "U", 0.0, 0.0),
+                    gen_mora("ト", "t", 0.0, "o", 0.0, 0.0),
+                ],
+                "accent": 1,
+                "pause_mora": None,
+                "is_interrogative": False,
+            }
+        ],
+        "speedScale": 1.0,
+        "pitchScale": 1.0,
+        "intonationScale": 1.0,
+        "volumeScale": 1.0,
+        "prePhonemeLength": 0.1,
+        "postPhonemeLength": 0.1,
+        "pauseLength": None,
+        "pauseLengthScale": 1.0,
+        "outputSamplingRate": 44100,
+        "outputStereo": False,
+        "kana": "テスト",
+    }
+    response = client.post(
+        "/multi_synthesis",
+        params={"speaker": 888753760, "concatenate": True},
+        json=[query, query],
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "audio/wav"
+
+    # 2 件の音声が連結された WAV ファイルが返される
+    wave, sampling_rate = soundfile.read(io.BytesIO(response.read()))
+    assert sampling_rate == 44100
+    assert len(wave) > 0
@@ -0,0 +1,92 @@
+"""音声合成モデルのアイコン画像・ボイスサンプルのアセットストアのテスト"""
+
+import uuid
+from pathlib import Path
+
+import pytest
+from aivmlib.schemas.aivm_manifest import DEFAULT_AIVM_MANIFEST, AivmManifest
+
+from voicevox_engine.aivm_assets_store import AivmAssetsStore, AivmAssetsStoreError
+from voicevox_engine.library.model import LibrarySpeaker
+from voicevox_engine.metas.Metas import Speaker, SpeakerInfo, SpeakerStyle, StyleInfo
+from voicevox_engine.model import AivmInfo
+
+_ICON_BASE64 = DEFAULT_AIVM_MANIFEST.speakers[0].icon.split(",")[1]
+_VOICE_SAMPLE_BASE64 = "UklGRiQAAABXQVZFZm10IBAAAAABAAEAIlYAAESsAAACABAAZGF0YQAAAAA="
+
+
+def _gen_aivm_info() -> AivmInfo:
+    """アイコン画像・ボイスサンプルを含む音声合成モデルの情報を生成する。"""
+    manifest_dict = DEFAULT_AIVM_MANIFEST.model_dump()
+    manifest_dict["uuid"] = uuid.UUID("11111111-1111-1111-1111-111111111111")
+    manifest_dict["speakers"][0]["styles"][0]["voice_samples"] = [
+        {"audio": f"data:audio/wav;base64,{_VOICE_SAMPLE_BASE64}", "transcript": "あ"}
+    ]
+    manifest = AivmManifest.model_validate(manifest_dict)
+    return AivmInfo(
+        is_loaded=False,
+        is_update_available=False,
+        is_private_model=True,
+        latest_version=manifest.version,
+        file_path=Path("model.aivmx"),
+        file_size=0,
+        manifest=manifest,
+        speakers=[
+            LibrarySpeaker(
+                speaker=Speaker(
+                    name="Speaker",
+                    speaker_uuid=str(manifest.speakers[0].uuid),
+                    styles=[SpeakerStyle(name="ノーマル", id=0)],
+                    version=manifest.version,
+                ),
+                speaker_info=SpeakerInfo(
+                    policy="",
+                    portrait=_ICON_BASE64,
+                    style_infos=[
+                        StyleInfo(
+                            id=0,
+                            icon=_ICON_BASE64,
+                            voice_samples=[_VOICE_SAMPLE_BASE64],
+                            voice_sample_transcripts=["あ"],
+                        )
+                    ],
+                ),
+            )
+        ],
+    )
+
+
+def test_store_and_load_assets(tmp_path: Path) -> None:
+    """アイコン画像・ボイスサンプルを参照に置き換えて保存し、元の値に戻して読み込める。"""
+    store = AivmAssetsStore(tmp_path)
+    aivm_info = _gen_aivm_info()
+
+    stored_aivm_info = store.store_assets(aivm_info)
+    # 同じ画像は Data URL と Base64 文字列の両方に含まれていても 1 つだけ保存される
+    assert len(list(tmp_path.glob("*.b64"))) == 2
+    assert len(stored_aivm_info.model_dump_json()) < len(aivm_info.model_dump_json()) / 4  # fmt: skip
+    # 参照に置き換えた後も AIVM マニフェストのバリデーションを通る
+    AivmManifest.model_validate(stored_aivm_info.manifest.model_dump())
+    assert stored_aivm_info.manifest.speakers[0].icon.startswith("data:image/png;base64,")  # fmt: skip
+    assert store.has_assets(stored_aivm_info) is True
+
+    assert store.load_assets(stored_aivm_info) == aivm_info
+    speaker_info = stored_aivm_info.speakers[0].speaker_info
+    assert store.load_speaker_info_assets(speaker_info) == aivm_info.speakers[0].speaker_info  # fmt: skip
+    # 引数の AivmInfo・SpeakerInfo は変更されない
+    assert speaker_info.portrait != _ICON_BASE64
+
+
+def test_prune(tmp_path: Path) -> None:
+    """どの音声合成モデルからも参照されていないアセットのみを削除する。"""
+    store = AivmAssetsStore(tmp_path)
+    stored_aivm_info = store.store_assets(_gen_aivm_info())
+
+    store.prune([stored_aivm_info])
+    assert store.has_assets(stored_aivm_info) is True
+
+    store.prune([])
+    assert list(tmp_path.glob("*.b64")) == []
+    assert store.has_assets(stored_aivm_info) is False
+    with pytest.raises(AivmAssetsStoreError):
+        store.load_assets(stored_aivm_info)
@@ -0,0 +1,215 @@
+"""インストール済み音声合成モデルのスキャンとインデックスのテスト"""
+
+import uuid
+from pathlib import Path
+from typing import BinaryIO
+
+import pytest
+from aivmlib.schemas.aivm_manifest import (
+    DEFAULT_AIVM_MANIFEST,
+    AivmManifest,
+    AivmManifestSpeaker,
+    AivmManifestSpeakerStyle,
+    AivmMetadata,
+)
+from aivmlib.schemas.style_bert_vits2 import StyleBertVITS2HyperParameters
+
+from voicevox_engine import aivm_infos_repository
+from voicevox_engine.aivm_infos_repository import (
+    AivmInfosRepository,
+    AivmModelParameters,
+    _AivmInfosIndex,
+)
+from voicevox_engine.library.model import LibrarySpeaker
+from voicevox_engine.metas.Metas import (
+    Speaker,
+    SpeakerInfo,
+    SpeakerStyle,
+    StyleInfo,
+)
+from voicevox_engine.model import AivmInfo
+
+
+def _gen_aivm_info(
+    aivm_uuid: uuid.UUID, speaker_uuid: uuid.UUID, style_names: list[str]
+) -> AivmInfo:
+    """1 話者のみを含む音声合成モデルの情報を生成する。"""
+    manifest_styles = [
+        AivmManifestSpeakerStyle(
+            name=name, icon=None, local_id=local_id, voice_samples=[]
+        )
+        for local_id, name in enumerate(style_names)
+    ]
+    manifest_speaker = AivmManifestSpeaker(
+        name="Speaker",
+        icon=DEFAULT_AIVM_MANIFEST.speakers[0].icon,
+        supported_languages=["ja"],
+        uuid=speaker_uuid,
+        local_id=0,
+        styles=manifest_styles,
+    )
+    manifest = AivmManifest.model_validate(
+        {
+            **DEFAULT_AIVM_MANIFEST.model_dump(),
+            "uuid": aivm_uuid,
+            "speakers": [manifest_speaker.model_dump()],
+        }
+    )
+    style_ids = [
+        AivmInfosRepository.local_style_id_to_style_id(
+            style.local_id, str(speaker_uuid)
+        )
+        for style in manifest_styles
+    ]
+    return AivmInfo(
+        is_loaded=False,
+        is_update_available=False,
+        is_private_model=True,
+        latest_version=manifest.version,
+        file_path=Path(f"{aivm_uuid}.aivmx"),
+        file_size=0,
+        manifest=manifest,
+        speakers=[
+            LibrarySpeaker(
+                speaker=Speaker(
+                    name="Speaker",
+                    speaker_uuid=str(speaker_uuid),
+                    styles=[
+                        SpeakerStyle(name=name, id=style_id)
+                        for name, style_id in zip(style_names, style_ids, strict=True)
+                    ],
+                    version=manifest.version,
+                ),
+                speaker_info=SpeakerInfo(
+                    policy=str(aivm_uuid),
+                    portrait="",
+                    style_infos=[
+                        StyleInfo(id=style_id, icon="", voice_samples=[])
+                        for style_id in style_ids
+                    ],
+                ),
+            )
+        ],
+    )
+
+
+def test_build_index() -> None:
+    """スタイル ID・話者の UUID から、対応する音声合成モデル・話者・スタイルの情報を引ける。"""
+    aivm_uuid = uuid.UUID("11111111-1111-1111-1111-111111111111")
+    speaker_uuid = uuid.UUID("22222222-2222-2222-2222-222222222222")
+    aivm_info = _gen_aivm_info(aivm_uuid, speaker_uuid, ["ノーマル", "あまあま"])
+    index = _AivmInfosIndex.build({str(aivm_uuid): aivm_info})
+
+    assert index.aivm_infos[str(aivm_uuid)] is aivm_info
+    assert index.speaker_infos[str(speaker_uuid)].policy == str(aivm_uuid)
+    assert len(index.styles) == 2
+    style_id = AivmInfosRepository.local_style_id_to_style_id(1, str(speaker_uuid))
+    entry = index.styles[style_id]
+    assert entry.aivm_info is aivm_info
+    assert entry.manifest_speaker.uuid == speaker_uuid
+    assert entry.local_speaker_id == 0
+    assert entry.local_style_id == 1
+    assert entry.style_name == "あまあま"
+
+
+def test_build_index_first_match_wins() -> None:
+    """同じ話者が複数の音声合成モデルに含まれる場合は、先に見つかった音声合成モデルの情報を優先する。"""
+    speaker_uuid = uuid.UUID("22222222-2222-2222-2222-222222222222")
+    first_uuid = uuid.UUID("33333333-3333-3333-3333-333333333333")
+    second_uuid = uuid.UUID("44444444-4444-4444-4444-444444444444")
+    index = _AivmInfosIndex.build(
+        {
+            str(first_uuid): _gen_aivm_info(first_uuid, speaker_uuid, ["ノーマル"]),
+            str(second_uuid): _gen_aivm_info(
+                second_uuid, speaker_uuid, ["ノーマル", "ささやき"]
+            ),
+        }
+    )
+
+    assert index.speaker_infos[str(speaker_uuid)].policy == str(first_uuid)
+    normal_style_id = AivmInfosRepository.local_style_id_to_style_id(
+        0, str(speaker_uuid)
+    )
+    whisper_style_id = AivmInfosRepository.local_style_id_to_style_id(
+        1, str(speaker_uuid)
+    )
+    assert index.styles[normal_style_id].aivm_info.manifest.uuid == first_uuid
+    assert index.styles[whisper_style_id].aivm_info.manifest.uuid == second_uuid
+
+
+def test_scan_models_reuses_unchanged_files(tmp_path: Path) -> None:
+    """前回のスキャン以降に変更されていない AIVMX ファイルは読み込み直さず、新規・変更されたファイルのみを読み込む。"""
+    speaker_uuid = uuid.UUID("22222222-2222-2222-2222-222222222222")
+    aivm_uuids = {
+        "a.aivmx": uuid.UUID("55555555-5555-5555-5555-555555555555"),
+        "b.aivmx": uuid.UUID("66666666-6666-6666-6666-666666666666"),
+        "c.aivmx": uuid.UUID("77777777-7777-7777-7777-777777777777"),
+    }
+    read_file_names: list[str] = []
+
+    def read_aivm_info(aivm_file_path: Path) -> AivmInfo | None:
+        read_file_names.append(aivm_file_path.name)
+        aivm_uuid = aivm_uuids[aivm_file_path.name]
+        return _gen_aivm_info(aivm_uuid, speaker_uuid, ["ノーマル"])
+
+    # コンストラクタでのキャッシュの読み込み・スキャンを避けるため、スキャンに必要な状態のみを初期化する
+    repository = AivmInfosRepository.__new__(AivmInfosRepository)
+    repository._scanned_aivm_infos = {}
+    repository._read_aivm_info = read_aivm_info  # type: ignore[method-assign]
+
+    (tmp_path / "a.aivmx").write_bytes(b"a")
+    (tmp_path / "b.aivmx").write_bytes(b"b")
+    assert len(repository._scan_models(tmp_path)) == 2
+    assert sorted(read_file_names) == ["a.aivmx", "b.aivmx"]
+
+    # 新しくインストールされたファイルと、内容が変更されたファイルのみが読み込まれる
+    read_file_names.clear()
+    (tmp_path / "b.aivmx").write_bytes(b"bb")
+    (tmp_path / "c.aivmx").write_bytes(b"c")
+    aivm_infos = repository._scan_models(tmp_path)
+    assert set(aivm_infos) == {str(aivm_uuid) for aivm_uuid in aivm_uuids.values()}
+    assert sorted(read_file_names) == ["b.aivmx", "c.aivmx"]
+
+    # アンインストールされたファイルはスキャン結果から除かれる
+    read_file_names.clear()
+    (tmp_path / "a.aivmx").unlink()
+    aivm_infos = repository._scan_models(tmp_path)
+    assert str(aivm_uuids["a.aivmx"]) not in aivm_infos
+    assert read_file_names == []
+
+
+def test_model_parameters_are_reused_without_manifest(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """スキャン時に読み込んだハイパーパラメータ・スタイルベクトルのみを保持し、ファイルが変更されるまで再利用する。"""
+    read_file_names: list[str] = []
+
+    def read_aivmx_metadata(aivmx_file: BinaryIO) -> AivmMetadata:
+        read_file_names.append(Path(aivmx_file.name).name)
+        return AivmMetadata(
+            manifest=DEFAULT_AIVM_MANIFEST,
+            hyper_parameters=StyleBertVITS2HyperParameters.model_construct(),
+            style_vectors=aivmx_file.read(),
+        )
+
+    monkeypatch.setattr(aivm_infos_repository, "read_aivmx_metadata", read_aivmx_metadata)  # fmt: skip
+    # コンストラクタでのキャッシュの読み込み・スキャンを避けるため、必要な状態のみを初期化する
+    repository = AivmInfosRepository.__new__(AivmInfosRepository)
+    repository._model_parameters = {}
+
+    aivm_file_path = tmp_path / "a.aivmx"
+    aivm_file_path.write_bytes(b"a")
+    # スキャン時はアイコン画像・ボイスサンプルを含む AIVM マニフェストを読み込む
+    assert repository._read_aivm_metadata(aivm_file_path).manifest == DEFAULT_AIVM_MANIFEST  # fmt: skip
+
+    # モデルのロード時はファイルを読み込み直さず、AIVM マニフェストは保持されていない
+    model_parameters = repository.get_model_parameters(aivm_file_path)
+    assert isinstance(model_parameters, AivmModelParameters)
+    assert not hasattr(model_parameters, "manifest")
+    assert model_parameters.style_vectors == b"a"
+    assert read_file_names == ["a.aivmx"]
+
+    # ファイルが変更された場合は読み込み直す
+    aivm_file_path.write_bytes(b"aa")
+    assert repository.get_model_parameters(aivm_file_path).style_vectors == b"aa"
+    assert read_file_names == ["a.aivmx", "a.aivmx"]
@@ -0,0 +1,61 @@
+"""音声合成モデルの管理のテスト"""
+
+from pathlib import Path
+
+from aivmlib.schemas.aivm_manifest import DEFAULT_AIVM_MANIFEST
+
+from voicevox_engine.aivm_manager import AivmManager
+from voicevox_engine.model import AivmInfo
+
+
+class _FakeRepository:
+    """スキャンのたびに、指定されたファイルサイズと更新日時を返すリポジトリ。"""
+
+    def __init__(self, aivm_info: AivmInfo) -> None:
+        self.aivm_info = aivm_info
+        self.scanned_file_key: tuple[int, int] | None = None
+        self.next_file_key: tuple[int, int] = (aivm_info.file_size, 1)
+
+    def get_installed_aivm_infos(self) -> dict[str, AivmInfo]:
+        return {str(self.aivm_info.manifest.uuid): self.aivm_info}
+
+    def get_scanned_file_key(self, aivm_file_path: Path) -> tuple[int, int] | None:
+        return self.scanned_file_key
+
+    def update_repository(self) -> None:
+        self.scanned_file_key = self.next_file_key
+
+
+def test_sync_installed_models_detects_overwrite_in_place(tmp_path: Path) -> None:
+    """ファイルサイズ・バージョンが同じまま上書きされた音声合成モデルも、更新日時の変化で変更を通知する。"""
+    aivm_info = AivmInfo(
+        is_loaded=False,
+        is_update_available=False,
+        is_private_model=True,
+        latest_version=DEFAULT_AIVM_MANIFEST.version,
+        file_path=tmp_path / "model.aivmx",
+        file_size=100,
+        manifest=DEFAULT_AIVM_MANIFEST,
+        speakers=[],
+    )
+    repository = _FakeRepository(aivm_info)
+    # コンストラクタでのスキャン・デフォルトモデルのインストールを避けるため、必要な状態のみを初期化する
+    manager = AivmManager.__new__(AivmManager)
+    manager.installed_models_dir = tmp_path
+    manager._repository = repository  # type: ignore[assignment]
+    manager._model_change_listeners = []
+    changed_aivm_uuids: list[str] = []
+    manager.add_model_change_listener(changed_aivm_uuids.append)
+
+    # キャッシュから読み込んだ直後の初回のスキャンでは、更新日時の比較ができないため変更とみなさない
+    manager.sync_installed_models()
+    assert changed_aivm_uuids == []
+
+    # 変更がなければ通知しない
+    manager.sync_installed_models()
+    assert changed_aivm_uuids == []
+
+    # ファイルサイズ・バージョンが同じでも、更新日時が変われば変更を通知する
+    repository.next_file_key = (aivm_info.file_size, 2)
+    manager.sync_installed_models()
+    assert changed_aivm_uuids == [str(aivm_info.manifest.uuid)]
@@ -0,0 +1,69 @@
+"""AIVMX ファイルのユーティリティのテスト"""
+
+import io
+
+import aivmlib
+import numpy as np
+import pytest
+
+from voicevox_engine.utility.aivmx_utility import read_aivmx_metadata
+
+onnx = pytest.importorskip("onnx")
+
+
+def _make_onnx_model(metadata: dict[str, str]) -> bytes:
+    """大きな重みを持つグラフと、指定されたメタデータを含む ONNX モデルを生成する。"""
+    weight = onnx.numpy_helper.from_array(
+        np.ones((256, 1024), dtype=np.float32), name="weight"
+    )
+    node = onnx.helper.make_node("MatMul", ["input", "weight"], ["output"])
+    graph = onnx.helper.make_graph(
+        [node],
+        "graph",
+        [onnx.helper.make_tensor_value_info("input", onnx.TensorProto.FLOAT, [1, 256])],
+        [onnx.helper.make_tensor_value_info("output", onnx.TensorProto.FLOAT, [1, 1024])],
+        initializer=[weight],
+    )  # fmt: skip
+    model = onnx.helper.make_model(graph)
+    onnx.helper.set_model_props(model, metadata)
+    serialized_model: bytes = model.SerializeToString()
+    return serialized_model
+
+
+@pytest.fixture()
+def raw_metadatas(monkeypatch: pytest.MonkeyPatch) -> list[dict[str, str]]:
+    """AIVM メタデータのバリデーションに渡された、生のメタデータを記録する。"""
+    raw_metadatas: list[dict[str, str]] = []
+    monkeypatch.setattr(aivmlib, "validate_aivm_metadata", raw_metadatas.append)
+    return raw_metadatas
+
+
+def test_read_aivmx_metadata(raw_metadatas: list[dict[str, str]]) -> None:
+    """グラフを読み飛ばし、aivmlib と同じメタデータを読み込む。"""
+    metadata = {
+        "aivm_manifest": '{"name": "テスト"}',
+        "aivm_hyper_parameters": "{}",
+        "aivm_style_vectors": "AAAA" * 1000,
+    }
+    aivmx_file = io.BytesIO(_make_onnx_model(metadata))
+    aivmx_file.seek(100)
+
+    read_aivmx_metadata(aivmx_file)
+    aivmlib.read_aivmx_metadata(aivmx_file)
+    assert raw_metadatas == [metadata, metadata]
+    # 読み込み後はカーソルが先頭に戻る
+    assert aivmx_file.tell() == 0
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"This is not an ONNX file.\n" * 10,
+        _make_onnx_model({"aivm_manifest": "{}"})[:-10],
+    ],
+    ids=["not_onnx", "truncated"],
+)
+def test_read_invalid_aivmx_file(data: bytes) -> None:
+    """ONNX ファイルでないファイルや途中で切れたファイルは、AivmValidationError になる。"""
+    with pytest.raises(aivmlib.AivmValidationError):
+        read_aivmx_metadata(io.BytesIO(data))
@@ -0,0 +1,46 @@
+"""ディレクトリ監視 utility のテスト"""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from voicevox_engine.utility.directory_watcher_utility import DirectoryWatcher
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_directory_watcher(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, use_inotify: bool
+) -> None:
+    """指定された拡張子のファイルの変更のみを検知し、連続した変更を 1 回のコールバックにまとめる。"""
+    called = threading.Event()
+    call_count = 0
+
+    def callback() -> None:
+        nonlocal call_count
+        call_count += 1
+        called.set()
+
+    watcher = DirectoryWatcher(
+        tmp_path, callback, ".aivmx", debounce_time=0.5, poll_interval=0.1
+    )
+    if use_inotify is False:
+        monkeypatch.setattr(watcher, "_init_inotify", lambda: None)
+    watcher.start()
+    try:
+        # 監視対象外の拡張子のファイルの変更は無視される
+        (tmp_path / "model.txt").write_text("text")
+        assert called.wait(1.0) is False
+
+        # 連続した変更は 1 回のコールバックにまとめられる
+        (tmp_path / "model_a.aivmx").write_bytes(b"a")
+        (tmp_path / "model_b.aivmx").write_bytes(b"b")
+        assert called.wait(5.0) is True
+        assert call_count == 1
+
+        called.clear()
+        (tmp_path / "model_a.aivmx").unlink()
+        assert called.wait(5.0) is True
+        assert call_count == 2
+    finally:
+        watcher.stop()
@@ -0,0 +1,119 @@
+"""ファイルダウンロード utility のテスト"""
+
+import base64
+import hashlib
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+import pytest
+
+from voicevox_engine.utility.download_utility import (
+    DownloadIntegrityError,
+    download_file,
+)
+
+_DATA = bytes(range(256)) * 1024
+_ETAG = '"test-etag"'
+
+
+class _FileServer(ThreadingHTTPServer):
+    """Range リクエストに対応し、指定された回数だけレスポンスを途中で切断する HTTP サーバー。"""
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _FileRequestHandler)
+        self.status_code = 200
+        self.digest = hashlib.sha256(_DATA).digest()
+        self.interrupt_count = 0
+        self.range_headers: list[str | None] = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/model.aivmx"
+
+
+class _FileRequestHandler(BaseHTTPRequestHandler):
+    server: _FileServer
+
+    def do_GET(self) -> None:
+        server = self.server
+        range_header = self.headers.get("Range")
+        server.range_headers.append(range_header)
+        if server.status_code != 200:
+            self.send_error(server.status_code)
+            return
+
+        start = 0
+        if range_header is not None and self.headers.get("If-Range") == _ETAG:
+            start = int(range_header.removeprefix("bytes=").removesuffix("-"))
+        body = _DATA[start:]
+        self.send_response(206 if start > 0 else 200)
+        if start > 0:
+            self.send_header("Content-Range", f"bytes {start}-{len(_DATA) - 1}/{len(_DATA)}")  # fmt: skip
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", _ETAG)
+        self.send_header("Repr-Digest", f"sha-256=:{base64.b64encode(server.digest).decode()}:")  # fmt: skip
+        self.end_headers()
+
+        # 指定された回数だけ、レスポンスの途中で接続を切断する
+        if server.interrupt_count > 0:
+            server.interrupt_count -= 1
+            self.wfile.write(body[: len(body) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def file_server() -> Iterator[_FileServer]:
+    server = _FileServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_download_file_resume(file_server: _FileServer, tmp_path: Path) -> None:
+    """レスポンスが途中で切断された場合、ダウンロード済みの部分の続きから再開する。"""
+    file_server.interrupt_count = 2
+    file_path = tmp_path / "model.aivmx.part"
+
+    download_file(file_server.url, file_path, retry_interval=0)
+
+    assert file_path.read_bytes() == _DATA
+    assert file_server.range_headers == [
+        None,
+        f"bytes={len(_DATA) // 2}-",
+        f"bytes={len(_DATA) // 2 + len(_DATA) // 4}-",
+    ]
+
+
+def test_download_file_hash_mismatch(file_server: _FileServer, tmp_path: Path) -> None:
+    """ハッシュ値が一致しない場合、最初からダウンロードし直し、最終的に DownloadIntegrityError を送出する。"""
+    file_server.digest = hashlib.sha256(b"other").digest()
+
+    with pytest.raises(DownloadIntegrityError):
+        download_file(file_server.url, tmp_path / "model.aivmx.part", retry_interval=0)
+    assert file_server.range_headers == [None, None, None]
+
+    # expected_sha256 が指定された場合は、サーバーが通知したハッシュ値よりも優先される
+    download_file(
+        file_server.url,
+        tmp_path / "model.aivmx.part",
+        expected_sha256=hashlib.sha256(_DATA).hexdigest(),
+    )
+
+
+def test_download_file_not_found(file_server: _FileServer, tmp_path: Path) -> None:
+    """404 Not Found の場合はリトライせずに送出する。"""
+    file_server.status_code = 404
+
+    with pytest.raises(httpx.HTTPStatusError):
+        download_file(file_server.url, tmp_path / "model.aivmx.part", retry_interval=0)
+    assert len(file_server.range_headers) == 1
@@ -0,0 +1,61 @@
+"""LRU キャッシュのテスト"""
+
+import pytest
+
+from voicevox_engine.utility.lru_cache_utility import LRUCache
+
+
+def test_lru_cache_max_entries() -> None:
+    """エントリ数の上限を超えると、最も長く参照されていないエントリから破棄される。"""
+    cache: LRUCache[str, int] = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_lru_cache_max_size() -> None:
+    """合計サイズの上限を超えるとエントリが破棄され、単独で上限を超えるエントリは追加されない。"""
+    cache: LRUCache[str, bytes] = LRUCache(max_size=10, get_size=len)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    cache.put("c", b"123")
+    assert "a" not in cache
+    assert cache.total_size == 8
+    cache.put("d", b"12345678901")
+    assert "d" not in cache
+    assert cache.total_size == 8
+
+
+def test_lru_cache_statistics() -> None:
+    """ヒット数・ミス数が記録される。"""
+    cache: LRUCache[str, int] = LRUCache(max_entries=10)
+    cache.put("a", 1)
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_lru_cache_remove() -> None:
+    """エントリを個別・条件指定・一括で削除できる。"""
+    cache: LRUCache[tuple[str, int], int] = LRUCache()
+    for model in ["x", "y"]:
+        for i in range(3):
+            cache.put((model, i), i)
+    assert cache.pop(("x", 0)) == 0
+    assert cache.pop(("x", 0)) is None
+    assert cache.remove_if(lambda key: key[0] == "x") == 2
+    assert len(cache) == 3
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_lru_cache_invalid_arguments() -> None:
+    """max_size を指定する際に get_size を指定しないとエラーになる。"""
+    with pytest.raises(ValueError):
+        LRUCache(max_size=10)
@@ -0,0 +1,61 @@
+"""起動処理の完了前から接続を受け付けるアプリケーションのラッパーのテスト"""
+
+import threading
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from voicevox_engine.app.startup_application import StartupApplication
+
+
+def test_requests_wait_until_app_is_ready() -> None:
+    """起動処理の完了前は起動状態のみを返し、それ以外のリクエストは起動処理の完了を待ってから処理される。"""
+    status = {"engine": "running"}
+    startup_app = StartupApplication(lambda: status)
+    lifespan_events: list[str] = []
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        lifespan_events.append("startup")
+        yield
+        lifespan_events.append("shutdown")
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.get("/version")
+    def version() -> str:
+        return "latest"
+
+    with TestClient(startup_app) as client:
+        response = client.get("/startup_status")
+        assert response.status_code == 503
+        assert response.json() == {"ready": False, "stages": {"engine": "running"}}
+
+        # 起動処理の完了前に届いたリクエストは、起動処理の完了後に処理される
+        responses = []
+        thread = threading.Thread(target=lambda: responses.append(client.get("/version")))  # fmt: skip
+        thread.start()
+        thread.join(timeout=0.2)
+        assert responses == []
+
+        status["engine"] = "ready"
+        startup_app.set_app(app)
+        thread.join(timeout=5)
+        assert responses[0].json() == "latest"
+        assert lifespan_events == ["startup"]
+
+        response = client.get("/startup_status")
+        assert response.status_code == 200
+        assert response.json() == {"ready": True, "stages": {"engine": "ready"}}
+    assert lifespan_events == ["startup", "shutdown"]
+
+
+def test_startup_error() -> None:
+    """起動処理が失敗した場合、リクエストには 503 エラーを返す。"""
+    startup_app = StartupApplication(lambda: {"engine": "failed"})
+    with TestClient(startup_app) as client:
+        startup_app.set_startup_error(RuntimeError("broken"))
+        assert client.get("/version").status_code == 503
+        assert client.get("/startup_status").json()["ready"] is False
@@ -0,0 +1,62 @@
+"""起動処理のオーケストレーターのテスト"""
+
+import threading
+
+import pytest
+
+from voicevox_engine.startup_orchestrator import StartupOrchestrator
+
+
+def test_independent_stages_run_concurrently() -> None:
+    """依存関係のない段階は並行に実行され、依存する段階は依存先の戻り値を受け取って実行される。"""
+    orchestrator = StartupOrchestrator()
+    barrier = threading.Barrier(2, timeout=5)
+
+    def stage_a() -> str:
+        # 段階 b と同時に実行されていなければタイムアウトする
+        barrier.wait()
+        return "a"
+
+    def stage_b() -> str:
+        barrier.wait()
+        return "b"
+
+    orchestrator.add_stage("a", stage_a)
+    orchestrator.add_stage("b", stage_b)
+    orchestrator.add_stage("c", lambda a, b: a + b + "c", ["a", "b"])
+    assert orchestrator.get_status() == {"a": "pending", "b": "pending", "c": "pending"}
+
+    results = orchestrator.run()
+    assert results == {"a": "a", "b": "b", "c": "abc"}
+    assert orchestrator.get_status() == {"a": "ready", "b": "ready", "c": "ready"}
+
+
+def test_failed_stage_skips_dependents() -> None:
+    """失敗した段階に依存する段階は実行されず、失敗した段階の例外が送出される。"""
+    orchestrator = StartupOrchestrator()
+    executed: list[str] = []
+
+    def fail() -> None:
+        raise ValueError("broken")
+
+    orchestrator.add_stage("a", fail)
+    orchestrator.add_stage("b", lambda: executed.append("b"))
+    orchestrator.add_stage("c", lambda *_: executed.append("c"), ["a", "b"])
+    orchestrator.add_stage("d", lambda *_: executed.append("d"), ["c"])
+
+    with pytest.raises(ValueError, match="broken"):
+        orchestrator.run()
+    assert executed == ["b"]
+    assert orchestrator.get_status() == {
+        "a": "failed",
+        "b": "ready",
+        "c": "failed",
+        "d": "failed",
+    }
+
+
+def test_unknown_dependency() -> None:
+    """追加されていない段階に依存する段階は追加できない。"""
+    orchestrator = StartupOrchestrator()
+    with pytest.raises(ValueError):
+        orchestrator.add_stage("a", lambda *_: None, ["b"])
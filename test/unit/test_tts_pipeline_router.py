@@ -0,0 +1,211 @@
+"""音声合成 API の推論キューの実行順の確保・解放に関するテスト"""
+
+import asyncio
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRoute
+from numpy.typing import NDArray
+
+from test.unit.tts_pipeline.tts_utils import gen_mora
+from voicevox_engine.app.dependencies import AudioOutputFormat, InferenceSchedule
+from voicevox_engine.app.routers import tts_pipeline
+from voicevox_engine.app.routers.tts_pipeline import generate_tts_pipeline_router
+from voicevox_engine.dev.tts_engine.mock import MockTTSEngine
+from voicevox_engine.metas.Metas import StyleId
+from voicevox_engine.model import AudioQuery
+from voicevox_engine.preset.preset_manager import PresetManager
+from voicevox_engine.tts_pipeline import audio_encoder
+from voicevox_engine.tts_pipeline.audio_encoder import AudioFormat
+from voicevox_engine.tts_pipeline.inference_queue import InferenceQueue
+from voicevox_engine.tts_pipeline.model import AccentPhrase
+from voicevox_engine.tts_pipeline.song_engine import SongEngineManager
+from voicevox_engine.tts_pipeline.tts_engine import TTSEngineManager
+
+
+class _RecordingTTSEngine(MockTTSEngine):
+    """音声合成の実行時に、推論キューで実行中のリクエスト数を記録するモック版 TTSEngine。"""
+
+    def __init__(
+        self,
+        inference_queue: InferenceQueue,
+        cached_wave: NDArray[np.float32] | None = None,
+    ) -> None:
+        super().__init__()
+        self.inference_queue = inference_queue
+        self.cached_wave = cached_wave
+        self.running_counts: list[int] = []
+
+    def get_cached_wave(
+        self, query: AudioQuery, style_id: StyleId
+    ) -> NDArray[np.float32] | None:
+        return self.cached_wave
+
+    def synthesize_wave(
+        self,
+        query: AudioQuery,
+        style_id: StyleId,
+        enable_interrogative_upspeak: bool = True,
+    ) -> NDArray[np.float32]:
+        self.running_counts.append(self.inference_queue.running_count)
+        return np.zeros(240, dtype=np.float32)
+
+
+def _gen_two_sentence_query() -> AudioQuery:
+    """「アー. イー.」に相当する、2 文からなるクエリを生成する。"""
+
+    def gen_accent_phrase(text: str) -> AccentPhrase:
+        return AccentPhrase(
+            moras=[
+                gen_mora(text, None, None, "a", 0.1, 5.0),
+                gen_mora(".", None, None, "pau", 0.0, 0.0),
+            ],
+            accent=1,
+        )
+
+    return AudioQuery(
+        accent_phrases=[gen_accent_phrase("ア"), gen_accent_phrase("イ")],
+        speedScale=1.0,
+        pitchScale=0.0,
+        intonationScale=1.0,
+        volumeScale=1.0,
+        prePhonemeLength=0.1,
+        postPhonemeLength=0.1,
+        outputSamplingRate=24000,
+        outputStereo=False,
+        kana=None,
+    )
+
+
+def _get_endpoint(
+    engine: _RecordingTTSEngine, tmp_path: Path, path: str
+) -> Callable[..., Any]:
+    """音声合成 API Router を生成し、指定されたパスのエンドポイントの関数を返す。"""
+    tts_engines = TTSEngineManager()
+    tts_engines.register_engine(engine, "0.0.1")
+    router = generate_tts_pipeline_router(
+        tts_engines,
+        SongEngineManager(),
+        PresetManager(tmp_path / "presets.yaml"),
+        inference_queue=engine.inference_queue,
+    )
+    route = next(
+        route
+        for route in router.routes
+        if isinstance(route, APIRoute) and route.path == path
+    )
+    return route.endpoint
+
+
+def _request_synthesis_stream(
+    engine: _RecordingTTSEngine, tmp_path: Path
+) -> StreamingResponse:
+    """/synthesis_stream API のエンドポイントを直接呼び出し、レスポンスを返す。"""
+    endpoint = _get_endpoint(engine, tmp_path, "/synthesis_stream")
+    response: StreamingResponse = endpoint(
+        query=_gen_two_sentence_query(),
+        style_id=StyleId(0),
+        schedule=InferenceSchedule(priority=None, client_id="client"),
+        output_format=AudioOutputFormat(audio_format=AudioFormat.WAV, bitrate=None),
+        enable_interrogative_upspeak=True,
+        core_version=None,
+    )
+    return response
+
+
+def test_synthesis_stream_releases_slot_before_first_chunk(tmp_path: Path) -> None:
+    """クライアントが最初の音声データを受信する前に切断しても、推論キューの実行順が解放されたままになる。"""
+    engine = _RecordingTTSEngine(InferenceQueue(max_concurrency=1))
+
+    response = _request_synthesis_stream(engine, tmp_path)
+
+    # 最初の 1 文の音声合成中のみ実行順を確保し、レスポンスの送信前に解放する
+    assert engine.running_counts == [1]
+    assert engine.inference_queue.running_count == 0
+    # レスポンスボディが一度も読み出されないまま破棄されても、実行順は解放されたまま
+    del response
+    assert engine.inference_queue.running_count == 0
+
+
+def test_synthesis_stream_holds_slot_per_sentence(tmp_path: Path) -> None:
+    """推論キューの実行順は 1 文の音声合成ごとに確保・解放され、クライアントの受信待ちの間は保持されない。"""
+    engine = _RecordingTTSEngine(InferenceQueue(max_concurrency=1))
+
+    response = _request_synthesis_stream(engine, tmp_path)
+
+    async def receive_chunks() -> int:
+        chunk_count = 0
+        async for _ in response.body_iterator:
+            # 次の音声データを受信するまでの間は、他のリクエストに実行順を譲っている
+            assert engine.inference_queue.running_count == 0
+            chunk_count += 1
+        return chunk_count
+
+    # WAV ヘッダー付きの最初の文・次の文・ストリームの終端
+    assert asyncio.run(receive_chunks()) == 3
+    assert engine.running_counts == [1, 1]
+    assert engine.inference_queue.running_count == 0
+
+
+def test_synthesis_cache_hit_skips_inference_queue(tmp_path: Path) -> None:
+    """キャッシュされた音声合成結果は、推論キューの実行順が空くのを待たずに返される。"""
+    inference_queue = InferenceQueue(max_concurrency=1, max_queue_size=0)
+    engine = _RecordingTTSEngine(
+        inference_queue, cached_wave=np.zeros(240, dtype=np.float32)
+    )
+    endpoint = _get_endpoint(engine, tmp_path, "/synthesis")
+
+    # 推論中のリクエストで実行順が埋まり、待機もできない状態でも音声合成結果が返される
+    with inference_queue.enter():
+        response = endpoint(
+            query=_gen_two_sentence_query(),
+            style_id=StyleId(0),
+            schedule=InferenceSchedule(priority=None, client_id="client"),
+            output_format=AudioOutputFormat(audio_format=AudioFormat.WAV, bitrate=None),
+            enable_interrogative_upspeak=True,
+            core_version=None,
+        )
+    assert response.status_code == 200
+    assert response.headers["X-Inference-Queue-Position"] == "0"
+    assert engine.running_counts == []
+
+
+class _ConnectedRequest:
+    """接続を切断しないクライアントからのリクエスト。"""
+
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+def test_cancellable_synthesis_encodes_off_event_loop(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """/cancellable_synthesis API は、音声ファイルへのエンコードをイベントループのスレッドで実行しない。"""
+    encode_threads: list[threading.Thread] = []
+
+    def encode_wave(*args: Any, **kwargs: Any) -> memoryview:
+        encode_threads.append(threading.current_thread())
+        return audio_encoder.encode_wave(*args, **kwargs)
+
+    monkeypatch.setattr(tts_pipeline, "encode_wave", encode_wave)
+    engine = _RecordingTTSEngine(InferenceQueue(max_concurrency=1))
+    endpoint = _get_endpoint(engine, tmp_path, "/cancellable_synthesis")
+
+    response = asyncio.run(
+        endpoint(
+            query=_gen_two_sentence_query(),
+            request=_ConnectedRequest(),
+            style_id=StyleId(0),
+            schedule=InferenceSchedule(priority=None, client_id="client"),
+            output_format=AudioOutputFormat(audio_format=AudioFormat.WAV, bitrate=None),
+            core_version=None,
+        )
+    )
+    assert response.status_code == 200
+    assert len(encode_threads) == 1
+    assert encode_threads[0] is not threading.main_thread()
@@ -0,0 +1,23 @@
+"""ストリーミング ZIP ライターのテスト"""
+
+import io
+import zipfile
+
+from voicevox_engine.utility.zip_stream_utility import ZipStreamWriter
+
+
+def test_zip_stream_writer() -> None:
+    """エントリを追加するたびに返されたバイト列を連結すると、正しい ZIP ファイルになる。"""
+    writer = ZipStreamWriter()
+    first_chunk = writer.write_file("001.wav", b"first")
+    second_chunk = writer.write_file("002.wav", b"second" * 1000)
+    last_chunk = writer.close()
+
+    # エントリを追加した時点で、そのエントリの内容が返される
+    assert b"first" in first_chunk
+    assert len(second_chunk) > 0
+    with zipfile.ZipFile(io.BytesIO(first_chunk + second_chunk + last_chunk)) as zip_file:  # fmt: skip
+        assert zip_file.namelist() == ["001.wav", "002.wav"]
+        assert zip_file.read("001.wav") == b"first"
+        assert zip_file.read("002.wav") == b"second" * 1000
+        assert zip_file.testzip() is None
@@ -0,0 +1,117 @@
+"""音声ファイルのエンコーダーのテスト"""
+
+import io
+
+import numpy as np
+import pytest
+import soundfile
+from numpy.typing import NDArray
+
+from voicevox_engine.tts_pipeline.audio_encoder import (
+    AudioFormat,
+    AudioStreamEncoder,
+    encode_wave,
+    negotiate_audio_format,
+)
+from voicevox_engine.tts_pipeline.wave_stream import (
+    generate_streaming_wav_header,
+    wave_to_pcm16_bytes,
+)
+
+
+def _gen_wave(sampling_rate: int = 44100, seconds: float = 1.0) -> NDArray[np.float32]:
+    """440 Hz の正弦波の音声波形を生成する。"""
+    t = np.arange(int(sampling_rate * seconds)) / sampling_rate
+    wave: NDArray[np.float32] = (0.3 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+    return wave
+
+
+def test_negotiate_audio_format() -> None:
+    """Accept ヘッダーの品質係数が最も高い対応形式を選び、決定できない場合は WAV 形式とする。"""
+    assert negotiate_audio_format(None) == AudioFormat.WAV
+    assert negotiate_audio_format("*/*") == AudioFormat.WAV
+    assert negotiate_audio_format("application/json") == AudioFormat.WAV
+    assert negotiate_audio_format("audio/ogg") == AudioFormat.OPUS
+    assert negotiate_audio_format("audio/mpeg, audio/flac") == AudioFormat.MP3
+    assert negotiate_audio_format("audio/mpeg;q=0.5, audio/flac") == AudioFormat.FLAC
+    assert negotiate_audio_format("audio/flac;q=0, */*;q=0.1") == AudioFormat.WAV
+    assert negotiate_audio_format("audio/L16;rate=44100") == AudioFormat.L16
+
+
+@pytest.mark.parametrize(
+    "audio_format, output_sampling_rate",
+    [
+        (AudioFormat.WAV, 44100),
+        (AudioFormat.FLAC, 44100),
+        # Opus は 44100 Hz に対応していないため、48000 Hz にリサンプリングされる
+        (AudioFormat.OPUS, 48000),
+        (AudioFormat.MP3, 44100),
+    ],
+)
+def test_encode_wave(audio_format: AudioFormat, output_sampling_rate: int) -> None:
+    """音声波形全体を指定された形式の音声ファイルにエンコードできる。"""
+    wave = np.stack([_gen_wave(), _gen_wave()], axis=1)
+    audio_file = encode_wave(wave, 44100, audio_format)
+    info = soundfile.info(io.BytesIO(audio_file))
+    assert info.samplerate == output_sampling_rate
+    assert info.channels == 2
+
+
+@pytest.mark.parametrize("audio_format", [AudioFormat.OPUS, AudioFormat.MP3])
+def test_encode_wave_bitrate(audio_format: AudioFormat) -> None:
+    """非可逆圧縮形式では、目標ビットレートに応じた大きさの音声ファイルにエンコードされる。"""
+    wave = _gen_wave(seconds=5.0)
+    low_bitrate_file = encode_wave(wave, 44100, audio_format, bitrate=32)
+    high_bitrate_file = encode_wave(wave, 44100, audio_format, bitrate=128)
+    # 5 秒間の音声のため、ビットレート (kbps) の約 5 / 8 KB になる
+    assert len(low_bitrate_file) < 32 * 1000 * 5 / 8 * 1.2
+    assert len(high_bitrate_file) > 128 * 1000 * 5 / 8 * 0.8
+
+
+def test_encode_wave_raw_pcm() -> None:
+    """生の PCM データの形式では、float32 はコピーせずに音声波形のバッファを、16bit PCM はビッグエンディアンのデータを返す。"""
+    wave = np.stack([_gen_wave(), _gen_wave()], axis=1)
+
+    f32_data = encode_wave(wave, 44100, AudioFormat.F32)
+    assert np.shares_memory(np.frombuffer(f32_data, dtype="<f4"), wave)
+    assert f32_data == wave.tobytes()
+
+    l16_data = encode_wave(wave, 44100, AudioFormat.L16)
+    little_endian_pcm16 = np.frombuffer(wave_to_pcm16_bytes(wave), dtype="<i2")
+    assert l16_data == little_endian_pcm16.astype(">i2").tobytes()
+
+
+def test_stream_encoder_wav() -> None:
+    """WAV 形式では、全体の長さが不明な WAV ヘッダーに続けて 16bit PCM のデータを返す。"""
+    wave = _gen_wave()
+    encoder = AudioStreamEncoder(AudioFormat.WAV, 44100, 1)
+    # encode() はコピーを避けるため memoryview を返す場合があるので、+ ではなく b"".join() で連結する
+    data = b"".join(
+        [encoder.encode(wave[:1000]), encoder.encode(wave[1000:]), encoder.close()]
+    )
+    assert data == generate_streaming_wav_header(44100, 1) + wave_to_pcm16_bytes(wave)
+
+
+def test_stream_encoder_opus() -> None:
+    """Ogg Opus 形式では、少しずつ受け取った音声波形をリサンプリングしながらエンコードする。"""
+    wave = _gen_wave()
+    encoder = AudioStreamEncoder(AudioFormat.OPUS, 44100, 1, bitrate=64)
+    chunks = [encoder.encode(wave[i : i + 4410]) for i in range(0, len(wave), 4410)]
+    chunks.append(encoder.close())
+    decoded, sampling_rate = soundfile.read(io.BytesIO(b"".join(chunks)))
+    assert sampling_rate == 48000
+    assert len(decoded) == 48000
+
+
+def test_stream_encoder_flac() -> None:
+    """FLAC 形式では、総サンプル数などのヘッダー情報を除き、音声波形全体をエンコードした場合と同じバイト列を返す。"""
+    wave = _gen_wave()
+    encoder = AudioStreamEncoder(AudioFormat.FLAC, 44100, 1)
+    chunks = [encoder.encode(wave[i : i + 4410]) for i in range(0, len(wave), 4410)]
+    chunks.append(encoder.close())
+    data = b"".join(chunks)
+    audio_file = encode_wave(wave, 44100, AudioFormat.FLAC)
+    # 先頭 42 バイトは fLaC マーカーと STREAMINFO メタデータブロック
+    assert len(data) == len(audio_file)
+    assert data[:4] == b"fLaC"
+    assert data[42:] == audio_file[42:]
@@ -0,0 +1,66 @@
+"""音声波形の加工処理のテスト"""
+
+import numpy as np
+
+from voicevox_engine.model import AudioQuery
+from voicevox_engine.tts_pipeline.audio_postprocessing import (
+    find_non_silent_range,
+    raw_wave_to_output_wave,
+)
+
+
+def _gen_query(
+    volumeScale: float = 1.0,
+    outputSamplingRate: int = 24000,
+    outputStereo: bool = False,
+) -> AudioQuery:
+    """後処理に関係する値のみを指定した AudioQuery を生成する。"""
+    return AudioQuery(
+        accent_phrases=[],
+        speedScale=1.0,
+        pitchScale=0.0,
+        intonationScale=1.0,
+        tempoDynamicsScale=1.0,
+        volumeScale=volumeScale,
+        prePhonemeLength=0.0,
+        postPhonemeLength=0.0,
+        pauseLength=None,
+        pauseLengthScale=1.0,
+        outputSamplingRate=outputSamplingRate,
+        outputStereo=outputStereo,
+    )
+
+
+def test_find_non_silent_range() -> None:
+    """両端の閾値以下のサンプルを除いた範囲を返し、int16 の最小値も無音と誤判定しない。"""
+    wave = np.zeros(10000, dtype=np.int16)
+    wave[1234] = -32768
+    wave[5000] = 100
+    wave[8765] = -14
+    assert find_non_silent_range(wave, threshold=13.0, block_size=1000) == (1234, 8766)
+    assert find_non_silent_range(wave, threshold=20000.0, block_size=1000) == (1234, 1235)  # fmt: skip
+    assert find_non_silent_range(np.zeros(10, dtype=np.int16), threshold=13.0) == (0, 0)  # fmt: skip
+    assert find_non_silent_range(np.zeros(0, dtype=np.float32), threshold=0.1) == (0, 0)  # fmt: skip
+
+
+def test_raw_wave_to_output_wave() -> None:
+    """無音区間の追加・正規化・音量調整・ステレオ化をまとめて行った float32 の出力音声波形を返す。"""
+    raw_wave = np.array([16384, -32768, 8192], dtype=np.int16)
+    query = _gen_query(volumeScale=2.0, outputSamplingRate=24000, outputStereo=True)
+    wave = raw_wave_to_output_wave(
+        query,
+        raw_wave,
+        24000,
+        pre_silence_length=2,
+        post_silence_length=1,
+        input_scale=1.0 / 32768.0,
+    )
+    true_mono_wave = np.array([0.0, 0.0, 1.0, -2.0, 0.5, 0.0], dtype=np.float32)
+    assert wave.dtype == np.float32
+    assert wave.flags["C_CONTIGUOUS"]
+    assert np.array_equal(wave, np.stack([true_mono_wave, true_mono_wave], axis=1))
+
+    # サンプリングレートが異なる場合はリサンプリングされる
+    query = _gen_query(outputSamplingRate=12000)
+    wave = raw_wave_to_output_wave(query, np.ones(2400, dtype=np.float32), 24000)
+    assert wave.shape == (1200,)
@@ -0,0 +1,85 @@
+"""BERT 特徴量キャッシュのテスト"""
+
+import sys
+from types import ModuleType
+from typing import Any
+
+import numpy as np
+import pytest
+from numpy.typing import NDArray
+
+from voicevox_engine.tts_pipeline import bert_feature_cache
+from voicevox_engine.tts_pipeline.bert_feature_cache import (
+    BertFeatureCache,
+    bypass_bert_feature_cache,
+)
+
+
+@pytest.fixture()
+def infer_onnx(monkeypatch: pytest.MonkeyPatch) -> ModuleType:
+    """BERT 特徴量の抽出回数を記録する extract_bert_feature_onnx() を持つ infer_onnx モジュールを差し込む。"""
+    module = ModuleType("style_bert_vits2.models.infer_onnx")
+    module.calls = []  # type: ignore[attr-defined]
+
+    def extract_bert_feature_onnx(
+        text: str,
+        word2ph: list[int],
+        language: Any,
+        onnx_providers: list[Any],
+        assist_text: str | None = None,
+        assist_text_weight: float = 0.7,
+    ) -> NDArray[np.float32]:
+        module.calls.append(text)  # type: ignore[attr-defined]
+        return np.full((1024, sum(word2ph)), len(module.calls), dtype=np.float32)  # type: ignore[attr-defined]
+
+    module.extract_bert_feature_onnx = extract_bert_feature_onnx  # type: ignore[attr-defined]
+    monkeypatch.setitem(sys.modules, module.__name__, module)
+    monkeypatch.setattr(bert_feature_cache, "_active_cache", None)
+    monkeypatch.setattr(bert_feature_cache, "_original_extract_bert_feature_onnx", None)  # fmt: skip
+    return module
+
+
+def test_bert_feature_is_cached(infer_onnx: ModuleType) -> None:
+    """同じテキスト・音素列の BERT 特徴量は 1 度だけ抽出され、異なる音素列では再度抽出される。"""
+    cache = BertFeatureCache(max_size=1024 * 1024 * 1024)
+    assert cache.install() is True
+
+    first = infer_onnx.extract_bert_feature_onnx("こんにちは", [1, 2, 1], "JP", [])
+    # キャッシュから返された特徴量を書き換えても、キャッシュには影響しない
+    first[:] = -1
+    second = infer_onnx.extract_bert_feature_onnx("こんにちは", [1, 2, 1], "JP", [])
+    infer_onnx.extract_bert_feature_onnx("こんにちは", [2, 1, 1], "JP", [])
+
+    assert infer_onnx.calls == ["こんにちは", "こんにちは"]
+    assert np.all(second == 1)
+    assert cache.get_statistics()["hits"] == 1
+    assert cache.get_statistics()["misses"] == 2
+
+
+def test_bypass_bert_feature_cache(infer_onnx: ModuleType) -> None:
+    """bypass_bert_feature_cache() のブロック内では、キャッシュを参照・更新せずに BERT 特徴量を抽出する。"""
+    cache = BertFeatureCache(max_size=1024 * 1024 * 1024)
+    assert cache.install() is True
+
+    infer_onnx.extract_bert_feature_onnx("こんにちは", [1, 2, 1], "JP", [])
+    with bypass_bert_feature_cache():
+        infer_onnx.extract_bert_feature_onnx("こんにちは", [1, 2, 1], "JP", [])
+        infer_onnx.extract_bert_feature_onnx("ウォームアップ", [1, 1, 1], "JP", [])
+
+    assert infer_onnx.calls == ["こんにちは", "こんにちは", "ウォームアップ"]
+    assert cache.get_statistics()["hits"] == 0
+    assert cache.get_statistics()["misses"] == 1
+    assert cache.get_statistics()["entries"] == 1
+
+
+def test_install_twice_does_not_wrap_twice(infer_onnx: ModuleType) -> None:
+    """複数回差し替えても二重に差し替えられず、最後のインスタンスのキャッシュが使われる。"""
+    first_cache = BertFeatureCache(max_size=1024 * 1024 * 1024)
+    second_cache = BertFeatureCache(max_size=1024 * 1024 * 1024)
+    assert first_cache.install() is True
+    assert second_cache.install() is True
+
+    infer_onnx.extract_bert_feature_onnx("テスト", [1, 1, 1], "JP", [])
+    assert len(infer_onnx.calls) == 1
+    assert first_cache.get_statistics()["entries"] == 0
+    assert second_cache.get_statistics()["entries"] == 1
@@ -0,0 +1,81 @@
+"""音声合成処理の協調的なキャンセルのテスト"""
+
+from typing import Any
+
+import onnxruntime
+import pytest
+
+from voicevox_engine.tts_pipeline.cancellation import (
+    CancellationToken,
+    SynthesisCancelledError,
+    TerminableInferenceSession,
+    get_current_cancellation_token,
+    use_cancellation_token,
+)
+
+
+class _FakeSession:
+    """run() に渡された RunOptions を記録し、推論中にキャンセルされる状況を再現するテスト用の推論セッション。"""
+
+    def __init__(self, token: CancellationToken | None = None) -> None:
+        self.token = token
+        self.run_options: list[onnxruntime.RunOptions | None] = []
+        self.providers = ["CPUExecutionProvider"]
+
+    def run(
+        self,
+        output_names: Any,
+        input_feed: Any,
+        run_options: onnxruntime.RunOptions | None = None,
+    ) -> list[int]:
+        self.run_options.append(run_options)
+        if self.token is not None:
+            self.token.cancel()
+            assert run_options is not None and run_options.terminate is True
+            raise RuntimeError("Exiting due to terminate flag being set to true.")
+        return [1]
+
+
+def test_callbacks_are_called_on_cancel() -> None:
+    """キャンセル時に登録中のコールバックのみが呼び出され、キャンセル後に登録したコールバックは即座に呼び出される。"""
+    token = CancellationToken()
+    called: list[str] = []
+    with token.register(lambda: called.append("registered")):
+        pass
+    with token.register(lambda: called.append("active")):
+        token.cancel()
+    with token.register(lambda: called.append("after")):
+        pass
+    assert called == ["active", "after"]
+    with pytest.raises(SynthesisCancelledError):
+        token.raise_if_cancelled()
+
+
+def test_use_cancellation_token() -> None:
+    """ブロック内でのみ、音声合成処理にトークンが紐づけられる。"""
+    token = CancellationToken()
+    assert get_current_cancellation_token() is None
+    with use_cancellation_token(token):
+        assert get_current_cancellation_token() is token
+    assert get_current_cancellation_token() is None
+
+
+def test_terminable_session_passes_run_options() -> None:
+    """terminable() のブロック内でのみ RunOptions が渡され、それ以外の属性は元の推論セッションに委譲される。"""
+    fake_session = _FakeSession()
+    session = TerminableInferenceSession(fake_session)  # type: ignore[arg-type]
+    with TerminableInferenceSession.terminable(CancellationToken()):
+        assert session.run(None, {}) == [1]
+    session.run(None, {})
+    assert isinstance(fake_session.run_options[0], onnxruntime.RunOptions)
+    assert fake_session.run_options[1] is None
+    assert session.providers == ["CPUExecutionProvider"]
+
+
+def test_terminable_session_raises_cancelled_error() -> None:
+    """推論中にキャンセルされた場合、推論処理が打ち切られて SynthesisCancelledError が送出される。"""
+    token = CancellationToken()
+    session = TerminableInferenceSession(_FakeSession(token))  # type: ignore[arg-type]
+    with pytest.raises(SynthesisCancelledError):
+        with TerminableInferenceSession.terminable(token):
+            session.run(None, {})
@@ -0,0 +1,143 @@
+"""推論キューのテスト"""
+
+import threading
+import time
+
+import pytest
+
+from voicevox_engine.tts_pipeline.cancellation import (
+    CancellationToken,
+    SynthesisCancelledError,
+)
+from voicevox_engine.tts_pipeline.inference_queue import (
+    InferencePriority,
+    InferenceQueue,
+    InferenceQueueFullError,
+)
+
+
+def test_enter_without_waiting() -> None:
+    """同時実行数に空きがある場合は待機せずに実行され、待機順は 0 になる。"""
+    queue = InferenceQueue(max_concurrency=1, max_queue_size=0)
+    with queue.enter() as ticket:
+        assert ticket.position == 0
+        assert ticket.wait_time == 0.0
+        assert ticket.to_headers()["X-Inference-Queue-Position"] == "0"
+    assert queue.running_count == 0
+
+
+def test_requests_wait_in_order() -> None:
+    """同時実行数の上限に達している間、後続のリクエストは到着順に待機して実行される。"""
+    queue = InferenceQueue(max_concurrency=1)
+    executed: list[tuple[int, int]] = []
+
+    def run(index: int) -> None:
+        with queue.enter() as ticket:
+            executed.append((index, ticket.position))
+
+    first_ticket = queue.acquire()
+    threads = []
+    for index in range(3):
+        thread = threading.Thread(target=run, args=(index,))
+        thread.start()
+        threads.append(thread)
+        # 到着順を確定させるため、待機列に並ぶまで待つ
+        while queue.waiting_count < index + 1:
+            time.sleep(0.001)
+    assert first_ticket.position == 0
+    assert executed == []
+
+    queue.release()
+    for thread in threads:
+        thread.join()
+    assert executed == [(0, 1), (1, 2), (2, 3)]
+
+
+def test_priority_and_client_round_robin() -> None:
+    """優先度クラスの高いリクエストから実行され、同じ優先度クラスの中ではクライアントごとに順番に実行される。"""
+    queue = InferenceQueue(max_concurrency=1)
+    executed: list[str] = []
+
+    def run(name: str, priority: InferencePriority, client_id: str) -> None:
+        with queue.enter(priority, client_id):
+            executed.append(name)
+
+    queue.acquire()
+    requests = [
+        ("batch-a1", InferencePriority.BATCH, "a"),
+        ("batch-a2", InferencePriority.BATCH, "a"),
+        ("batch-a3", InferencePriority.BATCH, "a"),
+        ("prefetch-c1", InferencePriority.PREFETCH, "c"),
+        ("batch-b1", InferencePriority.BATCH, "b"),
+        ("interactive-c1", InferencePriority.INTERACTIVE, "c"),
+    ]
+    threads = []
+    for index, request in enumerate(requests):
+        thread = threading.Thread(target=run, args=request)
+        thread.start()
+        threads.append(thread)
+        while queue.waiting_count < index + 1:
+            time.sleep(0.001)
+
+    queue.release()
+    for thread in threads:
+        thread.join()
+    assert executed == [
+        "interactive-c1",
+        "batch-a1",
+        "batch-b1",
+        "batch-a2",
+        "batch-a3",
+        "prefetch-c1",
+    ]
+
+
+def test_queue_full_raises_error() -> None:
+    """待機数が上限に達している場合、待機せずに Retry-After 付きのエラーになる。"""
+    queue = InferenceQueue(max_concurrency=1, max_queue_size=1)
+    queue.acquire()
+
+    def wait() -> None:
+        with queue.enter():
+            pass
+
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    while queue.waiting_count < 1:
+        time.sleep(0.001)
+
+    with pytest.raises(InferenceQueueFullError) as exc_info:
+        queue.acquire()
+    assert exc_info.value.retry_after >= 1
+
+    queue.release()
+    waiter.join()
+    assert queue.running_count == 0
+    assert queue.waiting_count == 0
+
+
+def test_cancelled_request_is_removed_from_queue() -> None:
+    """待機中にキャンセルされたリクエストは実行されずに待機列から取り除かれる。"""
+    queue = InferenceQueue(max_concurrency=1)
+    token = CancellationToken()
+    errors: list[BaseException] = []
+
+    def wait() -> None:
+        try:
+            with queue.enter(cancellation_token=token):
+                pass
+        except SynthesisCancelledError as ex:
+            errors.append(ex)
+
+    queue.acquire()
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    while queue.waiting_count < 1:
+        time.sleep(0.001)
+
+    token.cancel()
+    waiter.join()
+    assert len(errors) == 1
+    assert queue.waiting_count == 0
+    assert queue.running_count == 1
+    queue.release()
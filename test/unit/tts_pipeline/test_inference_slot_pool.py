@@ -0,0 +1,68 @@
+"""推論スロットプールのテスト"""
+
+import threading
+import time
+
+import pytest
+
+from voicevox_engine.tts_pipeline.inference_slot_pool import InferenceSlotPool
+
+
+def _run_concurrently(
+    pool: InferenceSlotPool, aivm_uuids: list[str], duration: float = 0.05
+) -> int:
+    """指定されたモデルの推論スロットを並行して確保し、同時に確保されていたスロット数の最大値を返す。"""
+    lock = threading.Lock()
+    active = 0
+    max_active = 0
+
+    def worker(aivm_uuid: str) -> None:
+        nonlocal active, max_active
+        with pool.acquire(aivm_uuid):
+            with lock:
+                active += 1
+                max_active = max(max_active, active)
+            time.sleep(duration)
+            with lock:
+                active -= 1
+
+    threads = [threading.Thread(target=worker, args=(u,)) for u in aivm_uuids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return max_active
+
+
+def test_single_slot_serializes_inference() -> None:
+    """推論スロットが 1 つのとき、推論処理は直列に実行される。"""
+    pool = InferenceSlotPool(num_slots=1)
+    assert _run_concurrently(pool, ["a", "b", "c"]) == 1
+
+
+def test_multiple_slots_run_in_parallel() -> None:
+    """推論スロットが複数あるとき、異なるモデル・同じモデルの推論処理が並列に実行される。"""
+    pool = InferenceSlotPool(num_slots=3)
+    assert _run_concurrently(pool, ["a", "b", "c", "d"]) == 3
+    assert _run_concurrently(pool, ["a", "a", "a"]) == 3
+
+
+def test_max_slots_per_model() -> None:
+    """同一モデルあたりの上限を超えて推論処理は並列実行されない。"""
+    pool = InferenceSlotPool(num_slots=4, max_slots_per_model=1)
+    assert _run_concurrently(pool, ["a", "a", "a"]) == 1
+    assert _run_concurrently(pool, ["a", "b", "c"]) == 3
+
+
+def test_intra_op_num_threads() -> None:
+    """推論スロットが 1 つのときは ONNX Runtime に任せ、複数のときは 1 以上のスレッド数を割り当てる。"""
+    assert InferenceSlotPool(num_slots=1).intra_op_num_threads == 0
+    assert InferenceSlotPool(num_slots=1024).intra_op_num_threads == 1
+
+
+def test_invalid_arguments() -> None:
+    """不正な推論スロット数を指定するとエラーになる。"""
+    with pytest.raises(ValueError):
+        InferenceSlotPool(num_slots=0)
+    with pytest.raises(ValueError):
+        InferenceSlotPool(num_slots=1, max_slots_per_model=0)
@@ -0,0 +1,97 @@
+"""音声合成モデルの常駐管理マネージャーのテスト"""
+
+import time
+
+import pytest
+
+from voicevox_engine.tts_pipeline.model_residency_manager import ModelResidencyManager
+
+
+class _FakeEngine:
+    """ロード・アンロードされたモデルを記録するだけのテスト用エンジン。"""
+
+    def __init__(self) -> None:
+        self.manager: ModelResidencyManager
+        self.loaded: list[str] = []
+        self.unloaded: list[str] = []
+
+    def load(self, aivm_uuid: str, size: int) -> None:
+        self.manager.reserve(aivm_uuid, size)
+        self.loaded.append(aivm_uuid)
+        self.manager.on_loaded(aivm_uuid, size)
+
+    def unload(self, aivm_uuid: str) -> None:
+        self.loaded.remove(aivm_uuid)
+        self.unloaded.append(aivm_uuid)
+        self.manager.on_unloaded(aivm_uuid)
+
+
+def _create_manager(
+    memory_budget: int | None = None,
+    idle_ttl: float | None = None,
+    pinned_aivm_uuids: list[str] | None = None,
+) -> tuple[ModelResidencyManager, _FakeEngine]:
+    engine = _FakeEngine()
+    engine.manager = ModelResidencyManager(
+        unload_model=engine.unload,
+        memory_budget=memory_budget,
+        idle_ttl=idle_ttl,
+        pinned_aivm_uuids=pinned_aivm_uuids,
+    )
+    return engine.manager, engine
+
+
+def test_unlimited_budget_never_unloads() -> None:
+    """メモリ使用量の上限が指定されていない場合、モデルはアンロードされない。"""
+    manager, engine = _create_manager()
+    for aivm_uuid in ["a", "b", "c"]:
+        engine.load(aivm_uuid, 100)
+    assert engine.unloaded == []
+    assert manager.total_size == 300
+
+
+def test_least_recently_used_model_is_unloaded() -> None:
+    """上限を超える場合、最も長く使われていないモデルからアンロードされる。"""
+    manager, engine = _create_manager(memory_budget=250)
+    engine.load("a", 100)
+    engine.load("b", 100)
+    # a を使うことで、b の方が長く使われていない状態になる
+    with manager.use("a"):
+        pass
+    engine.load("c", 100)
+    assert engine.unloaded == ["b"]
+    assert engine.loaded == ["a", "c"]
+    assert manager.total_size == 200
+
+
+def test_pinned_and_in_use_models_are_not_unloaded() -> None:
+    """固定されたモデルと推論中のモデルはアンロードされず、上限を超えてロードされる。"""
+    manager, engine = _create_manager(memory_budget=150, pinned_aivm_uuids=["a"])
+    engine.load("a", 100)
+    with manager.use("b"):
+        engine.load("b", 100)
+        engine.load("c", 100)
+    assert engine.unloaded == []
+    # 推論が終わった b はアンロードの対象になる
+    engine.load("d", 10)
+    assert "b" in engine.unloaded
+    assert "a" in engine.loaded
+
+
+def test_idle_models_are_unloaded() -> None:
+    """idle_ttl 秒以上使われていないモデルがアンロードされる。"""
+    manager, engine = _create_manager(idle_ttl=0.05, pinned_aivm_uuids=["b"])
+    engine.load("a", 100)
+    engine.load("b", 100)
+    assert manager.unload_idle_models() == []
+    time.sleep(0.1)
+    assert manager.unload_idle_models() == ["a"]
+    assert engine.loaded == ["b"]
+
+
+def test_invalid_arguments() -> None:
+    """不正なメモリ使用量の上限・アンロードまでの時間を指定するとエラーになる。"""
+    with pytest.raises(ValueError):
+        ModelResidencyManager(unload_model=lambda _: None, memory_budget=0)
+    with pytest.raises(ValueError):
+        ModelResidencyManager(unload_model=lambda _: None, idle_ttl=0)
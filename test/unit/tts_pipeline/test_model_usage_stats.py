@@ -0,0 +1,54 @@
+"""音声合成モデルの利用統計のテスト"""
+
+import time
+from pathlib import Path
+
+from voicevox_engine.tts_pipeline.model_usage_stats import ModelUsageStats
+
+
+def test_rank_models(tmp_path: Path) -> None:
+    """よく使われる・最近使われた・現在の時間帯によく使われるモデルほど優先され、使われたことのないモデルは含まれない。"""
+    stats = ModelUsageStats(tmp_path / "stats.json")
+    now = time.time()
+    day = 24 * 60 * 60
+    for _ in range(10):
+        stats.record_request("frequent", now - day)
+    stats.record_request("rare", now - day)
+    # 2 週間前によく使われていたモデルより、昨日よく使われていたモデルが優先される
+    for _ in range(10):
+        stats.record_request("stale", now - 14 * day)
+    # 同じ回数・同じ日に使われていても、現在の時間帯に使われていたモデルが優先される
+    for _ in range(5):
+        stats.record_request("same_hour", now - day)
+        stats.record_request("other_hour", now - day - 12 * 60 * 60)
+
+    assert stats.rank_models(
+        ["rare", "unused", "other_hour", "stale", "same_hour", "frequent"], now
+    ) == ["frequent", "same_hour", "stale", "other_hour", "rare"]
+
+
+def test_persist_stats_and_resident_models(tmp_path: Path) -> None:
+    """利用統計とロード済みのモデルはファイルに保存され、次回起動時に読み込まれる。"""
+    stats_file_path = tmp_path / "stats.json"
+    stats = ModelUsageStats(stats_file_path)
+    now = time.time()
+    stats.record_request("a", now)
+    stats.on_loaded("a")
+    stats.on_loaded("b")
+    stats.on_loaded("c")
+    stats.on_unloaded("b")
+    stats.save()
+
+    restored_stats = ModelUsageStats(stats_file_path)
+    assert restored_stats.previous_resident_aivm_uuids == ["a", "c"]
+    assert restored_stats.get_score("a", now) == stats.get_score("a", now) > 0
+    assert restored_stats.get_score("b", now) == 0
+
+
+def test_broken_stats_file_is_ignored(tmp_path: Path) -> None:
+    """壊れた利用統計ファイルは無視され、空の利用統計から開始する。"""
+    stats_file_path = tmp_path / "stats.json"
+    stats_file_path.write_text("{broken", encoding="utf-8")
+    stats = ModelUsageStats(stats_file_path)
+    assert stats.previous_resident_aivm_uuids == []
+    assert stats.rank_models(["a"]) == []
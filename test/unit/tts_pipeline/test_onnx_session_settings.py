@@ -0,0 +1,115 @@
+"""ONNX 推論セッションの設定のテスト"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import onnxruntime
+import pytest
+
+from voicevox_engine.tts_pipeline.onnx_session_settings import OnnxSessionSettings
+
+
+@pytest.fixture()
+def model_path(tmp_path: Path) -> Path:
+    """入力を 2 倍して返すだけの ONNX モデルを作成する。"""
+    onnx = pytest.importorskip("onnx")
+    x = onnx.helper.make_tensor_value_info("x", onnx.TensorProto.FLOAT, [None])
+    y = onnx.helper.make_tensor_value_info("y", onnx.TensorProto.FLOAT, [None])
+    graph = onnx.helper.make_graph(
+        [onnx.helper.make_node("Add", ["x", "x"], ["y"])], "double", [x], [y]
+    )
+    model = onnx.helper.make_model(
+        graph, opset_imports=[onnx.helper.make_opsetid("", 13)]
+    )
+    model.ir_version = 8
+    path = tmp_path / "model.onnx"
+    onnx.save(model, str(path))
+    return path
+
+
+def test_apply() -> None:
+    """指定された項目のみが SessionOptions に反映される。"""
+    sess_options = onnxruntime.SessionOptions()
+    sess_options.inter_op_num_threads = 3
+    OnnxSessionSettings(
+        intra_op_num_threads=2,
+        execution_mode="parallel",
+        graph_optimization_level="basic",
+        enable_mem_pattern=False,
+    ).apply(sess_options)
+    assert sess_options.intra_op_num_threads == 2
+    assert sess_options.inter_op_num_threads == 3
+    assert sess_options.execution_mode == onnxruntime.ExecutionMode.ORT_PARALLEL
+    assert sess_options.graph_optimization_level == onnxruntime.GraphOptimizationLevel.ORT_ENABLE_BASIC  # fmt: skip
+    assert sess_options.enable_mem_pattern is False
+
+
+def test_optimized_model_cache(model_path: Path, tmp_path: Path) -> None:
+    """初回のロード時に最適化済みモデルがキャッシュされ、2 回目以降はキャッシュからロードされる。"""
+    cache_dir = tmp_path / "cache"
+    settings = OnnxSessionSettings(optimized_model_cache_dir=cache_dir)
+    x = np.array([1.0, 2.0], dtype=np.float32)
+
+    session = settings.create_session(
+        model_path, onnxruntime.SessionOptions(), ["CPUExecutionProvider"]
+    )
+    cache_files = list(cache_dir.glob("model-*.onnx"))
+    assert len(cache_files) == 1
+    assert np.allclose(session.run(None, {"x": x})[0], x * 2)
+
+    # 2 回目はキャッシュされた最適化済みモデルを、グラフ最適化なしでロードする
+    sess_options = onnxruntime.SessionOptions()
+    session = settings.create_session(
+        model_path, sess_options, ["CPUExecutionProvider"]
+    )
+    assert sess_options.graph_optimization_level == onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL  # fmt: skip
+    assert np.allclose(session.run(None, {"x": x})[0], x * 2)
+    assert list(cache_dir.glob("model-*.onnx")) == cache_files
+
+
+def test_optimized_model_cache_invalidation(model_path: Path, tmp_path: Path) -> None:
+    """
+    推論環境ごとのキャッシュは共存し、モデルファイルが変更された場合は変更前の内容に対するキャッシュのみが置き換えられる。
+    """
+    cache_dir = tmp_path / "cache"
+    basic_settings = OnnxSessionSettings(
+        graph_optimization_level="basic", optimized_model_cache_dir=cache_dir
+    )
+    all_settings = OnnxSessionSettings(
+        graph_optimization_level="all", optimized_model_cache_dir=cache_dir
+    )
+
+    def create_sessions() -> set[Path]:
+        for settings in (basic_settings, all_settings):
+            settings.create_session(
+                model_path, onnxruntime.SessionOptions(), ["CPUExecutionProvider"]
+            )
+        return set(cache_dir.glob("model-*.onnx"))
+
+    # グラフ最適化レベルが異なる設定のキャッシュは、互いに削除せずに共存する
+    cache_files = create_sessions()
+    assert len(cache_files) == 2
+    assert create_sessions() == cache_files
+
+    # モデルファイルが変更されると、変更前の内容に対するキャッシュが新しいキャッシュに置き換えられる
+    stat = model_path.stat()
+    os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    new_cache_files = create_sessions()
+    assert len(new_cache_files) == 2
+    assert new_cache_files.isdisjoint(cache_files)
+
+
+def test_apply_to_new_sessions(model_path: Path) -> None:
+    """ブロック内で作成された推論セッションにのみ設定が反映される。"""
+    settings = OnnxSessionSettings(intra_op_num_threads=1, enable_mem_pattern=False)
+    with settings.apply_to_new_sessions():
+        session = onnxruntime.InferenceSession(
+            str(model_path), providers=["CPUExecutionProvider"]
+        )
+    assert session.get_session_options().enable_mem_pattern is False
+
+    session = onnxruntime.InferenceSession(
+        str(model_path), providers=["CPUExecutionProvider"]
+    )
+    assert session.get_session_options().enable_mem_pattern is True
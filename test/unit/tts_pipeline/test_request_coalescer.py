@@ -0,0 +1,68 @@
+"""リクエストコアレッサーのテスト"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from voicevox_engine.tts_pipeline.request_coalescer import RequestCoalescer
+
+
+def test_single_request_runs_immediately() -> None:
+    """同じキーの処理が実行中でなければ、待機せずにすぐに処理される。"""
+    coalescer: RequestCoalescer[str, int] = RequestCoalescer()
+    assert coalescer.run("a", lambda: 42) == 42
+    # 処理の完了後は結果を保持しないため、同じキーでも再度処理される
+    assert coalescer.run("a", lambda: 43) == 43
+
+
+def test_concurrent_requests_are_coalesced_by_key() -> None:
+    """同じキーの処理が実行中の間に届いたリクエストは、実行中の処理の結果を受け取る。"""
+    coalescer: RequestCoalescer[str, str] = RequestCoalescer()
+    started = threading.Event()
+    release = threading.Event()
+    call_count = 0
+
+    def function() -> str:
+        nonlocal call_count
+        call_count += 1
+        started.set()
+        release.wait()
+        return "result-a"
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        leader = executor.submit(coalescer.run, "a", function)
+        started.wait()
+        follower = executor.submit(coalescer.run, "a", function)
+        # 異なるキーのリクエストは、実行中の処理の完了を待たずに処理される
+        other = executor.submit(coalescer.run, "b", lambda: "result-b")
+        assert other.result() == "result-b"
+        # 後続のリクエストが実行中の処理の完了を待ち始めるまで待機する
+        time.sleep(0.1)
+        release.set()
+        assert leader.result() == "result-a"
+        assert follower.result() == "result-a"
+
+    assert call_count == 1
+
+
+def test_exception_is_propagated_to_all_requests() -> None:
+    """処理中に発生した例外は、同じキーで待機中のすべてのリクエストに伝播する。"""
+    coalescer: RequestCoalescer[str, int] = RequestCoalescer()
+    started = threading.Event()
+    release = threading.Event()
+
+    def function() -> int:
+        started.set()
+        release.wait()
+        raise RuntimeError("inference failed")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(coalescer.run, "a", function)
+        started.wait()
+        follower = executor.submit(coalescer.run, "a", function)
+        release.set()
+        for future in (leader, follower):
+            with pytest.raises(RuntimeError):
+                future.result()
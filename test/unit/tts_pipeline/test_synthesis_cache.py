@@ -0,0 +1,113 @@
+"""合成音声キャッシュのテスト"""
+
+from pathlib import Path
+
+import numpy as np
+
+from voicevox_engine.metas.Metas import StyleId
+from voicevox_engine.model import AudioQuery
+from voicevox_engine.tts_pipeline.model import AccentPhrase, Mora
+from voicevox_engine.tts_pipeline.synthesis_cache import SynthesisCache
+
+
+def _gen_query(speed_scale: float = 1.0, pitch: float = 5.0) -> AudioQuery:
+    return AudioQuery(
+        accent_phrases=[
+            AccentPhrase(
+                moras=[
+                    Mora(
+                        text="ア",
+                        consonant=None,
+                        consonant_length=None,
+                        vowel="a",
+                        vowel_length=0.1,
+                        pitch=pitch,
+                    )
+                ],
+                accent=1,
+            )
+        ],
+        speedScale=speed_scale,
+        pitchScale=0.0,
+        intonationScale=1.0,
+        volumeScale=1.0,
+        prePhonemeLength=0.1,
+        postPhonemeLength=0.1,
+        outputSamplingRate=44100,
+        outputStereo=False,
+        kana="あ",
+    )
+
+
+def _make_key(query: AudioQuery, aivm_version: str = "1.0.0") -> str:
+    return SynthesisCache.make_key(
+        query,
+        StyleId(1),
+        aivm_uuid="model",
+        aivm_version=aivm_version,
+        dictionary_version="",
+    )
+
+
+def test_make_key() -> None:
+    """音声合成結果に影響する値が変わるとキーが変わり、影響しない値 (モーラ音高) が変わってもキーは変わらない。"""
+    key = _make_key(_gen_query())
+    assert key == _make_key(_gen_query())
+    assert key == _make_key(_gen_query(pitch=6.0))
+    assert key != _make_key(_gen_query(speed_scale=1.5))
+    assert key != _make_key(_gen_query(), aivm_version="1.0.1")
+
+
+def test_memory_and_disk_tiers(tmp_path: Path) -> None:
+    """メモリ上から溢れた音声波形もディスク上のキャッシュから取得でき、統計情報が記録される。"""
+    wave = np.linspace(-1.0, 1.0, 100, dtype=np.float32)
+    # メモリ上には音声波形 1 つ分しか保持できない
+    cache = SynthesisCache(memory_max_size=wave.nbytes, disk_max_size=10 * 1024 * 1024, cache_dir=tmp_path)  # fmt: skip
+    cache.put("model", "a", wave)
+    cache.put("model", "b", wave * 0.5)
+
+    a = cache.get("model", "a")
+    assert a is not None
+    assert np.array_equal(a, wave)
+    assert cache.get("model", "missing") is None
+    statistics = cache.get_statistics()
+    assert statistics["disk_hits"] == 1
+    assert statistics["misses"] == 1
+
+    # 再起動後もディスク上のキャッシュを参照できる
+    restarted_cache = SynthesisCache(memory_max_size=0, disk_max_size=10 * 1024 * 1024, cache_dir=tmp_path)  # fmt: skip
+    b = restarted_cache.get("model", "b")
+    assert b is not None
+    assert np.array_equal(b, wave * 0.5)
+
+
+def test_disk_max_size(tmp_path: Path) -> None:
+    """ディスク上のキャッシュが容量上限を超えると、最も長く参照されていないファイルから削除される。"""
+    wave = np.zeros(1000, dtype=np.float32)
+    cache = SynthesisCache(memory_max_size=0, disk_max_size=wave.nbytes * 2 + 500, cache_dir=tmp_path)  # fmt: skip
+    for key in ["a", "b", "c"]:
+        cache.put("model", key, wave)
+    assert cache.get("model", "a") is None
+    assert cache.get("model", "c") is not None
+    assert cache.get_statistics()["disk_entries"] == 2
+
+
+def test_invalidate_model(tmp_path: Path) -> None:
+    """音声合成モデルのキャッシュを削除すると、そのモデルのキャッシュのみ参照できなくなる。"""
+    wave = np.zeros(10, dtype=np.float32)
+    cache = SynthesisCache(memory_max_size=1024 * 1024, disk_max_size=1024 * 1024, cache_dir=tmp_path)  # fmt: skip
+    cache.put("x", "a", wave)
+    cache.put("y", "a", wave)
+    cache.invalidate_model("x")
+    assert cache.get("x", "a") is None
+    assert cache.get("y", "a") is not None
+    assert not (tmp_path / "x").exists()
+
+
+def test_get_without_recording_miss() -> None:
+    """record_miss=False で取得した場合、キャッシュされていなくてもミスとして記録されない。"""
+    cache = SynthesisCache(memory_max_size=1024 * 1024, disk_max_size=0)
+    assert cache.get("model", "missing", record_miss=False) is None
+    assert cache.get_statistics()["misses"] == 0
+    assert cache.get("model", "missing") is None
+    assert cache.get_statistics()["misses"] == 1
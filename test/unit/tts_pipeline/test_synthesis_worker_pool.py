@@ -0,0 +1,178 @@
+"""音声合成ワーカープールのテスト"""
+
+import os
+import signal
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+import pytest
+from fastapi import HTTPException
+
+from voicevox_engine.tts_pipeline.cancellation import (
+    CancellationToken,
+    SynthesisCancelledError,
+)
+from voicevox_engine.tts_pipeline.synthesis_worker_pool import (
+    SynthesisWorkerError,
+    SynthesisWorkerPool,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="fork() is not available on Windows"
+)
+
+_state: dict[str, str] = {}
+
+
+def _get_pid() -> int:
+    return os.getpid()
+
+
+def _echo(value: str) -> str:
+    return value + _state.get("suffix", "")
+
+
+def _set_suffix(suffix: str) -> None:
+    _state["suffix"] = suffix
+
+
+def _raise_http_error() -> None:
+    raise HTTPException(status_code=422, detail="invalid")
+
+
+def _raise_error() -> None:
+    raise ValueError("broken")
+
+
+def _sleep(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+@pytest.fixture()
+def pool() -> Iterator[SynthesisWorkerPool]:
+    """テスト用の関数を登録したワーカープールを起動し、テスト後に終了する。"""
+    pool = SynthesisWorkerPool(
+        {
+            "get_pid": _get_pid,
+            "echo": _echo,
+            "set_suffix": _set_suffix,
+            "raise_http_error": _raise_http_error,
+            "raise_error": _raise_error,
+            "sleep": _sleep,
+        },
+        num_workers=1,
+    )
+    yield pool
+    pool.shutdown()
+
+
+def test_call_runs_in_worker_process(pool: SynthesisWorkerPool) -> None:
+    """関数は親プロセスとは別のワーカープロセスで実行され、戻り値が返される。"""
+    assert pool.call("get_pid") != os.getpid()
+    assert pool.call("echo", "テスト") == "テスト"
+
+
+def test_broadcast_is_applied_to_workers(pool: SynthesisWorkerPool) -> None:
+    """ブロードキャストした関数呼び出しは、次のジョブの前にワーカープロセスに適用される。"""
+    pool.broadcast("suffix", "set_suffix", "!")
+    pool.broadcast("suffix", "set_suffix", "?")
+    assert pool.call("echo", "テスト") == "テスト?"
+
+
+def test_errors_are_propagated(pool: SynthesisWorkerPool) -> None:
+    """ワーカープロセスで送出された例外は親プロセスで再送出される。"""
+    with pytest.raises(HTTPException) as exc_info:
+        pool.call("raise_http_error")
+    assert exc_info.value.status_code == 422
+    with pytest.raises(SynthesisWorkerError, match="broken"):
+        pool.call("raise_error")
+    # エラーの後もワーカープロセスは引き続き利用できる
+    assert pool.call("echo", "テスト") == "テスト"
+
+
+def test_dead_worker_is_replaced(pool: SynthesisWorkerPool) -> None:
+    """異常終了したワーカープロセスは、ブロードキャストを適用した新しいワーカープロセスに置き換えられる。"""
+    pool.broadcast("suffix", "set_suffix", "!")
+    pid = pool.call("get_pid")
+    os.kill(pid, signal.SIGKILL)
+
+    with pytest.raises(SynthesisWorkerError):
+        pool.call("echo", "テスト")
+    assert pool.call("get_pid") != pid
+    assert pool.call("echo", "テスト") == "テスト!"
+
+
+def test_cancel_kills_worker(pool: SynthesisWorkerPool) -> None:
+    """処理中にキャンセルされた場合、ワーカープロセスは強制終了され、新しいワーカープロセスに置き換えられる。"""
+    pid = pool.call("get_pid")
+    token = CancellationToken()
+
+    def cancel_later() -> None:
+        time.sleep(0.2)
+        token.cancel()
+
+    thread = threading.Thread(target=cancel_later)
+    thread.start()
+    start_time = time.monotonic()
+    with pytest.raises(SynthesisCancelledError):
+        pool.call("sleep", 30.0, cancellation_token=token)
+    assert time.monotonic() - start_time < 10.0
+    thread.join()
+    assert pool.call("get_pid") != pid
+
+
+class _LateCallbackToken(CancellationToken):
+    """register() のブロックを抜けた直後にキャンセルされ、コールバックが遅れて呼び出される状況を再現するトークン。"""
+
+    @contextmanager
+    def register(self, callback: Callable[[], None]) -> Iterator[None]:
+        with super().register(callback):
+            yield
+        self.cancel()
+        callback()
+
+
+def test_late_cancel_callback_does_not_break_next_job(
+    pool: SynthesisWorkerPool,
+) -> None:
+    """ジョブの完了直後に遅れて呼び出されたキャンセル時のコールバックで、次のジョブが失敗しない。"""
+    pid = pool.call("get_pid")
+
+    assert (
+        pool.call("echo", "テスト", cancellation_token=_LateCallbackToken()) == "テスト"
+    )
+    # 強制終了された可能性のあるワーカープロセスは、待機中に戻されずに置き換えられている
+    assert pool.call("get_pid") != pid
+    assert pool.call("echo", "テスト") == "テスト"
+
+
+def test_hung_worker_is_replaced() -> None:
+    """job_timeout を過ぎても応答しないワーカープロセスは、強制終了されて新しいワーカープロセスに置き換えられる。"""
+    pool = SynthesisWorkerPool(
+        {"get_pid": _get_pid, "sleep": _sleep}, num_workers=1, job_timeout=0.5
+    )
+    try:
+        pid = pool.call("get_pid")
+        start_time = time.monotonic()
+        with pytest.raises(SynthesisWorkerError, match="did not respond"):
+            pool.call("sleep", 30.0)
+        assert time.monotonic() - start_time < 10.0
+        assert pool.call("get_pid") != pid
+    finally:
+        pool.shutdown()
+
+
+def test_refuses_to_start_with_running_threads() -> None:
+    """他のスレッドが動作している状態では、zygote を fork() せずに RuntimeError を送出する。"""
+    release = threading.Event()
+    thread = threading.Thread(target=release.wait, name="BlockingThread")
+    thread.start()
+    try:
+        with pytest.raises(RuntimeError, match="BlockingThread"):
+            SynthesisWorkerPool({"get_pid": _get_pid}, num_workers=1)
+    finally:
+        release.set()
+        thread.join()
@@ -22,9 +22,11 @@ from voicevox_engine.tts_pipeline.song_engine import (
     SongEngine,
 )
 from voicevox_engine.tts_pipeline.tts_engine import (
+    SENTENCE_PAUSE_LENGTH,
     TTSEngine,
     _apply_interrogative_upspeak,
     _to_flatten_phonemes,
+    split_audio_query_into_sentences,
     to_flatten_moras,
 )
 
@@ -664,3 +666,62 @@ def test_upspeak_voiced_u_last_mora() -> None:
     outputs = _apply_interrogative_upspeak(inputs, False)
     # Test
     _assert_equeal_accent_phrases(expected, outputs)
+
+
+def _gen_sentence_split_query(kana: str | None) -> AudioQuery:
+    """「こんにちは.元気...うん?」に相当する、記号モーラを含むアクセント句を持つクエリを生成する。"""
+
+    def symbol(text: str) -> Mora:
+        return gen_mora(text, None, None, "pau", 0.0, 0.0)
+
+    def gen_accent_phrase(texts: list[str], symbols: list[str]) -> AccentPhrase:
+        moras = [gen_mora(text, None, None, "a", 0.1, 5.0) for text in texts]
+        return AccentPhrase(moras=moras + [symbol(s) for s in symbols], accent=1)
+
+    return AudioQuery(
+        accent_phrases=[
+            gen_accent_phrase(["コ", "ン", "ニ", "チ", "ワ"], ["."]),
+            gen_accent_phrase(["ゲ", "ン", "キ"], [".", ".", "."]),
+            gen_accent_phrase(["ウ", "ン"], ["?"]),
+        ],
+        speedScale=1.0,
+        pitchScale=0.0,
+        intonationScale=1.0,
+        volumeScale=1.0,
+        prePhonemeLength=0.1,
+        postPhonemeLength=0.2,
+        outputSamplingRate=44100,
+        outputStereo=False,
+        kana=kana,
+    )
+
+
+def test_split_audio_query_into_sentences() -> None:
+    """クエリが文末記号で 1 文ずつに分割され (三点リーダーでは分割されない) 、前後の無音時間が文の位置に応じて設定される。"""
+    # Inputs
+    query = _gen_sentence_split_query(kana="こんにちは。元気…うん？")
+    # Outputs
+    sentence_queries = split_audio_query_into_sentences(query)
+    # Tests
+    assert [q.kana for q in sentence_queries] == ["こんにちは。", "元気…うん？"]
+    assert [len(q.accent_phrases) for q in sentence_queries] == [1, 2]
+    assert [q.prePhonemeLength for q in sentence_queries] == [0.1, 0.0]
+    assert [q.postPhonemeLength for q in sentence_queries] == [
+        SENTENCE_PAUSE_LENGTH,
+        0.2,
+    ]
+    # 元のクエリは変更されない
+    assert len(query.accent_phrases) == 3
+
+
+def test_split_audio_query_into_sentences_without_kana() -> None:
+    """読み上げテキストが指定されていなくても、アクセント句のみで分割される。"""
+    sentence_queries = split_audio_query_into_sentences(_gen_sentence_split_query(kana=None))  # fmt: skip
+    assert len(sentence_queries) == 2
+    assert all(q.kana is None for q in sentence_queries)
+
+
+def test_split_audio_query_into_sentences_mismatch() -> None:
+    """読み上げテキストとアクセント句の文の数が一致しない場合は分割しない。"""
+    query = _gen_sentence_split_query(kana="こんにちは、元気…うん？")
+    assert split_audio_query_into_sentences(query) == [query]
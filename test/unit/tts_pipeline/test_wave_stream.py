@@ -0,0 +1,27 @@
+"""音声波形のストリーミング配信用ユーティリティのテスト"""
+
+import io
+
+import numpy as np
+import soundfile
+
+from voicevox_engine.tts_pipeline.wave_stream import (
+    generate_streaming_wav_header,
+    wave_to_pcm16_bytes,
+)
+
+
+def test_streaming_wav_is_readable() -> None:
+    """ストリーミング配信向けの WAV ヘッダーと PCM データを連結したものが WAV として読み込める。"""
+    # Inputs
+    wave = np.array([[0.0, 0.5], [-0.5, 1.0], [2.0, -2.0]], dtype=np.float32)
+    # Outputs
+    data = generate_streaming_wav_header(
+        sampling_rate=24000, num_channels=2
+    ) + wave_to_pcm16_bytes(wave)
+    # Tests
+    assert len(generate_streaming_wav_header(24000, 2)) == 44
+    decoded, sampling_rate = soundfile.read(io.BytesIO(data), dtype="int16")
+    assert sampling_rate == 24000
+    # -1.0 ~ 1.0 の範囲外の値はクリップされる
+    assert decoded.tolist() == [[0, 16383], [-16383, 32767], [32767, -32767]]
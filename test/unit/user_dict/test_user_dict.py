@@ -8,6 +8,7 @@ from pathlib import Path
 import pytest
 from pyopenjtalk import g2p, unset_user_dict
 
+from voicevox_engine.user_dict import user_dict_manager
 from voicevox_engine.user_dict.constants import (
     PART_OF_SPEECH_DATA,
     USER_DICT_MAX_PRIORITY,
@@ -15,7 +16,11 @@ from voicevox_engine.user_dict.constants import (
     WordTypes,
 )
 from voicevox_engine.user_dict.model import UserDictInputError, UserDictWord
-from voicevox_engine.user_dict.user_dict_manager import UserDictionary
+from voicevox_engine.user_dict.user_dict_manager import (
+    UserDictionary,
+    add_dictionary_applied_listener,
+    get_applied_dictionary_generation,
+)
 
 # jsonとして保存される正しい形式の辞書データ
 valid_dict_dict_json = {
@@ -335,3 +340,45 @@ if sys.platform != "win32":
         user_dict.apply_jtalk_dictionary()
 
         assert g2p(text=test_text, kana=True) == success_pronunciation
+
+    def test_apply_dict_increments_generation(tmp_path: Path) -> None:
+        """ユーザー辞書を適用するたびに、適用済みユーザー辞書の世代番号がインクリメントされる。"""
+        user_dict = UserDictionary(user_dict_path=tmp_path / "test_generation.json")
+        user_dict.apply_jtalk_dictionary()
+        generation = get_applied_dictionary_generation()
+
+        user_dict.add_word(
+            WordProperty(
+                surface=["テスト用の単語"],
+                pronunciation=["テストヨーノタンゴ"],
+                accent_type=[1],
+                word_type=WordTypes.PROPER_NOUN,
+                priority=5,
+            )
+        )
+        assert get_applied_dictionary_generation() == generation + 1
+
+    def test_apply_dict_notifies_listeners(
+        tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """ユーザー辞書を適用すると、適用した辞書ファイルのパスのリストがリスナーに渡される。"""
+        monkeypatch.setattr(user_dict_manager, "_dictionary_applied_listeners", [])
+        applied_dict_files: list[list[Path]] = []
+        add_dictionary_applied_listener(
+            # 一時ファイルはリスナーの終了後に削除されるため、呼び出し時点で存在することを確認する
+            lambda dict_files: applied_dict_files.append(
+                [dict_file for dict_file in dict_files if dict_file.is_file()]
+            )
+        )
+        user_dict = UserDictionary(user_dict_path=tmp_path / "test_listener.json")
+        user_dict.add_word(
+            WordProperty(
+                surface=["テスト用の単語"],
+                pronunciation=["テストヨーノタンゴ"],
+                accent_type=[1],
+                word_type=WordTypes.PROPER_NOUN,
+                priority=5,
+            )
+        )
+        assert len(applied_dict_files) == 1
+        assert applied_dict_files[0][-1].name.startswith("user.dict_compiled-")
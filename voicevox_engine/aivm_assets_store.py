@@ -0,0 +1,255 @@
+"""音声合成モデルのアイコン画像・ボイスサンプルをディスク上に保存し、必要になった時点で読み込むアセットストア"""
+
+import hashlib
+from collections.abc import Callable
+from pathlib import Path
+from typing import Final
+from uuid import uuid4
+
+from voicevox_engine.logging import logger
+from voicevox_engine.metas.Metas import SpeakerInfo
+from voicevox_engine.model import AivmInfo
+from voicevox_engine.utility.lru_cache_utility import LRUCache
+
+__all__ = ["AivmAssetsStore", "AivmAssetsStoreError"]
+
+
+class AivmAssetsStoreError(Exception):
+    """アセットストアから参照先のアセットを読み込めなかった。"""
+
+    pass
+
+
+class AivmAssetsStore:
+    """
+    音声合成モデルのアイコン画像・ボイスサンプルの Base64 文字列を、その SHA-256 ハッシュ値をファイル名とする
+    コンテンツアドレス方式でディスク上に保存し、必要になった時点で読み込むアセットストア。
+
+    store_assets() で AivmInfo 内のアイコン画像・ボイスサンプルを「参照」に置き換えた軽量な AivmInfo を作成し、
+    load_assets() / load_speaker_info_assets() で API のレスポンスとして返す直前に元の値に戻す。
+    参照は元の値の Base64 部分のみをハッシュ値に置き換えた文字列で、Data URL の場合は "data:image/png;base64," などの
+    プレフィックスをそのまま残すため、AIVM マニフェストのバリデーションも通る。
+    同じ画像が話者アイコン (Data URL) と StyleInfo のアイコン (Base64 文字列) の両方に含まれていても、実体は 1 つだけ保存される。
+    """
+
+    # 直近に読み込んだアセットをメモリ上に保持する容量の上限 (バイト単位)
+    MEMORY_CACHE_MAX_SIZE: Final[int] = 32 * 1024 * 1024
+
+    def __init__(self, store_dir: Path) -> None:
+        """
+        AivmAssetsStore のコンストラクタ
+
+        Parameters
+        ----------
+        store_dir : Path
+            アセットの保存先ディレクトリ
+        """
+
+        self.store_dir = store_dir
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self._memory_cache: LRUCache[str, str] = LRUCache(
+            max_size=self.MEMORY_CACHE_MAX_SIZE,
+            get_size=len,
+        )
+
+    def store_assets(self, aivm_info: AivmInfo) -> AivmInfo:
+        """
+        AivmInfo 内のアイコン画像・ボイスサンプルをアセットストアに保存し、それらを参照に置き換えた AivmInfo を返す。
+
+        Parameters
+        ----------
+        aivm_info : AivmInfo
+            アイコン画像・ボイスサンプルを含む音声合成モデルの情報
+
+        Returns
+        -------
+        AivmInfo
+            アイコン画像・ボイスサンプルを参照に置き換えた音声合成モデルの情報 (引数の AivmInfo は変更されない)
+        """
+
+        return _map_aivm_info_assets(aivm_info, self._put)
+
+    def load_assets(self, aivm_info: AivmInfo) -> AivmInfo:
+        """
+        store_assets() で参照に置き換えたアイコン画像・ボイスサンプルを、アセットストアから読み込んで元に戻した AivmInfo を返す。
+
+        Parameters
+        ----------
+        aivm_info : AivmInfo
+            アイコン画像・ボイスサンプルを参照に置き換えた音声合成モデルの情報
+
+        Returns
+        -------
+        AivmInfo
+            アイコン画像・ボイスサンプルを含む音声合成モデルの情報 (引数の AivmInfo は変更されない)
+
+        Raises
+        ------
+        AivmAssetsStoreError
+            参照先のアセットが保存されていない場合
+        """
+
+        return _map_aivm_info_assets(aivm_info, self._get)
+
+    def load_speaker_info_assets(self, speaker_info: SpeakerInfo) -> SpeakerInfo:
+        """
+        store_assets() で参照に置き換えた SpeakerInfo 内のアイコン画像・ボイスサンプルを、
+        アセットストアから読み込んで元に戻した SpeakerInfo を返す。
+
+        Parameters
+        ----------
+        speaker_info : SpeakerInfo
+            アイコン画像・ボイスサンプルを参照に置き換えた話者の追加情報
+
+        Returns
+        -------
+        SpeakerInfo
+            アイコン画像・ボイスサンプルを含む話者の追加情報 (引数の SpeakerInfo は変更されない)
+
+        Raises
+        ------
+        AivmAssetsStoreError
+            参照先のアセットが保存されていない場合
+        """
+
+        speaker_info = speaker_info.model_copy(deep=True)
+        _map_speaker_info_assets(speaker_info, self._get)
+        return speaker_info
+
+    def has_assets(self, aivm_info: AivmInfo) -> bool:
+        """
+        AivmInfo 内で参照しているすべてのアセットが、アセットストアに保存されているかどうかを返す。
+
+        Parameters
+        ----------
+        aivm_info : AivmInfo
+            アイコン画像・ボイスサンプルを参照に置き換えた音声合成モデルの情報
+
+        Returns
+        -------
+        bool
+            すべてのアセットが保存されているかどうか
+        """
+
+        return all(
+            self._get_asset_path(digest).is_file()
+            for digest in self.get_referenced_digests(aivm_info)
+        )
+
+    def prune(self, aivm_infos: list[AivmInfo]) -> None:
+        """
+        指定された AivmInfo のいずれからも参照されていないアセットを削除する。
+
+        Parameters
+        ----------
+        aivm_infos : list[AivmInfo]
+            アイコン画像・ボイスサンプルを参照に置き換えた、すべてのインストール済み音声合成モデルの情報
+        """
+
+        referenced_digests: set[str] = set()
+        for aivm_info in aivm_infos:
+            referenced_digests |= self.get_referenced_digests(aivm_info)
+
+        removed_count = 0
+        for asset_path in self.store_dir.glob("*.b64"):
+            if asset_path.stem in referenced_digests:
+                continue
+            asset_path.unlink(missing_ok=True)
+            self._memory_cache.pop(asset_path.stem)
+            removed_count += 1
+        if removed_count > 0:
+            logger.info(f"Removed {removed_count} unused model assets.")
+
+    @staticmethod
+    def get_referenced_digests(aivm_info: AivmInfo) -> set[str]:
+        """
+        AivmInfo 内で参照しているアセットのハッシュ値を取得する。
+
+        Parameters
+        ----------
+        aivm_info : AivmInfo
+            アイコン画像・ボイスサンプルを参照に置き換えた音声合成モデルの情報
+
+        Returns
+        -------
+        set[str]
+            参照しているアセットのハッシュ値
+        """
+
+        digests: set[str] = set()
+
+        def collect(payload: str) -> str:
+            digests.add(payload)
+            return payload
+
+        _map_aivm_info_assets(aivm_info, collect)
+        return digests
+
+    def _put(self, payload: str) -> str:
+        """Base64 文字列をアセットストアに保存し、そのハッシュ値を返す。"""
+
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        asset_path = self._get_asset_path(digest)
+        if not asset_path.exists():
+            # 一時ファイルに書き込んでから名前変更することで、
+            # 書き込み中にクラッシュしたり、複数のスレッドから同時に書き込まれたりしても壊れたファイルが残らないようにする
+            temp_path = asset_path.with_suffix(f".{uuid4().hex}.tmp")
+            temp_path.write_text(payload, encoding="utf-8")
+            temp_path.replace(asset_path)
+        return digest
+
+    def _get(self, digest: str) -> str:
+        """ハッシュ値に対応する Base64 文字列をアセットストアから読み込む。"""
+
+        payload = self._memory_cache.get(digest)
+        if payload is not None:
+            return payload
+        try:
+            payload = self._get_asset_path(digest).read_text(encoding="utf-8")
+        except OSError as ex:
+            raise AivmAssetsStoreError(f"Model asset {digest} not found.") from ex
+        self._memory_cache.put(digest, payload)
+        return payload
+
+    def _get_asset_path(self, digest: str) -> Path:
+        """アセットの保存先パスを取得する。"""
+        return self.store_dir / f"{digest}.b64"
+
+
+def _map_asset(value: str, function: Callable[[str], str]) -> str:
+    """文字列 (Data URL または Base64 文字列) の Base64 部分のみを function で変換する。"""
+
+    prefix, separator, payload = value.rpartition(",")
+    return prefix + separator + function(payload)
+
+
+def _map_speaker_info_assets(
+    speaker_info: SpeakerInfo, function: Callable[[str], str]
+) -> None:
+    """SpeakerInfo 内のアイコン画像・ボイスサンプルの Base64 部分を、その場で function で変換する。"""
+
+    speaker_info.portrait = _map_asset(speaker_info.portrait, function)
+    for style_info in speaker_info.style_infos:
+        style_info.icon = _map_asset(style_info.icon, function)
+        style_info.voice_samples = [
+            _map_asset(voice_sample, function)
+            for voice_sample in style_info.voice_samples
+        ]
+
+
+def _map_aivm_info_assets(
+    aivm_info: AivmInfo, function: Callable[[str], str]
+) -> AivmInfo:
+    """AivmInfo 内のアイコン画像・ボイスサンプルの Base64 部分を function で変換した AivmInfo を返す。"""
+
+    aivm_info = aivm_info.model_copy(deep=True)
+    for manifest_speaker in aivm_info.manifest.speakers:
+        manifest_speaker.icon = _map_asset(manifest_speaker.icon, function)
+        for manifest_style in manifest_speaker.styles:
+            if manifest_style.icon is not None:
+                manifest_style.icon = _map_asset(manifest_style.icon, function)
+            for voice_sample in manifest_style.voice_samples:
+                voice_sample.audio = _map_asset(voice_sample.audio, function)
+    for aivm_info_speaker in aivm_info.speakers:
+        _map_speaker_info_assets(aivm_info_speaker.speaker_info, function)
+    return aivm_info
@@ -3,18 +3,28 @@
 import asyncio
 import glob
 import hashlib
+import os
 import sys
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Final
+from typing import Final, Self
 
 import aivmlib
 import httpx
-from aivmlib.schemas.aivm_manifest import ModelArchitecture
+from aivmlib.schemas.aivm_manifest import (
+    AivmManifestSpeaker,
+    AivmManifestSpeakerStyle,
+    AivmMetadata,
+    ModelArchitecture,
+)
+from aivmlib.schemas.style_bert_vits2 import StyleBertVITS2HyperParameters
 from pydantic import TypeAdapter
 from semver.version import Version
 
+from voicevox_engine.aivm_assets_store import AivmAssetsStore
 from voicevox_engine.library.model import LibrarySpeaker
 from voicevox_engine.logging import logger
 from voicevox_engine.metas.Metas import (
@@ -26,19 +36,106 @@ from voicevox_engine.metas.Metas import (
     StyleInfo,
 )
 from voicevox_engine.model import AivmInfo
+from voicevox_engine.utility.aivmx_utility import read_aivmx_metadata
 from voicevox_engine.utility.path_utility import get_save_dir
 from voicevox_engine.utility.user_agent_utility import generate_user_agent
 
-__all__ = ["AivmInfosRepository"]
+__all__ = ["AivmInfosRepository", "AivmModelParameters", "AivmStyleIndexEntry"]
 
 AivmInfosCache = TypeAdapter(dict[str, AivmInfo])
 
 
+@dataclass(frozen=True)
+class AivmStyleIndexEntry:
+    """スタイル ID に対応する、インストール済み音声合成モデル・AIVM マニフェスト内の話者とスタイルの情報"""
+
+    # スタイルが属する音声合成モデルの情報
+    aivm_info: AivmInfo
+    # AIVM マニフェスト内の話者
+    manifest_speaker: AivmManifestSpeaker
+    # AIVM マニフェスト内のスタイル
+    manifest_style: AivmManifestSpeakerStyle
+    # AIVM マニフェスト内のローカルな話者 ID
+    local_speaker_id: int
+    # AIVM マニフェスト内のローカルなスタイル ID (ハイパーパラメータの data.style2id の値と一致する)
+    local_style_id: int
+    # AIVM マニフェスト記載のスタイル名
+    style_name: str
+
+
+@dataclass(frozen=True)
+class AivmModelParameters:
+    """
+    音声合成モデルのロードに必要な、AIVM メタデータ内のハイパーパラメータとスタイルベクトル。
+    アイコン画像・ボイスサンプルを含む AIVM マニフェストは保持しない。
+    """
+
+    # ハイパーパラメータ
+    hyper_parameters: StyleBertVITS2HyperParameters
+    # スタイルベクトル (NumPy の .npy 形式)
+    style_vectors: bytes | None
+
+
+@dataclass(frozen=True)
+class _AivmInfosIndex:
+    """
+    すべてのインストール済み音声合成モデルの情報と、それらを各種 ID から定数時間で引くためのインデックス。
+    インストール済み音声合成モデルの情報が更新されるたびに丸ごと作り直して差し替えることで、
+    更新中のリクエストからも、常に更新前後のどちらか一方の一貫した状態が見えるようにする。
+    """
+
+    # インストール済み音声合成モデルの情報 (キー: 音声合成モデルの UUID)
+    aivm_infos: dict[str, AivmInfo]
+    # スタイル ID に対応する音声合成モデル・話者・スタイルの情報 (キー: スタイル ID)
+    styles: dict[StyleId, AivmStyleIndexEntry]
+    # 話者の追加情報 (キー: 話者の UUID)
+    speaker_infos: dict[str, SpeakerInfo]
+
+    @classmethod
+    def build(cls, aivm_infos: dict[str, AivmInfo]) -> Self:
+        """インストール済み音声合成モデルの情報からインデックスを構築する。"""
+
+        styles: dict[StyleId, AivmStyleIndexEntry] = {}
+        speaker_infos: dict[str, SpeakerInfo] = {}
+        for aivm_info in aivm_infos.values():
+            manifest_speakers = {
+                str(manifest_speaker.uuid): manifest_speaker
+                for manifest_speaker in aivm_info.manifest.speakers
+            }
+            for aivm_info_speaker in aivm_info.speakers:
+                speaker_uuid = aivm_info_speaker.speaker.speaker_uuid
+                # 同じ UUID の話者・同じスタイル ID のスタイルが複数ある場合は、先に見つかったものを優先する
+                speaker_infos.setdefault(speaker_uuid, aivm_info_speaker.speaker_info)
+                manifest_speaker = manifest_speakers.get(speaker_uuid)
+                if manifest_speaker is None:
+                    continue
+                manifest_styles = {
+                    manifest_style.local_id: manifest_style
+                    for manifest_style in reversed(manifest_speaker.styles)
+                }
+                for style in aivm_info_speaker.speaker.styles:
+                    local_style_id = AivmInfosRepository.style_id_to_local_style_id(style.id)  # fmt: skip
+                    manifest_style = manifest_styles.get(local_style_id)
+                    if manifest_style is None or style.id in styles:
+                        continue
+                    styles[style.id] = AivmStyleIndexEntry(
+                        aivm_info=aivm_info,
+                        manifest_speaker=manifest_speaker,
+                        manifest_style=manifest_style,
+                        local_speaker_id=manifest_speaker.local_id,
+                        local_style_id=local_style_id,
+                        style_name=manifest_style.name,
+                    )
+
+        return cls(aivm_infos=aivm_infos, styles=styles, speaker_infos=speaker_infos)
+
+
 class AivmInfosRepository:
     """
     インストール済み音声合成モデルのスキャンとメタデータの取得、キャッシュの管理を行うリポジトリ。
 
     エンジン起動時はキャッシュがあれば読み込み、バックグラウンドですべてのインストール済み音声合成モデルの情報を構築する。
+    サイズの大きいアイコン画像・ボイスサンプルはアセットストアに保存し、メモリ上とキャッシュファイルにはそれらへの参照のみを保持する。
     """
 
     # AivisHub API のベース URL
@@ -54,7 +151,14 @@ class AivmInfosRepository:
     ]
 
     # エンジン起動の高速化に用いるキャッシュファイルの保存パス
-    CACHE_FILE_PATH: Final[Path] = get_save_dir() / "aivm_infos_cache.json"
+    ## アイコン画像・ボイスサンプルを含まない、軽量な音声合成モデルの情報のみを保存する
+    CACHE_FILE_PATH: Final[Path] = get_save_dir() / "aivm_infos_index.json"
+
+    # アイコン画像・ボイスサンプルをすべて含んでいた、以前のバージョンのキャッシュファイルの保存パス
+    LEGACY_CACHE_FILE_PATH: Final[Path] = get_save_dir() / "aivm_infos_cache.json"
+
+    # アイコン画像・ボイスサンプルを保存するアセットストアのディレクトリ
+    ASSETS_STORE_DIR: Final[Path] = get_save_dir() / "aivm_assets"
 
     def __init__(self, installed_models_dir: Path) -> None:
         """
@@ -69,15 +173,36 @@ class AivmInfosRepository:
         self.installed_models_dir = installed_models_dir
         self._lock = threading.Lock()
 
+        # update_repository() が複数のスレッド (起動時のバックグラウンドスキャン・インストール・ディレクトリの監視など) から
+        # 同時に実行され、スキャン結果やアセットストアの状態が食い違わないよう、更新処理全体を排他制御するためのロック
+        self._update_lock = threading.Lock()
+
         # pytest から実行されているかどうか
         self._is_pytest = "pytest" in sys.argv[0] or "py.test" in sys.argv[0]
 
-        # すべてのインストール済み音声合成モデルの情報を保持するマップ
-        self._installed_aivm_infos: dict[str, AivmInfo] | None = None
+        # アイコン画像・ボイスサンプルを保存するアセットストア
+        ## インストール済み音声合成モデルの情報内のアイコン画像・ボイスサンプルは、アセットストアへの参照に置き換えて保持する
+        self._assets_store = AivmAssetsStore(self.ASSETS_STORE_DIR)
+
+        # すべてのインストール済み音声合成モデルの情報と、それらを各種 ID から引くためのインデックス
+        ## インストール済み音声合成モデルの情報が更新されるたびに、_set_installed_aivm_infos() で丸ごと差し替えられる
+        self._index: _AivmInfosIndex | None = None
+
+        # AIVMX ファイルから読み込んだ AIVM メタデータのうち、音声合成モデルのロードに必要な部分のみを保持するマップ
+        ## キー: AIVMX ファイルのパス, 値: (読み込み時のファイルサイズと更新日時, ハイパーパラメータとスタイルベクトル)
+        ## スキャン時に読み込んだメタデータをモデルのロード時にも再利用し、AIVMX ファイルの再読み込みを避ける
+        ## アイコン画像・ボイスサンプルを含む AIVM マニフェストまで保持するとアセットストアに移した意味がなくなるため、保持しない
+        self._model_parameters: dict[Path, tuple[tuple[int, int], AivmModelParameters]] = {}  # fmt: skip
+
+        # 前回のスキャンで AIVMX ファイルから取得した音声合成モデルの情報を保持するマップ
+        ## キー: AIVMX ファイルのパス, 値: (スキャン時のファイルサイズと更新日時, 音声合成モデルの情報 (読み込みに失敗した場合は None))
+        ## インストール・アンインストールのたびにすべての AIVMX ファイルを読み込み直さないよう、変更のないファイルのスキャン結果を再利用する
+        self._scanned_aivm_infos: dict[Path, tuple[tuple[int, int], AivmInfo | None]] = {}  # fmt: skip
 
         # コンストラクタ初期化時（＝エンジン起動時）、キャッシュがあればそこから即座に読み込む
         ## update_repository() は比較的実行コストが高い（モデル数が増えるほど時間がかかる）ため、
         ## 現在起動時に残したキャッシュを活用し、エンジンの起動を高速化する
+        self._background_update_thread: threading.Thread | None = None
         result = self._load_from_cache()
         if result is True:
             # キャッシュ情報が存在する際は、バックグラウンドでスキャンを開始
@@ -86,7 +211,7 @@ class AivmInfosRepository:
                 if self._is_pytest:
                     return
                 # BERT モデルのロードと並行させるため、少し待ってから実行
-                ## aivmlib.read_aivmx_metadata() はモデルファイルをロードする関係で若干 CPU-bound だが、
+                ## AIVM メタデータの読み込みは若干 CPU-bound だが、
                 ## Python は GIL の制約により、CPU-bound な処理はマルチスレッドでもほとんど並列化できない
                 ## そこで StyleBertVITS2TTSEngine 初期化時の BERT モデルのロードが GIL 外のネイティブコードで行われるのを活用し、
                 ## GIL の制約を受けない BERT モデルのロードと並行させ、エンジン起動時間を短縮している
@@ -98,15 +223,22 @@ class AivmInfosRepository:
                         "Failed to update repository in background:", exc_info=ex
                     )
 
-            threading.Thread(
+            self._background_update_thread = threading.Thread(
                 target=update_repository_in_background, daemon=True
-            ).start()
+            )
+            self._background_update_thread.start()
         else:
             # キャッシュ情報が存在しない際はサーバー起動前に情報準備が必要なため、同期的にスキャンを行う
             self.update_repository()
 
-        # この時点で確実に self._installed_aivm_infos が None でないことを保証する
-        assert self._installed_aivm_infos is not None
+        # この時点で確実に self._index が None でないことを保証する
+        assert self._index is not None
+
+    def wait_for_background_update(self) -> None:
+        """コンストラクタでバックグラウンドで開始したスキャンが完了するまで待機する。"""
+
+        if self._background_update_thread is not None:
+            self._background_update_thread.join()
 
     def get_installed_aivm_infos(self) -> dict[str, AivmInfo]:
         """
@@ -116,11 +248,184 @@ class AivmInfosRepository:
         -------
         aivm_infos : dict[str, AivmInfo]
             インストール済み音声合成モデルの情報 (キー: 音声合成モデルの UUID, 値: AivmInfo)
+            (アイコン画像・ボイスサンプルはアセットストアへの参照に置き換えられている)
+        """
+
+        # コンストラクタ初期化時に確認した通り、この時点で self._index が None でないことを保証する
+        assert self._index is not None
+        return self._index.aivm_infos
+
+    def get_aivm_info(self, aivm_uuid: str) -> AivmInfo | None:
+        """
+        音声合成モデルの UUID からインストール済み音声合成モデルの情報を取得する
+
+        Parameters
+        ----------
+        aivm_uuid : str
+            音声合成モデルの UUID
+
+        Returns
+        -------
+        AivmInfo | None
+            インストール済み音声合成モデルの情報 (インストールされていない場合は None)
+            (アイコン画像・ボイスサンプルはアセットストアへの参照に置き換えられている)
+        """
+
+        assert self._index is not None
+        return self._index.aivm_infos.get(aivm_uuid)
+
+    def get_style_index_entry(self, style_id: StyleId) -> AivmStyleIndexEntry | None:
+        """
+        スタイル ID から、そのスタイルが属する音声合成モデル・AIVM マニフェスト内の話者とスタイルの情報を取得する
+
+        Parameters
+        ----------
+        style_id : StyleId
+            スタイル ID
+
+        Returns
+        -------
+        AivmStyleIndexEntry | None
+            スタイル ID に対応する音声合成モデル・話者・スタイルの情報 (存在しない場合は None)
+        """
+
+        assert self._index is not None
+        return self._index.styles.get(style_id)
+
+    def get_speaker_info(self, speaker_uuid: str) -> SpeakerInfo | None:
+        """
+        話者の UUID からインストール済み音声合成モデル内の話者の追加情報を取得する
+
+        Parameters
+        ----------
+        speaker_uuid : str
+            話者の UUID
+
+        Returns
+        -------
+        SpeakerInfo | None
+            話者の追加情報 (インストールされていない場合は None)
+            (アイコン画像・ボイスサンプルはアセットストアへの参照に置き換えられている)
+        """
+
+        assert self._index is not None
+        return self._index.speaker_infos.get(speaker_uuid)
+
+    def load_assets(self, aivm_info: AivmInfo) -> AivmInfo:
+        """
+        アセットストアへの参照に置き換えられているアイコン画像・ボイスサンプルを読み込み、元に戻した音声合成モデルの情報を取得する
+
+        Parameters
+        ----------
+        aivm_info : AivmInfo
+            get_installed_aivm_infos() などで取得した音声合成モデルの情報
+
+        Returns
+        -------
+        AivmInfo
+            アイコン画像・ボイスサンプルを含む音声合成モデルの情報
+        """
+
+        return self._assets_store.load_assets(aivm_info)
+
+    def load_speaker_info_assets(self, speaker_info: SpeakerInfo) -> SpeakerInfo:
+        """
+        アセットストアへの参照に置き換えられているアイコン画像・ボイスサンプルを読み込み、元に戻した話者の追加情報を取得する
+
+        Parameters
+        ----------
+        speaker_info : SpeakerInfo
+            get_speaker_info() で取得した話者の追加情報
+
+        Returns
+        -------
+        SpeakerInfo
+            アイコン画像・ボイスサンプルを含む話者の追加情報
+        """
+
+        return self._assets_store.load_speaker_info_assets(speaker_info)
+
+    def get_scanned_file_key(self, aivm_file_path: Path) -> tuple[int, int] | None:
+        """
+        前回のスキャン時に取得した AIVMX ファイルのファイルサイズと更新日時を取得する。
+
+        Parameters
+        ----------
+        aivm_file_path : Path
+            AIVMX ファイルのパス
+
+        Returns
+        -------
+        tuple[int, int] | None
+            スキャン時のファイルサイズと更新日時 (ナノ秒単位) (キャッシュから読み込んだ直後など、まだスキャンしていない場合は None)
+        """
+
+        scanned = self._scanned_aivm_infos.get(aivm_file_path)
+        return scanned[0] if scanned is not None else None
+
+    def get_model_parameters(self, aivm_file_path: Path) -> AivmModelParameters:
+        """
+        AIVMX ファイルの AIVM メタデータから、音声合成モデルのロードに必要なハイパーパラメータとスタイルベクトルを取得する。
+        スキャン時などに読み込んだ値があり、その後 AIVMX ファイルが変更されていなければ、ファイルを読み込まずにそれを返す。
+
+        Parameters
+        ----------
+        aivm_file_path : Path
+            AIVMX ファイルのパス
+
+        Returns
+        -------
+        AivmModelParameters
+            ハイパーパラメータとスタイルベクトル
+
+        Raises
+        ------
+        aivmlib.AivmValidationError
+            AIVMX ファイルのフォーマットが不正・AIVM メタデータのバリデーションに失敗した場合
         """
 
-        # コンストラクタ初期化時に確認した通り、この時点で self._installed_aivm_infos が None でないことを保証する
-        assert self._installed_aivm_infos is not None
-        return self._installed_aivm_infos
+        # ファイルサイズと更新日時が読み込み時と同じであれば、読み込み済みの値を返す
+        stat = aivm_file_path.stat()
+        cached = self._model_parameters.get(aivm_file_path)
+        if cached is not None and cached[0] == (stat.st_size, stat.st_mtime_ns):
+            return cached[1]
+
+        self._read_aivm_metadata(aivm_file_path)
+        return self._model_parameters[aivm_file_path][1]
+
+    def _read_aivm_metadata(self, aivm_file_path: Path) -> AivmMetadata:
+        """
+        AIVMX ファイルから AIVM メタデータを読み込み、音声合成モデルのロードに必要な部分のみを保持しておく。
+
+        Parameters
+        ----------
+        aivm_file_path : Path
+            AIVMX ファイルのパス
+
+        Returns
+        -------
+        AivmMetadata
+            AIVM メタデータ (アイコン画像・ボイスサンプルを含む)
+
+        Raises
+        ------
+        aivmlib.AivmValidationError
+            AIVMX ファイルのフォーマットが不正・AIVM メタデータのバリデーションに失敗した場合
+        """
+
+        # 読み込み中にファイルが変更されても次回に読み込み直されるよう、ファイルの情報は読み込み前に取得する
+        stat = aivm_file_path.stat()
+        file_key = (stat.st_size, stat.st_mtime_ns)
+        with open(aivm_file_path, mode="rb") as f:
+            aivm_metadata = read_aivmx_metadata(f)
+        self._model_parameters[aivm_file_path] = (
+            file_key,
+            AivmModelParameters(
+                hyper_parameters=aivm_metadata.hyper_parameters,
+                style_vectors=aivm_metadata.style_vectors,
+            ),
+        )
+        return aivm_metadata
 
     def update_model_load_state(self, aivm_uuid: str, is_loaded: bool) -> None:
         """
@@ -135,34 +440,48 @@ class AivmInfosRepository:
             モデルがロードされているかどうか
         """
 
-        if (
-            self._installed_aivm_infos is not None
-            and aivm_uuid in self._installed_aivm_infos
-        ):
-            self._installed_aivm_infos[aivm_uuid].is_loaded = is_loaded
+        index = self._index
+        if index is not None and aivm_uuid in index.aivm_infos:
+            index.aivm_infos[aivm_uuid].is_loaded = is_loaded
 
     def update_repository(self) -> None:
         """
         すべてのインストール済み音声合成モデルから AIVM メタデータを取得し、内部状態を最新の情報に更新する。
         更新後の情報は次回起動時に利用するキャッシュにも反映される。
+        複数のスレッドから同時に呼び出された場合は、先に呼び出された更新処理の完了を待ってから実行する。
         """
 
+        with self._update_lock:
+            self._update_repository()
+
+    def _update_repository(self) -> None:
+        """update_repository() の実体。self._update_lock を取得した状態で呼び出す必要がある。"""
+
         # ファイルシステムをスキャンして最新の音声合成モデルの情報を取得
         new_installed_aivm_infos = self._scan_models(self.installed_models_dir)
 
         # 情報の更新前に、現在保持されている既存のロード状態を新しい AivmInfo に移行する
-        if self._installed_aivm_infos is not None:
+        if self._index is not None:
+            previous_installed_aivm_infos = self._index.aivm_infos
             for aivm_uuid, aivm_info in new_installed_aivm_infos.items():
-                if aivm_uuid in self._installed_aivm_infos:
-                    aivm_info.is_loaded = self._installed_aivm_infos[aivm_uuid].is_loaded  # fmt: skip
+                if aivm_uuid in previous_installed_aivm_infos:
+                    aivm_info.is_loaded = previous_installed_aivm_infos[aivm_uuid].is_loaded  # fmt: skip
 
         # 内部状態を更新
-        self._installed_aivm_infos = new_installed_aivm_infos
+        self._set_installed_aivm_infos(new_installed_aivm_infos)
+
+        # アンインストールされた AIVMX ファイルのハイパーパラメータ・スタイルベクトルを破棄する
+        installed_file_paths = {aivm_info.file_path for aivm_info in new_installed_aivm_infos.values()}  # fmt: skip
+        self._model_parameters = {
+            file_path: cached
+            for file_path, cached in self._model_parameters.items()
+            if file_path in installed_file_paths
+        }
 
         # AivisHub API からインストール済み音声合成モデルのアップデート情報を取得し、内部状態を更新
         try:
-            self._installed_aivm_infos = asyncio.run(
-                self._update_latest_version_info(self._installed_aivm_infos)
+            self._set_installed_aivm_infos(
+                asyncio.run(self._update_latest_version_info(new_installed_aivm_infos))
             )
         except Exception as ex:
             # AivisHub API からの情報取得に失敗しても起動に影響を与えないよう、ログ出力のみ行う
@@ -171,13 +490,43 @@ class AivmInfosRepository:
                 exc_info=ex,
             )
 
+        # どのインストール済み音声合成モデルからも参照されなくなったアイコン画像・ボイスサンプルをアセットストアから削除する
+        ## 同一 UUID の別ファイルとしてスキャン結果からは除外された AIVMX ファイルのアセットも、削除せずに残しておく
+        try:
+            self._assets_store.prune(
+                [
+                    aivm_info
+                    for _, aivm_info in self._scanned_aivm_infos.values()
+                    if aivm_info is not None
+                ]
+            )
+        except OSError as ex:
+            logger.warning("Failed to remove unused model assets:", exc_info=ex)
+
         # 現在保持している情報をキャッシュに保存
         self._persist_to_cache()
 
+    def reload_from_cache(self) -> None:
+        """
+        キャッシュファイルからすべてのインストール済み音声合成モデルの情報を再読み込みする。
+        別のプロセスで update_repository() が実行され、キャッシュファイルが更新された際に、その内容を反映するために利用する。
+        """
+
+        previous_index = self._index
+        if self._load_from_cache() is not True:
+            return
+
+        # 再読み込み前のロード状態を引き継ぐ
+        assert self._index is not None
+        if previous_index is not None:
+            for aivm_uuid, aivm_info in self._index.aivm_infos.items():
+                if aivm_uuid in previous_index.aivm_infos:
+                    aivm_info.is_loaded = previous_index.aivm_infos[aivm_uuid].is_loaded  # fmt: skip
+
     def _load_from_cache(self) -> bool:
         """
         キャッシュファイルからすべてのインストール済み音声合成モデルの情報を取得し、
-        内部で保持している self._installed_aivm_infos に格納する。
+        内部で保持している self._index に格納する。
 
         Returns
         -------
@@ -198,10 +547,13 @@ class AivmInfosRepository:
                 # すべてのモデルのロード状態を False にする
                 for aivm_info in result.values():
                     aivm_info.is_loaded = False
-                self._installed_aivm_infos = result
-                logger.info(
-                    f"Loaded {len(self._installed_aivm_infos)} models from cache."
-                )
+                # 参照しているアイコン画像・ボイスサンプルがアセットストアから削除されている場合は、キャッシュを利用しない
+                for aivm_info in result.values():
+                    if not self._assets_store.has_assets(aivm_info):
+                        logger.warning(f"Model assets for {aivm_info.manifest.uuid} not found. Ignoring cache file.")  # fmt: skip
+                        return False
+                self._set_installed_aivm_infos(result)
+                logger.info(f"Loaded {len(result)} models from cache.")
                 return True
             except Exception as ex:
                 logger.warning("Failed to load cache file:", exc_info=ex)
@@ -213,7 +565,8 @@ class AivmInfosRepository:
         """
 
         # まだインストール済みの音声合成モデルをスキャンし終わっていないため何も実行しない
-        if self._installed_aivm_infos is None:
+        index = self._index
+        if index is None:
             return
 
         # 万が一保存先ディレクトリが存在しない場合は作成
@@ -226,19 +579,35 @@ class AivmInfosRepository:
                 temp_path = self.CACHE_FILE_PATH.with_suffix(".tmp")
                 with open(temp_path, mode="w", encoding="utf-8") as f:
                     f.write(
-                        AivmInfosCache.dump_json(
-                            self._installed_aivm_infos, indent=4
-                        ).decode("utf-8")
+                        AivmInfosCache.dump_json(index.aivm_infos, indent=4).decode(
+                            "utf-8"
+                        )
                     )
                 # ファイル名を変更（既存のファイルは上書き）
                 temp_path.replace(self.CACHE_FILE_PATH)
+                # 以前のバージョンのキャッシュファイルは不要なので削除する
+                self.LEGACY_CACHE_FILE_PATH.unlink(missing_ok=True)
             except Exception as ex:
                 logger.warning("Failed to save cache file:", exc_info=ex)
 
-    @classmethod
-    def _scan_models(cls, installed_models_dir: Path) -> dict[str, AivmInfo]:
+    def _set_installed_aivm_infos(self, aivm_infos: dict[str, AivmInfo]) -> None:
+        """
+        すべてのインストール済み音声合成モデルの情報を更新し、各種 ID から引くためのインデックスを作り直す。
+        新しいインデックスを構築し終えてから 1 回の代入で差し替えるため、読み取り側はロックを取得する必要がない。
+
+        Parameters
+        ----------
+        aivm_infos : dict[str, AivmInfo]
+            インストール済み音声合成モデルの情報 (キー: 音声合成モデルの UUID)
+        """
+
+        self._index = _AivmInfosIndex.build(aivm_infos)
+
+    def _scan_models(self, installed_models_dir: Path) -> dict[str, AivmInfo]:
         """
         指定されたディレクトリに保存されている *.aivmx ファイルを走査し、すべての音声合成モデルの情報を取得する。
+        前回のスキャン以降にパス・ファイルサイズ・更新日時が変わっていない AIVMX ファイルは、前回のスキャン結果をそのまま再利用し、
+        新規または変更された AIVMX ファイルのみをスレッドプール上で並行して読み込む。
 
         Parameters
         ----------
@@ -257,8 +626,11 @@ class AivmInfosRepository:
         # AIVMX ファイルのインストール先ディレクトリ内に配置されている .aivmx ファイルのパスを取得
         aivm_file_paths = glob.glob(str(installed_models_dir / "*.aivmx"))
 
-        # 各 AIVMX ファイルごとに
-        aivm_infos: dict[str, AivmInfo] = {}
+        # 各 AIVMX ファイルごとに、前回のスキャン結果を再利用できるかどうかを判定する
+        ## 読み込み中にファイルが変更されても次回に読み込み直されるよう、ファイルの情報は読み込み前に取得する
+        previous_scanned_aivm_infos = self._scanned_aivm_infos
+        scanned_aivm_infos: dict[Path, tuple[tuple[int, int], AivmInfo | None]] = {}
+        file_paths_to_read: list[Path] = []
         for aivm_file_path_str in aivm_file_paths:
             # 最低限のパスのバリデーション
             aivm_file_path = Path(aivm_file_path_str)
@@ -269,183 +641,233 @@ class AivmInfosRepository:
                 logger.warning(f"{aivm_file_path}: Not a file. Skipping...")
                 continue
 
-            # AIVM メタデータの読み込み
-            try:
-                with open(aivm_file_path, mode="rb") as f:
-                    aivm_metadata = aivmlib.read_aivmx_metadata(f)
-                    aivm_manifest = aivm_metadata.manifest
-            except aivmlib.AivmValidationError as ex:
-                logger.warning(
-                    f"{aivm_file_path}: Failed to read AIVM metadata. Skipping...",
-                    exc_info=ex,
+            stat = aivm_file_path.stat()
+            file_key = (stat.st_size, stat.st_mtime_ns)
+            previous = previous_scanned_aivm_infos.get(aivm_file_path)
+            if previous is not None and previous[0] == file_key:
+                scanned_aivm_infos[aivm_file_path] = previous
+            else:
+                scanned_aivm_infos[aivm_file_path] = (file_key, None)
+                file_paths_to_read.append(aivm_file_path)
+        reused_count = len(scanned_aivm_infos) - len(file_paths_to_read)
+
+        # 新規または変更された AIVMX ファイルのみ、スレッドプール上で並行して AIVM メタデータを読み込む
+        ## AIVMX ファイルの読み込みの大半はファイル I/O のため、GIL の制約下でもスレッド数に応じて高速化できる
+        read_start_time = time.time()
+        if len(file_paths_to_read) > 0:
+            max_workers = min(len(file_paths_to_read), os.cpu_count() or 1)
+            with ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="scan_models"
+            ) as executor:
+                read_aivm_infos = list(executor.map(self._read_aivm_info, file_paths_to_read))  # fmt: skip
+            for aivm_file_path, read_aivm_info in zip(
+                file_paths_to_read, read_aivm_infos, strict=True
+            ):
+                scanned_aivm_infos[aivm_file_path] = (
+                    scanned_aivm_infos[aivm_file_path][0],
+                    read_aivm_info,
                 )
-                continue
+        read_time = time.time() - read_start_time
+
+        # 次回のスキャンで再利用できるよう、今回のスキャン結果を保持する
+        ## 読み込みに失敗した AIVMX ファイルも、変更されるまでは再度読み込まないよう None として保持する
+        self._scanned_aivm_infos = scanned_aivm_infos
 
-            # 音声合成モデルの UUID
-            aivm_uuid = str(aivm_manifest.uuid)
+        # スキャン結果を音声合成モデルの UUID をキーとするマップにまとめる
+        aivm_infos: dict[str, AivmInfo] = {}
+        for aivm_file_path, (_, aivm_info) in scanned_aivm_infos.items():
+            if aivm_info is None:
+                continue
 
             # すでに同一 UUID のファイルがインストール済みかどうかのチェック
+            aivm_uuid = str(aivm_info.manifest.uuid)
             if aivm_uuid in aivm_infos:
                 logger.info(
                     f"{aivm_file_path}: AIVM model {aivm_uuid} is already installed. Skipping..."
                 )
                 continue
 
-            # マニフェストバージョンのバリデーション
-            # バージョン文字列をメジャー・マイナーに分割
-            manifest_version_parts = aivm_manifest.manifest_version.split(".")
-            if len(manifest_version_parts) != 2:
+            aivm_infos[aivm_uuid] = aivm_info
+
+        # 音声合成モデル名でソートしてから返す
+        sorted_aivm_infos = dict(sorted(aivm_infos.items(), key=lambda x: x[1].manifest.name))  # fmt: skip
+        logger.info(
+            f"Scanned {len(sorted_aivm_infos)} installed models. ({time.time() - start_time:.2f}s) "
+            f"(Reused: {reused_count} files, Read: {len(file_paths_to_read)} files in {read_time:.2f}s)"
+        )
+
+        return sorted_aivm_infos
+
+    def _read_aivm_info(self, aivm_file_path: Path) -> AivmInfo | None:
+        """
+        AIVMX ファイルから AIVM メタデータを読み込み、音声合成モデルの情報に変換する。
+        スキャン時にスレッドプール上で並行して呼び出される。
+
+        Parameters
+        ----------
+        aivm_file_path : Path
+            AIVMX ファイルのパス
+
+        Returns
+        -------
+        AivmInfo | None
+            音声合成モデルの情報 (AIVM メタデータの読み込みに失敗した場合や、サポートされていないモデルの場合は None)
+        """
+
+        # AIVM メタデータの読み込み
+        try:
+            aivm_manifest = self._read_aivm_metadata(aivm_file_path).manifest
+        except aivmlib.AivmValidationError as ex:
+            logger.warning(
+                f"{aivm_file_path}: Failed to read AIVM metadata. Skipping...",
+                exc_info=ex,
+            )
+            return None
+
+        # マニフェストバージョンのバリデーション
+        # バージョン文字列をメジャー・マイナーに分割
+        manifest_version_parts = aivm_manifest.manifest_version.split(".")
+        if len(manifest_version_parts) != 2:
+            logger.warning(
+                f"{aivm_file_path}: Invalid AIVM manifest version format: {aivm_manifest.manifest_version} Skipping..."
+            )
+            return None
+        # サポートされているマニフェストバージョンごとにチェック
+        manifest_major, _ = map(int, manifest_version_parts)
+        for supported_manifest_version in self.SUPPORTED_MANIFEST_VERSIONS:
+            # メジャーバージョンを取得
+            supported_major = int(supported_manifest_version.split(".")[0])
+            if manifest_major != supported_major:
+                # メジャーバージョンが AIVM マニフェストのものと異なる場合はスキップ
                 logger.warning(
-                    f"{aivm_file_path}: Invalid AIVM manifest version format: {aivm_manifest.manifest_version} Skipping..."
+                    f"{aivm_file_path}: AIVM manifest version {aivm_manifest.manifest_version} is not supported (different major version). Skipping..."
                 )
                 continue
-            # サポートされているマニフェストバージョンごとにチェック
-            manifest_major, _ = map(int, manifest_version_parts)
-            for supported_manifest_version in cls.SUPPORTED_MANIFEST_VERSIONS:
-                # メジャーバージョンを取得
-                supported_major = int(supported_manifest_version.split(".")[0])
-                if manifest_major != supported_major:
-                    # メジャーバージョンが AIVM マニフェストのものと異なる場合はスキップ
-                    logger.warning(
-                        f"{aivm_file_path}: AIVM manifest version {aivm_manifest.manifest_version} is not supported (different major version). Skipping..."
-                    )
-                    continue
-                # 同じメジャーバージョンだが、より新しいマイナーバージョンの場合は警告を出して続行
-                elif (
-                    aivm_manifest.manifest_version
-                    not in cls.SUPPORTED_MANIFEST_VERSIONS
-                ):
-                    logger.warning(
-                        f"{aivm_file_path}: AIVM manifest version {aivm_manifest.manifest_version} is newer than supported versions. Trying to load anyway..."
-                    )
-
-            # 音声合成モデルのアーキテクチャがサポートされているかどうかのチェック
-            if aivm_manifest.model_architecture not in cls.SUPPORTED_MODEL_ARCHITECTURES:  # fmt: skip
+            # 同じメジャーバージョンだが、より新しいマイナーバージョンの場合は警告を出して続行
+            elif aivm_manifest.manifest_version not in self.SUPPORTED_MANIFEST_VERSIONS:
                 logger.warning(
-                    f"{aivm_file_path}: Model architecture {aivm_manifest.model_architecture} is not supported. Skipping..."
+                    f"{aivm_file_path}: AIVM manifest version {aivm_manifest.manifest_version} is newer than supported versions. Trying to load anyway..."
                 )
-                continue
 
-            # 仮の AivmInfo モデルを作成
-            aivm_info = AivmInfo(
-                is_loaded=False,
-                # 初期値として False を設定 (AivisHub から情報を取得できるまではアップデートなし扱い)
-                is_update_available=False,
-                # 初期値として True を設定 (AivisHub にモデルが公開されているか確認できるまでは Private 扱い)
-                is_private_model=True,
-                # 初期値として AIVM マニフェスト記載のバージョンを設定
-                latest_version=aivm_manifest.version,
-                # AIVMX ファイルのインストール先パス
-                file_path=aivm_file_path,
-                # AIVMX ファイルのインストールサイズ (バイト単位)
-                file_size=aivm_file_path.stat().st_size,
-                # AIVM マニフェスト
-                manifest=aivm_manifest,
-                # 話者情報は後で追加するため、空リストを渡す
-                speakers=[],
+        # 音声合成モデルのアーキテクチャがサポートされているかどうかのチェック
+        if aivm_manifest.model_architecture not in self.SUPPORTED_MODEL_ARCHITECTURES:  # fmt: skip
+            logger.warning(
+                f"{aivm_file_path}: Model architecture {aivm_manifest.model_architecture} is not supported. Skipping..."
             )
+            return None
+
+        # 仮の AivmInfo モデルを作成
+        aivm_info = AivmInfo(
+            is_loaded=False,
+            # 初期値として False を設定 (AivisHub から情報を取得できるまではアップデートなし扱い)
+            is_update_available=False,
+            # 初期値として True を設定 (AivisHub にモデルが公開されているか確認できるまでは Private 扱い)
+            is_private_model=True,
+            # 初期値として AIVM マニフェスト記載のバージョンを設定
+            latest_version=aivm_manifest.version,
+            # AIVMX ファイルのインストール先パス
+            file_path=aivm_file_path,
+            # AIVMX ファイルのインストールサイズ (バイト単位)
+            file_size=aivm_file_path.stat().st_size,
+            # AIVM マニフェスト
+            manifest=aivm_manifest,
+            # 話者情報は後で追加するため、空リストを渡す
+            speakers=[],
+        )
 
-            # 話者情報を LibrarySpeaker に変換し、AivmInfo.speakers に追加
-            for speaker_manifest in aivm_manifest.speakers:
-                speaker_uuid = str(speaker_manifest.uuid)
-
-                # AivisSpeech Engine は日本語のみをサポートするため、日本語をサポートしない話者は除外
-                ## 念のため小文字に変換してから比較
-                supported_langs = [
-                    lang.lower() for lang in speaker_manifest.supported_languages
-                ]
-                if not any(lang in supported_langs for lang in ['ja', 'ja-jp']):  # fmt: skip
-                    logger.warning(f"{aivm_file_path}: Speaker {speaker_uuid} does not support Japanese. Skipping...")  # fmt: skip
-                    continue
+        # 話者情報を LibrarySpeaker に変換し、AivmInfo.speakers に追加
+        for speaker_manifest in aivm_manifest.speakers:
+            speaker_uuid = str(speaker_manifest.uuid)
+
+            # AivisSpeech Engine は日本語のみをサポートするため、日本語をサポートしない話者は除外
+            ## 念のため小文字に変換してから比較
+            supported_langs = [
+                lang.lower() for lang in speaker_manifest.supported_languages
+            ]
+            if not any(lang in supported_langs for lang in ['ja', 'ja-jp']):  # fmt: skip
+                logger.warning(f"{aivm_file_path}: Speaker {speaker_uuid} does not support Japanese. Skipping...")  # fmt: skip
+                continue
 
-                # 話者アイコンを Base64 文字列に変換
-                speaker_icon = cls.extract_base64_from_data_url(speaker_manifest.icon)
-
-                # スタイルごとのメタデータを取得
-                speaker_styles: list[SpeakerStyle] = []
-                style_infos: list[StyleInfo] = []
-                for style_manifest in speaker_manifest.styles:
-                    # AIVM マニフェスト内の話者スタイル ID を VOICEVOX ENGINE 互換の StyleId に変換
-                    style_id = cls.local_style_id_to_style_id(style_manifest.local_id, speaker_uuid)  # fmt: skip
-
-                    # SpeakerStyle の作成
-                    speaker_style = SpeakerStyle(
-                        # VOICEVOX ENGINE 互換のスタイル ID
-                        id=style_id,
-                        # スタイル名
-                        name=style_manifest.name,
-                        # AivisSpeech は歌唱音声合成に対応しないので talk で固定
-                        type="talk",
-                    )
-                    speaker_styles.append(speaker_style)
-
-                    # StyleInfo の作成
-                    style_info = StyleInfo(
-                        # VOICEVOX ENGINE 互換のスタイル ID
-                        id=style_id,
-                        # アイコン画像
-                        ## 未指定時は話者のアイコン画像がスタイルのアイコン画像として使われる
-                        icon=cls.extract_base64_from_data_url(style_manifest.icon) if style_manifest.icon else speaker_icon,
-                        # 立ち絵を省略
-                        ## VOICEVOX ENGINE 本家では portrait に立ち絵が入るが、AivisSpeech Engine では敢えてアイコン画像のみを設定する
-                        portrait=None,
-                        # ボイスサンプル
-                        voice_samples=[
-                            cls.extract_base64_from_data_url(sample.audio)
-                            for sample in style_manifest.voice_samples
-                        ],
-                        # 書き起こしテキスト
-                        voice_sample_transcripts=[
-                            sample.transcript
-                            for sample in style_manifest.voice_samples
-                        ],
-                    )  # fmt: skip
-                    style_infos.append(style_info)
-
-                # LibrarySpeaker の作成
-                ## 事前に取得・生成した SpeakerStyle / StyleInfo をそれぞれ Speaker / SpeakerInfo に設定する
-                aivm_info_speaker = LibrarySpeaker(
-                    # 話者情報
-                    speaker=Speaker(
-                        # 話者 UUID
-                        speaker_uuid=speaker_uuid,
-                        # 話者名
-                        name=speaker_manifest.name,
-                        # 話者のバージョン
-                        ## 音声合成モデルのバージョンを話者のバージョンとして設定する
-                        version=aivm_manifest.version,
-                        # AivisSpeech Engine では全話者に対し常にモーフィング機能を無効化する
-                        ## Style-Bert-VITS2 の仕様上音素長を一定にできず、話者ごとに発話タイミングがずれてまともに合成できないため
-                        supported_features=SpeakerSupportedFeatures(
-                            permitted_synthesis_morphing="NOTHING",
-                        ),
-                        # 話者スタイル情報
-                        styles=speaker_styles,
-                    ),
-                    # 追加の話者情報
-                    speaker_info=SpeakerInfo(
-                        # ライセンス (Markdown またはプレーンテキスト)
-                        ## 同一 AIVM / AIVMX ファイル内のすべての話者は同一のライセンスを持つ
-                        policy=aivm_manifest.license if aivm_manifest.license else "",
-                        # アイコン画像
-                        ## VOICEVOX ENGINE 本家では portrait に立ち絵が入るが、AivisSpeech Engine では敢えてアイコン画像を設定する
-                        portrait=speaker_icon,
-                        # 追加の話者スタイル情報
-                        style_infos=style_infos,
-                    ),
+            # 話者アイコンを Base64 文字列に変換
+            speaker_icon = self.extract_base64_from_data_url(speaker_manifest.icon)
+
+            # スタイルごとのメタデータを取得
+            speaker_styles: list[SpeakerStyle] = []
+            style_infos: list[StyleInfo] = []
+            for style_manifest in speaker_manifest.styles:
+                # AIVM マニフェスト内の話者スタイル ID を VOICEVOX ENGINE 互換の StyleId に変換
+                style_id = self.local_style_id_to_style_id(style_manifest.local_id, speaker_uuid)  # fmt: skip
+
+                # SpeakerStyle の作成
+                speaker_style = SpeakerStyle(
+                    # VOICEVOX ENGINE 互換のスタイル ID
+                    id=style_id,
+                    # スタイル名
+                    name=style_manifest.name,
+                    # AivisSpeech は歌唱音声合成に対応しないので talk で固定
+                    type="talk",
+                )
+                speaker_styles.append(speaker_style)
+
+                # StyleInfo の作成
+                style_info = StyleInfo(
+                    # VOICEVOX ENGINE 互換のスタイル ID
+                    id=style_id,
+                    # アイコン画像
+                    ## 未指定時は話者のアイコン画像がスタイルのアイコン画像として使われる
+                    icon=self.extract_base64_from_data_url(style_manifest.icon) if style_manifest.icon else speaker_icon,
+                    # 立ち絵を省略
+                    ## VOICEVOX ENGINE 本家では portrait に立ち絵が入るが、AivisSpeech Engine では敢えてアイコン画像のみを設定する
+                    portrait=None,
+                    # ボイスサンプル
+                    voice_samples=[
+                        self.extract_base64_from_data_url(sample.audio)
+                        for sample in style_manifest.voice_samples
+                    ],
+                    # 書き起こしテキスト
+                    voice_sample_transcripts=[
+                        sample.transcript
+                        for sample in style_manifest.voice_samples
+                    ],
                 )  # fmt: skip
-                aivm_info.speakers.append(aivm_info_speaker)
-
-            # 完成した AivmInfo を UUID をキーとして追加
-            aivm_infos[aivm_uuid] = aivm_info
-
-        # 音声合成モデル名でソートしてから返す
-        sorted_aivm_infos = dict(sorted(aivm_infos.items(), key=lambda x: x[1].manifest.name))  # fmt: skip
-        logger.info(
-            f"Scanned {len(sorted_aivm_infos)} installed models. ({time.time() - start_time:.2f}s)"
-        )
-
-        return sorted_aivm_infos
+                style_infos.append(style_info)
+
+            # LibrarySpeaker の作成
+            ## 事前に取得・生成した SpeakerStyle / StyleInfo をそれぞれ Speaker / SpeakerInfo に設定する
+            aivm_info_speaker = LibrarySpeaker(
+                # 話者情報
+                speaker=Speaker(
+                    # 話者 UUID
+                    speaker_uuid=speaker_uuid,
+                    # 話者名
+                    name=speaker_manifest.name,
+                    # 話者のバージョン
+                    ## 音声合成モデルのバージョンを話者のバージョンとして設定する
+                    version=aivm_manifest.version,
+                    # AivisSpeech Engine では全話者に対し常にモーフィング機能を無効化する
+                    ## Style-Bert-VITS2 の仕様上音素長を一定にできず、話者ごとに発話タイミングがずれてまともに合成できないため
+                    supported_features=SpeakerSupportedFeatures(
+                        permitted_synthesis_morphing="NOTHING",
+                    ),
+                    # 話者スタイル情報
+                    styles=speaker_styles,
+                ),
+                # 追加の話者情報
+                speaker_info=SpeakerInfo(
+                    # ライセンス (Markdown またはプレーンテキスト)
+                    ## 同一 AIVM / AIVMX ファイル内のすべての話者は同一のライセンスを持つ
+                    policy=aivm_manifest.license if aivm_manifest.license else "",
+                    # アイコン画像
+                    ## VOICEVOX ENGINE 本家では portrait に立ち絵が入るが、AivisSpeech Engine では敢えてアイコン画像を設定する
+                    portrait=speaker_icon,
+                    # 追加の話者スタイル情報
+                    style_infos=style_infos,
+                ),
+            )  # fmt: skip
+            aivm_info.speakers.append(aivm_info_speaker)
+
+        # アイコン画像・ボイスサンプルをアセットストアに保存し、それらへの参照に置き換えた軽量な AivmInfo を返す
+        return self._assets_store.store_assets(aivm_info)
 
     @classmethod
     async def _update_latest_version_info(
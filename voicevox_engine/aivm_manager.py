@@ -1,10 +1,12 @@
 """AIVM (Aivis Voice Model) 仕様に準拠した音声合成モデルと AIVM マニフェストを管理するクラス"""
 
+import os
 import re
-import time
-from io import BytesIO
+import shutil
+from collections.abc import Callable
 from pathlib import Path
 from typing import BinaryIO, Final
+from uuid import uuid4
 
 import aivmlib
 import httpx
@@ -15,11 +17,21 @@ from aivmlib.schemas.aivm_manifest import (
 )
 from fastapi import HTTPException
 
-from voicevox_engine.aivm_infos_repository import AivmInfosRepository
+from voicevox_engine.aivm_infos_repository import (
+    AivmInfosRepository,
+    AivmModelParameters,
+    AivmStyleIndexEntry,
+)
 from voicevox_engine.logging import logger
 from voicevox_engine.metas.Metas import Speaker, SpeakerInfo, StyleId
 from voicevox_engine.metas.MetasStore import Character
 from voicevox_engine.model import AivmInfo
+from voicevox_engine.utility.aivmx_utility import read_aivmx_metadata
+from voicevox_engine.utility.directory_watcher_utility import DirectoryWatcher
+from voicevox_engine.utility.download_utility import (
+    DownloadIntegrityError,
+    download_file,
+)
 from voicevox_engine.utility.user_agent_utility import generate_user_agent
 
 __all__ = ["AivmManager"]
@@ -39,6 +51,11 @@ class AivmManager:
         "a59cb814-0083-4369-8542-f51a29e72af7",
     ]
 
+    # インストール中の AIVMX ファイルを一時的に保存するファイルの拡張子
+    ## インストール先ディレクトリ内に作成することで、インストール完了時にアトミックに名前変更できるようにしている
+    ## 拡張子が .aivmx ではないため、インストール済み音声合成モデルのスキャンやディレクトリの監視の対象にはならない
+    TEMP_FILE_SUFFIX: Final[str] = ".aivmx.part"
+
     def __init__(self, installed_models_dir: Path):
         """
         AivmManager のコンストラクタ
@@ -54,11 +71,23 @@ class AivmManager:
         self.installed_models_dir.mkdir(parents=True, exist_ok=True)
         logger.info(f"Models directory: {self.installed_models_dir}")
 
+        # 前回起動時にインストールが中断された際に残った一時ファイルを削除
+        for temp_file_path in self.installed_models_dir.glob(f"*{self.TEMP_FILE_SUFFIX}"):  # fmt: skip
+            logger.info(f"Removing incomplete AIVMX file {temp_file_path}...")
+            temp_file_path.unlink(missing_ok=True)
+
         # リポジトリを初期化
         ## この時点で前回起動時に作成したキャッシュがあればそこから即座に情報を読み込む
         ## キャッシュがない場合はコンストラクタで同期的にスキャンを行い、スキャン完了次第リポジトリの初期化が完了する
         self._repository = AivmInfosRepository(self.installed_models_dir)
 
+        # 音声合成モデルがインストール (更新を含む)・アンインストールされた際に呼び出されるリスナーのリスト
+        self._model_change_listeners: list[Callable[[str], None]] = []
+
+        # インストール先ディレクトリを監視し、API を経由せずに追加・変更・削除された AIVMX ファイルを反映するウォッチャー
+        ## start_models_dir_watcher() が呼び出されるまでは監視しない
+        self._models_dir_watcher: DirectoryWatcher | None = None
+
         # まだ一つも音声合成モデルがインストールされていない場合、デフォルトモデルをインストール
         # メタデータの読み取りに失敗したなどで情報を取得できなかったモデルはインストールされていないとみなす
         current_installed_aivm_infos = self._repository.get_installed_aivm_infos()
@@ -132,21 +161,20 @@ class AivmManager:
         Returns
         -------
         speaker_info : SpeakerInfo
-            話者の追加情報
+            話者の追加情報 (アイコン画像・ボイスサンプルを含む)
         """
 
-        aivm_infos = self.get_installed_aivm_infos()
-        for aivm_info in aivm_infos.values():
-            for aivm_info_speaker in aivm_info.speakers:
-                if aivm_info_speaker.speaker.speaker_uuid == speaker_uuid:
-                    return aivm_info_speaker.speaker_info
+        speaker_info = self._repository.get_speaker_info(speaker_uuid)
+        if speaker_info is not None:
+            # アイコン画像・ボイスサンプルは、API のレスポンスとして必要になったこの時点でアセットストアから読み込む
+            return self._repository.load_speaker_info_assets(speaker_info)
 
         raise HTTPException(
             status_code=404,
             detail=f"話者 {speaker_uuid} はインストールされていません。",
         )
 
-    def get_aivm_info(self, aivm_uuid: str) -> AivmInfo:
+    def get_aivm_info(self, aivm_uuid: str, load_assets: bool = False) -> AivmInfo:
         """
         音声合成モデルの UUID から AIVMX ファイルの情報を取得する
 
@@ -154,6 +182,9 @@ class AivmManager:
         ----------
         aivm_uuid : str
             音声合成モデルの UUID (aivm_manifest.json に記載されているものと同一)
+        load_assets : bool, default False
+            アイコン画像・ボイスサンプルをアセットストアから読み込むかどうか
+            (False のときはアセットストアへの参照に置き換えられたままの情報を返す)
 
         Returns
         -------
@@ -161,16 +192,66 @@ class AivmManager:
             AIVMX ファイルの情報
         """
 
-        aivm_infos = self.get_installed_aivm_infos()
-        for aivm_info in aivm_infos.values():
-            if str(aivm_info.manifest.uuid) == aivm_uuid:
-                return aivm_info
+        aivm_info = self._repository.get_aivm_info(aivm_uuid)
+        if aivm_info is not None:
+            if load_assets is True:
+                return self._repository.load_assets(aivm_info)
+            return aivm_info
 
         raise HTTPException(
             status_code=404,
             detail=f"音声合成モデル {aivm_uuid} はインストールされていません。",
         )
 
+    def get_model_parameters(self, aivm_uuid: str) -> AivmModelParameters:
+        """
+        音声合成モデルの UUID から、音声合成モデルのロードに必要なハイパーパラメータとスタイルベクトルを取得する
+        スキャン時に読み込まれた値を再利用するため、通常は AIVMX ファイルを読み込まずに取得できる
+
+        Parameters
+        ----------
+        aivm_uuid : str
+            音声合成モデルの UUID (aivm_manifest.json に記載されているものと同一)
+
+        Returns
+        -------
+        model_parameters : AivmModelParameters
+            ハイパーパラメータとスタイルベクトル
+
+        Raises
+        ------
+        aivmlib.AivmValidationError
+            AIVMX ファイルのフォーマットが不正・AIVM メタデータのバリデーションに失敗した場合
+        """
+
+        aivm_info = self.get_aivm_info(aivm_uuid)
+        return self._repository.get_model_parameters(aivm_info.file_path)
+
+    def get_style_index_entry(self, style_id: StyleId) -> AivmStyleIndexEntry:
+        """
+        スタイル ID に対応する音声合成モデル・AIVM マニフェスト内の話者とスタイル・ローカルな ID を取得する
+        インストール済み音声合成モデルの情報の更新時に構築されたインデックスから、定数時間で取得できる
+
+        Parameters
+        ----------
+        style_id : StyleId
+            スタイル ID
+
+        Returns
+        -------
+        style_index_entry : AivmStyleIndexEntry
+            スタイル ID に対応する音声合成モデル・話者・スタイルの情報
+        """
+
+        style_index_entry = self._repository.get_style_index_entry(style_id)
+        if style_index_entry is not None:
+            return style_index_entry
+
+        raise HTTPException(
+            status_code=404,
+            detail=f"スタイル {style_id} は存在しません。",
+        )
+
     def get_aivm_manifest_from_style_id(
         self, style_id: StyleId
     ) -> tuple[AivmManifest, AivmManifestSpeaker, AivmManifestSpeakerStyle]:
@@ -192,33 +273,25 @@ class AivmManager:
             AIVM マニフェスト内のスタイル
         """
 
-        # fmt: off
-        aivm_infos = self.get_installed_aivm_infos()
-        for aivm_info in aivm_infos.values():
-            for aivm_info_speaker in aivm_info.speakers:
-                for aivm_info_speaker_style in aivm_info_speaker.speaker.styles:
-                    if aivm_info_speaker_style.id == style_id:
-                        # ここでスタイル ID が示す音声合成モデルに対応する AivmManifest を特定
-                        aivm_manifest = aivm_info.manifest
-                        for aivm_manifest_speaker in aivm_manifest.speakers:
-                            # ここでスタイル ID が示す話者に対応する AivmManifestSpeaker を特定
-                            if str(aivm_manifest_speaker.uuid) == aivm_info_speaker.speaker.speaker_uuid:
-                                for aivm_manifest_style in aivm_manifest_speaker.styles:
-                                    # ここでスタイル ID が示すスタイルに対応する AivmManifestSpeakerStyle を特定
-                                    local_style_id = self._repository.style_id_to_local_style_id(style_id)
-                                    if aivm_manifest_style.local_id == local_style_id:
-                                        # すべて取得できたので値を返す
-                                        return aivm_manifest, aivm_manifest_speaker, aivm_manifest_style
-
-        raise HTTPException(
-            status_code=404,
-            detail=f"スタイル {style_id} は存在しません。",
+        style_index_entry = self.get_style_index_entry(style_id)
+        return (
+            style_index_entry.aivm_info.manifest,
+            style_index_entry.manifest_speaker,
+            style_index_entry.manifest_style,
         )
 
-    def get_installed_aivm_infos(self) -> dict[str, AivmInfo]:
+    def get_installed_aivm_infos(
+        self, load_assets: bool = False
+    ) -> dict[str, AivmInfo]:
         """
         すべてのインストール済み音声合成モデルの情報を取得する
 
+        Parameters
+        ----------
+        load_assets : bool, default False
+            アイコン画像・ボイスサンプルをアセットストアから読み込むかどうか
+            (False のときはアセットストアへの参照に置き換えられたままの情報を返す)
+
         Returns
         -------
         aivm_infos : dict[str, AivmInfo]
@@ -226,7 +299,128 @@ class AivmManager:
         """
 
         # リポジトリの現在の状態を返す
-        return self._repository.get_installed_aivm_infos()
+        aivm_infos = self._repository.get_installed_aivm_infos()
+        if load_assets is True:
+            return {
+                aivm_uuid: self._repository.load_assets(aivm_info)
+                for aivm_uuid, aivm_info in aivm_infos.items()
+            }
+        return aivm_infos
+
+    def reload_installed_aivm_infos(self) -> None:
+        """
+        すべてのインストール済み音声合成モデルの情報を、キャッシュファイルから再読み込みする
+        音声合成のワーカープロセスで、親プロセスでのインストール・アンインストールを反映するために利用する
+        """
+
+        self._repository.reload_from_cache()
+
+    def wait_for_background_scan(self) -> None:
+        """
+        起動時にバックグラウンドで開始したインストール済み音声合成モデルのスキャンが完了するまで待機する
+        音声合成のワーカープロセスを fork() する前に、スキャン用のスレッドを終了させておくために利用する
+        """
+
+        self._repository.wait_for_background_update()
+
+    def sync_installed_models(self) -> None:
+        """
+        インストール先ディレクトリをスキャンし、API を経由せずに追加・変更・削除された音声合成モデルを反映する
+        前回のスキャン以降に変更された AIVMX ファイルのみを読み込み、追加・変更・削除された音声合成モデルをリスナーに通知する
+        """
+
+        # 更新前後で、AIVMX ファイルのパス・ファイルサイズ・バージョン・更新日時のいずれかが変わった音声合成モデルを変更されたものとみなす
+        ## デプロイツールなどでファイルサイズ・バージョンが同じまま上書きされた場合も、更新日時の変化で検出できる
+        def get_file_states(aivm_infos: dict[str, AivmInfo]) -> dict[str, tuple[Path, int, str, int | None]]:  # fmt: skip
+            file_states: dict[str, tuple[Path, int, str, int | None]] = {}
+            for aivm_uuid, aivm_info in aivm_infos.items():
+                file_key = self._repository.get_scanned_file_key(aivm_info.file_path)
+                file_states[aivm_uuid] = (
+                    aivm_info.file_path,
+                    aivm_info.file_size,
+                    aivm_info.manifest.version,
+                    file_key[1] if file_key is not None else None,
+                )  # fmt: skip
+            return file_states
+
+        def is_changed(aivm_uuid: str) -> bool:
+            previous_state = previous_file_states.get(aivm_uuid)
+            current_state = current_file_states.get(aivm_uuid)
+            if previous_state is None or current_state is None:
+                return previous_state != current_state
+            # キャッシュから読み込んだ直後など、前回のスキャン時の更新日時がない場合は更新日時を除いて比較する
+            if previous_state[3] is None:
+                return previous_state[:3] != current_state[:3]
+            return previous_state != current_state
+
+        previous_file_states = get_file_states(self.get_installed_aivm_infos())
+        self._repository.update_repository()
+        current_file_states = get_file_states(self.get_installed_aivm_infos())
+
+        changed_aivm_uuids = sorted(
+            aivm_uuid
+            for aivm_uuid in previous_file_states.keys() | current_file_states.keys()
+            if is_changed(aivm_uuid)
+        )
+        for aivm_uuid in changed_aivm_uuids:
+            if aivm_uuid not in current_file_states:
+                logger.info(f"AIVM model {aivm_uuid} was removed from {self.installed_models_dir}.")  # fmt: skip
+            elif aivm_uuid not in previous_file_states:
+                logger.info(f"AIVM model {aivm_uuid} was added to {self.installed_models_dir}.")  # fmt: skip
+            else:
+                logger.info(f"AIVM model {aivm_uuid} was modified in {self.installed_models_dir}.")  # fmt: skip
+            self._notify_model_changed(aivm_uuid)
+
+    def start_models_dir_watcher(self, debounce_time: float = 2.0) -> None:
+        """
+        インストール先ディレクトリの監視を開始する
+        デプロイツールなどで API を経由せずに AIVMX ファイルが追加・変更・削除された場合も、
+        変更が落ち着いた時点で sync_installed_models() を呼び出し、エンジンを再起動せずに反映する
+
+        Parameters
+        ----------
+        debounce_time : float, default 2.0
+            最後の変更から反映を開始するまでの待機時間 (秒)
+        """
+
+        if self._models_dir_watcher is not None:
+            return
+        self._models_dir_watcher = DirectoryWatcher(
+            self.installed_models_dir,
+            self.sync_installed_models,
+            suffix=".aivmx",
+            debounce_time=debounce_time,
+        )
+        self._models_dir_watcher.start()
+
+    def add_model_change_listener(self, listener: Callable[[str], None]) -> None:
+        """
+        音声合成モデルがインストール (更新を含む)・アンインストールされた際に呼び出されるリスナーを登録する
+        リスナーには、インストール・アンインストールされた音声合成モデルの UUID が渡される
+
+        Parameters
+        ----------
+        listener : Callable[[str], None]
+            AIVM の UUID を受け取るリスナー
+        """
+
+        self._model_change_listeners.append(listener)
+
+    def _notify_model_changed(self, aivm_uuid: str) -> None:
+        """
+        登録されたリスナーに、音声合成モデルがインストール・アンインストールされたことを通知する
+
+        Parameters
+        ----------
+        aivm_uuid : str
+            AIVM の UUID
+        """
+
+        for listener in self._model_change_listeners:
+            try:
+                listener(aivm_uuid)
+            except Exception as ex:
+                logger.error(f"Model change listener failed for {aivm_uuid}:", exc_info=ex)  # fmt: skip
 
     def update_model_load_state(self, aivm_uuid: str, is_loaded: bool) -> None:
         """
@@ -254,88 +448,19 @@ class AivmManager:
             AIVMX ファイルのバイナリ
         """
 
-        # AIVMX ファイルからから AIVM メタデータを取得
+        # AIVMX ファイルを少しずつインストール先ディレクトリ内の一時ファイルに書き込む
+        ## ファイル全体をメモリ上に読み込まないため、ファイルサイズにかかわらずメモリ使用量は一定になる
+        temp_file_path = self._create_temp_file_path()
         try:
-            aivm_metadata = aivmlib.read_aivmx_metadata(file)
-            aivm_manifest = aivm_metadata.manifest
-        except aivmlib.AivmValidationError as ex:
-            logger.error("AIVMX file is invalid:", exc_info=ex)
-            raise HTTPException(
-                status_code=422,
-                detail=f"指定された AIVMX ファイルの形式が正しくありません。({ex})",
-            ) from ex
-
-        # すでに同一 UUID のファイルがインストール済みの場合、同じファイルを更新する
-        ## 手動で .aivmx ファイルをインストール先ディレクトリにコピーしていた (ファイル名が UUID と一致しない) 場合も更新できるよう、
-        ## この場合のみ特別に更新先ファイル名を現在保存されているファイル名に変更する
-        aivm_file_path = self.installed_models_dir / f"{aivm_manifest.uuid}.aivmx"
-        aivm_infos = self.get_installed_aivm_infos()
-        if str(aivm_manifest.uuid) in aivm_infos:
-            logger.info(
-                f"AIVM model {aivm_manifest.uuid} is already installed. Updating..."
-            )
-            # aivm_file_path を現在保存されているファイル名に変更
-            aivm_file_path = aivm_infos[str(aivm_manifest.uuid)].file_path
-
-        # マニフェストバージョンのバリデーション
-        if (
-            aivm_manifest.manifest_version
-            not in self._repository.SUPPORTED_MANIFEST_VERSIONS
-        ):
-            logger.error(
-                f"AIVM manifest version {aivm_manifest.manifest_version} is not supported."
-            )
-            raise HTTPException(
-                status_code=422,
-                detail=f"AIVM マニフェストバージョン {aivm_manifest.manifest_version} には対応していません。",
-            )
-
-        # 音声合成モデルのアーキテクチャのバリデーション
-        if (
-            aivm_manifest.model_architecture
-            not in self._repository.SUPPORTED_MODEL_ARCHITECTURES
-        ):
-            logger.error(
-                f"AIVM model architecture {aivm_manifest.model_architecture} is not supported."
-            )
-            raise HTTPException(
-                status_code=422,
-                detail=f'モデルアーキテクチャ "{aivm_manifest.model_architecture}" には対応していません。',
-            )
-
-        # BinaryIO のシークをリセット
-        # ここでリセットしないとファイルの内容を読み込めない
-        file.seek(0)
-
-        # AIVMX ファイルをインストール
-        ## 通常は重複防止のため "(音声合成モデルの UUID).aivmx" のフォーマットのファイル名でインストールされるが、
-        ## 手動で .aivmx ファイルをインストール先ディレクトリにコピーしても一通り動作するように考慮している
-        logger.info(f"Installing AIVMX file to {aivm_file_path}...")
-        try:
-            with open(aivm_file_path, mode="wb") as f:
-                f.write(file.read())
-            logger.info(f"Installed AIVMX file to {aivm_file_path}.")
-        except OSError as ex:
-            logger.error(
-                f"Failed to write AIVMX file to {aivm_file_path}:", exc_info=ex
-            )
-            error_message = str(ex).lower()
-            if "no space" in error_message:
-                detail = f"AIVMX ファイルの書き込みに失敗しました。ストレージ容量が不足しています。({ex})"
-            elif "permission denied" in error_message:
-                detail = f"AIVMX ファイルの書き込みに失敗しました。インストール先フォルダへのアクセス権限が不足しています。({ex})"
-            elif "read-only" in error_message:
-                detail = f"AIVMX ファイルの書き込みに失敗しました。インストール先フォルダが読み取り専用権限になっています。({ex})"
-            else:
-                detail = f"AIVMX ファイルの書き込みに失敗しました。({ex})"
-            raise HTTPException(
-                status_code=500,
-                detail=detail,
-            ) from ex
-
-        # すべてのインストール済み音声合成モデルの情報を再取得
-        ## このメソッドは情報更新後、AivisHub からアップデート情報を再取得してから戻る
-        self._repository.update_repository()
+            try:
+                file.seek(0)
+                with open(temp_file_path, mode="wb") as f:
+                    shutil.copyfileobj(file, f)
+            except OSError as ex:
+                raise self._create_write_error(ex, temp_file_path) from ex
+            self._install_temp_file(temp_file_path)
+        finally:
+            temp_file_path.unlink(missing_ok=True)
 
     def install_model_from_url(self, url: str) -> None:
         """
@@ -367,65 +492,35 @@ class AivmManager:
                 f"Detected AivisHub model page URL. Using download API URL: {url}"
             )
 
-        # URL から AIVMX ファイルをダウンロード
-        max_retries = 3
-        retry_count = 0
-        last_exception: httpx.HTTPError | None = None
-        while retry_count < max_retries:
+        # URL から AIVMX ファイルをインストール先ディレクトリ内の一時ファイルにダウンロード
+        ## レスポンスは少しずつ一時ファイルに書き込まれるため、ファイルサイズにかかわらずメモリ使用量は一定になる
+        ## 通信エラーが発生した場合は最大 3 回まで試行し、サーバーが対応していればダウンロード済みの部分の続きから再開する
+        temp_file_path = self._create_temp_file_path()
+        try:
+            logger.info(f"Downloading AIVMX file from {url}...")
             try:
-                logger.info(
-                    f"Downloading AIVMX file from {url} (Attempt {retry_count + 1}/{max_retries})..."
-                )
-                response = httpx.get(
+                download_file(
                     url,
+                    temp_file_path,
                     headers={"User-Agent": generate_user_agent()},
-                    # リダイレクトを追跡する
-                    follow_redirects=True,
                     # 接続タイムアウト10秒 / 読み取りタイムアウト300秒
                     timeout=httpx.Timeout(10.0, read=300.0),
+                    max_retries=3,
                 )
-                response.raise_for_status()
-                logger.info(f"Downloaded AIVMX file from {url}.")
-                # ダウンロードした AIVMX ファイルをインストール
-                self.install_model(BytesIO(response.content))
-                return
-            except httpx.HTTPStatusError as ex:
-                last_exception = ex
-                # 403 Forbidden や 404 Not Found の場合はリトライしない
-                if ex.response.status_code in [403, 404]:
-                    logger.error(
-                        f"Failed to download AIVMX file from {url} (HTTP Error {ex.response.status_code}). No retry.",
-                        exc_info=ex,
-                    )
-                    raise HTTPException(
-                        status_code=500,  # 4xx 系エラーでもサーバー側の問題として 500 を返す
-                        detail=f"AIVMX ファイルのダウンロードに失敗しました。({ex})",
-                    ) from ex
-                logger.warning(
-                    f"Failed to download AIVMX file from {url} (Attempt {retry_count + 1}/{max_retries}). Retrying...",
-                    exc_info=ex,
-                )
-            except httpx.HTTPError as ex:
-                last_exception = ex
-                logger.warning(
-                    f"Failed to download AIVMX file from {url} (Attempt {retry_count + 1}/{max_retries}). Retrying...",
-                    exc_info=ex,
-                )
-
-            retry_count += 1
-            if retry_count < max_retries:
-                # リトライ前に1秒待機
-                time.sleep(1)
-
-        # リトライ上限に達しても成功しなかった場合
-        logger.error(
-            f"Failed to download AIVMX file from {url} after {max_retries} attempts.",
-            exc_info=last_exception,
-        )
-        raise HTTPException(
-            status_code=500,
-            detail=f"AIVMX ファイルのダウンロードに失敗しました。({last_exception})",
-        ) from last_exception
+            except (httpx.HTTPError, DownloadIntegrityError) as ex:
+                logger.error(f"Failed to download AIVMX file from {url}:", exc_info=ex)  # fmt: skip
+                raise HTTPException(
+                    status_code=500,  # 4xx 系エラーでもサーバー側の問題として 500 を返す
+                    detail=f"AIVMX ファイルのダウンロードに失敗しました。({ex})",
+                ) from ex
+            except OSError as ex:
+                raise self._create_write_error(ex, temp_file_path) from ex
+            logger.info(f"Downloaded AIVMX file from {url}.")
+
+            # ダウンロードした AIVMX ファイルをインストール
+            self._install_temp_file(temp_file_path)
+        finally:
+            temp_file_path.unlink(missing_ok=True)
 
     def update_model(self, aivm_uuid: str) -> None:
         """
@@ -505,3 +600,111 @@ class AivmManager:
         # すべてのインストール済み音声合成モデルの情報を再取得
         ## このメソッドは情報更新後、AivisHub からアップデート情報を再取得してから戻る
         self._repository.update_repository()
+
+        # リスナーにアンインストールを通知する
+        self._notify_model_changed(aivm_uuid)
+
+    def _create_temp_file_path(self) -> Path:
+        """インストール中の AIVMX ファイルを一時的に保存する、インストール先ディレクトリ内のファイルパスを生成する。"""
+
+        return self.installed_models_dir / f".{uuid4().hex}{self.TEMP_FILE_SUFFIX}"
+
+    def _install_temp_file(self, temp_file_path: Path) -> None:
+        """
+        一時ファイルに保存された AIVMX ファイルのメタデータを検証し、インストール先のファイルパスにアトミックに名前変更する。
+
+        Parameters
+        ----------
+        temp_file_path : Path
+            インストール先ディレクトリ内に保存された AIVMX ファイルの一時ファイルのパス
+        """
+
+        # AIVMX ファイルからから AIVM メタデータを取得
+        ## メタデータはファイルの先頭付近のみを読み込んで取得するため、ファイル全体はメモリ上に読み込まない
+        try:
+            with open(temp_file_path, mode="rb") as f:
+                aivm_metadata = read_aivmx_metadata(f)
+            aivm_manifest = aivm_metadata.manifest
+        except aivmlib.AivmValidationError as ex:
+            logger.error("AIVMX file is invalid:", exc_info=ex)
+            raise HTTPException(
+                status_code=422,
+                detail=f"指定された AIVMX ファイルの形式が正しくありません。({ex})",
+            ) from ex
+        except OSError as ex:
+            raise self._create_write_error(ex, temp_file_path) from ex
+
+        # すでに同一 UUID のファイルがインストール済みの場合、同じファイルを更新する
+        ## 手動で .aivmx ファイルをインストール先ディレクトリにコピーしていた (ファイル名が UUID と一致しない) 場合も更新できるよう、
+        ## この場合のみ特別に更新先ファイル名を現在保存されているファイル名に変更する
+        aivm_file_path = self.installed_models_dir / f"{aivm_manifest.uuid}.aivmx"
+        aivm_infos = self.get_installed_aivm_infos()
+        if str(aivm_manifest.uuid) in aivm_infos:
+            logger.info(
+                f"AIVM model {aivm_manifest.uuid} is already installed. Updating..."
+            )
+            # aivm_file_path を現在保存されているファイル名に変更
+            aivm_file_path = aivm_infos[str(aivm_manifest.uuid)].file_path
+
+        # マニフェストバージョンのバリデーション
+        if (
+            aivm_manifest.manifest_version
+            not in self._repository.SUPPORTED_MANIFEST_VERSIONS
+        ):
+            logger.error(
+                f"AIVM manifest version {aivm_manifest.manifest_version} is not supported."
+            )
+            raise HTTPException(
+                status_code=422,
+                detail=f"AIVM マニフェストバージョン {aivm_manifest.manifest_version} には対応していません。",
+            )
+
+        # 音声合成モデルのアーキテクチャのバリデーション
+        if (
+            aivm_manifest.model_architecture
+            not in self._repository.SUPPORTED_MODEL_ARCHITECTURES
+        ):
+            logger.error(
+                f"AIVM model architecture {aivm_manifest.model_architecture} is not supported."
+            )
+            raise HTTPException(
+                status_code=422,
+                detail=f'モデルアーキテクチャ "{aivm_manifest.model_architecture}" には対応していません。',
+            )
+
+        # 一時ファイルをインストール先のファイルパスに名前変更して AIVMX ファイルをインストール
+        ## 同一ディレクトリ内での名前変更はアトミックに行われるため、書き込み途中の AIVMX ファイルが読み込まれることはない
+        ## 通常は重複防止のため "(音声合成モデルの UUID).aivmx" のフォーマットのファイル名でインストールされるが、
+        ## 手動で .aivmx ファイルをインストール先ディレクトリにコピーしても一通り動作するように考慮している
+        logger.info(f"Installing AIVMX file to {aivm_file_path}...")
+        try:
+            os.replace(temp_file_path, aivm_file_path)
+            logger.info(f"Installed AIVMX file to {aivm_file_path}.")
+        except OSError as ex:
+            raise self._create_write_error(ex, aivm_file_path) from ex
+
+        # すべてのインストール済み音声合成モデルの情報を再取得
+        ## このメソッドは情報更新後、AivisHub からアップデート情報を再取得してから戻る
+        self._repository.update_repository()
+
+        # 同一 UUID のモデルを上書き更新した場合に備え、リスナーに変更を通知する
+        self._notify_model_changed(str(aivm_manifest.uuid))
+
+    @staticmethod
+    def _create_write_error(ex: OSError, aivm_file_path: Path) -> HTTPException:
+        """AIVMX ファイルの書き込みに失敗した際に送出する HTTPException を、エラーの原因に応じたメッセージで生成する。"""
+
+        logger.error(f"Failed to write AIVMX file to {aivm_file_path}:", exc_info=ex)
+        error_message = str(ex).lower()
+        if "no space" in error_message:
+            detail = f"AIVMX ファイルの書き込みに失敗しました。ストレージ容量が不足しています。({ex})"
+        elif "permission denied" in error_message:
+            detail = f"AIVMX ファイルの書き込みに失敗しました。インストール先フォルダへのアクセス権限が不足しています。({ex})"
+        elif "read-only" in error_message:
+            detail = f"AIVMX ファイルの書き込みに失敗しました。インストール先フォルダが読み取り専用権限になっています。({ex})"
+        else:
+            detail = f"AIVMX ファイルの書き込みに失敗しました。({ex})"
+        return HTTPException(
+            status_code=500,
+            detail=detail,
+        )
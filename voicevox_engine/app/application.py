@@ -1,7 +1,10 @@
 """ASGI application の生成"""
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 
+import anyio.to_thread
 from fastapi import FastAPI
 
 from voicevox_engine import __version__
@@ -23,7 +26,6 @@ from voicevox_engine.app.routers.preset import generate_preset_router
 from voicevox_engine.app.routers.setting import generate_setting_router
 from voicevox_engine.app.routers.tts_pipeline import generate_tts_pipeline_router
 from voicevox_engine.app.routers.user_dict import generate_user_dict_router
-from voicevox_engine.cancellable_engine import CancellableEngine
 from voicevox_engine.core.core_adapter import CoreCharacter
 from voicevox_engine.core.core_initializer import CoreManager
 from voicevox_engine.engine_manifest import EngineManifest
@@ -32,6 +34,7 @@ from voicevox_engine.preset.preset_manager import PresetManager
 from voicevox_engine.resource_manager import ResourceManager
 from voicevox_engine.setting.model import CorsPolicyMode
 from voicevox_engine.setting.setting_manager import SettingHandler
+from voicevox_engine.tts_pipeline.inference_queue import InferenceQueue
 from voicevox_engine.tts_pipeline.song_engine import SongEngineManager
 from voicevox_engine.tts_pipeline.tts_engine import TTSEngineManager
 from voicevox_engine.user_dict.user_dict_manager import UserDictionary
@@ -49,11 +52,11 @@ def generate_app(
     user_dict: UserDictionary,
     engine_manifest: EngineManifest,
     library_manager: LibraryManager,
-    cancellable_engine: CancellableEngine | None = None,
     character_info_dir: Path | None = None,
     cors_policy_mode: CorsPolicyMode = CorsPolicyMode.localapps,
     allow_origin: list[str] | None = None,
     disable_mutable_api: bool = False,
+    inference_queue: InferenceQueue | None = None,
 ) -> FastAPI:
     """ASGI 'application' 仕様に準拠した AivisSpeech Engine アプリケーションインスタンスを生成する。"""
     if character_info_dir is None:
@@ -63,11 +66,28 @@ def generate_app(
         disable_mutable_api
     )
 
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        # 推論キューで実行順を待機しているリクエストは同期処理用のスレッドプールのスレッドを占有するため、
+        # 実行中・待機中のリクエストで埋まっても他の API を処理できるよう、スレッドプールのスレッド数を引き上げる
+        if (
+            inference_queue is not None
+            and inference_queue.max_concurrency is not None
+            and inference_queue.max_queue_size is not None
+        ):
+            limiter = anyio.to_thread.current_default_thread_limiter()
+            limiter.total_tokens = max(
+                limiter.total_tokens,
+                inference_queue.max_concurrency + inference_queue.max_queue_size + 8,
+            )
+        yield
+
     app = FastAPI(
         title=engine_manifest.name,
         description=f"{engine_manifest.brand_name} の音声合成エンジンです。",
         version=__version__,
         separate_input_output_schemas=False,  # Pydantic V1 のときのスキーマに合わせるため
+        lifespan=lifespan,
     )
     app = configure_middlewares(app, cors_policy_mode, allow_origin)
     app = configure_global_exception_handlers(app)
@@ -90,7 +110,10 @@ def generate_app(
 
     app.include_router(
         generate_tts_pipeline_router(
-            tts_engines, song_engines, preset_manager, cancellable_engine
+            tts_engines,
+            song_engines,
+            preset_manager,
+            inference_queue,
         )
     )
     app.include_router(generate_morphing_router(tts_engines, aivm_manager))
@@ -1,9 +1,17 @@
 """FastAPI dependencies"""
 
 from collections.abc import Callable, Coroutine
-from typing import Any, TypeAlias
+from dataclasses import dataclass
+from typing import Annotated, Any, TypeAlias
 
-from fastapi import HTTPException
+from fastapi import Header, HTTPException, Query, Request
+from pydantic.json_schema import SkipJsonSchema
+
+from voicevox_engine.tts_pipeline.audio_encoder import (
+    AudioFormat,
+    negotiate_audio_format,
+)
+from voicevox_engine.tts_pipeline.inference_queue import InferencePriority
 
 VerifyMutabilityAllowed: TypeAlias = Callable[[], Coroutine[Any, Any, None]]
 
@@ -21,3 +29,83 @@ def generate_mutability_allowed_verifier(
             pass
 
     return verify_mutability_allowed
+
+
+@dataclass(frozen=True)
+class InferenceSchedule:
+    """推論キューでの音声合成リクエストの実行順の決定に利用する情報。"""
+
+    # リクエストで指定された優先度クラス (指定されていない場合は None)
+    priority: InferencePriority | None
+    # リクエスト元のクライアントを識別する文字列
+    client_id: str
+
+
+async def get_inference_schedule(
+    request: Request,
+    priority: Annotated[
+        InferencePriority | SkipJsonSchema[None],
+        Query(
+            description="音声合成リクエストの優先度クラスです。X-Synthesis-Priority ヘッダーでも指定できます。"
+            "指定しない場合、/multi_synthesis では batch 、それ以外では interactive として扱われます。"
+        ),
+    ] = None,
+    x_synthesis_priority: Annotated[
+        InferencePriority | SkipJsonSchema[None],
+        Header(include_in_schema=False),
+    ] = None,
+) -> InferenceSchedule:
+    """音声合成リクエストの優先度クラスと、リクエスト元のクライアントを識別する文字列を取得する。"""
+
+    # Authorization ヘッダーが指定されている場合はトークンで、そうでなければ IP アドレスでクライアントを識別する
+    client_id = request.headers.get("Authorization", "")
+    if client_id == "" and request.client is not None:
+        client_id = request.client.host
+    return InferenceSchedule(
+        priority=priority or x_synthesis_priority,
+        client_id=client_id,
+    )
+
+
+@dataclass(frozen=True)
+class AudioOutputFormat:
+    """音声合成 API が返す音声ファイルの形式とビットレート。"""
+
+    # 音声ファイルの形式
+    audio_format: AudioFormat
+    # 非可逆圧縮形式 (Opus / MP3) の目標ビットレート (kbps) (指定されていない場合は None)
+    bitrate: int | None
+
+
+async def get_audio_output_format(
+    output_format: Annotated[
+        AudioFormat | SkipJsonSchema[None],
+        Query(
+            alias="format",
+            description="返す音声ファイルの形式です (wav: WAV, flac: FLAC, opus: Ogg Opus, mp3: MP3, "
+            "l16: コンテナを持たないビッグエンディアンの 16bit PCM, f32: コンテナを持たないリトルエンディアンの 32bit float PCM) 。"
+            "指定しない場合は Accept ヘッダーに指定されたメディアタイプ (audio/wav, audio/flac, audio/ogg, audio/mpeg, audio/L16, audio/x-raw) から決定し、"
+            "Accept ヘッダーからも決定できない場合は WAV 形式で返します。"
+            "l16 / f32 形式では、サンプリングレートとチャンネル数を X-Audio-Sampling-Rate / X-Audio-Channels ヘッダーで返します。",
+        ),
+    ] = None,
+    bitrate: Annotated[
+        int | SkipJsonSchema[None],
+        Query(
+            ge=6,
+            le=512,
+            description="Ogg Opus / MP3 形式で返す場合の目標ビットレート (kbps) です。"
+            "指定しない場合はエンコーダーの既定値を用います。"
+            "MP3 形式では、指定値以下の規格上のビットレートの固定ビットレートでエンコードされます。",
+        ),
+    ] = None,
+    accept: Annotated[
+        str | SkipJsonSchema[None], Header(include_in_schema=False)
+    ] = None,
+) -> AudioOutputFormat:
+    """音声合成 API が返す音声ファイルの形式を、format パラメータまたは Accept ヘッダーから決定する。"""
+
+    return AudioOutputFormat(
+        audio_format=output_format or negotiate_audio_format(accept),
+        bitrate=bitrate,
+    )
@@ -4,6 +4,7 @@ from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
 from voicevox_engine.core.core_initializer import CoreNotFound
+from voicevox_engine.tts_pipeline.inference_queue import InferenceQueueFullError
 from voicevox_engine.tts_pipeline.tts_engine import (
     MockTTSEngineNotFound,
     TTSEngineNotFound,
@@ -34,4 +35,16 @@ def configure_global_exception_handlers(app: FastAPI) -> FastAPI:
         msg = "モックが見つかりません。エンジンの起動引数 `--enable_mock` を確認してください。"
         return JSONResponse(status_code=422, content={"message": msg})
 
+    # 推論キューの待機数が上限に達しているエラー
+    ## ロードバランサーやクライアントが再試行のタイミングを判断できるよう、Retry-After ヘッダーを付与して 503 を返す
+    @app.exception_handler(InferenceQueueFullError)
+    async def inference_queue_full_exception_handler(
+        request: Request, e: InferenceQueueFullError
+    ) -> JSONResponse:
+        return JSONResponse(
+            status_code=503,
+            content={"message": f"{str(e)}"},
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
     return app
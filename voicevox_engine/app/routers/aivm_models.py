@@ -39,7 +39,7 @@ def generate_aivm_models_router(
         インストール済みのすべての音声合成モデルの情報を返します。
         """
 
-        return aivm_manager.get_installed_aivm_infos()
+        return aivm_manager.get_installed_aivm_infos(load_assets=True)
 
     @router.post(
         "/install",
@@ -87,7 +87,7 @@ def generate_aivm_models_router(
         指定された音声合成モデルの情報を取得します。
         """
 
-        return aivm_manager.get_aivm_info(aivm_uuid)
+        return aivm_manager.get_aivm_info(aivm_uuid, load_assets=True)
 
     @router.post(
         "/{aivm_uuid}/load",
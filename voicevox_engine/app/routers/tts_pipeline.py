@@ -1,17 +1,29 @@
 """音声合成機能を提供する API Router"""
 
+import asyncio
 import io
-import zipfile
-from typing import Annotated, Self
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Annotated, Any, Self
 
+import numpy as np
 import soundfile
-from fastapi import APIRouter, HTTPException, Query, Request, Response
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from numpy.typing import NDArray
 from pydantic import BaseModel, Field
 from pydantic.json_schema import SkipJsonSchema
 
-from voicevox_engine.cancellable_engine import CancellableEngine
+from voicevox_engine.app.dependencies import (
+    AudioOutputFormat,
+    InferenceSchedule,
+    get_audio_output_format,
+    get_inference_schedule,
+)
 from voicevox_engine.core.core_adapter import DeviceSupport
+from voicevox_engine.logging import logger
 from voicevox_engine.metas.Metas import StyleId
 from voicevox_engine.model import AudioQuery
 from voicevox_engine.preset.preset_manager import (
@@ -19,10 +31,28 @@ from voicevox_engine.preset.preset_manager import (
     PresetInternalError,
     PresetManager,
 )
+from voicevox_engine.tts_pipeline.audio_encoder import (
+    AudioFormat,
+    AudioStreamEncoder,
+    encode_wave,
+    get_file_extension,
+    get_media_type,
+    get_raw_audio_headers,
+)
+from voicevox_engine.tts_pipeline.cancellation import (
+    CancellationToken,
+    SynthesisCancelledError,
+    use_cancellation_token,
+)
 from voicevox_engine.tts_pipeline.connect_base64_waves import (
     ConnectBase64WavesException,
     connect_base64_waves,
 )
+from voicevox_engine.tts_pipeline.inference_queue import (
+    InferencePriority,
+    InferenceQueue,
+    InferenceTicket,
+)
 from voicevox_engine.tts_pipeline.kana_converter import ParseKanaError, parse_kana
 from voicevox_engine.tts_pipeline.model import (
     AccentPhrase,
@@ -31,7 +61,36 @@ from voicevox_engine.tts_pipeline.model import (
     Score,
 )
 from voicevox_engine.tts_pipeline.song_engine import SongEngineManager
-from voicevox_engine.tts_pipeline.tts_engine import LATEST_VERSION, TTSEngineManager
+from voicevox_engine.tts_pipeline.tts_engine import (
+    LATEST_VERSION,
+    TTSEngine,
+    TTSEngineManager,
+    split_audio_query_into_sentences,
+)
+from voicevox_engine.utility.zip_stream_utility import ZipStreamWriter
+
+# 音声ファイルを返す API の、OpenAPI スキーマ上のレスポンスの定義
+_AUDIO_RESPONSE_CONTENT: dict[str, Any] = {
+    get_media_type(audio_format): {"schema": {"type": "string", "format": "binary"}}
+    for audio_format in AudioFormat
+}
+
+
+def _generate_audio_headers(
+    output_format: AudioOutputFormat,
+    sampling_rate: int,
+    output_stereo: bool,
+    ticket: InferenceTicket,
+) -> dict[str, str]:
+    """音声ファイルを返すレスポンスの、Content-Type 以外のレスポンスヘッダーを生成する。"""
+    return {
+        **ticket.to_headers(),
+        # 同じ URL でも Accept ヘッダーによって返す形式が変わることを、キャッシュに伝える
+        "Vary": "Accept",
+        **get_raw_audio_headers(
+            output_format.audio_format, sampling_rate, 2 if output_stereo else 1
+        ),
+    }
 
 
 class ParseKanaBadRequest(BaseModel):
@@ -72,11 +131,41 @@ def generate_tts_pipeline_router(
     tts_engines: TTSEngineManager,
     song_engines: SongEngineManager,
     preset_manager: PresetManager,
-    cancellable_engine: CancellableEngine | None,
+    inference_queue: InferenceQueue | None = None,
 ) -> APIRouter:
     """音声合成 API Router を生成する"""
     router = APIRouter()
 
+    # 音声合成リクエストの同時実行数と待機数を制限する推論キュー
+    ## 指定されていない場合は同時実行数・待機数を制限せず、待機情報のレスポンスヘッダーのみ付与する
+    if inference_queue is None:
+        inference_queue = InferenceQueue()
+
+    def synthesize_wave_in_queue(
+        engine: TTSEngine,
+        query: AudioQuery,
+        style_id: StyleId,
+        priority: InferencePriority,
+        client_id: str,
+        cancellation_token: CancellationToken | None = None,
+        enable_interrogative_upspeak: bool = True,
+    ) -> tuple[NDArray[np.float32], InferenceTicket]:
+        """
+        推論キューで実行順が回ってくるまで待機してから音声合成を行い、音声波形と待機情報を返す。
+        同一内容の音声合成結果がキャッシュされている場合は、推論キューで待機せずにキャッシュされた音声波形を返す。
+        """
+        # キャッシュされた音声合成結果の取得には推論を伴わないため、推論中のリクエストの完了を待たずに返す
+        cached_wave = engine.get_cached_wave(query, style_id)
+        if cached_wave is not None:
+            return cached_wave, InferenceTicket(wait_time=0.0, position=0)
+        with inference_queue.enter(priority, client_id, cancellation_token) as ticket:
+            wave = engine.synthesize_wave(
+                query,
+                style_id,
+                enable_interrogative_upspeak=enable_interrogative_upspeak,
+            )
+        return wave, ticket
+
     @router.post(
         "/audio_query",
         tags=["クエリ作成"],
@@ -273,19 +362,15 @@ def generate_tts_pipeline_router(
     @router.post(
         "/synthesis",
         response_class=Response,
-        responses={
-            200: {
-                "content": {
-                    "audio/wav": {"schema": {"type": "string", "format": "binary"}}
-                },
-            }
-        },
+        responses={200: {"content": _AUDIO_RESPONSE_CONTENT}},
         tags=["音声合成"],
         summary="音声合成する",
     )
     def synthesis(
         query: AudioQuery,
         style_id: Annotated[StyleId, Query(alias="speaker")],
+        schedule: Annotated[InferenceSchedule, Depends(get_inference_schedule)],
+        output_format: Annotated[AudioOutputFormat, Depends(get_audio_output_format)],
         enable_interrogative_upspeak: bool = Query(  # noqa: B008
             default=True,
             description="AivisSpeech Engine ではサポートされていないパラメータです (常に無視されます) 。",
@@ -298,83 +383,209 @@ def generate_tts_pipeline_router(
         ] = None,  # fmt: skip # noqa
     ) -> Response:
         """
-        指定されたスタイル ID に紐づく音声合成モデルを用いて音声合成を行います。
+        指定されたスタイル ID に紐づく音声合成モデルを用いて音声合成を行います。<br>
+        音声ファイルの形式 (WAV / FLAC / Ogg Opus / MP3) は format パラメータまたは Accept ヘッダーで指定できます。
         """
         version = core_version or LATEST_VERSION
         engine = tts_engines.get_tts_engine(version)
-        wave = engine.synthesize_wave(
-            query, style_id, enable_interrogative_upspeak=enable_interrogative_upspeak
+        wave, ticket = synthesize_wave_in_queue(
+            engine,
+            query,
+            style_id,
+            schedule.priority or InferencePriority.INTERACTIVE,
+            schedule.client_id,
+            enable_interrogative_upspeak=enable_interrogative_upspeak,
         )
 
-        buffer = io.BytesIO()
-        soundfile.write(
-            file=buffer, data=wave, samplerate=query.outputSamplingRate, format="WAV"
+        audio_file = encode_wave(
+            wave,
+            query.outputSamplingRate,
+            output_format.audio_format,
+            output_format.bitrate,
         )
 
-        return Response(buffer.getvalue(), media_type="audio/wav")
+        return Response(
+            audio_file,
+            media_type=get_media_type(
+                output_format.audio_format,
+                query.outputSamplingRate,
+                2 if query.outputStereo else 1,
+            ),
+            headers=_generate_audio_headers(
+                output_format, query.outputSamplingRate, query.outputStereo, ticket
+            ),
+        )
+
+    @router.post(
+        "/synthesis_stream",
+        response_class=StreamingResponse,
+        responses={200: {"content": _AUDIO_RESPONSE_CONTENT}},
+        tags=["音声合成"],
+        summary="1 文ずつ音声合成し、生成できた順にストリーミングで返す",
+    )
+    def synthesis_stream(
+        query: AudioQuery,
+        style_id: Annotated[StyleId, Query(alias="speaker")],
+        schedule: Annotated[InferenceSchedule, Depends(get_inference_schedule)],
+        output_format: Annotated[AudioOutputFormat, Depends(get_audio_output_format)],
+        enable_interrogative_upspeak: bool = Query(  # noqa: B008
+            default=True,
+            description="AivisSpeech Engine ではサポートされていないパラメータです (常に無視されます) 。",
+        ),
+        core_version: Annotated[
+            str | SkipJsonSchema[None],
+            Query(
+                description="AivisSpeech Engine ではサポートされていないパラメータです (常に無視されます) 。"
+            ),
+        ] = None,  # fmt: skip # noqa
+    ) -> StreamingResponse:
+        """
+        指定されたスタイル ID に紐づく音声合成モデルを用いて、読み上げテキストを文末記号で区切った 1 文ずつ音声合成を行います。<br>
+        1 文の音声合成が完了するたびにエンコードできた音声データを送信するため、長い文章でも最初の 1 文の音声合成が終わり次第再生を開始できます。<br>
+        WAV 形式のレスポンスは、全体の長さが不明な WAV 形式 (RIFF / data チャンクのサイズが 0xFFFFFFFF) で返されます。<br>
+        format パラメータまたは Accept ヘッダーで、FLAC / Ogg Opus / MP3 形式を指定することもできます。
+        """
+        version = core_version or LATEST_VERSION
+        engine = tts_engines.get_tts_engine(version)
+
+        priority = schedule.priority or InferencePriority.INTERACTIVE
+        sentence_queries = iter(split_audio_query_into_sentences(query))
+
+        def synthesize_next_wave() -> tuple[NDArray[np.float32] | None, InferenceTicket]:  # fmt: skip
+            # 推論キューの実行順は 1 文の音声合成ごとに確保・解放する
+            ## クライアントが音声データを受信し終えるまでの間は実行順を保持せず、他のリクエストに譲る
+            sentence_query = next(sentence_queries, None)
+            if sentence_query is None:
+                return None, InferenceTicket(wait_time=0.0, position=0)
+            return synthesize_wave_in_queue(
+                engine,
+                sentence_query,
+                style_id,
+                priority,
+                schedule.client_id,
+                enable_interrogative_upspeak=enable_interrogative_upspeak,
+            )
+
+        # 最初の 1 文はレスポンスを返す前に音声合成し、音声合成時のエラーを通常の HTTP エラーとして返せるようにする
+        first_wave, ticket = synthesize_next_wave()
+
+        def generate_wave_stream() -> Iterator[bytes | memoryview]:
+            encoder = AudioStreamEncoder(
+                output_format.audio_format,
+                sampling_rate=query.outputSamplingRate,
+                num_channels=2 if query.outputStereo else 1,
+                bitrate=output_format.bitrate,
+            )
+            if first_wave is not None:
+                yield encoder.encode(first_wave)
+            while (wave := synthesize_next_wave()[0]) is not None:
+                yield encoder.encode(wave)
+            yield encoder.close()
+
+        return StreamingResponse(
+            generate_wave_stream(),
+            media_type=get_media_type(
+                output_format.audio_format,
+                query.outputSamplingRate,
+                2 if query.outputStereo else 1,
+            ),
+            headers=_generate_audio_headers(
+                output_format, query.outputSamplingRate, query.outputStereo, ticket
+            ),
+        )
 
     @router.post(
         "/cancellable_synthesis",
         response_class=Response,
-        responses={
-            200: {
-                "content": {
-                    "audio/wav": {"schema": {"type": "string", "format": "binary"}}
-                },
-            }
-        },
+        responses={200: {"content": _AUDIO_RESPONSE_CONTENT}},
         tags=["音声合成"],
-        # summary="音声合成する（キャンセル可能）",
-        summary="AivisSpeech Engine ではサポートされていない API です (常に 501 Not Implemented を返します)",
+        summary="音声合成する（キャンセル可能）",
     )
-    def cancellable_synthesis(
+    async def cancellable_synthesis(
         query: AudioQuery,
         request: Request,
         style_id: Annotated[StyleId, Query(alias="speaker")],
+        schedule: Annotated[InferenceSchedule, Depends(get_inference_schedule)],
+        output_format: Annotated[AudioOutputFormat, Depends(get_audio_output_format)],
         core_version: Annotated[
             str | SkipJsonSchema[None],
             Query(
                 description="AivisSpeech Engine ではサポートされていないパラメータです (常に無視されます) 。"
             ),
         ] = None,  # fmt: skip # noqa
-    ) -> FileResponse:
-        raise HTTPException(
-            status_code=501,
-            detail="Cancelable synthesis is not supported in AivisSpeech Engine.",
-        )
+    ) -> Response:
         """
-        if cancellable_engine is None:
-            raise HTTPException(
-                status_code=404,
-                detail="実験的機能はデフォルトで無効になっています。使用するには引数を指定してください。",
-            )
-        try:
-            version = core_version or LATEST_VERSION
-            f_name = cancellable_engine.synthesize_wave(
-                query, style_id, request, version=version
-            )
-        except CancellableEngineInternalError as e:
-            raise HTTPException(status_code=500, detail=str(e)) from e
+        指定されたスタイル ID に紐づく音声合成モデルを用いて音声合成を行います。<br>
+        音声合成が完了する前にクライアントが接続を切断した場合、実行順を待機中の音声合成リクエストは破棄され、推論中の音声合成処理は中断されます。<br>
+        音声ファイルの形式 (WAV / FLAC / Ogg Opus / MP3) は format パラメータまたは Accept ヘッダーで指定できます。
+        """
+        version = core_version or LATEST_VERSION
+        engine = tts_engines.get_tts_engine(version)
+        # VOICEVOX ENGINE の CancellableEngine (--enable_cancellable_synthesis) のように音声合成をサブプロセスで実行するのではなく、
+        # プロセス内の音声合成処理にキャンセル要求のトークンを渡して協調的にキャンセルするため、常に有効になっている
+        cancellation_token = CancellationToken()
+
+        def synthesize() -> tuple[NDArray[np.float32], InferenceTicket]:
+            with use_cancellation_token(cancellation_token):
+                return synthesize_wave_in_queue(
+                    engine,
+                    query,
+                    style_id,
+                    schedule.priority or InferencePriority.INTERACTIVE,
+                    schedule.client_id,
+                    cancellation_token,
+                )
 
-        if f_name == "":
-            raise HTTPException(status_code=422, detail="不明なバージョンです")
+        async def watch_disconnection() -> None:
+            # クライアントが接続を切断したら、待機中・推論中の音声合成処理をキャンセルする
+            while await request.is_disconnected() is False:
+                await asyncio.sleep(0.1)
+            logger.info("Client disconnected. Cancelling synthesis...")
+            cancellation_token.cancel()
 
-        return FileResponse(
-            f_name,
-            media_type="audio/wav",
-            background=BackgroundTask(try_delete_file, f_name),
+        # 音声合成処理はイベントループをブロックしないよう、スレッドプールで実行する
+        watcher = asyncio.create_task(watch_disconnection())
+        try:
+            wave, ticket = await run_in_threadpool(synthesize)
+        except SynthesisCancelledError as ex:
+            # クライアントは既に切断しているため、このレスポンスが届くことはない
+            raise HTTPException(
+                status_code=499, detail="Synthesis was cancelled."
+            ) from ex
+        finally:
+            watcher.cancel()
+
+        # FLAC / Ogg Opus / MP3 へのエンコードは長い音声では時間がかかるため、同様にスレッドプールで実行する
+        audio_file = await run_in_threadpool(
+            encode_wave,
+            wave,
+            query.outputSamplingRate,
+            output_format.audio_format,
+            output_format.bitrate,
+        )
+
+        return Response(
+            audio_file,
+            media_type=get_media_type(
+                output_format.audio_format,
+                query.outputSamplingRate,
+                2 if query.outputStereo else 1,
+            ),
+            headers=_generate_audio_headers(
+                output_format, query.outputSamplingRate, query.outputStereo, ticket
+            ),
         )
-        """
 
     @router.post(
         "/multi_synthesis",
-        response_class=Response,
+        response_class=StreamingResponse,
         responses={
             200: {
                 "content": {
                     "application/zip": {
                         "schema": {"type": "string", "format": "binary"}
-                    }
+                    },
+                    **_AUDIO_RESPONSE_CONTENT,
                 },
             }
         },
@@ -384,39 +595,142 @@ def generate_tts_pipeline_router(
     def multi_synthesis(
         queries: list[AudioQuery],
         style_id: Annotated[StyleId, Query(alias="speaker")],
+        schedule: Annotated[InferenceSchedule, Depends(get_inference_schedule)],
+        output_format: Annotated[AudioOutputFormat, Depends(get_audio_output_format)],
+        concatenate: bool = Query(  # noqa: B008
+            default=False,
+            description=(
+                "true を指定すると、ZIP ファイルの代わりに、すべてのクエリの音声をクエリ順に連結した 1 つの音声ファイルを返します。"
+                "すべてのクエリで outputSamplingRate と outputStereo が同じである必要があります。"
+            ),
+        ),
         core_version: Annotated[
             str | SkipJsonSchema[None],
             Query(
                 description="AivisSpeech Engine ではサポートされていないパラメータです (常に無視されます) 。"
             ),
         ] = None,  # fmt: skip # noqa
-    ) -> Response:
+    ) -> StreamingResponse:
+        """
+        指定されたスタイル ID に紐づく音声合成モデルを用いて、複数のクエリをまとめて音声合成を行います。<br>
+        クエリは同時に推論できる数まで並列に音声合成され、クエリ順に 1 件音声合成が完了するたびに、その音声ファイルを ZIP ファイルのエントリとしてストリーミングで送信します。<br>
+        concatenate に true を指定した場合は、すべてのクエリの音声を連結した 1 つの音声ファイルをストリーミングで返します (WAV 形式の場合は RIFF / data チャンクのサイズが 0xFFFFFFFF の、全体の長さが不明な WAV 形式になります) 。<br>
+        音声ファイルの形式は format パラメータまたは Accept ヘッダーで指定できます。<br>
+        2 件目以降のクエリの音声合成に失敗した場合は、その時点で接続が切断されます。
+        """
         version = core_version or LATEST_VERSION
         engine = tts_engines.get_tts_engine(version)
+
+        if len(queries) == 0:
+            raise HTTPException(status_code=422, detail="クエリが指定されていません")
         sampling_rate = queries[0].outputSamplingRate
+        output_stereo = queries[0].outputStereo
+        # ストリーミングの開始後にはエラーを返せないため、音声合成を始める前にすべてのクエリを検証する
+        if any(query.outputSamplingRate != sampling_rate for query in queries):
+            raise HTTPException(
+                status_code=422,
+                detail="サンプリングレートが異なるクエリがあります",
+            )
+        if concatenate and any(query.outputStereo != output_stereo for query in queries):  # fmt: skip
+            raise HTTPException(
+                status_code=422,
+                detail="ステレオ出力の設定が異なるクエリがあります",
+            )
 
-        buffer = io.BytesIO()
-        with zipfile.ZipFile(buffer, mode="a") as zip_file:
-            for i in range(len(queries)):
-                if queries[i].outputSamplingRate != sampling_rate:
-                    raise HTTPException(
-                        status_code=422,
-                        detail="サンプリングレートが異なるクエリがあります",
-                    )
-
-                wav_file_buffer = io.BytesIO()
-                wave = engine.synthesize_wave(queries[i], style_id)
-                soundfile.write(
-                    file=wav_file_buffer,
-                    data=wave,
-                    samplerate=sampling_rate,
-                    format="WAV",
+        priority = schedule.priority or InferencePriority.BATCH
+
+        def synthesize(query: AudioQuery) -> tuple[NDArray[np.float32], InferenceTicket]:  # fmt: skip
+            # 1 件音声合成するごとに推論キューの実行順を譲り、
+            # 大量のクエリを含むリクエストの処理中でも、後から来た優先度の高いリクエストを先に実行できるようにする
+            return synthesize_wave_in_queue(
+                engine, query, style_id, priority, schedule.client_id
+            )
+
+        # 推論キューで同時に実行できる数まで、クエリを並列に音声合成する
+        ## 音声合成結果はクエリ順に送信するため、先行して音声合成するクエリの数を同時実行数までに抑え、
+        ## クエリの数に関わらず、メモリ上に保持する音声波形の数を一定に保つ
+        concurrency = min(len(queries), inference_queue.max_concurrency or 1)
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        pending_queries = iter(queries)
+        futures: deque[Future[tuple[NDArray[np.float32], InferenceTicket]]] = deque()
+
+        def submit_next_query() -> None:
+            query = next(pending_queries, None)
+            if query is not None:
+                futures.append(executor.submit(synthesize, query))
+
+        def next_wave() -> tuple[NDArray[np.float32], InferenceTicket]:
+            result = futures.popleft().result()
+            submit_next_query()
+            return result
+
+        for _ in range(concurrency):
+            submit_next_query()
+        try:
+            # 最初のクエリはレスポンスを返す前に音声合成し、音声合成時のエラーを通常の HTTP エラーとして返せるようにする
+            first_wave, first_ticket = next_wave()
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+        def iterate_waves() -> Iterator[NDArray[np.float32]]:
+            yield first_wave
+            while len(futures) > 0:
+                yield next_wave()[0]
+
+        def generate_zip_stream() -> Iterator[bytes]:
+            zip_writer = ZipStreamWriter()
+            file_extension = get_file_extension(output_format.audio_format)
+            for index, wave in enumerate(iterate_waves()):
+                audio_file = encode_wave(
+                    wave,
+                    sampling_rate,
+                    output_format.audio_format,
+                    output_format.bitrate,
                 )
-                zip_file.writestr(
-                    f"{str(i + 1).zfill(3)}.wav", wav_file_buffer.getvalue()
+                yield zip_writer.write_file(
+                    f"{str(index + 1).zfill(3)}.{file_extension}", audio_file
                 )
+            yield zip_writer.close()
+
+        def generate_wave_stream() -> Iterator[bytes | memoryview]:
+            encoder = AudioStreamEncoder(
+                output_format.audio_format,
+                sampling_rate=sampling_rate,
+                num_channels=2 if output_stereo else 1,
+                bitrate=output_format.bitrate,
+            )
+            for wave in iterate_waves():
+                yield encoder.encode(wave)
+            yield encoder.close()
 
-        return Response(buffer.getvalue(), media_type="application/zip")
+        def generate_stream() -> Iterator[bytes | memoryview]:
+            try:
+                yield from generate_wave_stream() if concatenate else generate_zip_stream()  # fmt: skip
+            finally:
+                # クライアントが途中で切断した場合も含め、まだ始まっていない音声合成を取り消す
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        # レスポンスヘッダーには、最初のクエリの待機情報を設定する
+        return StreamingResponse(
+            generate_stream(),
+            media_type=(
+                get_media_type(
+                    output_format.audio_format,
+                    sampling_rate,
+                    2 if output_stereo else 1,
+                )
+                if concatenate
+                else "application/zip"
+            ),
+            headers=(
+                _generate_audio_headers(
+                    output_format, sampling_rate, output_stereo, first_ticket
+                )
+                if concatenate
+                else {**first_ticket.to_headers(), "Vary": "Accept"}
+            ),
+        )
 
     @router.post(
         "/sing_frame_audio_query",
@@ -652,7 +966,8 @@ def generate_tts_pipeline_router(
     ) -> None:
         """
         指定されたスタイル ID に紐づく音声合成モデルをロードします。<br>
-        実行しなくても他の API は利用できますが、音声合成の初回実行時に時間がかかることがあります。
+        実行しなくても他の API は利用できますが、音声合成の初回実行時に時間がかかることがあります。<br>
+        エンジンの起動時に --warm_up_models が指定されている場合は、ロードした音声合成モデルのウォームアップが完了してから応答します。
         """
         version = core_version or LATEST_VERSION
         engine = tts_engines.get_tts_engine(version)
@@ -0,0 +1,155 @@
+"""起動処理の完了前から接続を受け付けるための、AivisSpeech Engine アプリケーションのラッパー"""
+
+import asyncio
+import threading
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from voicevox_engine.logging import logger
+
+__all__ = ["StartupApplication"]
+
+
+class StartupApplication:
+    """
+    起動処理の完了前から HTTP サーバーを起動し、接続を受け付けるための ASGI アプリケーションのラッパー。
+
+    起動処理の完了後に set_app() で設定された AivisSpeech Engine アプリケーションにすべてのリクエストを委譲する。
+    起動処理の完了前に届いたリクエストは、起動処理の完了まで待機させてから処理する。
+    起動状態の確認用の STATUS_PATH へのリクエストには常に即座に応答し、各段階の起動状態を返す。
+    (すべての段階の起動が完了していれば 200 、完了していなければ 503 を返す)
+    """
+
+    # 起動状態の確認用のパス
+    STATUS_PATH = "/startup_status"
+
+    def __init__(self, get_status: Callable[[], Mapping[str, str]]) -> None:
+        """
+        StartupApplication のコンストラクタ
+
+        Parameters
+        ----------
+        get_status : Callable[[], Mapping[str, str]]
+            起動処理の各段階の状態 (キー: 段階の名前) を返す関数
+        """
+
+        self._get_status = get_status
+        self._lock = threading.Lock()
+        self._app: ASGIApp | None = None
+        self._startup_error: BaseException | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # AivisSpeech Engine アプリケーションの lifespan の startup が完了した (または起動処理が失敗した) ときにセットされる
+        self._ready = asyncio.Event()
+        self._lifespan_task: asyncio.Task[None] | None = None
+        self._lifespan_messages: asyncio.Queue[Message] = asyncio.Queue()
+
+    def set_app(self, app: ASGIApp) -> None:
+        """
+        起動処理の完了後に、リクエストの委譲先となる AivisSpeech Engine アプリケーションを設定する。
+        任意のスレッドから呼び出せる。
+
+        Parameters
+        ----------
+        app : ASGIApp
+            AivisSpeech Engine アプリケーション
+        """
+
+        with self._lock:
+            self._app = app
+            loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._start_app_lifespan)
+
+    def set_startup_error(self, error: BaseException) -> None:
+        """
+        起動処理が失敗したことを設定する。待機中のリクエストには 503 エラーを返す。
+        任意のスレッドから呼び出せる。
+
+        Parameters
+        ----------
+        error : BaseException
+            起動処理で発生した例外
+        """
+
+        with self._lock:
+            self._startup_error = error
+            loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._ready.set)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """ASGI アプリケーションとしてリクエストを処理する。"""
+
+        if scope["type"] == "lifespan":
+            await self._handle_lifespan(receive, send)
+            return
+
+        # 起動状態の確認用のパスへのリクエストには即座に応答する
+        if scope["type"] == "http" and scope["path"] == self.STATUS_PATH:
+            is_ready = self._ready.is_set() and self._startup_error is None
+            status_response = JSONResponse(
+                {"ready": is_ready, "stages": dict(self._get_status())},
+                status_code=200 if is_ready else 503,
+            )
+            await status_response(scope, receive, send)
+            return
+
+        # 起動処理の完了まで待機してから、AivisSpeech Engine アプリケーションに委譲する
+        await self._ready.wait()
+        if self._startup_error is not None or self._app is None:
+            if scope["type"] == "http":
+                error_response = PlainTextResponse("Engine startup failed.", status_code=503)  # fmt: skip
+                await error_response(scope, receive, send)
+            return
+        await self._app(scope, receive, send)
+
+    async def _handle_lifespan(self, receive: Receive, send: Send) -> None:
+        """HTTP サーバーの lifespan イベントを処理し、AivisSpeech Engine アプリケーションの lifespan イベントに中継する。"""
+
+        message = await receive()
+        assert message["type"] == "lifespan.startup"
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            app = self._app
+            startup_error = self._startup_error
+        # HTTP サーバーの起動前に起動処理が完了していた場合
+        if startup_error is not None:
+            self._ready.set()
+        elif app is not None:
+            self._start_app_lifespan()
+        await send({"type": "lifespan.startup.complete"})
+
+        message = await receive()
+        assert message["type"] == "lifespan.shutdown"
+        if self._lifespan_task is not None:
+            await self._lifespan_messages.put({"type": "lifespan.shutdown"})
+            await self._lifespan_task
+        await send({"type": "lifespan.shutdown.complete"})
+
+    def _start_app_lifespan(self) -> None:
+        """AivisSpeech Engine アプリケーションの lifespan の startup を開始する。イベントループ上で呼び出す必要がある。"""
+
+        app = self._app
+        assert app is not None
+        if self._lifespan_task is not None:
+            return
+
+        async def send(message: Message) -> None:
+            if message["type"] == "lifespan.startup.failed":
+                logger.error(f"Application startup failed: {message.get('message')}")
+                self._startup_error = RuntimeError(message.get("message"))
+            if message["type"] in ("lifespan.startup.complete", "lifespan.startup.failed"):  # fmt: skip
+                self._ready.set()
+
+        async def run_lifespan() -> None:
+            scope: dict[str, Any] = {"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}  # fmt: skip
+            await self._lifespan_messages.put({"type": "lifespan.startup"})
+            try:
+                await app(scope, self._lifespan_messages.get, send)
+            finally:
+                self._ready.set()
+
+        self._lifespan_task = asyncio.get_running_loop().create_task(run_lifespan())
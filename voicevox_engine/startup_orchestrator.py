@@ -0,0 +1,191 @@
+"""エンジン起動時の各段階の処理を、依存関係に従って並行に実行するオーケストレーター"""
+
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from voicevox_engine.logging import logger
+
+__all__ = ["StartupOrchestrator", "StartupStageStatus"]
+
+StartupStageStatus = Literal["pending", "running", "ready", "failed"]
+
+
+@dataclass
+class _StartupStage:
+    """起動処理の 1 つの段階"""
+
+    name: str
+    function: Callable[..., Any]
+    dependencies: list[str]
+    future: Future[Any] = field(default_factory=Future)
+    status: StartupStageStatus = "pending"
+    started_at: float | None = None
+    finished_at: float | None = None
+
+
+class StartupOrchestrator:
+    """
+    エンジン起動時の各段階の処理 (モデルのスキャン・BERT モデルのロード・ユーザー辞書のコンパイルなど) を、
+    依存関係に従って並行に実行するオーケストレーター。
+
+    各段階は依存するすべての段階が完了した時点でスレッドプール上で開始され、依存する段階の戻り値を引数として受け取る。
+    各段階の状態は起動中でも取得でき、すべての段階の完了後は各段階の所要時間をまとめたレポートをログに出力する。
+    """
+
+    def __init__(self) -> None:
+        self._stages: dict[str, _StartupStage] = {}
+        self._lock = threading.Lock()
+        self._started_at: float | None = None
+        self._executor: ThreadPoolExecutor | None = None
+
+    def add_stage(
+        self,
+        name: str,
+        function: Callable[..., Any],
+        dependencies: list[str] | None = None,
+    ) -> None:
+        """
+        起動処理の段階を追加する。
+
+        Parameters
+        ----------
+        name : str
+            段階の名前
+        function : Callable[..., Any]
+            段階の処理 (dependencies に指定した段階の戻り値を、その順で位置引数として受け取る)
+        dependencies : list[str] | None, default None
+            この段階の開始前に完了している必要がある段階の名前のリスト (先に追加されている必要がある)
+        """
+
+        if name in self._stages:
+            raise ValueError(f"Startup stage {name} is already added.")
+        for dependency in dependencies or []:
+            if dependency not in self._stages:
+                raise ValueError(f"Unknown startup stage: {dependency}")
+        self._stages[name] = _StartupStage(name, function, list(dependencies or []))
+
+    def run(self) -> dict[str, Any]:
+        """
+        すべての段階を依存関係に従って並行に実行し、完了まで待機する。
+        いずれかの段階が失敗した場合は、その段階に依存する段階を実行せずに、失敗した段階のうち最初に追加された段階の例外を送出する。
+
+        Returns
+        -------
+        dict[str, Any]
+            各段階の戻り値 (キー: 段階の名前)
+        """
+
+        self._started_at = time.perf_counter()
+        with ThreadPoolExecutor(
+            max_workers=max(len(self._stages), 1), thread_name_prefix="startup"
+        ) as executor:
+            self._executor = executor
+            with self._lock:
+                for stage in self._stages.values():
+                    if len(stage.dependencies) == 0:
+                        self._start_stage(stage)
+
+            # 失敗した段階があっても、実行中の段階の完了を待ってからレポートを出力する
+            wait([stage.future for stage in self._stages.values()])
+            self._executor = None
+
+        self.log_report()
+        for stage in self._stages.values():
+            exception = stage.future.exception()
+            if exception is not None:
+                raise exception
+        return {name: stage.future.result() for name, stage in self._stages.items()}
+
+    def get_status(self) -> dict[str, StartupStageStatus]:
+        """
+        各段階の状態を取得する。
+
+        Returns
+        -------
+        dict[str, StartupStageStatus]
+            各段階の状態 (キー: 段階の名前)
+        """
+
+        with self._lock:
+            return {name: stage.status for name, stage in self._stages.items()}
+
+    def log_report(self) -> None:
+        """各段階の開始時刻・所要時間と、起動処理全体の所要時間をログに出力する。"""
+
+        if self._started_at is None:
+            return
+        lines: list[str] = []
+        finished_at = self._started_at
+        total_stage_time = 0.0
+        with self._lock:
+            for stage in self._stages.values():
+                if stage.started_at is None or stage.finished_at is None:
+                    lines.append(f"- {stage.name}: {stage.status}")
+                    continue
+                finished_at = max(finished_at, stage.finished_at)
+                total_stage_time += stage.finished_at - stage.started_at
+                lines.append(
+                    f"- {stage.name}: {stage.status} "
+                    f"(Start: +{stage.started_at - self._started_at:.2f}s, "
+                    f"Duration: {stage.finished_at - stage.started_at:.2f}s)"
+                )
+        logger.info(
+            f"Startup timing report (Total: {finished_at - self._started_at:.2f}s, "
+            f"Sum of stages: {total_stage_time:.2f}s):\n" + "\n".join(lines)
+        )
+
+    def _start_stage(self, stage: _StartupStage) -> None:
+        """段階の処理をスレッドプール上で開始する。self._lock を取得した状態で呼び出す必要がある。"""
+
+        assert self._executor is not None
+        stage.status = "running"
+        arguments = [self._stages[dependency].future.result() for dependency in stage.dependencies]  # fmt: skip
+
+        def run_stage() -> None:
+            stage.started_at = time.perf_counter()
+            try:
+                result = stage.function(*arguments)
+            except BaseException as ex:
+                stage.finished_at = time.perf_counter()
+                stage.future.set_exception(ex)
+                self._on_stage_finished(stage, "failed")
+                return
+            stage.finished_at = time.perf_counter()
+            stage.future.set_result(result)
+            self._on_stage_finished(stage, "ready")
+
+        self._executor.submit(run_stage)
+
+    def _on_stage_finished(
+        self, stage: _StartupStage, status: StartupStageStatus
+    ) -> None:
+        """段階の完了時に状態を更新し、依存するすべての段階が完了した段階を開始する。"""
+
+        with self._lock:
+            stage.status = status
+            if status == "failed":
+                self._skip_dependent_stages(stage)
+                return
+            for next_stage in self._stages.values():
+                if next_stage.status == "pending" and all(
+                    self._stages[dependency].status == "ready"
+                    for dependency in next_stage.dependencies
+                ):
+                    self._start_stage(next_stage)
+
+    def _skip_dependent_stages(self, stage: _StartupStage) -> None:
+        """失敗した段階に依存する段階を、実行せずに再帰的に失敗扱いとする。self._lock を取得した状態で呼び出す必要がある。"""
+
+        for next_stage in self._stages.values():
+            if next_stage.status == "pending" and stage.name in next_stage.dependencies:
+                next_stage.status = "failed"
+                next_stage.future.set_exception(
+                    RuntimeError(
+                        f"Startup stage {next_stage.name} was skipped because {stage.name} failed."
+                    )  # fmt: skip
+                )
+                self._skip_dependent_stages(next_stage)
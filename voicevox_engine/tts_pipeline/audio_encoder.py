@@ -0,0 +1,464 @@
+"""音声波形を WAV / FLAC / Ogg Opus / MP3 形式の音声ファイル、またはコンテナを持たない生の PCM データにエンコードする。"""
+
+import io
+from dataclasses import dataclass
+from enum import Enum
+
+import numpy as np
+import soundfile
+import soxr
+from numpy.typing import NDArray
+
+from .wave_stream import generate_streaming_wav_header, wave_to_pcm16_bytes
+
+__all__ = [
+    "AudioFormat",
+    "AudioStreamEncoder",
+    "encode_wave",
+    "get_file_extension",
+    "get_media_type",
+    "get_raw_audio_headers",
+    "negotiate_audio_format",
+]
+
+
+class AudioFormat(str, Enum):
+    """音声合成 API が出力する音声ファイルの形式。"""
+
+    # 16bit PCM の WAV (非圧縮)
+    WAV = "wav"
+    # 16bit の FLAC (可逆圧縮)
+    FLAC = "flac"
+    # Ogg コンテナに格納した Opus (非可逆圧縮)
+    OPUS = "opus"
+    # MPEG-1/2 Audio Layer III (非可逆圧縮)
+    MP3 = "mp3"
+    # コンテナを持たない、ビッグエンディアンの 16bit PCM (RFC 2586 の audio/L16)
+    L16 = "l16"
+    # コンテナを持たない、リトルエンディアンの 32bit float PCM (音声波形のバッファをそのまま送信する)
+    F32 = "f32"
+
+
+@dataclass(frozen=True)
+class _AudioFormatInfo:
+    """音声ファイルの形式ごとの情報"""
+
+    # レスポンスの Content-Type
+    media_type: str
+    # ファイルの拡張子 (先頭の . を除く)
+    file_extension: str
+    # libsndfile (soundfile) に渡すフォーマットとサブタイプ (コンテナを持たない生の PCM データの場合は None)
+    soundfile_format: str | None
+    soundfile_subtype: str | None
+    # コンテナを持たない生の PCM データのサンプルの型 (numpy の dtype 文字列)
+    raw_dtype: str | None = None
+    # エンコードできるサンプリングレート (None の場合は任意のサンプリングレートに対応する)
+    supported_sampling_rates: tuple[int, ...] | None = None
+    # エンコードできないサンプリングレートが指定された場合に、リサンプリングする先のサンプリングレート
+    fallback_sampling_rate: int = 48000
+
+
+# Opus / MP3 のエンコーダーが対応しているサンプリングレート
+_OPUS_SAMPLING_RATES = (8000, 12000, 16000, 24000, 48000)
+_MP3_SAMPLING_RATES = (8000, 11025, 12000, 16000, 22050, 24000, 32000, 44100, 48000)
+
+_AUDIO_FORMAT_INFOS: dict[AudioFormat, _AudioFormatInfo] = {
+    AudioFormat.WAV: _AudioFormatInfo("audio/wav", "wav", "WAV", "PCM_16"),
+    AudioFormat.FLAC: _AudioFormatInfo("audio/flac", "flac", "FLAC", "PCM_16"),
+    AudioFormat.OPUS: _AudioFormatInfo(
+        "audio/ogg",
+        "ogg",
+        "OGG",
+        "OPUS",
+        supported_sampling_rates=_OPUS_SAMPLING_RATES,
+        fallback_sampling_rate=48000,
+    ),
+    AudioFormat.MP3: _AudioFormatInfo(
+        "audio/mpeg",
+        "mp3",
+        "MP3",
+        "MPEG_LAYER_III",
+        supported_sampling_rates=_MP3_SAMPLING_RATES,
+        fallback_sampling_rate=44100,
+    ),
+    AudioFormat.L16: _AudioFormatInfo("audio/L16", "l16", None, None, raw_dtype=">i2"),
+    AudioFormat.F32: _AudioFormatInfo(
+        "audio/x-raw", "f32", None, None, raw_dtype="<f4"
+    ),
+}
+
+# Accept ヘッダーに指定されるメディアタイプと、音声ファイルの形式の対応
+_MEDIA_TYPE_TO_AUDIO_FORMAT: dict[str, AudioFormat] = {
+    "audio/wav": AudioFormat.WAV,
+    "audio/wave": AudioFormat.WAV,
+    "audio/x-wav": AudioFormat.WAV,
+    "audio/vnd.wave": AudioFormat.WAV,
+    "audio/flac": AudioFormat.FLAC,
+    "audio/x-flac": AudioFormat.FLAC,
+    "audio/ogg": AudioFormat.OPUS,
+    "audio/opus": AudioFormat.OPUS,
+    "audio/mpeg": AudioFormat.MP3,
+    "audio/mp3": AudioFormat.MP3,
+    "audio/l16": AudioFormat.L16,
+    "audio/x-raw": AudioFormat.F32,
+}
+
+
+def get_media_type(
+    audio_format: AudioFormat,
+    sampling_rate: int | None = None,
+    num_channels: int | None = None,
+) -> str:
+    """
+    音声ファイルの形式に対応するレスポンスの Content-Type を返す。
+    生の PCM データの形式でサンプリングレートとチャンネル数が指定された場合は、それらをパラメータとして付与する。
+    """
+
+    info = _AUDIO_FORMAT_INFOS[audio_format]
+    if info.raw_dtype is None or sampling_rate is None or num_channels is None:
+        return info.media_type
+    if audio_format == AudioFormat.F32:
+        # GStreamer の audio/x-raw のメディアタイプの表記に倣い、サンプルの形式をパラメータで示す
+        return f"{info.media_type};format=F32LE;rate={sampling_rate};channels={num_channels}"  # fmt: skip
+    return f"{info.media_type};rate={sampling_rate};channels={num_channels}"
+
+
+def get_raw_audio_headers(
+    audio_format: AudioFormat, sampling_rate: int, num_channels: int
+) -> dict[str, str]:
+    """
+    生の PCM データの形式の場合に、サンプリングレートとチャンネル数を示すレスポンスヘッダーを返す。
+    (コンテナを持つ形式の場合は空の辞書を返す)
+    """
+
+    if _AUDIO_FORMAT_INFOS[audio_format].raw_dtype is None:
+        return {}
+    return {
+        "X-Audio-Sampling-Rate": str(sampling_rate),
+        "X-Audio-Channels": str(num_channels),
+    }
+
+
+def get_file_extension(audio_format: AudioFormat) -> str:
+    """音声ファイルの形式に対応するファイルの拡張子 (先頭の . を除く) を返す。"""
+    return _AUDIO_FORMAT_INFOS[audio_format].file_extension
+
+
+def negotiate_audio_format(accept: str | None) -> AudioFormat:
+    """
+    Accept ヘッダーの値から、レスポンスとして返す音声ファイルの形式を決定する。
+    品質係数 (q) が最も高い対応形式のメディアタイプを選び、同じ品質係数の場合は先に記述されたものを優先する。
+    */* や audio/* 、対応形式のメディアタイプが含まれない場合は、従来どおり WAV 形式とする。
+
+    Parameters
+    ----------
+    accept : str | None
+        Accept ヘッダーの値
+
+    Returns
+    -------
+    AudioFormat
+        レスポンスとして返す音声ファイルの形式
+    """
+
+    if accept is None:
+        return AudioFormat.WAV
+
+    best_format = AudioFormat.WAV
+    best_quality = 0.0
+    for media_range in accept.split(","):
+        media_type, *parameters = [part.strip() for part in media_range.split(";")]
+        quality = 1.0
+        for parameter in parameters:
+            name, _, value = parameter.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        media_type = media_type.lower()
+        if media_type in ("*/*", "audio/*"):
+            audio_format = AudioFormat.WAV
+        elif media_type in _MEDIA_TYPE_TO_AUDIO_FORMAT:
+            audio_format = _MEDIA_TYPE_TO_AUDIO_FORMAT[media_type]
+        else:
+            continue
+        if quality > best_quality:
+            best_format = audio_format
+            best_quality = quality
+    return best_format
+
+
+def encode_wave(
+    wave: NDArray[np.float32],
+    sampling_rate: int,
+    audio_format: AudioFormat,
+    bitrate: int | None = None,
+) -> memoryview:
+    """
+    音声波形全体を指定された形式の音声ファイルにエンコードする。
+    エンコード結果をコピーせずにレスポンスとして送信できるよう、バイト列ではなく memoryview を返す。
+
+    Parameters
+    ----------
+    wave : NDArray[np.float32]
+        -1.0 ~ 1.0 の範囲の音声波形 (ステレオの場合は (サンプル数, 2) の形状)
+    sampling_rate : int
+        音声波形のサンプリングレート
+    audio_format : AudioFormat
+        音声ファイルの形式
+    bitrate : int | None, default None
+        非可逆圧縮形式 (Opus / MP3) の目標ビットレート (kbps) 。None の場合はエンコーダーの既定値を用いる。
+
+    Returns
+    -------
+    memoryview
+        音声ファイルのバイト列
+    """
+
+    info = _AUDIO_FORMAT_INFOS[audio_format]
+    if info.raw_dtype is not None:
+        return _wave_to_raw_pcm(wave, info.raw_dtype)
+
+    output_sampling_rate = _get_output_sampling_rate(info, sampling_rate)
+    if output_sampling_rate != sampling_rate:
+        wave = soxr.resample(wave, sampling_rate, output_sampling_rate)
+
+    buffer = io.BytesIO()
+    if audio_format == AudioFormat.WAV:
+        # 従来と同一のバイト列を返すため、WAV 形式はエンコーダーの設定を指定せずに書き込む
+        soundfile.write(file=buffer, data=wave, samplerate=sampling_rate, format="WAV")
+        return buffer.getbuffer()
+
+    num_channels = 1 if wave.ndim == 1 else wave.shape[-1]
+    with _open_sound_file(buffer, info, output_sampling_rate, num_channels, bitrate) as sound_file:  # fmt: skip
+        sound_file.write(wave)
+    return buffer.getbuffer()
+
+
+class AudioStreamEncoder:
+    """
+    音声波形を少しずつ受け取り、指定された形式の音声ファイルとして、エンコードできた部分から順にバイト列を返すエンコーダー。
+    チャンク転送でのストリーミング配信向けに、WAV 形式は全体の長さが不明な WAV ヘッダーを、
+    FLAC / MP3 形式はエンコード完了後に先頭へ書き戻される総サンプル数などの情報を含まないヘッダーを出力する。
+    生の PCM データの形式では、受け取った音声波形をそのまま (または 16bit PCM に変換して) 返す。
+    """
+
+    def __init__(
+        self,
+        audio_format: AudioFormat,
+        sampling_rate: int,
+        num_channels: int,
+        bitrate: int | None = None,
+    ) -> None:
+        """
+        AudioStreamEncoder のコンストラクタ
+
+        Parameters
+        ----------
+        audio_format : AudioFormat
+            音声ファイルの形式
+        sampling_rate : int
+            入力される音声波形のサンプリングレート
+        num_channels : int
+            入力される音声波形のチャンネル数
+        bitrate : int | None, default None
+            非可逆圧縮形式 (Opus / MP3) の目標ビットレート (kbps) 。None の場合はエンコーダーの既定値を用いる。
+        """
+
+        self._audio_format = audio_format
+        self._sampling_rate = sampling_rate
+        self._num_channels = num_channels
+        self._is_header_written = False
+        self._sink = _StreamingSink()
+        self._sound_file: soundfile.SoundFile | None = None
+        self._resampler: soxr.ResampleStream | None = None
+
+        info = _AUDIO_FORMAT_INFOS[audio_format]
+        self._raw_dtype = info.raw_dtype
+        if audio_format == AudioFormat.WAV or info.raw_dtype is not None:
+            return
+        output_sampling_rate = _get_output_sampling_rate(info, sampling_rate)
+        if output_sampling_rate != sampling_rate:
+            self._resampler = soxr.ResampleStream(
+                sampling_rate, output_sampling_rate, num_channels, dtype="float32"
+            )
+        self._sound_file = _open_sound_file(
+            self._sink, info, output_sampling_rate, num_channels, bitrate
+        )
+
+    def encode(self, wave: NDArray[np.float32]) -> bytes | memoryview:
+        """
+        音声波形をエンコードし、これまでにエンコードできた部分のバイト列を返す。
+
+        Parameters
+        ----------
+        wave : NDArray[np.float32]
+            -1.0 ~ 1.0 の範囲の音声波形 (ステレオの場合は (サンプル数, 2) の形状)
+
+        Returns
+        -------
+        bytes | memoryview
+            音声ファイルの続きのバイト列 (エンコーダー内でバッファリングされている場合は空になる)
+        """
+
+        if self._raw_dtype is not None:
+            return _wave_to_raw_pcm(wave, self._raw_dtype)
+        if self._sound_file is None:
+            data = wave_to_pcm16_bytes(wave)
+            if not self._is_header_written:
+                self._is_header_written = True
+                header = generate_streaming_wav_header(self._sampling_rate, self._num_channels)  # fmt: skip
+                data = header + data
+            return data
+
+        if self._resampler is not None:
+            wave = self._resampler.resample_chunk(wave)
+        self._sound_file.write(wave)
+        return self._sink.pop_bytes()
+
+    def close(self) -> bytes:
+        """
+        エンコーダー内にバッファリングされている音声波形をすべてエンコードし、音声ファイルの残りのバイト列を返す。
+
+        Returns
+        -------
+        bytes
+            音声ファイルの残りのバイト列
+        """
+
+        if self._raw_dtype is not None:
+            return b""
+        if self._sound_file is None:
+            if not self._is_header_written:
+                self._is_header_written = True
+                return generate_streaming_wav_header(self._sampling_rate, self._num_channels)  # fmt: skip
+            return b""
+
+        if self._sound_file.closed:
+            return b""
+        if self._resampler is not None:
+            shape = (0,) if self._num_channels == 1 else (0, self._num_channels)
+            empty_wave = np.zeros(shape, dtype=np.float32)
+            self._sound_file.write(
+                self._resampler.resample_chunk(empty_wave, last=True)
+            )
+        self._sound_file.close()
+        return self._sink.pop_bytes()
+
+
+class _StreamingSink:
+    """
+    libsndfile が書き込んだバイト列を、先頭から順に取り出せるようにするファイルライクオブジェクト。
+    既に取り出した位置より前への書き込み (エンコード完了後のヘッダーの書き戻しなど) は破棄する。
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        # _buffer の先頭のバイト列の、ファイル全体での位置
+        self._buffer_offset = 0
+        self._position = 0
+        self._size = 0
+
+    def write(self, data: bytes) -> int:
+        """現在の位置にバイト列を書き込む。"""
+        length = len(data)
+        start = self._position - self._buffer_offset
+        if start < 0:
+            ## 既に取り出した範囲に重なる部分は破棄する
+            data = data[-start:]
+            start = 0
+        self._buffer[start : start + len(data)] = data
+        self._position += length
+        self._size = max(self._size, self._position)
+        return length
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """読み書きする位置を変更する。"""
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._size
+        self._position = offset
+        return self._position
+
+    def tell(self) -> int:
+        """現在の位置を返す。"""
+        return self._position
+
+    def read(self, size: int = -1) -> bytes:
+        """書き込み専用のため、常に空のバイト列を返す。"""
+        return b""
+
+    def pop_bytes(self) -> bytes:
+        """まだ取り出していないバイト列を取り出す。"""
+        data = bytes(self._buffer)
+        self._buffer_offset += len(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def _wave_to_raw_pcm(wave: NDArray[np.float32], dtype: str) -> memoryview:
+    """
+    -1.0 ~ 1.0 の範囲の float32 型の音声波形を、指定されたサンプルの型の生の PCM データに変換する。
+    リトルエンディアンの float32 型で C 連続な音声波形は、コピーせずにそのバッファを返す。
+    """
+
+    if np.dtype(dtype).kind == "f":
+        return np.ascontiguousarray(wave, dtype=dtype).data.cast("B")
+
+    # 16bit PCM への変換は wave_to_pcm16_bytes() と同じ値になるようにしつつ、一時配列の確保を 1 つに抑える
+    scaled_wave = np.clip(wave, -1.0, 1.0)
+    np.multiply(scaled_wave, 32767.0, out=scaled_wave)
+    return np.ascontiguousarray(scaled_wave.astype(dtype)).data.cast("B")
+
+
+def _get_output_sampling_rate(info: _AudioFormatInfo, sampling_rate: int) -> int:
+    """音声ファイルに書き込むサンプリングレートを返す。エンコードできないサンプリングレートの場合はリサンプリング先を返す。"""
+    if info.supported_sampling_rates is None or sampling_rate in info.supported_sampling_rates:  # fmt: skip
+        return sampling_rate
+    return info.fallback_sampling_rate
+
+
+def _open_sound_file(
+    file: io.BytesIO | _StreamingSink,
+    info: _AudioFormatInfo,
+    sampling_rate: int,
+    num_channels: int,
+    bitrate: int | None,
+) -> soundfile.SoundFile:
+    """指定された形式・ビットレートで音声ファイルを書き込む SoundFile を開く。"""
+
+    assert info.soundfile_format is not None and info.soundfile_subtype is not None
+
+    compression_level: float | None = None
+    bitrate_mode: str | None = None
+    if bitrate is not None and info.soundfile_subtype == "OPUS":
+        # libsndfile の Opus エンコーダーは、圧縮レベル 0.0 ~ 1.0 を 1 チャンネルあたり 256 ~ 6 kbps に線形に対応付ける
+        compression_level = 1.0 - (bitrate / num_channels - 6.0) / 250.0
+    elif bitrate is not None and info.soundfile_subtype == "MPEG_LAYER_III":
+        # libsndfile の MP3 エンコーダーは、圧縮レベル 0.0 ~ 1.0 をサンプリングレートごとのビットレートの範囲に線形に対応付け、
+        # LAME が指定値以下の規格上のビットレートに切り捨てる
+        ## 浮動小数点数の誤差で 1 段階低いビットレートに切り捨てられないよう、0.5 kbps 上乗せした値を指定する
+        if sampling_rate >= 32000:
+            max_bitrate, min_bitrate = 320.0, 32.0
+        elif sampling_rate >= 16000:
+            max_bitrate, min_bitrate = 160.0, 8.0
+        else:
+            max_bitrate, min_bitrate = 64.0, 8.0
+        compression_level = (max_bitrate - (bitrate + 0.5)) / (max_bitrate - min_bitrate)  # fmt: skip
+        bitrate_mode = "CONSTANT"
+    if compression_level is not None:
+        ## 圧縮レベル 1.0 は MP3 エンコーダーでエラーになるため、わずかに小さい値を上限とする
+        compression_level = min(max(compression_level, 0.0), 0.999)
+
+    return soundfile.SoundFile(
+        file,
+        mode="w",
+        samplerate=sampling_rate,
+        channels=num_channels,
+        format=info.soundfile_format,
+        subtype=info.soundfile_subtype,
+        compression_level=compression_level,
+        bitrate_mode=bitrate_mode,
+    )
@@ -1,5 +1,7 @@
 """音声波形を加工する。"""
 
+from typing import Any
+
 import numpy as np
 from numpy.typing import NDArray
 from soxr import resample
@@ -11,20 +13,68 @@ from .model import (
 
 
 def raw_wave_to_output_wave(
-    query: AudioQuery | FrameAudioQuery, wave: NDArray[np.float32], sr_wave: int
+    query: AudioQuery | FrameAudioQuery,
+    wave: NDArray[Any],
+    sr_wave: int,
+    pre_silence_length: int = 0,
+    post_silence_length: int = 0,
+    input_scale: float = 1.0,
 ) -> NDArray[np.float32]:
-    """生音声波形に音声合成用のクエリを適用して出力音声波形を生成する"""
-    wave = _apply_volume_scale(wave, query)
+    """
+    生音声波形に音声合成用のクエリを適用して出力音声波形を生成する
+    音量調整・前後の無音区間の追加・float32 への変換は、出力用に確保した 1 つのバッファ上でまとめて行う
+
+    Parameters
+    ----------
+    query : AudioQuery | FrameAudioQuery
+        音声合成用のクエリ
+    wave : NDArray[Any]
+        生音声波形 (int16 など float32 以外の型でもよい)
+    sr_wave : int
+        生音声波形のサンプリングレート
+    pre_silence_length : int, default 0
+        生音声波形の前に追加する無音区間のサンプル数
+    post_silence_length : int, default 0
+        生音声波形の後に追加する無音区間のサンプル数
+    input_scale : float, default 1.0
+        音量スケールと合わせて生音声波形に掛ける係数 (int16 の生音声波形を -1.0 ~ 1.0 に正規化する場合など)
+
+    Returns
+    -------
+    NDArray[np.float32]
+        出力音声波形 (ステレオ出力時は (サンプル数, 2) の形状)
+    """
+    wave = _apply_volume_scale(
+        wave, query, pre_silence_length, post_silence_length, input_scale
+    )
     wave = _apply_output_sampling_rate(wave, sr_wave, query)
     wave = _apply_output_stereo(wave, query)
     return wave
 
 
 def _apply_volume_scale(
-    wave: NDArray[np.float32], query: AudioQuery | FrameAudioQuery
+    wave: NDArray[Any],
+    query: AudioQuery | FrameAudioQuery,
+    pre_silence_length: int = 0,
+    post_silence_length: int = 0,
+    input_scale: float = 1.0,
 ) -> NDArray[np.float32]:
-    """音声波形へ音声合成用のクエリがもつ音量スケール（`volumeScale`）を適用する"""
-    return wave * query.volumeScale
+    """
+    音声波形へ音声合成用のクエリがもつ音量スケール（`volumeScale`）を適用する
+    前後の無音区間を含む float32 の出力バッファを確保し、型変換と音量調整を一度の演算で書き込む
+    """
+    length = pre_silence_length + len(wave) + post_silence_length
+    output = np.empty((length, *wave.shape[1:]), dtype=np.float32)
+    output[:pre_silence_length] = 0.0
+    output[pre_silence_length + len(wave) :] = 0.0
+    np.multiply(
+        wave,
+        np.float32(query.volumeScale * input_scale),
+        out=output[pre_silence_length : pre_silence_length + len(wave)],
+        dtype=np.float32,
+        casting="unsafe",
+    )
+    return output
 
 
 def _apply_output_sampling_rate(
@@ -42,6 +92,64 @@ def _apply_output_stereo(
     wave: NDArray[np.float32], query: AudioQuery | FrameAudioQuery
 ) -> NDArray[np.float32]:
     """音声波形へ音声合成用のクエリがもつステレオ出力設定（`outputStereo`）を適用する"""
-    if query.outputStereo:
+    if query.outputStereo and wave.ndim != 1:
+        # 1 次元配列以外の音声波形は従来どおり転置によってステレオ化する
         wave = np.array([wave, wave]).T
+    elif query.outputStereo:
+        # 左右のチャンネルが交互に並ぶ (サンプル数, 2) の配列に直接書き込み、転置によるコピーを避ける
+        stereo_wave = np.empty((len(wave), 2), dtype=wave.dtype)
+        stereo_wave[:, 0] = wave
+        stereo_wave[:, 1] = wave
+        wave = stereo_wave
     return wave
+
+
+def find_non_silent_range(
+    audio: NDArray[Any], threshold: float, block_size: int = 4096
+) -> tuple[int, int]:
+    """
+    前後の無音（または閾値以下の小音）を除いた範囲を、波形の両端から順に探索して返す。
+    波形全体の絶対値などを計算せず、両端からブロック単位で閾値を超えるサンプルを探すため、
+    前後の無音が短ければ波形の長さによらず高速に処理でき、波形全体の大きさの一時配列も確保しない。
+
+    Parameters
+    ----------
+    audio : NDArray[Any]
+        1 次元配列の音声波形（モノラル想定）
+    threshold : float
+        無音判定の絶対振幅の閾値 (音声波形と同じスケールの値)
+    block_size : int, default 4096
+        一度に判定するサンプル数
+
+    Returns
+    -------
+    tuple[int, int]
+        前後の無音を除いた範囲の開始位置と終了位置 (+1) 。
+        全サンプルが閾値以下の場合は (0, 0) を返す。
+    """
+
+    length = len(audio)
+
+    # 前側から閾値を超える最初のサンプルを探す
+    ## int16 の -32768 の絶対値がオーバーフローしないよう、ブロックごとに float32 に変換してから絶対値をとる
+    start_index: int | None = None
+    for block_start in range(0, length, block_size):
+        block = np.abs(audio[block_start : block_start + block_size], dtype=np.float32)
+        indices = np.flatnonzero(block > threshold)
+        if len(indices) > 0:
+            start_index = block_start + int(indices[0])
+            break
+    if start_index is None:
+        return 0, 0
+
+    # 後ろ側から閾値を超える最後のサンプルを探す (前側で見つかったサンプルより前には戻らない)
+    end_index = start_index + 1
+    for block_end in range(length, start_index, -block_size):
+        block_start = max(block_end - block_size, start_index)
+        block = np.abs(audio[block_start:block_end], dtype=np.float32)
+        indices = np.flatnonzero(block > threshold)
+        if len(indices) > 0:
+            end_index = block_start + int(indices[-1]) + 1
+            break
+
+    return start_index, end_index
@@ -0,0 +1,170 @@
+"""Style-Bert-VITS2 の BERT 特徴量の抽出結果をキャッシュする BERT 特徴量キャッシュ"""
+
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ..logging import logger
+from ..utility.lru_cache_utility import LRUCache
+
+__all__ = ["BertFeatureCache", "bypass_bert_feature_cache"]
+
+
+# 現在有効な BERT 特徴量キャッシュ (プロセス全体で 1 つのみ)
+_active_cache: "BertFeatureCache | None" = None
+# キャッシュを差し込む前の、Style-Bert-VITS2 本来の BERT 特徴量の抽出関数
+_original_extract_bert_feature_onnx: Callable[..., NDArray[Any]] | None = None
+# 現在の処理で BERT 特徴量キャッシュを参照せずに BERT 特徴量を抽出するかどうか
+_bypass_cache: ContextVar[bool] = ContextVar("bypass_bert_feature_cache", default=False)
+
+
+@contextmanager
+def bypass_bert_feature_cache() -> Iterator[None]:
+    """
+    ブロック内で実行される BERT 特徴量の抽出処理で、BERT 特徴量キャッシュを参照・更新しないようにする。
+    ウォームアップ用のダミーの文章など、実際のリクエストでは使われない入力でキャッシュを埋めないために利用する。
+    """
+
+    token = _bypass_cache.set(True)
+    try:
+        yield
+    finally:
+        _bypass_cache.reset(token)
+
+
+def _cached_extract_bert_feature_onnx(
+    text: str,
+    word2ph: Sequence[int],
+    language: Any,
+    onnx_providers: Sequence[Any],
+    assist_text: str | None = None,
+    assist_text_weight: float = 0.7,
+) -> NDArray[Any]:
+    """Style-Bert-VITS2 の extract_bert_feature_onnx() を置き換える、キャッシュ付きの BERT 特徴量の抽出関数。"""
+
+    assert _original_extract_bert_feature_onnx is not None
+    cache = _active_cache
+    if cache is None or _bypass_cache.get() is True:
+        return _original_extract_bert_feature_onnx(
+            text, word2ph, language, onnx_providers, assist_text, assist_text_weight
+        )
+
+    return cache._extract(
+        text, word2ph, language, onnx_providers, assist_text, assist_text_weight
+    )
+
+
+class BertFeatureCache:
+    """
+    Style-Bert-VITS2 の BERT 特徴量の抽出結果をキャッシュする BERT 特徴量キャッシュ。
+
+    BERT 特徴量の抽出は音声合成処理の中で最も CPU 負荷が高い処理だが、その結果は正規化済みテキストと
+    与えられた音素列のみに依存し、スタイルや話速などのパラメータには依存しない。
+    そこで Style-Bert-VITS2 の ONNX 推論処理が呼び出す extract_bert_feature_onnx() をキャッシュ付きの関数に差し替え、
+    同じ文章をパラメータを変えて何度も音声合成する際に BERT 特徴量の抽出を省略する。
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """
+        BertFeatureCache のコンストラクタ
+
+        Parameters
+        ----------
+        max_size : int
+            キャッシュの容量上限 (バイト単位)
+        """
+
+        self._cache: LRUCache[tuple[Any, ...], NDArray[Any]] = LRUCache(
+            max_size=max_size,
+            get_size=lambda feature: feature.nbytes,
+        )
+
+    def install(self) -> bool:
+        """
+        Style-Bert-VITS2 の ONNX 推論処理が呼び出す BERT 特徴量の抽出関数を、このキャッシュを参照する関数に差し替える。
+        複数回呼び出された場合は、最後に呼び出されたインスタンスのキャッシュが有効になる。
+
+        Returns
+        -------
+        bool
+            差し替えに成功したかどうか (Style-Bert-VITS2 の実装が想定と異なる場合は False)
+        """
+
+        global _active_cache, _original_extract_bert_feature_onnx
+
+        try:
+            from style_bert_vits2.models import infer_onnx
+        except ImportError as ex:
+            logger.warning("BERT feature cache is disabled (infer_onnx not found).", exc_info=ex)  # fmt: skip
+            return False
+        current = getattr(infer_onnx, "extract_bert_feature_onnx", None)
+        if current is None:
+            logger.warning("BERT feature cache is disabled (extract_bert_feature_onnx not found).")  # fmt: skip
+            return False
+
+        if current is not _cached_extract_bert_feature_onnx:
+            _original_extract_bert_feature_onnx = current
+            infer_onnx.extract_bert_feature_onnx = _cached_extract_bert_feature_onnx  # type: ignore[attr-defined]
+        _active_cache = self
+        return True
+
+    def _extract(
+        self,
+        text: str,
+        word2ph: Sequence[int],
+        language: Any,
+        onnx_providers: Sequence[Any],
+        assist_text: str | None,
+        assist_text_weight: float,
+    ) -> NDArray[Any]:
+        """キャッシュを参照し、キャッシュされていなければ BERT 特徴量を抽出してキャッシュする。"""
+
+        assert _original_extract_bert_feature_onnx is not None
+
+        # BERT 特徴量は正規化済みテキストと音素ごとの文字数 (与えられた音素列から算出される) のみに依存し、
+        # スタイルや話速・音高・音量などのパラメータには依存しない
+        key = (
+            text,
+            tuple(int(count) for count in word2ph),
+            str(language),
+            assist_text,
+            assist_text_weight if assist_text else None,
+        )
+        feature = self._cache.get(key)
+        if feature is not None:
+            logger.info(
+                f"BERT feature cache hit. (Hits: {self._cache.hits}, Misses: {self._cache.misses}, "
+                f"Entries: {len(self._cache)}, Size: {self._cache.total_size / 1024 / 1024:.1f}MB)"
+            )
+            return feature.copy()
+
+        feature = _original_extract_bert_feature_onnx(
+            text, word2ph, language, onnx_providers, assist_text, assist_text_weight
+        )
+        self._cache.put(key, np.array(feature, copy=True))
+        return feature
+
+    def get_statistics(self) -> dict[str, int]:
+        """
+        キャッシュのヒット数・ミス数などの統計情報を取得する。
+
+        Returns
+        -------
+        dict[str, int]
+            統計情報
+        """
+
+        return {
+            "hits": self._cache.hits,
+            "misses": self._cache.misses,
+            "entries": len(self._cache),
+            "size": self._cache.total_size,
+        }
+
+    def clear(self) -> None:
+        """キャッシュをすべて削除する。"""
+        self._cache.clear()
@@ -0,0 +1,203 @@
+"""音声合成処理の協調的なキャンセルに関する処理"""
+
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+import onnxruntime
+
+__all__ = [
+    "CancellationToken",
+    "SynthesisCancelledError",
+    "TerminableInferenceSession",
+    "get_current_cancellation_token",
+    "use_cancellation_token",
+]
+
+
+class SynthesisCancelledError(Exception):
+    """音声合成処理がキャンセルされた。"""
+
+    def __init__(self) -> None:
+        super().__init__("Synthesis was cancelled.")
+
+
+class CancellationToken:
+    """
+    音声合成処理のキャンセル要求を伝えるトークン。
+
+    キャンセルされると、登録されたコールバックが呼び出される。
+    音声合成処理の各段階ではトークンの状態を確認し、キャンセルされていれば SynthesisCancelledError を送出して処理を中断する。
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._is_cancelled = False
+        self._callbacks: list[Callable[[], None]] = []
+
+    @property
+    def is_cancelled(self) -> bool:
+        """キャンセルされているかどうかを返す。"""
+        with self._lock:
+            return self._is_cancelled
+
+    def cancel(self) -> None:
+        """キャンセルし、登録されているコールバックをすべて呼び出す。"""
+
+        with self._lock:
+            if self._is_cancelled:
+                return
+            self._is_cancelled = True
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            callback()
+
+    def raise_if_cancelled(self) -> None:
+        """
+        キャンセルされている場合は SynthesisCancelledError を送出する。
+
+        Raises
+        ------
+        SynthesisCancelledError
+            キャンセルされている場合
+        """
+
+        if self.is_cancelled:
+            raise SynthesisCancelledError()
+
+    @contextmanager
+    def register(self, callback: Callable[[], None]) -> Iterator[None]:
+        """
+        ブロックの実行中にキャンセルされた場合に呼び出されるコールバックを登録する。
+        既にキャンセルされている場合は、その場でコールバックを呼び出す。
+        コールバックはロックの外で呼び出されるため、ブロックの終了間際にキャンセルされると、ブロックを抜けた後に呼び出されることがある。
+        ブロックを抜けた後に is_cancelled が True であれば、コールバックが呼び出された (または呼び出される) 可能性がある。
+
+        Parameters
+        ----------
+        callback : Callable[[], None]
+            キャンセル時に呼び出される関数
+        """
+
+        with self._lock:
+            is_cancelled = self._is_cancelled
+            if not is_cancelled:
+                self._callbacks.append(callback)
+        if is_cancelled:
+            callback()
+        try:
+            yield
+        finally:
+            with self._lock:
+                if callback in self._callbacks:
+                    self._callbacks.remove(callback)
+
+
+# 現在の音声合成処理に紐づくキャンセル要求のトークン
+_current_cancellation_token: ContextVar[CancellationToken | None] = ContextVar(
+    "current_cancellation_token", default=None
+)
+# 現在の推論処理で ONNX Runtime に渡す RunOptions
+_current_run_options: ContextVar[onnxruntime.RunOptions | None] = ContextVar(
+    "current_run_options", default=None
+)
+
+
+@contextmanager
+def use_cancellation_token(token: CancellationToken) -> Iterator[None]:
+    """
+    ブロック内で実行される音声合成処理に、キャンセル要求のトークンを紐づける。
+    TTSEngine.synthesize_wave() の引数を変えずにトークンを渡すために利用する。
+
+    Parameters
+    ----------
+    token : CancellationToken
+        キャンセル要求のトークン
+    """
+
+    reset_token = _current_cancellation_token.set(token)
+    try:
+        yield
+    finally:
+        _current_cancellation_token.reset(reset_token)
+
+
+def get_current_cancellation_token() -> CancellationToken | None:
+    """現在の音声合成処理に紐づくキャンセル要求のトークンを取得する。紐づいていない場合は None を返す。"""
+    return _current_cancellation_token.get()
+
+
+class TerminableInferenceSession:
+    """
+    推論中にキャンセルされた場合に、ONNX Runtime の推論処理を途中で打ち切れるようにする推論セッションのラッパー。
+
+    Style-Bert-VITS2 の推論処理は InferenceSession.run() に RunOptions を渡さないため、
+    terminable() のブロック内で呼び出された run() にのみ、キャンセル時に terminate フラグが立つ RunOptions を差し込む。
+    それ以外の属性へのアクセスは、元の推論セッションにそのまま委譲する。
+    """
+
+    def __init__(self, session: onnxruntime.InferenceSession) -> None:
+        """
+        TerminableInferenceSession のコンストラクタ
+
+        Parameters
+        ----------
+        session : onnxruntime.InferenceSession
+            元の推論セッション
+        """
+
+        self.session = session
+
+    def __getattr__(self, name: str) -> Any:
+        """run() 以外の属性へのアクセスを元の推論セッションに委譲する。"""
+        return getattr(self.session, name)
+
+    def run(
+        self,
+        output_names: Any,
+        input_feed: Any,
+        run_options: onnxruntime.RunOptions | None = None,
+    ) -> Any:
+        """RunOptions が指定されていない場合、terminable() で設定された RunOptions を渡して推論する。"""
+
+        if run_options is None:
+            run_options = _current_run_options.get()
+        return self.session.run(output_names, input_feed, run_options)
+
+    @staticmethod
+    @contextmanager
+    def terminable(token: CancellationToken) -> Iterator[None]:
+        """
+        ブロック内で実行される推論処理を、トークンがキャンセルされた時点で打ち切れるようにする。
+        推論処理が打ち切られた場合は SynthesisCancelledError を送出する。
+
+        Parameters
+        ----------
+        token : CancellationToken
+            キャンセル要求のトークン
+
+        Raises
+        ------
+        SynthesisCancelledError
+            推論処理がキャンセルされた場合
+        """
+
+        run_options = onnxruntime.RunOptions()
+
+        def terminate() -> None:
+            run_options.terminate = True
+
+        reset_run_options = _current_run_options.set(run_options)
+        try:
+            with token.register(terminate):
+                yield
+        except Exception as ex:
+            # terminate フラグによって打ち切られた推論処理は ONNX Runtime の例外として送出されるため、キャンセルとして扱う
+            if token.is_cancelled:
+                raise SynthesisCancelledError() from ex
+            raise
+        finally:
+            _current_run_options.reset(reset_run_options)
+        token.raise_if_cancelled()
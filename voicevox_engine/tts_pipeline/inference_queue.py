@@ -0,0 +1,307 @@
+"""音声合成リクエストの同時実行数と待機数を制限する推論キュー"""
+
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import Enum
+
+from .cancellation import CancellationToken, SynthesisCancelledError
+
+__all__ = [
+    "InferencePriority",
+    "InferenceQueue",
+    "InferenceQueueFullError",
+    "InferenceTicket",
+]
+
+
+class InferencePriority(str, Enum):
+    """音声合成リクエストの優先度クラス。"""
+
+    # 対話的な音声合成 (再生ボタンを押した直後の 1 文など、ユーザーが結果を待っているもの)
+    INTERACTIVE = "interactive"
+    # 一括での音声合成 (複数の文章の書き出しなど)
+    BATCH = "batch"
+    # 先読みでの音声合成 (後で再生される可能性のある文章の事前生成など)
+    PREFETCH = "prefetch"
+
+
+# 優先度クラスの実行順 (先頭ほど優先される)
+_PRIORITY_ORDER: list[InferencePriority] = [
+    InferencePriority.INTERACTIVE,
+    InferencePriority.BATCH,
+    InferencePriority.PREFETCH,
+]
+
+
+class InferenceQueueFullError(Exception):
+    """推論キューの待機数が上限に達しているため、音声合成リクエストを受け付けられない。"""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(
+            f"Inference queue is full. Please retry after {retry_after} seconds."
+        )
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class InferenceTicket:
+    """推論キューで実行順が回ってきた音声合成リクエストの待機情報。"""
+
+    # 実行順が回ってくるまでに待機した時間 (秒)
+    wait_time: float
+    # キューに追加された時点での待機順 (1 始まり、待機せずに実行された場合は 0)
+    position: int
+
+    def to_headers(self) -> dict[str, str]:
+        """待機情報をレスポンスヘッダーに変換する。"""
+        return {
+            "X-Inference-Queue-Wait-Time": f"{self.wait_time:.3f}",
+            "X-Inference-Queue-Position": str(self.position),
+        }
+
+
+class InferenceQueue:
+    """
+    音声合成リクエストの同時実行数と待機数を制限する推論キュー。
+
+    同時実行数の上限に達している間、後続のリクエストは優先度クラスの高い順に待機列から実行される。
+    同じ優先度クラスの中では、クライアント (トークンや IP アドレスで識別) ごとに 1 件ずつ順番に実行し、
+    特定のクライアントが大量のリクエストを送っても他のクライアントのリクエストが待たされ続けないようにする。
+    待機数が上限に達している場合は待機させずに InferenceQueueFullError を送出し、
+    数分間待たされた末にクライアント側でタイムアウトする代わりに、即座に 503 Service Unavailable を返せるようにする。
+    """
+
+    # Retry-After に設定する秒数の上限
+    MAX_RETRY_AFTER: int = 60
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        max_queue_size: int | None = None,
+    ) -> None:
+        """
+        InferenceQueue のコンストラクタ
+
+        Parameters
+        ----------
+        max_concurrency : int | None, default None
+            同時に実行できる音声合成リクエストの数 (None のときは無制限)
+        max_queue_size : int | None, default None
+            実行順を待機できる音声合成リクエストの数 (None のときは無制限)
+        """
+
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be greater than or equal to 1.")
+        if max_queue_size is not None and max_queue_size < 0:
+            raise ValueError("max_queue_size must be greater than or equal to 0.")
+
+        self.max_concurrency = max_concurrency
+        self.max_queue_size = max_queue_size
+        self._condition = threading.Condition()
+        # 優先度クラスごと・クライアントごとに実行順を待機しているリクエスト
+        ## クライアントは次に実行順が回ってくる順に並んでおり、実行順が回ってきたクライアントは末尾に移動する
+        self._waiters: dict[InferencePriority, OrderedDict[str, deque[object]]] = {
+            priority: OrderedDict() for priority in _PRIORITY_ORDER
+        }
+        self._waiting_count = 0
+        self._running_count = 0
+        # 1 リクエストあたりの処理時間の指数移動平均 (秒) で、Retry-After の算出に利用する
+        self._average_processing_time: float | None = None
+
+    @property
+    def running_count(self) -> int:
+        """実行中の音声合成リクエストの数を返す。"""
+        with self._condition:
+            return self._running_count
+
+    @property
+    def waiting_count(self) -> int:
+        """実行順を待機している音声合成リクエストの数を返す。"""
+        with self._condition:
+            return self._waiting_count
+
+    @contextmanager
+    def enter(
+        self,
+        priority: InferencePriority = InferencePriority.INTERACTIVE,
+        client_id: str = "",
+        cancellation_token: CancellationToken | None = None,
+    ) -> Iterator[InferenceTicket]:
+        """
+        実行順が回ってくるまで待機し、ブロックを抜けた時点で次のリクエストに実行順を譲る。
+
+        Parameters
+        ----------
+        priority : InferencePriority, default InferencePriority.INTERACTIVE
+            リクエストの優先度クラス
+        client_id : str, default ""
+            リクエスト元のクライアントを識別する文字列
+        cancellation_token : CancellationToken | None, default None
+            キャンセル要求のトークン (待機中にキャンセルされた場合は待機列から取り除かれる)
+
+        Yields
+        ------
+        InferenceTicket
+            待機情報
+
+        Raises
+        ------
+        InferenceQueueFullError
+            待機数が上限に達している場合
+        SynthesisCancelledError
+            待機中にキャンセルされた場合
+        """
+
+        ticket = self.acquire(priority, client_id, cancellation_token)
+        start_time = time.monotonic()
+        try:
+            yield ticket
+        finally:
+            self.release(time.monotonic() - start_time)
+
+    def acquire(
+        self,
+        priority: InferencePriority = InferencePriority.INTERACTIVE,
+        client_id: str = "",
+        cancellation_token: CancellationToken | None = None,
+    ) -> InferenceTicket:
+        """
+        実行順が回ってくるまで待機する。処理が終わったら必ず release() を呼び出す必要がある。
+        ストリーミングレスポンスのように、処理の終了がブロックに収まらない場合に利用する。
+
+        Parameters
+        ----------
+        priority : InferencePriority, default InferencePriority.INTERACTIVE
+            リクエストの優先度クラス
+        client_id : str, default ""
+            リクエスト元のクライアントを識別する文字列
+        cancellation_token : CancellationToken | None, default None
+            キャンセル要求のトークン (待機中にキャンセルされた場合は待機列から取り除かれる)
+
+        Returns
+        -------
+        InferenceTicket
+            待機情報
+
+        Raises
+        ------
+        InferenceQueueFullError
+            待機数が上限に達している場合
+        SynthesisCancelledError
+            待機中にキャンセルされた場合
+        """
+
+        if cancellation_token is None:
+            cancellation_token = CancellationToken()
+        cancellation_token.raise_if_cancelled()
+
+        def notify_cancelled() -> None:
+            with self._condition:
+                self._condition.notify_all()
+
+        start_time = time.monotonic()
+        with self._condition:
+            # 待機しているリクエストがおらず、同時実行数にも空きがあれば待機せずに実行する
+            if self._waiting_count == 0 and self._has_free_slot():
+                self._running_count += 1
+                return InferenceTicket(wait_time=0.0, position=0)
+
+            if self.max_queue_size is not None and self._waiting_count >= self.max_queue_size:  # fmt: skip
+                raise InferenceQueueFullError(self._estimate_retry_after())
+
+            # 待機順は、同じかより高い優先度クラスで待機しているリクエストの数から算出する (ラウンドロビンのため目安)
+            position = 1
+            for waiting_priority in _PRIORITY_ORDER:
+                position += sum(map(len, self._waiters[waiting_priority].values()))
+                if waiting_priority == priority:
+                    break
+
+            waiter = object()
+            client_waiters = self._waiters[priority].setdefault(client_id, deque())
+            client_waiters.append(waiter)
+            self._waiting_count += 1
+            try:
+                # 自分に実行順が回ってきて、かつ同時実行数に空きが出るまで待機する
+                ## 待機中にキャンセルされた場合 (クライアントが切断した場合など) は、実行せずに待機列から取り除く
+                with cancellation_token.register(notify_cancelled):
+                    self._condition.wait_for(
+                        lambda: cancellation_token.is_cancelled
+                        or (
+                            self._peek_next_waiter() is waiter and self._has_free_slot()
+                        )
+                    )
+            finally:
+                self._remove_waiter(priority, client_id, waiter)
+                # 後続のリクエストに実行順が回ってきたことを通知する
+                self._condition.notify_all()
+            if cancellation_token.is_cancelled:
+                raise SynthesisCancelledError()
+            self._running_count += 1
+
+        return InferenceTicket(wait_time=time.monotonic() - start_time, position=position)  # fmt: skip
+
+    def release(self, processing_time: float | None = None) -> None:
+        """
+        acquire() で確保した実行順を解放し、次のリクエストに実行順を譲る。
+
+        Parameters
+        ----------
+        processing_time : float | None, default None
+            リクエストの処理に要した時間 (秒) で、Retry-After の算出に利用する
+        """
+
+        with self._condition:
+            self._running_count -= 1
+            if processing_time is not None:
+                if self._average_processing_time is None:
+                    self._average_processing_time = processing_time
+                else:
+                    self._average_processing_time = (
+                        0.8 * self._average_processing_time + 0.2 * processing_time
+                    )
+            self._condition.notify_all()
+
+    def _peek_next_waiter(self) -> object | None:
+        """次に実行順が回ってくるリクエストを返す。呼び出し元でロックを取得している必要がある。"""
+
+        for priority in _PRIORITY_ORDER:
+            clients = self._waiters[priority]
+            if len(clients) > 0:
+                # 最も長く実行順が回ってきていないクライアントの、最も古いリクエスト
+                return next(iter(clients.values()))[0]
+        return None
+
+    def _remove_waiter(
+        self, priority: InferencePriority, client_id: str, waiter: object
+    ) -> None:
+        """待機列からリクエストを削除する。呼び出し元でロックを取得している必要がある。"""
+
+        clients = self._waiters[priority]
+        client_waiters = clients[client_id]
+        is_head = client_waiters[0] is waiter
+        client_waiters.remove(waiter)
+        self._waiting_count -= 1
+        if len(client_waiters) == 0:
+            del clients[client_id]
+        elif is_head:
+            # 実行順が回ってきたクライアントを末尾に移動し、同じ優先度クラスの他のクライアントに順番を譲る
+            clients.move_to_end(client_id)
+
+    def _has_free_slot(self) -> bool:
+        """同時実行数に空きがあるかどうかを返す。呼び出し元でロックを取得している必要がある。"""
+        return self.max_concurrency is None or self._running_count < self.max_concurrency  # fmt: skip
+
+    def _estimate_retry_after(self) -> int:
+        """待機中のリクエストがすべて処理されるまでの目安の時間 (秒) を算出する。呼び出し元でロックを取得している必要がある。"""
+
+        if self._average_processing_time is None:
+            return 1
+        concurrency = self.max_concurrency or max(1, self._running_count)
+        pending_count = self._waiting_count + self._running_count
+        estimated = self._average_processing_time * pending_count / concurrency
+        return min(self.MAX_RETRY_AFTER, max(1, math.ceil(estimated)))
@@ -0,0 +1,92 @@
+"""音声合成モデルの推論処理を同時に実行できる数を制限する推論スロットプール"""
+
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import psutil
+
+__all__ = ["InferenceSlotPool"]
+
+
+class InferenceSlotPool:
+    """
+    音声合成モデルの推論処理を同時に実行できる数 (推論スロット数) を制限するプール。
+
+    エンジン全体で同時に実行できる推論処理の数に加え、必要に応じて同一モデルあたりの上限も設定できる。
+    推論処理を無制限に並列実行すると最悪プロセスごと ONNX Runtime がクラッシュするため、
+    推論処理は必ずこのプールから推論スロットを確保した上で実行する。
+    """
+
+    def __init__(self, num_slots: int = 1, max_slots_per_model: int | None = None) -> None:  # fmt: skip
+        """
+        InferenceSlotPool のコンストラクタ
+
+        Parameters
+        ----------
+        num_slots : int, default 1
+            エンジン全体で同時に実行できる推論処理の数
+        max_slots_per_model : int | None, default None
+            同一モデルで同時に実行できる推論処理の数 (None のときは num_slots と同じ)
+        """
+
+        if num_slots < 1:
+            raise ValueError("num_slots must be greater than or equal to 1.")
+        if max_slots_per_model is not None and max_slots_per_model < 1:
+            raise ValueError("max_slots_per_model must be greater than or equal to 1.")
+
+        self.num_slots = num_slots
+        self.max_slots_per_model = max_slots_per_model
+        self._global_semaphore = threading.BoundedSemaphore(num_slots)
+        self._model_semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def intra_op_num_threads(self) -> int:
+        """
+        推論スロット 1 つあたりに割り当てる ONNX Runtime の intra-op スレッド数を取得する。
+        推論スロットが 1 つのみの場合は ONNX Runtime に任せる (0 を返す) 。
+        """
+
+        if self.num_slots <= 1:
+            return 0
+        # 複数の推論処理が同時に CPU コアを奪い合わないよう、物理コア数を推論スロット数で等分する
+        physical_cores = psutil.cpu_count(logical=False) or psutil.cpu_count() or 1
+        return max(1, physical_cores // self.num_slots)
+
+    @contextmanager
+    def acquire(self, aivm_uuid: str) -> Iterator[None]:
+        """
+        指定された音声合成モデルの推論スロットを確保し、ブロックを抜けた時点で解放する。
+        推論スロットに空きがない場合は、空きが出るまで待機する。
+
+        Parameters
+        ----------
+        aivm_uuid : str
+            推論に利用する音声合成モデルの UUID
+        """
+
+        # 先にモデルごとの推論スロットを確保してから全体の推論スロットを確保する
+        # 逆順だと、モデルごとの上限に達したリクエストが全体の推論スロットを握ったまま待機してしまい、
+        # 別のモデルに対するリクエストまで待たされてしまう
+        model_semaphore = self._get_model_semaphore(aivm_uuid)
+        if model_semaphore is not None:
+            model_semaphore.acquire()
+        try:
+            with self._global_semaphore:
+                yield
+        finally:
+            if model_semaphore is not None:
+                model_semaphore.release()
+
+    def _get_model_semaphore(self, aivm_uuid: str) -> threading.BoundedSemaphore | None:
+        """指定された音声合成モデルの推論スロット数を制限するセマフォを取得する。"""
+
+        if self.max_slots_per_model is None:
+            return None
+        with self._lock:
+            if aivm_uuid not in self._model_semaphores:
+                self._model_semaphores[aivm_uuid] = threading.BoundedSemaphore(
+                    self.max_slots_per_model
+                )
+            return self._model_semaphores[aivm_uuid]
@@ -0,0 +1,248 @@
+"""ロード済みの音声合成モデルをメモリ使用量の上限と LRU に基づいて自動的にアンロードする常駐管理マネージャー"""
+
+import threading
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+from ..logging import logger
+
+__all__ = ["ModelResidencyManager"]
+
+
+class ModelResidencyManager:
+    """
+    ロード済みの音声合成モデルの常駐状態を管理するマネージャー。
+
+    ロード済みのモデルの推定メモリ使用量の合計が上限 (memory_budget) を超えないよう、
+    新たなモデルのロード前に最も長く使われていないモデルから順にアンロードする (LRU) 。
+    また、idle_ttl を指定すると、一定時間使われていないモデルをバックグラウンドで自動的にアンロードする。
+    固定 (ピン留め) されたモデルと推論中のモデルはアンロードの対象外となる。
+    実際のアンロード処理はコンストラクタで渡された unload_model() に委ねる。
+    """
+
+    def __init__(
+        self,
+        unload_model: Callable[[str], None],
+        memory_budget: int | None = None,
+        idle_ttl: float | None = None,
+        pinned_aivm_uuids: list[str] | None = None,
+    ) -> None:
+        """
+        ModelResidencyManager のコンストラクタ
+
+        Parameters
+        ----------
+        unload_model : Callable[[str], None]
+            AIVM の UUID を受け取り、対応する音声合成モデルをアンロードする関数
+        memory_budget : int | None, default None
+            ロード済みのモデルに割り当てるメモリ使用量の上限 (バイト単位、None のときは無制限)
+        idle_ttl : float | None, default None
+            最後に使われてからアンロードされるまでの時間 (秒単位、None のときはアンロードしない)
+        pinned_aivm_uuids : list[str] | None, default None
+            常にロードしたままにする (アンロードの対象外とする) モデルの AIVM の UUID のリスト
+        """
+
+        if memory_budget is not None and memory_budget <= 0:
+            raise ValueError("memory_budget must be greater than 0.")
+        if idle_ttl is not None and idle_ttl <= 0:
+            raise ValueError("idle_ttl must be greater than 0.")
+
+        self.memory_budget = memory_budget
+        self.idle_ttl = idle_ttl
+        self._unload_model = unload_model
+        self._pinned_aivm_uuids: set[str] = set(pinned_aivm_uuids or [])
+        # ロード済みのモデルの推定メモリ使用量 (最も長く使われていないモデルが先頭に来る)
+        self._model_sizes: OrderedDict[str, int] = OrderedDict()
+        # ロード済みのモデルが最後に使われた時刻
+        self._last_used_at: dict[str, float] = {}
+        # 推論中のモデルの参照カウント
+        self._in_use_counts: Counter[str] = Counter()
+        # unload_model() の中から on_unloaded() が呼ばれるため、再入可能なロックを用いる
+        self._lock = threading.RLock()
+        self._idle_sweeper: threading.Thread | None = None
+
+    @property
+    def total_size(self) -> int:
+        """ロード済みのモデルの推定メモリ使用量の合計 (バイト単位) を取得する。"""
+        with self._lock:
+            return sum(self._model_sizes.values())
+
+    def pin(self, aivm_uuid: str) -> None:
+        """指定されたモデルを固定し、アンロードの対象外とする。"""
+        with self._lock:
+            self._pinned_aivm_uuids.add(aivm_uuid)
+
+    def unpin(self, aivm_uuid: str) -> None:
+        """指定されたモデルの固定を解除し、アンロードの対象とする。"""
+        with self._lock:
+            self._pinned_aivm_uuids.discard(aivm_uuid)
+
+    def is_pinned(self, aivm_uuid: str) -> bool:
+        """指定されたモデルが固定されているかどうかを返す。"""
+        with self._lock:
+            return aivm_uuid in self._pinned_aivm_uuids
+
+    @contextmanager
+    def use(self, aivm_uuid: str) -> Iterator[None]:
+        """
+        ブロックを抜けるまでの間、指定されたモデルを推論中としてアンロードの対象外とする。
+        ブロックを抜けた時点で、モデルの最終利用時刻を更新する。
+
+        Parameters
+        ----------
+        aivm_uuid : str
+            推論に利用する音声合成モデルの AIVM の UUID
+        """
+
+        with self._lock:
+            self._in_use_counts[aivm_uuid] += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_use_counts[aivm_uuid] -= 1
+                if self._in_use_counts[aivm_uuid] <= 0:
+                    del self._in_use_counts[aivm_uuid]
+                self._touch(aivm_uuid)
+
+    def reserve(self, aivm_uuid: str, size: int) -> None:
+        """
+        これからロードするモデルのために、メモリ使用量の上限を超えないよう必要に応じて他のモデルをアンロードする。
+        固定されたモデルや推論中のモデルしか残っておらず上限内に収まらない場合は、警告を出力した上で上限を超えてロードを許可する。
+
+        Parameters
+        ----------
+        aivm_uuid : str
+            これからロードするモデルの AIVM の UUID
+        size : int
+            これからロードするモデルの推定メモリ使用量 (バイト単位)
+        """
+
+        if self.memory_budget is None:
+            return
+
+        with self._lock:
+            while sum(self._model_sizes.values()) + size > self.memory_budget:
+                victim_aivm_uuid = self._find_eviction_candidate(exclude=aivm_uuid)
+                if victim_aivm_uuid is None:
+                    logger.warning(
+                        "Model memory budget exceeded, but no model can be unloaded. "
+                        f"(Budget: {self.memory_budget / 1024 / 1024:.0f}MB, "
+                        f"Resident: {sum(self._model_sizes.values()) / 1024 / 1024:.0f}MB, "
+                        f"Requested: {size / 1024 / 1024:.0f}MB)"
+                    )
+                    return
+                logger.info(f"Unloading least recently used model {victim_aivm_uuid} to stay within the memory budget.")  # fmt: skip
+                self._evict(victim_aivm_uuid)
+
+    def on_loaded(self, aivm_uuid: str, size: int) -> None:
+        """
+        モデルがロードされたことを記録する。
+
+        Parameters
+        ----------
+        aivm_uuid : str
+            ロードされたモデルの AIVM の UUID
+        size : int
+            ロードされたモデルの推定メモリ使用量 (バイト単位)
+        """
+
+        with self._lock:
+            self._model_sizes[aivm_uuid] = size
+            self._touch(aivm_uuid)
+
+    def on_unloaded(self, aivm_uuid: str) -> None:
+        """
+        モデルがアンロードされたことを記録する。
+
+        Parameters
+        ----------
+        aivm_uuid : str
+            アンロードされたモデルの AIVM の UUID
+        """
+
+        with self._lock:
+            self._model_sizes.pop(aivm_uuid, None)
+            self._last_used_at.pop(aivm_uuid, None)
+
+    def unload_idle_models(self) -> list[str]:
+        """
+        idle_ttl 秒以上使われていないモデルをアンロードする。
+
+        Returns
+        -------
+        list[str]
+            アンロードされたモデルの AIVM の UUID のリスト
+        """
+
+        if self.idle_ttl is None:
+            return []
+
+        unloaded_aivm_uuids: list[str] = []
+        with self._lock:
+            now = time.monotonic()
+            for aivm_uuid in list(self._model_sizes.keys()):
+                if not self._is_evictable(aivm_uuid):
+                    continue
+                if now - self._last_used_at.get(aivm_uuid, now) < self.idle_ttl:
+                    continue
+                logger.info(f"Unloading model {aivm_uuid} (idle for more than {self.idle_ttl:.0f}s).")  # fmt: skip
+                self._evict(aivm_uuid)
+                unloaded_aivm_uuids.append(aivm_uuid)
+        return unloaded_aivm_uuids
+
+    def start_idle_sweeper(self, interval: float | None = None) -> None:
+        """
+        一定時間使われていないモデルを定期的にアンロードするバックグラウンドスレッドを開始する。
+        idle_ttl が指定されていない場合は何もしない。
+
+        Parameters
+        ----------
+        interval : float | None, default None
+            チェック間隔 (秒単位、None のときは idle_ttl の 1/4 (最短 1 秒・最長 60 秒))
+        """
+
+        if self.idle_ttl is None or self._idle_sweeper is not None:
+            return
+        sweep_interval = interval if interval is not None else min(max(self.idle_ttl / 4, 1.0), 60.0)  # fmt: skip
+
+        def sweep() -> None:
+            while True:
+                time.sleep(sweep_interval)
+                try:
+                    self.unload_idle_models()
+                except Exception as ex:
+                    logger.error("Failed to unload idle models:", exc_info=ex)
+
+        self._idle_sweeper = threading.Thread(target=sweep, name="ModelIdleSweeper", daemon=True)  # fmt: skip
+        self._idle_sweeper.start()
+
+    def _touch(self, aivm_uuid: str) -> None:
+        """モデルの最終利用時刻を更新し、LRU の末尾 (最も最近使われた位置) に移動する。呼び出し元でロックを取得している必要がある。"""
+        self._last_used_at[aivm_uuid] = time.monotonic()
+        if aivm_uuid in self._model_sizes:
+            self._model_sizes.move_to_end(aivm_uuid)
+
+    def _is_evictable(self, aivm_uuid: str) -> bool:
+        """モデルがアンロードの対象となるかどうかを返す。呼び出し元でロックを取得している必要がある。"""
+        return (
+            aivm_uuid not in self._pinned_aivm_uuids
+            and self._in_use_counts[aivm_uuid] == 0
+        )
+
+    def _find_eviction_candidate(self, exclude: str) -> str | None:
+        """最も長く使われていないアンロード可能なモデルを探す。呼び出し元でロックを取得している必要がある。"""
+        for aivm_uuid in self._model_sizes:
+            if aivm_uuid != exclude and self._is_evictable(aivm_uuid):
+                return aivm_uuid
+        return None
+
+    def _evict(self, aivm_uuid: str) -> None:
+        """モデルをアンロードする。呼び出し元でロックを取得している必要がある。"""
+        try:
+            self._unload_model(aivm_uuid)
+        finally:
+            # unload_model() が失敗した場合でも、無限ループを避けるため管理対象からは外す
+            self.on_unloaded(aivm_uuid)
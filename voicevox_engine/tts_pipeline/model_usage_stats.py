@@ -0,0 +1,220 @@
+"""音声合成モデルごとの利用統計を記録・永続化し、起動時に事前ロードするモデルの優先順位を決定する"""
+
+import atexit
+import math
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+from pydantic import BaseModel, Field
+
+from ..logging import logger
+
+__all__ = ["ModelUsageStats"]
+
+
+class _ModelUsage(BaseModel):
+    """1 つの音声合成モデルの利用統計"""
+
+    # 音声合成リクエストの累計回数
+    request_count: int = 0
+    # 最後に音声合成リクエストがあった時刻 (UNIX 時間)
+    last_used_at: float = 0.0
+    # 時間帯 (ローカル時刻の 0 ~ 23 時) ごとの音声合成リクエストの累計回数
+    hourly_request_counts: list[int] = Field(
+        default_factory=lambda: [0] * 24, min_length=24, max_length=24
+    )
+
+
+class _ModelUsageStatsFile(BaseModel):
+    """利用統計ファイルの内容"""
+
+    # 音声合成モデルごとの利用統計 (キー: AIVM の UUID)
+    models: dict[str, _ModelUsage] = Field(default_factory=dict)
+    # 保存時点でロードされていた音声合成モデルの AIVM の UUID (ロードされた順)
+    resident_aivm_uuids: list[str] = Field(default_factory=list)
+
+
+class ModelUsageStats:
+    """
+    音声合成モデルごとの利用統計 (リクエスト回数・最終利用時刻・時間帯ごとのリクエスト回数) と、
+    ロード済みの音声合成モデルの一覧をファイルに永続化する。
+
+    エンジン起動時は、前回終了時にロードされていた音声合成モデルと、利用統計から算出したスコアの高い音声合成モデルを
+    事前ロードすることで、よく使われる音声合成モデルの最初のリクエストでロードを待たずに済むようにする。
+    """
+
+    # 最終利用時刻によるスコアの重みが半減するまでの時間 (秒単位)
+    RECENCY_HALF_LIFE: float = 3 * 24 * 60 * 60
+
+    def __init__(self, stats_file_path: Path, save_interval: float = 60.0) -> None:
+        """
+        ModelUsageStats のコンストラクタ
+
+        Parameters
+        ----------
+        stats_file_path : Path
+            利用統計ファイルの保存先パス
+        save_interval : float, default 60.0
+            利用統計に変更があった場合に、バックグラウンドでファイルに保存する間隔 (秒単位)
+        """
+
+        self._stats_file_path = stats_file_path
+        self._save_interval = save_interval
+        self._lock = threading.Lock()
+        self._is_dirty = False
+        self._autosave_thread: threading.Thread | None = None
+
+        stats_file = self._load()
+        self._models = stats_file.models
+        # 前回終了時にロードされていた音声合成モデル
+        self.previous_resident_aivm_uuids: list[str] = stats_file.resident_aivm_uuids
+        # 現在ロードされている音声合成モデル (ロードされた順)
+        self._resident_aivm_uuids: list[str] = []
+
+    def record_request(self, aivm_uuid: str, now: float | None = None) -> None:
+        """
+        音声合成モデルへの音声合成リクエストを記録する。
+
+        Parameters
+        ----------
+        aivm_uuid : str
+            音声合成リクエストの対象の音声合成モデルの AIVM の UUID
+        now : float | None, default None
+            リクエスト時刻 (UNIX 時間、None のときは現在時刻)
+        """
+
+        now = time.time() if now is None else now
+        with self._lock:
+            usage = self._models.setdefault(aivm_uuid, _ModelUsage())
+            usage.request_count += 1
+            usage.last_used_at = max(usage.last_used_at, now)
+            usage.hourly_request_counts[time.localtime(now).tm_hour] += 1
+            self._is_dirty = True
+
+    def on_loaded(self, aivm_uuid: str) -> None:
+        """音声合成モデルがロードされたことを記録する。"""
+        with self._lock:
+            if aivm_uuid not in self._resident_aivm_uuids:
+                self._resident_aivm_uuids.append(aivm_uuid)
+                self._is_dirty = True
+
+    def on_unloaded(self, aivm_uuid: str) -> None:
+        """音声合成モデルがアンロードされたことを記録する。"""
+        with self._lock:
+            if aivm_uuid in self._resident_aivm_uuids:
+                self._resident_aivm_uuids.remove(aivm_uuid)
+                self._is_dirty = True
+
+    def get_score(self, aivm_uuid: str, now: float | None = None) -> float:
+        """
+        音声合成モデルの事前ロードの優先度を表すスコアを算出する。
+        リクエスト回数が多いほど・最近使われたほど・現在の時間帯によく使われているほど高くなり、一度も使われていなければ 0 になる。
+
+        Parameters
+        ----------
+        aivm_uuid : str
+            音声合成モデルの AIVM の UUID
+        now : float | None, default None
+            スコアを算出する時刻 (UNIX 時間、None のときは現在時刻)
+
+        Returns
+        -------
+        float
+            事前ロードの優先度を表すスコア
+        """
+
+        now = time.time() if now is None else now
+        with self._lock:
+            usage = self._models.get(aivm_uuid)
+            if usage is None or usage.request_count == 0:
+                return 0.0
+
+            # リクエスト回数は対数をとり、極端に多く使われたモデルだけが常に優先されないようにする
+            frequency = math.log1p(usage.request_count)
+            # 最終利用時刻から経過するほど、半減期に従って重みを下げる
+            recency = math.pow(
+                0.5, max(now - usage.last_used_at, 0.0) / self.RECENCY_HALF_LIFE
+            )
+            # 現在の時間帯と前後の時間帯のリクエスト回数の割合 (0 ~ 1)
+            hour = time.localtime(now).tm_hour
+            counts = usage.hourly_request_counts
+            time_of_day = (
+                counts[(hour - 1) % 24] + 2 * counts[hour] + counts[(hour + 1) % 24]
+            ) / (2 * usage.request_count)  # fmt: skip
+            return frequency * (recency + min(time_of_day, 1.0))
+
+    def rank_models(self, aivm_uuids: Iterable[str], now: float | None = None) -> list[str]:  # fmt: skip
+        """
+        一度以上使われたことのある音声合成モデルを、事前ロードの優先度が高い順に並べて返す。
+
+        Parameters
+        ----------
+        aivm_uuids : Iterable[str]
+            候補となる音声合成モデルの AIVM の UUID (インストール済みの音声合成モデルなど)
+        now : float | None, default None
+            スコアを算出する時刻 (UNIX 時間、None のときは現在時刻)
+
+        Returns
+        -------
+        list[str]
+            優先度が高い順に並べた音声合成モデルの AIVM の UUID
+        """
+
+        now = time.time() if now is None else now
+        scores = {aivm_uuid: self.get_score(aivm_uuid, now) for aivm_uuid in aivm_uuids}
+        return sorted(
+            (aivm_uuid for aivm_uuid, score in scores.items() if score > 0),
+            key=lambda aivm_uuid: scores[aivm_uuid],
+            reverse=True,
+        )
+
+    def start_autosave(self) -> None:
+        """利用統計を定期的にファイルに保存するバックグラウンドスレッドを開始し、プロセス終了時にも保存されるようにする。"""
+
+        if self._autosave_thread is not None:
+            return
+
+        def autosave() -> None:
+            while True:
+                time.sleep(self._save_interval)
+                self.save()
+
+        self._autosave_thread = threading.Thread(target=autosave, daemon=True)
+        self._autosave_thread.start()
+        atexit.register(self.save)
+
+    def save(self) -> None:
+        """前回の保存以降に利用統計が変更されていれば、ファイルに保存する。"""
+
+        with self._lock:
+            if self._is_dirty is False:
+                return
+            data = _ModelUsageStatsFile(
+                models=self._models,
+                resident_aivm_uuids=self._resident_aivm_uuids,
+            ).model_dump_json()
+            self._is_dirty = False
+
+        try:
+            # 一時ファイルに書き込んでから名前変更することで、書き込み中にクラッシュしてもファイルが壊れないようにする
+            self._stats_file_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self._stats_file_path.with_suffix(".tmp")
+            temp_path.write_text(data, encoding="utf-8")
+            temp_path.replace(self._stats_file_path)
+        except OSError as ex:
+            logger.warning("Failed to save model usage stats:", exc_info=ex)
+
+    def _load(self) -> _ModelUsageStatsFile:
+        """利用統計ファイルを読み込む。ファイルが存在しないか壊れている場合は、空の利用統計を返す。"""
+
+        if not self._stats_file_path.exists():
+            return _ModelUsageStatsFile()
+        try:
+            return _ModelUsageStatsFile.model_validate_json(
+                self._stats_file_path.read_text(encoding="utf-8")
+            )
+        except Exception as ex:
+            logger.warning("Failed to load model usage stats:", exc_info=ex)
+            return _ModelUsageStatsFile()
@@ -0,0 +1,237 @@
+"""ONNX Runtime の推論セッションの設定と、最適化済みモデルのキャッシュに関する処理"""
+
+import hashlib
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal
+
+import onnxruntime
+
+from ..logging import logger
+
+__all__ = ["OnnxSessionSettings"]
+
+
+# 実行モードの名前と ONNX Runtime の ExecutionMode の対応
+_EXECUTION_MODES: dict[str, onnxruntime.ExecutionMode] = {
+    "sequential": onnxruntime.ExecutionMode.ORT_SEQUENTIAL,
+    "parallel": onnxruntime.ExecutionMode.ORT_PARALLEL,
+}
+
+# グラフ最適化レベルの名前と ONNX Runtime の GraphOptimizationLevel の対応
+_GRAPH_OPTIMIZATION_LEVELS: dict[str, onnxruntime.GraphOptimizationLevel] = {
+    "disable": onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+
+@dataclass(frozen=True)
+class OnnxSessionSettings:
+    """
+    BERT モデル・音声合成モデルの ONNX 推論セッションに適用する設定。
+    None の項目は変更せず、AivisSpeech Engine または ONNX Runtime の既定値のままにする。
+
+    optimized_model_cache_dir を指定すると、グラフ最適化を行った後のモデルを、元のモデルファイルのパス・サイズ・更新日時と
+    ONNX Runtime のバージョン・ExecutionProvider・グラフ最適化レベルをキーとしてキャッシュディレクトリに保存する。
+    次回以降のロード時は保存済みの最適化済みモデルをグラフ最適化なしでロードするため、ロード時間を短縮できる。
+    最適化済みモデルには実行環境の CPU に固有の最適化が含まれることがあるため、キャッシュディレクトリは他の環境と共有しないこと。
+    """
+
+    # 1 つの推論処理の中で並列に演算を行うスレッド数
+    intra_op_num_threads: int | None = None
+    # 並列実行モードで、独立した演算を並列に行うスレッド数
+    inter_op_num_threads: int | None = None
+    # グラフ内の独立した演算を逐次 (sequential) 実行するか、並列 (parallel) 実行するか
+    execution_mode: Literal["sequential", "parallel"] | None = None
+    # ロード時に行うグラフ最適化のレベル
+    graph_optimization_level: Literal["disable", "basic", "extended", "all"] | None = None  # fmt: skip
+    # 入力の形状に基づいてメモリ割り当てを事前に計画するメモリパターン最適化を有効にするかどうか
+    enable_mem_pattern: bool | None = None
+    # グラフ最適化を行った後のモデルを保存するキャッシュディレクトリ (None のときはキャッシュしない)
+    optimized_model_cache_dir: Path | None = None
+
+    def apply(self, sess_options: onnxruntime.SessionOptions) -> None:
+        """
+        設定を SessionOptions に反映する。
+
+        Parameters
+        ----------
+        sess_options : onnxruntime.SessionOptions
+            設定を反映する SessionOptions
+        """
+
+        if self.intra_op_num_threads is not None:
+            sess_options.intra_op_num_threads = self.intra_op_num_threads
+        if self.inter_op_num_threads is not None:
+            sess_options.inter_op_num_threads = self.inter_op_num_threads
+        if self.execution_mode is not None:
+            sess_options.execution_mode = _EXECUTION_MODES[self.execution_mode]
+        if self.graph_optimization_level is not None:
+            sess_options.graph_optimization_level = _GRAPH_OPTIMIZATION_LEVELS[self.graph_optimization_level]  # fmt: skip
+        if self.enable_mem_pattern is not None:
+            sess_options.enable_mem_pattern = self.enable_mem_pattern
+
+    def create_session(
+        self,
+        model_path: Path,
+        sess_options: onnxruntime.SessionOptions,
+        providers: Sequence[str | tuple[str, dict[str, Any]]],
+    ) -> onnxruntime.InferenceSession:
+        """
+        設定を反映した推論セッションを作成する。
+        最適化済みモデルのキャッシュが有効な場合は、キャッシュされた最適化済みモデルをロードするか、最適化済みモデルをキャッシュに保存する。
+
+        Parameters
+        ----------
+        model_path : Path
+            ONNX モデルのパス
+        sess_options : onnxruntime.SessionOptions
+            推論セッションの SessionOptions (設定が反映される)
+        providers : Sequence[str | tuple[str, dict[str, Any]]]
+            推論に利用する ExecutionProvider
+
+        Returns
+        -------
+        onnxruntime.InferenceSession
+            作成された推論セッション
+        """
+
+        session: onnxruntime.InferenceSession | None = None
+
+        def init(path_or_bytes: Any, options: onnxruntime.SessionOptions) -> None:
+            nonlocal session
+            session = onnxruntime.InferenceSession(
+                path_or_bytes, sess_options=options, providers=providers
+            )
+
+        self._initialize(init, str(model_path), sess_options, providers)
+        assert session is not None
+        return session
+
+    @contextmanager
+    def apply_to_new_sessions(self) -> Iterator[None]:
+        """
+        ブロック内で作成されるすべての推論セッションに設定を反映する。
+        Style-Bert-VITS2 の BERT モデルのように、SessionOptions を外部から指定できない推論セッションに利用する。
+        """
+
+        original_init = onnxruntime.InferenceSession.__init__
+
+        def patched_init(
+            session: onnxruntime.InferenceSession,
+            path_or_bytes: Any,
+            sess_options: onnxruntime.SessionOptions | None = None,
+            providers: Any = None,
+            provider_options: Any = None,
+            **kwargs: Any,
+        ) -> None:
+            def init(path_or_bytes: Any, options: onnxruntime.SessionOptions) -> None:
+                original_init(session, path_or_bytes, options, providers, provider_options, **kwargs)  # fmt: skip
+
+            self._initialize(
+                init,
+                path_or_bytes,
+                sess_options if sess_options is not None else onnxruntime.SessionOptions(),
+                providers or [],
+            )  # fmt: skip
+
+        onnxruntime.InferenceSession.__init__ = patched_init  # type: ignore[method-assign]
+        try:
+            yield
+        finally:
+            onnxruntime.InferenceSession.__init__ = original_init  # type: ignore[method-assign]
+
+    def _initialize(
+        self,
+        init: Callable[[Any, onnxruntime.SessionOptions], None],
+        path_or_bytes: Any,
+        sess_options: onnxruntime.SessionOptions,
+        providers: Sequence[Any],
+    ) -> None:
+        """設定を反映した SessionOptions で推論セッションを初期化し、必要に応じて最適化済みモデルのキャッシュを利用する。"""
+
+        self.apply(sess_options)
+
+        # ファイルパス以外 (バイト列) から作成される推論セッションや、キャッシュが無効な場合はそのまま初期化する
+        if self.optimized_model_cache_dir is None or not isinstance(path_or_bytes, str | Path):  # fmt: skip
+            init(path_or_bytes, sess_options)
+            return
+
+        model_path = Path(path_or_bytes)
+        cache_path = self._get_optimized_model_path(model_path, sess_options, providers)  # fmt: skip
+
+        # キャッシュされた最適化済みモデルがあれば、グラフ最適化を行わずにロードする
+        if cache_path.is_file():
+            graph_optimization_level = sess_options.graph_optimization_level
+            sess_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL  # fmt: skip
+            try:
+                init(str(cache_path), sess_options)
+                logger.info(f"Loaded optimized model from cache. ({cache_path.name})")
+                return
+            except Exception as ex:
+                # 破損したキャッシュなどは削除し、元のモデルからロードし直す
+                logger.warning(f"Failed to load optimized model cache {cache_path}:", exc_info=ex)  # fmt: skip
+                cache_path.unlink(missing_ok=True)
+                sess_options.graph_optimization_level = graph_optimization_level
+
+        # 元のモデルからロードし、グラフ最適化を行った後のモデルをキャッシュに保存する
+        ## 書き込み中のファイルがロードされないよう、一時ファイルに保存してから名前を変更する
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_suffix(".tmp")
+        sess_options.optimized_model_filepath = str(temp_path)
+        try:
+            init(path_or_bytes, sess_options)
+        except Exception as ex:
+            # 2GB を超えるモデルなど、最適化済みモデルを保存できない場合は、キャッシュせずにロードする
+            logger.warning(f"Failed to save optimized model of {model_path.name}:", exc_info=ex)  # fmt: skip
+            temp_path.unlink(missing_ok=True)
+            sess_options.optimized_model_filepath = ""
+            init(path_or_bytes, sess_options)
+            return
+        if temp_path.is_file():
+            # 同じパスのモデルファイルの、変更前の内容に対するキャッシュを削除してから保存する
+            ## ExecutionProvider やグラフ最適化レベルが異なる設定のキャッシュは、同時に利用されうるため削除しない
+            path_prefix, file_key, _ = cache_path.stem.rsplit("-", 2)
+            for stale_path in cache_path.parent.glob(f"{path_prefix}-*.onnx"):
+                if stale_path.stem.rsplit("-", 2)[1] != file_key:
+                    stale_path.unlink(missing_ok=True)
+            temp_path.replace(cache_path)
+            logger.info(f"Saved optimized model to cache. ({cache_path.name})")
+
+    def _get_optimized_model_path(
+        self,
+        model_path: Path,
+        sess_options: onnxruntime.SessionOptions,
+        providers: Sequence[Any],
+    ) -> Path:
+        """
+        元のモデルファイルと推論環境から、最適化済みモデルのキャッシュファイルのパスを決定する。
+        ファイル名は「モデルファイル名-パスのハッシュ値-ファイルのハッシュ値-推論環境のハッシュ値.onnx」の形式になる。
+        数百 MB あるモデルファイルの内容をロードのたびにハッシュ化しないよう、モデルファイルはパス・サイズ・更新日時で識別する。
+        """
+
+        assert self.optimized_model_cache_dir is not None
+        resolved_path = model_path.resolve()
+        stat = resolved_path.stat()
+        path_key = hashlib.sha256(str(resolved_path).encode("utf-8")).hexdigest()
+        file_key = hashlib.sha256(
+            f"{resolved_path}\n{stat.st_size}\n{stat.st_mtime_ns}".encode()
+        ).hexdigest()
+        provider_names = [
+            provider[0] if isinstance(provider, tuple) else provider
+            for provider in providers
+        ]
+        environment_key = hashlib.sha256(
+            "\n".join([
+                onnxruntime.__version__,
+                ",".join(provider_names),
+                str(sess_options.graph_optimization_level),
+            ]).encode("utf-8")
+        ).hexdigest()  # fmt: skip
+        return self.optimized_model_cache_dir / (
+            f"{model_path.stem}-{path_key[:8]}-{file_key[:16]}-{environment_key[:16]}.onnx"
+        )
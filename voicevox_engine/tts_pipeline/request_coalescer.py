@@ -0,0 +1,67 @@
+"""同一内容の同時リクエストを 1 回の処理にまとめるリクエストコアレッサー"""
+
+import threading
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from typing import Generic, TypeVar
+
+__all__ = ["RequestCoalescer"]
+
+K = TypeVar("K", bound=Hashable)
+R = TypeVar("R")
+
+
+class RequestCoalescer(Generic[K, R]):
+    """
+    同一内容の同時リクエストを 1 回の処理にまとめるリクエストコアレッサー。
+
+    あるキーに対する処理が実行中の間に同じキーのリクエストが届いた場合、後続のリクエストは新たに処理を行わず、
+    実行中の処理の結果を受け取る。後続のリクエストを待ち受けるための待機時間は設けず、最初のリクエストはすぐに処理される。
+    処理が完了した時点でキーは破棄されるため、結果がキャッシュされることはない。
+    """
+
+    def __init__(self) -> None:
+        """RequestCoalescer のコンストラクタ"""
+
+        self._in_flight: dict[K, Future[R]] = {}
+        self._lock = threading.Lock()
+
+    def run(self, key: K, function: Callable[[], R]) -> R:
+        """
+        同じキーの処理が実行中であればその結果を待機して返し、そうでなければ function を実行して結果を返す。
+
+        Parameters
+        ----------
+        key : K
+            同一内容のリクエストを判別するキー
+        function : Callable[[], R]
+            リクエストを処理する関数 (同じキーに対しては、同じ結果を返す処理である必要がある)
+
+        Returns
+        -------
+        R
+            リクエストに対応する結果 (同時に届いた同一内容のリクエストには、同じオブジェクトが返される)
+        """
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if future is None:
+                future = Future()
+                self._in_flight[key] = future
+
+        # 後続のリクエストは、最初のリクエストの処理が完了するまで待機する
+        if not is_leader:
+            return future.result()
+
+        # 最初のリクエストは自ら処理を行い、その結果を待機中のリクエストにも渡す
+        try:
+            result = function()
+        except BaseException as ex:
+            future.set_exception(ex)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+        future.set_result(result)
+        return result
@@ -1,10 +1,15 @@
 """AivisSpeech Engine におけるテキスト音声合成エンジンの実装"""
 
 import copy
+import dataclasses
+import os
 import re
+import shutil
+import tempfile
 import threading
 import time
 from collections.abc import Sequence
+from dataclasses import dataclass
 from io import BytesIO
 from pathlib import Path
 from typing import Any, Final, cast
@@ -13,6 +18,7 @@ import aivmlib
 import jaconv
 import numpy as np
 import onnxruntime
+import pyopenjtalk
 from fastapi import HTTPException
 from numpy.typing import NDArray
 from style_bert_vits2.constants import (
@@ -40,12 +46,37 @@ from ..dev.core.mock import MockCoreWrapper
 from ..logging import logger
 from ..metas.Metas import StyleId
 from ..model import AudioQuery
-from ..tts_pipeline.audio_postprocessing import raw_wave_to_output_wave
+from ..tts_pipeline.audio_postprocessing import (
+    find_non_silent_range,
+    raw_wave_to_output_wave,
+)
+from ..tts_pipeline.bert_feature_cache import (
+    BertFeatureCache,
+    bypass_bert_feature_cache,
+)
+from ..tts_pipeline.cancellation import (
+    CancellationToken,
+    TerminableInferenceSession,
+    get_current_cancellation_token,
+)
+from ..tts_pipeline.inference_slot_pool import InferenceSlotPool
 from ..tts_pipeline.model import AccentPhrase, Mora
+from ..tts_pipeline.model_residency_manager import ModelResidencyManager
+from ..tts_pipeline.model_usage_stats import ModelUsageStats
+from ..tts_pipeline.onnx_session_settings import OnnxSessionSettings
+from ..tts_pipeline.request_coalescer import RequestCoalescer
+from ..tts_pipeline.synthesis_cache import SynthesisCache
+from ..tts_pipeline.synthesis_worker_pool import SynthesisWorkerPool
 from ..tts_pipeline.tts_engine import (
     TTSEngine,
     to_flatten_moras,
 )
+from ..user_dict.user_dict_manager import (
+    add_dictionary_applied_listener,
+    get_applied_dictionary_generation,
+    get_applied_dictionary_version,
+)
+from ..utility.lru_cache_utility import LRUCache
 from ..utility.path_utility import get_save_dir
 
 
@@ -59,22 +90,166 @@ class StyleBertVITS2TTSEngine(TTSEngine):
     # BERT モデルのキャッシュディレクトリ
     BERT_MODEL_CACHE_DIR: Final[Path] = get_save_dir() / "BertModelCaches"
 
-    # ONNX Runtime の推論処理を排他制御するためのロック
-    _inference_lock: Final[threading.Lock] = threading.Lock()
+    # 合成音声キャッシュ (ディスク上のキャッシュ) の保存先ディレクトリ
+    SYNTHESIS_CACHE_DIR: Final[Path] = get_save_dir() / "SynthesisCaches"
+
+    # グラフ最適化済みの ONNX モデルのキャッシュの保存先ディレクトリ
+    OPTIMIZED_MODEL_CACHE_DIR: Final[Path] = get_save_dir() / "OptimizedModelCaches"
+
+    # 音声合成モデルごとの利用統計の保存先パス
+    MODEL_USAGE_STATS_PATH: Final[Path] = get_save_dir() / "model_usage_stats.json"
+
+    # ウォームアップ時に推論する文章
+    ## ONNX Runtime は入力の長さに応じてメモリアリーナの拡張やカーネルの選択を行うため、長さの異なる文章を用意している
+    WARM_UP_TEXTS: Final[tuple[str, ...]] = (
+        "こんにちは。",
+        "今日はとてもいい天気ですね。少し散歩に出かけましょうか。",
+        "吾輩は猫である。名前はまだ無い。どこで生れたかとんと見当がつかぬ。何でも薄暗いじめじめした所でニャーニャー泣いていた事だけは記憶している。",
+    )
 
     def __init__(
         self,
         aivm_manager: AivmManager,
         use_gpu: bool = False,
         load_all_models: bool = False,
+        inference_slots: int = 1,
+        max_inference_slots_per_model: int | None = None,
+        coalesce_identical_requests: bool = False,
+        model_memory_budget: int | None = None,
+        model_idle_ttl: float | None = None,
+        pinned_models: list[str] | None = None,
+        synthesis_cache_memory_size: int = 0,
+        synthesis_cache_disk_size: int = 0,
+        bert_feature_cache_size: int = 0,
+        g2p_cache_size: int = 0,
+        synthesis_workers: int = 0,
+        warm_up_models: bool = False,
+        onnx_session_settings: OnnxSessionSettings | None = None,
+        preload_models: int = 0,
+        restore_resident_models: bool = False,
     ) -> None:
         self.aivm_manager = aivm_manager
         self.use_gpu = use_gpu
         self.load_all_models = load_all_models
 
+        # BERT モデルや音声合成モデルのロード直後に、ダミーの文章で推論してウォームアップするかどうか
+        ## ONNX Runtime は初回の推論時にメモリアリーナの確保やカーネルの選択などを行うため、初回の音声合成だけが大幅に遅くなる
+        ## ウォームアップを有効にすると、ロードに時間がかかる代わりに、ロード直後の音声合成も定常時と同じ速度で行える
+        self.warm_up_models = warm_up_models
+
+        # 音声合成処理を並列に実行するワーカープロセスの数
+        ## 0 のとき (既定) はワーカープロセスを起動せず、従来通り API サーバーのプロセス内で音声合成を行う
+        ## ワーカープロセスはモデルのロード後に start_synthesis_workers() で fork() して起動するため、fork() をサポートしない環境では利用できない
+        ## また、GPU の推論コンテキストは fork() 後のワーカープロセスに引き継げないため、GPU 推論時も利用できない
+        if synthesis_workers > 0 and not hasattr(os, "fork"):
+            logger.warning("Synthesis workers are not supported on this platform. Synthesizing in the main process.")  # fmt: skip
+            synthesis_workers = 0
+        elif synthesis_workers > 0 and use_gpu is True:
+            logger.warning("Synthesis workers are not supported with GPU inference. Synthesizing in the main process.")  # fmt: skip
+            synthesis_workers = 0
+        self._synthesis_workers = synthesis_workers
+        self._synthesis_worker_pool: SynthesisWorkerPool | None = None
+
+        # BERT モデル・音声合成モデルの推論セッションに適用する設定
+        ## ワーカープロセスを利用する場合は、ワーカープロセス数の分だけ並列に推論するため、推論用のスレッド数を 1 に固定する
+        ## ONNX Runtime の推論用のスレッドは fork() 後の子プロセスに引き継がれず、親プロセスで作成した推論セッションを
+        ## 子プロセスで利用するとハングするが、スレッド数が 1 のときはスレッドプール自体が作成されないため安全に利用できる
+        self._onnx_session_settings = onnx_session_settings or OnnxSessionSettings()
+        if synthesis_workers > 0:
+            self._onnx_session_settings = dataclasses.replace(
+                self._onnx_session_settings,
+                intra_op_num_threads=1,
+                inter_op_num_threads=1,
+            )
+
         # ロード済みモデルのキャッシュ
         self.tts_models: dict[str, TTSModel] = {}
 
+        # 音声合成モデルごとの、ローカルなスタイル ID からハイパーパラメータ記載のスタイル名への対応表
+        ## 音声合成のたびにハイパーパラメータの data.style2id を走査しないよう、モデルのロード時に作成する
+        ## モデルのロード時に作り直すため、アンロード時には削除しない (モデルの更新でスタイルが変わっても問題ない)
+        self._local_style_names: dict[str, dict[int, str]] = {}
+
+        # 音声合成モデルごとの利用統計 (リクエスト回数・最終利用時刻・時間帯ごとのリクエスト回数) とロード済みのモデルの一覧
+        ## 起動時の事前ロードの設定にかかわらず常に記録し、次回起動時に事前ロードするモデルの優先順位の決定に利用する
+        self._model_usage_stats = ModelUsageStats(self.MODEL_USAGE_STATS_PATH)
+
+        # 複数のリクエストから同時に同じモデルがロードされないよう、モデルのロード処理を排他制御するためのモデルごとのロック
+        ## 異なるモデルのロードは互いに待ち合わせず、並行して実行できる
+        self._model_load_locks: dict[str, threading.Lock] = {}
+        self._model_load_locks_lock = threading.Lock()
+
+        # ONNX Runtime の推論処理を同時に実行できる数を制限する推論スロットプール
+        ## 推論処理を大量に並列実行すると最悪プロセスごと ONNX Runtime がクラッシュするため、推論スロット数で上限を設ける
+        ## 既定では推論スロットは 1 つのみで、従来通りすべての推論処理が直列に実行される
+        self._inference_slot_pool = InferenceSlotPool(
+            num_slots=inference_slots,
+            max_slots_per_model=max_inference_slots_per_model,
+        )
+        if inference_slots > 1:
+            logger.info(
+                f"Inference slots: {inference_slots} "
+                f"(Max per model: {max_inference_slots_per_model or inference_slots}, "
+                f"Intra-op threads per slot: {self._inference_slot_pool.intra_op_num_threads})"
+            )
+
+        # 推論中のリクエストとまったく同じ内容のリクエストが届いた場合に、推論を 1 回にまとめて結果を共有するリクエストコアレッサー
+        ## Style-Bert-VITS2 の ONNX モデルは 1 発話ずつの入力にしか対応していないため、異なる内容のリクエストはまとめられない
+        ## 同じ内容でも推論ごとに異なる音声が生成されるが、有効にすると同時に届いた同一内容のリクエストには同じ音声が返される
+        ## 既定では無効で、リクエストごとに推論する
+        self._request_coalescer: (
+            RequestCoalescer[tuple[str, _InferenceParameters], tuple[int, NDArray[Any]]] | None
+        ) = None  # fmt: skip
+        ## ワーカープロセスを利用する場合は、ワーカープロセスごとに推論するため、リクエストをまとめない
+        if coalesce_identical_requests is True and synthesis_workers > 0:
+            logger.warning("Request coalescing is disabled when synthesis workers are enabled.")  # fmt: skip
+        elif coalesce_identical_requests is True:
+            self._request_coalescer = RequestCoalescer()
+            logger.info("Coalescing identical synthesis requests.")
+
+        # ロード済みの音声合成モデルをメモリ使用量の上限・最終利用時刻に基づいて自動的にアンロードする常駐管理マネージャー
+        ## いずれも指定されていない場合 (既定) は、従来通り明示的にアンロードされるまでモデルをロードしたままにする
+        self._model_residency_manager = ModelResidencyManager(
+            unload_model=self.unload_model,
+            memory_budget=model_memory_budget,
+            idle_ttl=model_idle_ttl,
+            pinned_aivm_uuids=pinned_models,
+        )
+        if model_memory_budget is not None or model_idle_ttl is not None:
+            logger.info(
+                "Model residency: "
+                f"Memory budget: {f'{model_memory_budget / 1024 / 1024:.0f}MB' if model_memory_budget is not None else 'unlimited'}, "
+                f"Idle TTL: {f'{model_idle_ttl:.0f}s' if model_idle_ttl is not None else 'disabled'}, "
+                f"Pinned models: {len(pinned_models or [])}"
+            )
+
+        # 同一内容の音声合成結果をメモリとディスクにキャッシュする合成音声キャッシュ
+        ## いずれの容量上限も 0 のとき (既定) はキャッシュを無効化し、毎回音声合成を行う
+        ## 音声合成モデルが更新・アンインストールされた際は、そのモデルのキャッシュを自動的に削除する
+        self._synthesis_cache: SynthesisCache | None = None
+        if synthesis_cache_memory_size > 0 or synthesis_cache_disk_size > 0:
+            self._synthesis_cache = SynthesisCache(
+                memory_max_size=synthesis_cache_memory_size,
+                disk_max_size=synthesis_cache_disk_size,
+                cache_dir=self.SYNTHESIS_CACHE_DIR,
+            )
+            self.aivm_manager.add_model_change_listener(
+                self._synthesis_cache.invalidate_model
+            )
+            logger.info(
+                "Synthesis cache enabled. "
+                f"(Memory: {synthesis_cache_memory_size / 1024 / 1024:.0f}MB, "
+                f"Disk: {synthesis_cache_disk_size / 1024 / 1024:.0f}MB)"
+            )
+
+        # テキストから生成したアクセント句系列をキャッシュする g2p キャッシュ
+        ## キャッシュキーにはユーザー辞書の世代番号を含めるため、ユーザー辞書が更新されると古い結果は参照されなくなる
+        ## g2p_cache_size が 0 のとき (既定) はキャッシュを無効化し、毎回 g2p 処理を行う
+        self._g2p_cache: LRUCache[tuple[str, int], list[AccentPhrase]] | None = None
+        if g2p_cache_size > 0:
+            self._g2p_cache = LRUCache(max_entries=g2p_cache_size)
+            logger.info(f"G2P cache enabled. ({g2p_cache_size} entries)")
+
         # ONNX Runtime での推論に利用するデバイスを選択
         ## デフォルト: CPU 推論 (CPUExecutionProvider)
         ## arena_extend_strategy を kSameAsRequested にすると、推論セッションによって作成される
@@ -156,15 +331,17 @@ class StyleBertVITS2TTSEngine(TTSEngine):
         ## 一度ロードしておけば、同じプロセス内でグローバルに保持される
         ## リビジョンを指定しない場合毎回 Hugging Face への通信が発生し、オフライン環境では 60 秒でタイムアウトするまで待たされるので、
         ## 明示的にコミットハッシュでリビジョンを指定している (こうすることで、オンライン環境でもロード時間が短縮されるメリットもある)
+        ## BERT モデルの推論セッションは Style-Bert-VITS2 の内部で作成されるため、作成時に推論セッションの設定を差し込む
         start_time = time.time()
         logger.info("Loading BERT model and tokenizer...")
-        onnx_bert_models.load_model(
-            language=Languages.JP,
-            pretrained_model_name_or_path="tsukumijima/deberta-v2-large-japanese-char-wwm-onnx",
-            onnx_providers=self.onnx_providers,
-            cache_dir=str(self.BERT_MODEL_CACHE_DIR),
-            revision="d701ec67708287b20d2063270f6b535e6eed09ab",
-        )
+        with self._onnx_session_settings.apply_to_new_sessions():
+            onnx_bert_models.load_model(
+                language=Languages.JP,
+                pretrained_model_name_or_path="tsukumijima/deberta-v2-large-japanese-char-wwm-onnx",
+                onnx_providers=self.onnx_providers,
+                cache_dir=str(self.BERT_MODEL_CACHE_DIR),
+                revision="d701ec67708287b20d2063270f6b535e6eed09ab",
+            )
         onnx_bert_models.load_tokenizer(
             language=Languages.JP,
             pretrained_model_name_or_path="tsukumijima/deberta-v2-large-japanese-char-wwm-onnx",
@@ -174,6 +351,19 @@ class StyleBertVITS2TTSEngine(TTSEngine):
         logger.info(
             f"BERT model and tokenizer loaded. ({time.time() - start_time:.2f}s)"
         )
+        ## BERT 特徴量キャッシュにダミーの文章の特徴量が残らないよう、キャッシュを有効化する前にウォームアップする
+        if warm_up_models is True:
+            self._warm_up_bert_model()
+
+        # 正規化済みテキストと音素列ごとに BERT 特徴量の抽出結果をキャッシュする BERT 特徴量キャッシュ
+        ## 同じ文章を話速や感情表現の強さなどを変えて何度も音声合成する際に、最も重い BERT 特徴量の抽出を省略できる
+        ## 容量上限が 0 のとき (既定) はキャッシュを無効化する
+        self._bert_feature_cache: BertFeatureCache | None = None
+        if bert_feature_cache_size > 0:
+            bert_feature_cache = BertFeatureCache(max_size=bert_feature_cache_size)
+            if bert_feature_cache.install() is True:
+                self._bert_feature_cache = bert_feature_cache
+                logger.info(f"BERT feature cache enabled. ({bert_feature_cache_size / 1024 / 1024:.0f}MB)")  # fmt: skip
 
         # load_all_models が True の場合は全ての音声合成モデルをロードしておく
         if load_all_models is True:
@@ -182,6 +372,36 @@ class StyleBertVITS2TTSEngine(TTSEngine):
                 self.load_model(aivm_uuid)
             logger.info("All models loaded.")
 
+        # 固定 (ピン留め) されたモデルは、最初のリクエストを待たずにロードしておく
+        for aivm_uuid in pinned_models or []:
+            if aivm_uuid in self.aivm_manager.get_installed_aivm_infos():
+                self.load_model(aivm_uuid)
+            else:
+                logger.warning(f"Pinned model {aivm_uuid} is not installed.")
+
+        # 利用統計に基づいて、よく使われる音声合成モデルや前回終了時にロードされていたモデルを事前ロードする
+        ## 通常は API サーバーがリクエストを受け付けている間にバックグラウンドで優先度の高いモデルから順にロードし、起動を遅らせない
+        ## ワーカープロセスを利用する場合は、事前ロードしたモデルをワーカープロセスと共有できるよう、ワーカープロセスの起動前にロードする
+        if load_all_models is False and (preload_models > 0 or restore_resident_models is True):  # fmt: skip
+            if synthesis_workers > 0:
+                self._preload_models(preload_models, restore_resident_models)
+            else:
+                threading.Thread(
+                    target=self._preload_models,
+                    args=(preload_models, restore_resident_models),
+                    daemon=True,
+                ).start()
+
+        # 音声合成モデルが更新・アンインストールされた際は、更新前のモデルをアンロードし、次回の音声合成時に読み込み直す
+        ## インストール先ディレクトリの監視により、API を経由せずに AIVMX ファイルが置き換え・削除された場合も同様にアンロードする
+        self.aivm_manager.add_model_change_listener(self.unload_model)
+
+        # 利用統計の自動保存と、一定時間使われていないモデルのアンロードを行うバックグラウンドスレッドを開始する
+        ## ワーカープロセスを利用する場合は、ワーカープロセスを fork() するまで他のスレッドを起動できないため、
+        ## start_synthesis_workers() でワーカープロセスを起動した後に開始する
+        if synthesis_workers == 0:
+            self._start_background_threads()
+
         # VOICEVOX CORE の通常の CoreWrapper の代わりに MockCoreWrapper を利用する
         ## 継承元の TTSEngine は self._core に CoreWrapper を入れた CoreAdapter のインスタンスがないと動作しない
         self._core = CoreAdapter(MockCoreWrapper())
@@ -215,6 +435,7 @@ class StyleBertVITS2TTSEngine(TTSEngine):
         Style-Bert-VITS2 の音声合成モデルをロードする
         StyleBertVITS2TTSEngine の初期化時に use_gpu=True が指定されている場合、モデルは GPU にロードされる
         継承元の TTSEngine には存在しない、StyleBertVITS2TTSEngine 固有のメソッド
+        warm_up_models=True の場合、実際にロードを行った呼び出しのみ、ロード後にウォームアップが完了するまで待ってから返る
 
         Parameters
         ----------
@@ -231,11 +452,45 @@ class StyleBertVITS2TTSEngine(TTSEngine):
         if aivm_uuid in self.tts_models:
             return self.tts_models[aivm_uuid]
 
-        # AIVM メタデータを読み込む
+        # 同じモデルが複数のリクエストから同時にロードされないよう排他制御する
+        with self._model_load_locks_lock:
+            model_load_lock = self._model_load_locks.setdefault(aivm_uuid, threading.Lock())  # fmt: skip
+        with model_load_lock:
+            # ロック取得待ちの間に別のリクエストによってロードされた場合はそのまま返す
+            if aivm_uuid in self.tts_models:
+                return self.tts_models[aivm_uuid]
+            tts_model = self._load_model(aivm_uuid)
+
+        # ウォームアップは数秒かかることがあるため、ロードの排他制御のロックを解放してから行う
+        # ロード済みのモデルは既に公開されているため、ウォームアップ中も他のリクエストはモデルを利用できる
+        # ウォームアップを行った呼び出し元 (/initialize_speaker など) は、ウォームアップの完了後に返る
+        if self.warm_up_models is True:
+            with self._model_residency_manager.use(aivm_uuid):
+                self._warm_up_model(aivm_uuid, tts_model)
+        return tts_model
+
+    def _load_model(self, aivm_uuid: str) -> TTSModel:
+        """
+        Style-Bert-VITS2 の音声合成モデルをロードする (load_model() の内部実装)
+        呼び出し元で self._model_load_locks 内の対象モデルのロックを取得している必要がある
+
+        Parameters
+        ----------
+        aivm_uuid : str
+            AIVM の UUID
+
+        Returns
+        -------
+        TTSModel
+            ロード済みの TTSModel インスタンス
+        """
+
+        # AIVM メタデータからハイパーパラメータとスタイルベクトルを取得する
+        ## スキャン時に読み込まれた値を再利用し、AIVMX ファイル全体を Python 上で読み込み直さないようにする
+        ## 重みを含む音声合成モデル本体は、推論セッションの作成時に ONNX Runtime がファイルパスから直接読み込む
         aivm_info = self.aivm_manager.get_aivm_info(aivm_uuid)
         try:
-            with open(aivm_info.file_path, mode="rb") as f:
-                aivm_metadata = aivmlib.read_aivmx_metadata(f)
+            model_parameters = self.aivm_manager.get_model_parameters(aivm_uuid)
         except aivmlib.AivmValidationError as ex:
             logger.error(
                 f"{aivm_info.file_path}: Failed to read AIVM metadata:", exc_info=ex
@@ -247,12 +502,12 @@ class StyleBertVITS2TTSEngine(TTSEngine):
 
         # ハイパーパラメータを読み込む
         hyper_parameters = HyperParameters.model_validate(
-            aivm_metadata.hyper_parameters.model_dump()
+            model_parameters.hyper_parameters.model_dump()
         )
 
         # スタイルベクトルを読み込む
-        assert aivm_metadata.style_vectors is not None
-        style_vectors = np.load(BytesIO(aivm_metadata.style_vectors))
+        assert model_parameters.style_vectors is not None
+        style_vectors = np.load(BytesIO(model_parameters.style_vectors))
 
         # 音声合成モデルをロード
         tts_model = TTSModel(
@@ -265,10 +520,26 @@ class StyleBertVITS2TTSEngine(TTSEngine):
             # ONNX 推論で利用する ExecutionProvider を指定
             onnx_providers=self.onnx_providers,
         )  # fmt: skip
+        # メモリ使用量の上限を超えないよう、必要に応じて最も長く使われていないモデルをアンロードしてからロードする
+        ## ロード後のメモリ使用量は、概ね AIVMX ファイル (ONNX モデル) のサイズに比例する
+        self._model_residency_manager.reserve(aivm_uuid, aivm_info.file_size)
         start_time = time.time()
         logger.info(f"Loading {aivm_info.manifest.name} ({aivm_uuid}) ...")
-        tts_model.load()
+        ## TTSModel.load() では推論セッションの SessionOptions を指定できないため、
+        ## 推論スロット数に応じたスレッド数などを反映した推論セッションをこちらで作成して TTSModel に設定する
+        ## キャンセル可能な音声合成で推論処理を途中で打ち切れるよう、推論セッションは TerminableInferenceSession でラップする
+        tts_model.onnx_session = TerminableInferenceSession(
+            self._create_onnx_session(aivm_info.file_path)
+        )
+        ## 音声合成時にスタイル名を定数時間で引けるよう、ローカルなスタイル ID からスタイル名への対応表を作成しておく
+        ## 同じスタイル ID に複数のスタイル名が対応する場合は、data.style2id で先に記載されたものを優先する
+        local_style_names: dict[int, str] = {}
+        for hps_style_name, hps_style_id in hyper_parameters.data.style2id.items():
+            local_style_names.setdefault(hps_style_id, hps_style_name)
+        self._local_style_names[aivm_uuid] = local_style_names
         self.tts_models[aivm_uuid] = tts_model
+        self._model_residency_manager.on_loaded(aivm_uuid, aivm_info.file_size)
+        self._model_usage_stats.on_loaded(aivm_uuid)
         self.aivm_manager.update_model_load_state(aivm_uuid, is_loaded=True)
         logger.info(
             f"{aivm_info.manifest.name} ({aivm_uuid}) loaded. ({time.time() - start_time:.2f}s)"
@@ -276,6 +547,165 @@ class StyleBertVITS2TTSEngine(TTSEngine):
 
         return tts_model
 
+    def _preload_models(self, num_top_models: int, restore_resident_models: bool) -> None:  # fmt: skip
+        """
+        前回終了時にロードされていた音声合成モデルと、利用統計に基づく優先度が上位の音声合成モデルを順にロードする
+        メモリ使用量の上限が設定されている場合は、上限内に収まらなくなった時点で事前ロードを打ち切り、ロード済みのモデルをアンロードしない
+
+        Parameters
+        ----------
+        num_top_models : int
+            利用統計に基づく優先度が上位の音声合成モデルのうち、事前ロードするモデルの数
+        restore_resident_models : bool
+            前回終了時にロードされていた音声合成モデルを事前ロードするかどうか
+        """
+
+        installed_aivm_infos = self.aivm_manager.get_installed_aivm_infos()
+        ranked_aivm_uuids = self._model_usage_stats.rank_models(installed_aivm_infos.keys())  # fmt: skip
+
+        # 前回終了時にロードされていたモデルを優先度順に並べた後に、優先度が上位のモデルを続ける
+        preload_aivm_uuids: list[str] = []
+        if restore_resident_models is True:
+            previous_resident_aivm_uuids = [
+                aivm_uuid
+                for aivm_uuid in self._model_usage_stats.previous_resident_aivm_uuids
+                if aivm_uuid in installed_aivm_infos
+            ]
+            preload_aivm_uuids.extend(sorted(
+                previous_resident_aivm_uuids,
+                key=lambda aivm_uuid: self._model_usage_stats.get_score(aivm_uuid),
+                reverse=True,
+            ))  # fmt: skip
+        for aivm_uuid in ranked_aivm_uuids[:num_top_models]:
+            if aivm_uuid not in preload_aivm_uuids:
+                preload_aivm_uuids.append(aivm_uuid)
+        if len(preload_aivm_uuids) == 0:
+            return
+
+        start_time = time.time()
+        logger.info(f"Preloading {len(preload_aivm_uuids)} models...")
+        preloaded_count = 0
+        for aivm_uuid in preload_aivm_uuids:
+            if self.is_model_loaded(aivm_uuid):
+                continue
+            memory_budget = self._model_residency_manager.memory_budget
+            file_size = installed_aivm_infos[aivm_uuid].file_size
+            if memory_budget is not None and self._model_residency_manager.total_size + file_size > memory_budget:  # fmt: skip
+                logger.info("Preloading stopped to stay within the model memory budget.")  # fmt: skip
+                break
+            try:
+                self.load_model(aivm_uuid)
+                preloaded_count += 1
+            except Exception as ex:
+                logger.warning(f"Failed to preload model {aivm_uuid}:", exc_info=ex)
+        logger.info(
+            f"{preloaded_count} models preloaded. ({time.time() - start_time:.2f}s)"
+        )
+
+    def _warm_up_bert_model(self) -> None:
+        """
+        ロード直後の BERT モデルで、長さの異なるダミーの文章の特徴量を抽出してウォームアップする
+        ウォームアップに失敗しても音声合成には影響しないため、警告ログを出力して続行する
+        ダミーの文章で BERT 特徴量キャッシュを埋めないよう、キャッシュを参照せずに推論する
+        (TTSModel.infer() は g2p キャッシュを経由しないため、g2p キャッシュが埋まることもない)
+        """
+
+        try:
+            from style_bert_vits2.models import infer_onnx
+
+            start_time = time.time()
+            logger.info("Warming up BERT model...")
+            elapsed_times: list[float] = []
+            for text in (*self.WARM_UP_TEXTS, self.WARM_UP_TEXTS[0]):
+                text_start_time = time.time()
+                normalized_text = normalize_text(text)
+                _, _, word2ph, _, _, _ = g2p(normalized_text, use_jp_extra=True, raise_yomi_error=False)  # fmt: skip
+                infer_onnx.extract_bert_feature_onnx(
+                    normalized_text, word2ph, Languages.JP, self.onnx_providers
+                )
+                elapsed_times.append(time.time() - text_start_time)
+            logger.info(
+                f"BERT model warmed up. ({time.time() - start_time:.2f}s, "
+                f"Cold: {elapsed_times[0]:.2f}s, Warm: {elapsed_times[-1]:.2f}s)"
+            )
+        except Exception as ex:
+            logger.warning("Failed to warm up BERT model:", exc_info=ex)
+
+    def _warm_up_model(self, aivm_uuid: str, tts_model: TTSModel) -> None:
+        """
+        ロード直後の音声合成モデルで、長さの異なるダミーの文章を推論してウォームアップする
+        最初の文章は最後にもう一度推論し、初回 (コールド) と定常時 (ウォーム) の推論時間をログに出力する
+        ウォームアップに失敗しても音声合成には影響しないため、警告ログを出力して続行する
+
+        Parameters
+        ----------
+        aivm_uuid : str
+            AIVM の UUID
+        tts_model : TTSModel
+            推論セッションを設定済みの TTSModel インスタンス
+        """
+
+        try:
+            start_time = time.time()
+            logger.info(f"Warming up {aivm_uuid} ...")
+            # 最初の話者・スタイルで推論する
+            speaker_id = next(iter(tts_model.hyper_parameters.data.spk2id.values()))
+            style = next(iter(tts_model.hyper_parameters.data.style2id.keys()))
+            elapsed_times: list[float] = []
+            # 推論処理を大量に並列実行すると最悪プロセスごと ONNX Runtime がクラッシュするため、推論スロットを確保してから実行する
+            with (
+                self._inference_slot_pool.acquire(aivm_uuid),
+                bypass_bert_feature_cache(),
+            ):
+                for text in (*self.WARM_UP_TEXTS, self.WARM_UP_TEXTS[0]):
+                    text_start_time = time.time()
+                    tts_model.infer(
+                        text=text,
+                        language=Languages.JP,
+                        speaker_id=speaker_id,
+                        style=style,
+                        style_weight=DEFAULT_STYLE_WEIGHT,
+                        sdp_ratio=DEFAULT_SDP_RATIO,
+                        line_split=False,
+                    )
+                    elapsed_times.append(time.time() - text_start_time)
+            logger.info(
+                f"{aivm_uuid} warmed up. ({time.time() - start_time:.2f}s, "
+                f"Cold: {elapsed_times[0]:.2f}s, Warm: {elapsed_times[-1]:.2f}s)"
+            )
+        except Exception as ex:
+            logger.warning(f"Failed to warm up {aivm_uuid}:", exc_info=ex)
+
+    def _create_onnx_session(self, model_path: Path) -> onnxruntime.InferenceSession:
+        """
+        音声合成モデルの ONNX 推論セッションを作成する
+
+        Parameters
+        ----------
+        model_path : Path
+            音声合成モデル (AIVMX ファイル) のパス
+
+        Returns
+        -------
+        onnxruntime.InferenceSession
+            作成された推論セッション
+        """
+
+        sess_options = onnxruntime.SessionOptions()
+        # エラーレベルのログのみを出力する
+        sess_options.log_severity_level = 3
+        # 複数の推論スロットが同時に CPU コアを奪い合わないよう、推論スロット数に応じて intra-op スレッド数を制限する
+        ## 0 のときは ONNX Runtime が自動的に決定する
+        sess_options.intra_op_num_threads = (
+            self._inference_slot_pool.intra_op_num_threads
+        )
+        # 推論セッションの設定が指定されている場合はそれを優先し、有効であれば最適化済みモデルのキャッシュを利用する
+        return self._onnx_session_settings.create_session(
+            model_path,
+            sess_options=sess_options,
+            providers=self.onnx_providers,
+        )
+
     def unload_model(self, aivm_uuid: str) -> None:
         """
         指定された AIVM の UUID に対応する音声合成モデルをアンロードする
@@ -288,20 +718,87 @@ class StyleBertVITS2TTSEngine(TTSEngine):
         """
 
         # モデルがロードされていない場合は何もしない
-        if not self.is_model_loaded(aivm_uuid):
+        ## 常駐管理マネージャーによる自動アンロードと API からのアンロードが同時に実行されうるため、
+        ## 先にロード済みモデルのキャッシュから取り除いた上でアンロードする
+        tts_model = self.tts_models.pop(aivm_uuid, None)
+        if tts_model is None:
             return
 
         # モデルをアンロード
-        aivm_info = self.aivm_manager.get_aivm_info(aivm_uuid)
+        ## インストール先ディレクトリから AIVMX ファイルが直接削除された場合など、既にアンインストール済みのモデルもアンロードできるようにする
+        aivm_info = self.aivm_manager.get_installed_aivm_infos().get(aivm_uuid)
+        model_name = aivm_info.manifest.name if aivm_info is not None else "Uninstalled model"  # fmt: skip
         start_time = time.time()
-        logger.info(f"Unloading {aivm_info.manifest.name} ({aivm_uuid}) ...")
-        self.tts_models[aivm_uuid].unload()
-        del self.tts_models[aivm_uuid]
+        logger.info(f"Unloading {model_name} ({aivm_uuid}) ...")
+        tts_model.unload()
+        self._model_residency_manager.on_unloaded(aivm_uuid)
+        self._model_usage_stats.on_unloaded(aivm_uuid)
         self.aivm_manager.update_model_load_state(aivm_uuid, is_loaded=False)
         logger.info(
-            f"{aivm_info.manifest.name} ({aivm_uuid}) unloaded. ({time.time() - start_time:.2f}s)"
+            f"{model_name} ({aivm_uuid}) unloaded. ({time.time() - start_time:.2f}s)"
         )
 
+    def start_synthesis_workers(self) -> None:
+        """
+        音声合成処理を並列に実行するワーカープロセスを起動し、バックグラウンドスレッドを開始する
+        継承元の TTSEngine には存在しない、StyleBertVITS2TTSEngine 固有のメソッド
+        ワーカープロセスは他のスレッドが動作していない状態で fork() する必要があるため、起動処理のスレッドがすべて終了した後、
+        API サーバーを起動する前に呼び出す必要がある
+        ワーカープロセスを利用しない場合や、既にワーカープロセスを起動済みの場合は何もしない
+        """
+
+        if self._synthesis_workers == 0 or self._synthesis_worker_pool is not None:
+            return
+
+        # 起動時にバックグラウンドで開始したインストール済み音声合成モデルのスキャンが終わるまで待機する
+        self.aivm_manager.wait_for_background_scan()
+
+        # BERT モデルや音声合成モデルのロードを終えた時点の状態で、ワーカープロセスを起動する
+        ## ロード済みのモデルのメモリは、すべてのワーカープロセスで copy-on-write で共有される
+        ## ユーザー辞書の適用と音声合成モデルのインストール・アンインストールは、次の音声合成の前に各ワーカープロセスにも反映する
+        synthesis_worker_pool = SynthesisWorkerPool(
+            {
+                "synthesize": self._synthesize_wave_uncached,
+                "apply_user_dict": _apply_user_dict_in_worker,
+                "reload_model": self._reload_model_in_worker,
+            },
+            num_workers=self._synthesis_workers,
+        )
+        add_dictionary_applied_listener(
+            lambda dict_files: synthesis_worker_pool.broadcast(
+                "user_dict",
+                "apply_user_dict",
+                [(dict_file.name, dict_file.read_bytes()) for dict_file in dict_files],
+            )
+        )  # fmt: skip
+        self.aivm_manager.add_model_change_listener(
+            lambda aivm_uuid: synthesis_worker_pool.broadcast(
+                f"model:{aivm_uuid}", "reload_model", aivm_uuid
+            )
+        )
+        self._synthesis_worker_pool = synthesis_worker_pool
+        self._start_background_threads()
+
+    def _start_background_threads(self) -> None:
+        """利用統計の自動保存と、一定時間使われていないモデルのアンロードを行うバックグラウンドスレッドを開始する。"""
+
+        self._model_usage_stats.start_autosave()
+        self._model_residency_manager.start_idle_sweeper()
+
+    def _reload_model_in_worker(self, aivm_uuid: str) -> None:
+        """
+        親プロセスで音声合成モデルがインストール (更新を含む)・アンインストールされたことをワーカープロセスに反映する
+        ワーカープロセス上で呼び出され、更新前のモデルをアンロードした上で、インストール済み音声合成モデルの情報を再読み込みする
+
+        Parameters
+        ----------
+        aivm_uuid : str
+            AIVM の UUID
+        """
+
+        self.unload_model(aivm_uuid)
+        self.aivm_manager.reload_installed_aivm_infos()
+
     def is_model_loaded(self, aivm_uuid: str) -> bool:
         """
         指定された AIVM の UUID に対応する音声合成モデルがロード済みかどうかを返す
@@ -345,6 +842,19 @@ class StyleBertVITS2TTSEngine(TTSEngine):
             アクセント句系列
         """
 
+        # 同じテキスト・同じユーザー辞書の状態で生成済みのアクセント句系列があれば、g2p 処理を省略してそれを返す
+        ## 後続の処理で Mora オブジェクトが書き換えられるため、キャッシュとの間では常にディープコピーを受け渡す
+        ## ユーザー辞書の世代番号は g2p 処理の前に取得し、処理中に辞書が更新された場合は古い世代の結果として保存されるようにする
+        g2p_cache_key = (text, get_applied_dictionary_generation())
+        if self._g2p_cache is not None:
+            cached_accent_phrases = self._g2p_cache.get(g2p_cache_key)
+            if cached_accent_phrases is not None:
+                logger.info(
+                    f"G2P cache hit. (Hits: {self._g2p_cache.hits}, Misses: {self._g2p_cache.misses}, "
+                    f"Entries: {len(self._g2p_cache)})"
+                )
+                return self.update_length_and_pitch(copy.deepcopy(cached_accent_phrases), style_id)  # fmt: skip
+
         # 入力テキストを Style-Bert-VITS2 の基準で正規化
         ## Style-Bert-VITS2 では「〜」などの伸ばす棒も長音記号として扱うため、normalize_text() でそれらを統一する
         normalized_text = normalize_text(text.strip())  # 前後の空白を削除してから実行
@@ -486,6 +996,11 @@ class StyleBertVITS2TTSEngine(TTSEngine):
                 )
             )
 
+        # 生成したアクセント句系列を g2p キャッシュに保存
+        ## 音素長・モーラ音高の更新前の状態で保存し、スタイル ID に依存しないようにする
+        if self._g2p_cache is not None:
+            self._g2p_cache.put(g2p_cache_key, copy.deepcopy(accent_phrases))
+
         # ダミーの音素長・モーラ音高を生成
         ## VOICEVOX ENGINE と異なりスタイル ID に基づいてその音素長・モーラ音高を更新することは原理上不可能なため、
         ## 音素長・モーラ音高は常にダミー値で返される
@@ -555,6 +1070,126 @@ class StyleBertVITS2TTSEngine(TTSEngine):
         # モーフィング時などに同一参照の AudioQuery で複数回呼ばれる可能性があるので、元の引数の AudioQuery に破壊的変更を行わない
         query = copy.deepcopy(query)
 
+        # 次回起動時の事前ロードの優先順位の決定に利用するため、音声合成モデルの利用統計を記録する
+        aivm_manifest = self.aivm_manager.get_aivm_manifest_from_style_id(style_id)[0]
+        self._model_usage_stats.record_request(str(aivm_manifest.uuid))
+
+        # 合成音声キャッシュが有効な場合、同一内容の音声合成結果がキャッシュされていればそれを返す
+        cache_key: str | None = None
+        cache_aivm_uuid: str | None = None
+        if self._synthesis_cache is not None:
+            cache_aivm_uuid, cache_key = self._make_synthesis_cache_key(query, style_id)
+            cached_wave = self._synthesis_cache.get(cache_aivm_uuid, cache_key)
+            if cached_wave is not None:
+                self._log_synthesis_cache_hit()
+                return cached_wave
+
+        # ワーカープロセスを利用する場合は、待機中のワーカープロセスで音声合成を行う
+        ## キャンセル可能な音声合成がキャンセルされた場合は、ワーカープロセスごと強制終了して音声合成を打ち切る
+        wave: NDArray[np.float32]
+        if self._synthesis_worker_pool is not None:
+            wave = self._synthesis_worker_pool.call(
+                "synthesize",
+                query,
+                style_id,
+                cancellation_token=get_current_cancellation_token(),
+            )
+        else:
+            wave = self._synthesize_wave_uncached(query, style_id)
+
+        # 合成音声キャッシュが有効な場合、音声合成結果をキャッシュする
+        if self._synthesis_cache is not None and cache_aivm_uuid is not None and cache_key is not None:  # fmt: skip
+            self._synthesis_cache.put(cache_aivm_uuid, cache_key, wave)
+
+        return wave
+
+    def get_cached_wave(
+        self,
+        query: AudioQuery,
+        style_id: StyleId,
+    ) -> NDArray[np.float32] | None:
+        """
+        同一内容の音声合成結果が合成音声キャッシュにあれば、音声合成を行わずにそれを返す
+        継承元の TTSEngine.get_cached_wave() をオーバーライドしている
+        キャッシュにない場合はミスとして記録せず、続けて呼び出される synthesize_wave() で改めてキャッシュを確認する
+
+        Parameters
+        ----------
+        query : AudioQuery
+            音声合成用のクエリ
+        style_id : StyleId
+            スタイル ID
+
+        Returns
+        -------
+        NDArray[np.float32] | None
+            キャッシュされた音声波形 (合成音声キャッシュが無効な場合や、キャッシュされていない場合は None)
+        """
+
+        if self._synthesis_cache is None:
+            return None
+
+        cache_aivm_uuid, cache_key = self._make_synthesis_cache_key(query, style_id)
+        cached_wave = self._synthesis_cache.get(cache_aivm_uuid, cache_key, record_miss=False)  # fmt: skip
+        if cached_wave is not None:
+            # キャッシュから返す場合も、次回起動時の事前ロードの優先順位の決定に利用する音声合成モデルの利用統計を記録する
+            self._model_usage_stats.record_request(cache_aivm_uuid)
+            self._log_synthesis_cache_hit()
+        return cached_wave
+
+    def _make_synthesis_cache_key(
+        self, query: AudioQuery, style_id: StyleId
+    ) -> tuple[str, str]:
+        """
+        音声合成結果を合成音声キャッシュに格納する際の AIVM の UUID とキャッシュキーを返す
+        キャッシュキーには適用中のユーザー辞書のバージョンも含め、辞書の更新前の音声合成結果が返されないようにする
+        """
+
+        aivm_manifest = self.aivm_manager.get_aivm_manifest_from_style_id(style_id)[0]
+        cache_aivm_uuid = str(aivm_manifest.uuid)
+        cache_key = SynthesisCache.make_key(
+            query,
+            style_id,
+            aivm_uuid=cache_aivm_uuid,
+            aivm_version=aivm_manifest.version,
+            dictionary_version=get_applied_dictionary_version(),
+        )
+        return cache_aivm_uuid, cache_key
+
+    def _log_synthesis_cache_hit(self) -> None:
+        """合成音声キャッシュにヒットしたことを、キャッシュの統計情報とともにログに出力する。"""
+
+        assert self._synthesis_cache is not None
+        statistics = self._synthesis_cache.get_statistics()
+        logger.info(
+            "Synthesis cache hit. "
+            f"(Memory hits: {statistics['memory_hits']}, Disk hits: {statistics['disk_hits']}, "
+            f"Misses: {statistics['misses']})"
+        )
+
+    def _synthesize_wave_uncached(
+        self,
+        query: AudioQuery,
+        style_id: StyleId,
+    ) -> NDArray[np.float32]:
+        """
+        音声合成用のクエリに含まれる読み仮名に基づいて Style-Bert-VITS2 で音声波形を生成する (synthesize_wave() の内部実装)
+        合成音声キャッシュを参照せずに必ず音声合成を行う
+        ワーカープロセスを利用する場合は、ワーカープロセス上で呼び出される
+
+        Parameters
+        ----------
+        query : AudioQuery
+            音声合成用のクエリ (破壊的変更が行われうるため、呼び出し元でコピーしておく必要がある)
+        style_id : StyleId
+            スタイル ID
+
+        Returns
+        -------
+        NDArray[np.float32]
+            生成された音声波形 (float32 型)
+        """
+
         # もし AudioQuery.kana に漢字混じりの通常の文章が指定されている場合はそれを使う (AivisSpeech 独自仕様)
         ## VOICEVOX ENGINE では AudioQuery.kana は読み取り専用パラメータだが、AivisSpeech Engine では
         ## 音声合成 API にアクセント句だけでなく通常の読み上げテキストを直接渡すためのパラメータとして利用している
@@ -629,13 +1264,14 @@ class StyleBertVITS2TTSEngine(TTSEngine):
             given_tone_list = []
 
         # スタイル ID に対応する AivmManifest, AivmManifestSpeaker, AivmManifestSpeakerStyle を取得
-        result = self.aivm_manager.get_aivm_manifest_from_style_id(style_id)
-        aivm_manifest = result[0]
-        aivm_manifest_speaker = result[1]
-        aivm_manifest_speaker_style = result[2]
+        ## インストール済み音声合成モデルの情報の更新時に構築されたインデックスから、定数時間で取得する
+        style_index_entry = self.aivm_manager.get_style_index_entry(style_id)
+        aivm_manifest = style_index_entry.aivm_info.manifest
+        aivm_manifest_speaker = style_index_entry.manifest_speaker
+        aivm_manifest_speaker_style = style_index_entry.manifest_style
 
         # 音声合成モデルをロード (初回のみ)
-        model = self.load_model(str(aivm_manifest.uuid))
+        self.load_model(str(aivm_manifest.uuid))
         logger.info(f"Model: {aivm_manifest.name} / Version {aivm_manifest.version}")  # fmt: skip
         logger.info(f"Speaker: {aivm_manifest_speaker.name} / Style: {aivm_manifest_speaker_style.name}")  # fmt: skip
 
@@ -644,13 +1280,10 @@ class StyleBertVITS2TTSEngine(TTSEngine):
         ## 別途 local_style_id に対応するスタイル名をハイパーパラメータから取得している
         ## AIVM マニフェスト記載のスタイル名とハイパーパラメータのスタイル名は必ずしも一致しないため (通常一致するはずだが…) 、
         ## 万が一に備え AIVM マニフェストとハイパーパラメータで共通のスタイル ID からスタイル名を取得する
-        local_speaker_id: int = aivm_manifest_speaker.local_id
-        local_style_id: int = aivm_manifest_speaker_style.local_id
-        local_style_name: str | None = None
-        for hps_style_name, hps_style_id in model.hyper_parameters.data.style2id.items():  # fmt: skip
-            if hps_style_id == local_style_id:
-                local_style_name = hps_style_name
-                break
+        ## スタイル名は、モデルのロード時に作成したローカルなスタイル ID からスタイル名への対応表から取得する
+        local_speaker_id: int = style_index_entry.local_speaker_id
+        local_style_id: int = style_index_entry.local_style_id
+        local_style_name = self._local_style_names.get(str(aivm_manifest.uuid), {}).get(local_style_id)  # fmt: skip
         if local_style_name is None:
             raise ValueError(f"Style ID {local_style_id} not found in hyper parameters.")  # fmt: skip
 
@@ -689,55 +1322,59 @@ class StyleBertVITS2TTSEngine(TTSEngine):
         ## pitchScale の基準は 0.0 (-1 ~ 1) なので、1.0 を基準とした 0 ~ 2 の範囲に変換する
         pitch_scale = max(0.0, 1.0 + query.pitchScale)
 
-        # 音声合成を実行
+        logger.info(f"Text: {text}")
+        logger.info(f"         Speed: {length:.2f} (Input: {query.speedScale:.2f})")
+        logger.info(f"  Style Weight: {style_weight:.2f} (Input: {query.intonationScale:.2f})")  # fmt: skip
+        logger.info(f"Tempo Dynamics: {sdp_ratio:.2f} (Input: {query.tempoDynamicsScale:.2f})")  # fmt: skip
+        logger.info(f"         Pitch: {pitch_scale:.2f} (Input: {query.pitchScale:.2f})")  # fmt: skip
+        logger.info(f"        Volume: {query.volumeScale:.2f}")
+        logger.info(f"   Pre-Silence: {query.prePhonemeLength:.2f}")
+        logger.info(f"  Post-Silence: {query.postPhonemeLength:.2f}")
+
+        # テキストが空文字列ではなく、given_phone_list / given_tone_list が空でない場合のみ音声合成を実行
         ## 出力音声は int16 型の NDArray で返される
-        ## 推論処理を大量に並列実行すると最悪プロセスごと ONNX Runtime がクラッシュするため、排他ロックを掛ける
-        with self._inference_lock:
-            logger.info("Running inference...")
-            logger.info(f"Text: {text}")
-            logger.info(f"         Speed: {length:.2f} (Input: {query.speedScale:.2f})")
-            logger.info(f"  Style Weight: {style_weight:.2f} (Input: {query.intonationScale:.2f})")  # fmt: skip
-            logger.info(f"Tempo Dynamics: {sdp_ratio:.2f} (Input: {query.tempoDynamicsScale:.2f})")  # fmt: skip
-            logger.info(f"         Pitch: {pitch_scale:.2f} (Input: {query.pitchScale:.2f})")  # fmt: skip
-            logger.info(f"        Volume: {query.volumeScale:.2f}")
-            logger.info(f"   Pre-Silence: {query.prePhonemeLength:.2f}")
-            logger.info(f"  Post-Silence: {query.postPhonemeLength:.2f}")
-
-            # テキストが空文字列ではなく、given_phone_list / given_tone_list が空でない場合のみ音声合成を実行
-            if text != "" and len(given_phone_list) > 0 and len(given_tone_list) > 0:
-                start_time = time.time()
-                raw_sample_rate, raw_wave = model.infer(
-                    text=text,
-                    given_phone=given_phone_list,
-                    given_tone=given_tone_list,
-                    language=Languages.JP,
-                    speaker_id=local_speaker_id,
-                    style=local_style_name,
-                    style_weight=style_weight,
-                    sdp_ratio=sdp_ratio,
-                    length=length,
-                    pitch_scale=pitch_scale,
-                    # AivisSpeech Engine ではテキストの改行ごとの分割生成を行わない (エディタ側の機能と競合するため)
-                    # line_split=True だと音素やアクセントの指定ができない
-                    line_split=False,
+        if text != "" and len(given_phone_list) > 0 and len(given_tone_list) > 0:
+            inference_parameters = _InferenceParameters(
+                text=text,
+                given_phone=tuple(given_phone_list),
+                given_tone=tuple(given_tone_list),
+                speaker_id=local_speaker_id,
+                style=local_style_name,
+                style_weight=style_weight,
+                sdp_ratio=sdp_ratio,
+                length=length,
+                pitch_scale=pitch_scale,
+            )
+            # リクエストコアレッサーが有効な場合は、推論中のリクエストとまったく同じ内容のリクエストを 1 回の推論にまとめる
+            ## キャンセル可能な音声合成では、キャンセル時に他のリクエストの推論まで打ち切らないよう、まとめずに単独で推論する
+            aivm_uuid = str(aivm_manifest.uuid)
+            cancellation_token = get_current_cancellation_token()
+            if self._request_coalescer is not None and cancellation_token is None:
+                raw_sample_rate, raw_wave = self._request_coalescer.run(
+                    (aivm_uuid, inference_parameters),
+                    lambda: self._infer(aivm_uuid, inference_parameters),
                 )
-                logger.info(f"Inference done. Elapsed time: {time.time() - start_time:.2f} sec.")  # fmt: skip
-
-            # 空文字列が入力された場合、0.5 秒の無音波形を後続の処理に渡す
             else:
-                logger.info("Text is empty. Returning 0.5 sec silence.")
-                raw_sample_rate = self.default_sampling_rate
-                raw_wave = np.zeros(int(self.default_sampling_rate * 0.5), dtype=np.float32)  # fmt: skip
+                raw_sample_rate, raw_wave = self._infer(
+                    aivm_uuid,
+                    inference_parameters,
+                    cancellation_token=cancellation_token,
+                )
 
-        # VOICEVOX CORE は float32 型の音声波形を返すため、int16 から float32 に変換して VOICEVOX CORE に合わせる
-        ## float32 に変換する際に -1.0 ~ 1.0 の範囲に正規化する
-        raw_wave = raw_wave.astype(np.float32) / 32768.0
+        # 空文字列が入力された場合、0.5 秒の無音波形を後続の処理に渡す
+        else:
+            logger.info("Text is empty. Returning 0.5 sec silence.")
+            raw_sample_rate = self.default_sampling_rate
+            raw_wave = np.zeros(int(self.default_sampling_rate * 0.5), dtype=np.float32)  # fmt: skip
 
         # 学習元データなどの関係でモデルによっては音声の前後に無音が含まれることがあるため、後処理前に前後の無音をトリミングする
         ## この処理を行ってから再度指定秒数の無音区間を追加することで、無音区間が指定以上に長くなるのを防ぐ
-        raw_wave = _trim_silence(raw_wave)
+        ## 推論結果は int16 の範囲の値のため、-1.0 ~ 1.0 の範囲に正規化した場合の閾値に換算して判定する
+        ## 波形全体をコピーしないよう、トリミング後の範囲はスライス (ビュー) として後処理に渡す
+        start_index, end_index = find_non_silent_range(raw_wave, threshold=0.0004 * 32768.0)  # fmt: skip
+        raw_wave = raw_wave[start_index:end_index]
 
-        # 前後の無音区間を追加
+        # 前後の無音区間の長さを算出
         ## VOICEVOX の TTSEngine との互換性のため、音声合成側と同様に AudioQuery の speedScale を加味する
         pre_silence_length = int(
             raw_sample_rate * query.prePhonemeLength / query.speedScale
@@ -745,14 +1382,84 @@ class StyleBertVITS2TTSEngine(TTSEngine):
         post_silence_length = int(
             raw_sample_rate * query.postPhonemeLength / query.speedScale
         )
-        silence_wave_pre = np.zeros(pre_silence_length, dtype=np.float32)
-        silence_wave_post = np.zeros(post_silence_length, dtype=np.float32)
-        raw_wave = np.concatenate((silence_wave_pre, raw_wave, silence_wave_post))
 
-        # 生成した音声の音量調整/サンプルレート変更/ステレオ化を行ってから返す
-        wave = raw_wave_to_output_wave(query, raw_wave, raw_sample_rate)
+        # 生成した音声の無音区間の追加/音量調整/サンプルレート変更/ステレオ化を行ってから返す
+        ## VOICEVOX CORE は float32 型の音声波形を返すため、int16 から float32 に変換して VOICEVOX CORE に合わせる
+        ## float32 への変換・-1.0 ~ 1.0 の範囲への正規化・音量調整・無音区間の追加は、出力用のバッファ上でまとめて行われる
+        wave = raw_wave_to_output_wave(
+            query,
+            raw_wave,
+            raw_sample_rate,
+            pre_silence_length=pre_silence_length,
+            post_silence_length=post_silence_length,
+            input_scale=1.0 / 32768.0,
+        )
+
         return wave
 
+    def _infer(
+        self,
+        aivm_uuid: str,
+        parameters: "_InferenceParameters",
+        cancellation_token: CancellationToken | None = None,
+    ) -> tuple[int, NDArray[Any]]:
+        """
+        推論スロットを確保して、音声合成モデルで 1 発話分の推論を実行する
+
+        Parameters
+        ----------
+        aivm_uuid : str
+            AIVM の UUID
+        parameters : _InferenceParameters
+            推論パラメータ
+        cancellation_token : CancellationToken | None, default None
+            キャンセル要求のトークン (キャンセルされた場合は推論スロットの確保待ち・推論処理を打ち切る)
+
+        Returns
+        -------
+        tuple[int, NDArray[Any]]
+            サンプリングレートと int16 型の音声波形のタプル
+
+        Raises
+        ------
+        SynthesisCancelledError
+            推論処理がキャンセルされた場合
+        """
+
+        if cancellation_token is None:
+            cancellation_token = CancellationToken()
+        cancellation_token.raise_if_cancelled()
+
+        # 推論中に常駐管理マネージャーによってモデルがアンロードされないよう、ロード前から推論中としてマークしておく
+        with self._model_residency_manager.use(aivm_uuid):
+            model = self.load_model(aivm_uuid)
+            # 推論処理を大量に並列実行すると最悪プロセスごと ONNX Runtime がクラッシュするため、推論スロットを確保してから実行する
+            with self._inference_slot_pool.acquire(aivm_uuid):
+                # 推論スロットの確保を待っている間にキャンセルされた場合は、推論せずにすぐに推論スロットを解放する
+                cancellation_token.raise_if_cancelled()
+                logger.info("Running inference...")
+                start_time = time.time()
+                # 推論中にキャンセルされた場合は、ONNX Runtime の推論処理を途中で打ち切って SynthesisCancelledError を送出する
+                with TerminableInferenceSession.terminable(cancellation_token):
+                    result: tuple[int, NDArray[Any]] = model.infer(
+                        text=parameters.text,
+                        given_phone=list(parameters.given_phone),
+                        given_tone=list(parameters.given_tone),
+                        language=Languages.JP,
+                        speaker_id=parameters.speaker_id,
+                        style=parameters.style,
+                        style_weight=parameters.style_weight,
+                        sdp_ratio=parameters.sdp_ratio,
+                        length=parameters.length,
+                        pitch_scale=parameters.pitch_scale,
+                        # AivisSpeech Engine ではテキストの改行ごとの分割生成を行わない (エディタ側の機能と競合するため)
+                        # line_split=True だと音素やアクセントの指定ができない
+                        line_split=False,
+                    )
+                logger.info(f"Inference done. Elapsed time: {time.time() - start_time:.2f} sec.")  # fmt: skip
+
+        return result
+
     def initialize_synthesis(self, style_id: StyleId, skip_reinit: bool) -> None:
         """指定されたスタイル ID に関する合成機能を初期化する。既に初期化されていた場合は引数に応じて再初期化する。"""
         # スタイル ID に対応する AivmManifest を取得後、
@@ -769,6 +1476,21 @@ class StyleBertVITS2TTSEngine(TTSEngine):
         return self.is_model_loaded(str(aivm_manifest.uuid))
 
 
+@dataclass(frozen=True)
+class _InferenceParameters:
+    """TTSModel.infer() に渡す推論パラメータ (リクエストコアレッサーで同一内容のリクエストを判別するためハッシュ可能にしている)"""
+
+    text: str
+    given_phone: tuple[str, ...]
+    given_tone: tuple[int, ...]
+    speaker_id: int
+    style: str
+    style_weight: float
+    sdp_ratio: float
+    length: float
+    pitch_scale: float
+
+
 # コンパイル済み正規表現
 __MORA_PATTERN: Final[re.Pattern[str]] = re.compile(
     "|".join(
@@ -899,46 +1621,38 @@ def _sep_kata_with_joshi2sep_phonemes_with_joshi(
     return sep_phonemes_with_joshi
 
 
-def _trim_silence(
-    audio: NDArray[np.float32], threshold: float = 0.0004
-) -> NDArray[np.float32]:
+# ワーカープロセスで現在適用しているユーザー辞書ファイルの保存先ディレクトリ
+_worker_user_dict_dir: Path | None = None
+
+
+def _apply_user_dict_in_worker(dict_files: list[tuple[str, bytes]]) -> None:
     """
-    推論結果から変換済みの float32 波形（[-1.0, 1.0] の範囲）を受け取り、
-    前後の無音（または閾値以下の小音）をトリミングして返す。
+    親プロセスで適用されたユーザー辞書を、ワーカープロセスの pyopenjtalk にも適用する。
+    親プロセスでビルドされたユーザー辞書ファイルは適用後すぐに削除されるため、内容を受け取ってワーカープロセス側で保存し直す。
 
     Parameters
     ----------
-    audio : NDArray[np.float32]
-        float32 型の 1次元配列（モノラル想定）。値は [-1.0, 1.0] の範囲。
-    threshold : float
-        無音判定の絶対振幅の閾値 (0.0 ~ 1.0)。
-        例: 0.0001 (約 -80 dB), 0.001 (約 -60 dB) など
-
-    Returns
-    -------
-    NDArray[np.float32]
-        前後の無音を除去した波形 (dtype=float32)。
-        全サンプルが閾値以下の場合は空配列 (shape=(0,)) を返す。
+    dict_files : list[tuple[str, bytes]]
+        適用する辞書ファイルのファイル名と内容のリスト (適用順)
     """
 
-    if audio.dtype != np.float32:
-        raise ValueError("Input audio must be float32 (range: [-1.0, 1.0]).")
-
-    # 絶対値をとる
-    abs_audio = np.abs(audio)
-
-    # 閾値以上のサンプルのインデックスを取得
-    above_threshold_indices = np.where(abs_audio > threshold)[0]
-
-    # 全部が閾値以下の場合は空配列を返す
-    if len(above_threshold_indices) == 0:
-        return np.array([], dtype=np.float32)
-
-    # 前側のカット開始位置と後ろ側のカット終了位置(+1)
-    start_idx = above_threshold_indices[0]
-    end_idx = above_threshold_indices[-1] + 1
-
-    # 前後の無音をカット
-    trimmed = audio[start_idx:end_idx]
-
-    return trimmed
+    global _worker_user_dict_dir
+
+    # 辞書ファイルを一時ディレクトリに保存する
+    ## 適用順を保つため、ファイル名の先頭に連番を付与する
+    user_dict_dir = Path(tempfile.mkdtemp(prefix=f"user_dict-{os.getpid()}-"))
+    dict_paths: list[str] = []
+    for index, (name, content) in enumerate(dict_files):
+        dict_path = user_dict_dir / f"{index:03d}-{name}"
+        dict_path.write_bytes(content)
+        dict_paths.append(str(dict_path))
+
+    # ユーザー辞書を pyopenjtalk に適用
+    pyopenjtalk.unset_user_dict()
+    if dict_paths:
+        pyopenjtalk.update_global_jtalk_with_user_dict(dict_paths)
+
+    # 適用が完了したため、以前に適用していた辞書ファイルを削除する
+    if _worker_user_dict_dir is not None:
+        shutil.rmtree(_worker_user_dict_dir, ignore_errors=True)
+    _worker_user_dict_dir = user_dict_dir
@@ -0,0 +1,306 @@
+"""音声合成結果をメモリとディスクの 2 階層でキャッシュする合成音声キャッシュ"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Final
+from uuid import uuid4
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ..logging import logger
+from ..metas.Metas import StyleId
+from ..model import AudioQuery
+from ..utility.lru_cache_utility import LRUCache
+
+__all__ = ["SynthesisCache"]
+
+
+class SynthesisCache:
+    """
+    音声合成結果 (出力音声波形) をメモリとディスクの 2 階層でキャッシュする合成音声キャッシュ。
+
+    キャッシュキーは、音声合成結果に影響する AudioQuery のフィールド・AIVM の UUID とバージョン・スタイル ID・
+    適用中のユーザー辞書のバージョンから計算したハッシュ値 (コンテンツアドレス) で、内容が同一であれば同じキーになる。
+    メモリ上のキャッシュ (LRU) から溢れた音声波形は、容量上限付きのディスク上のキャッシュからも参照される。
+    """
+
+    # キャッシュキーの計算方法や保存形式を変更した際はインクリメントし、古いキャッシュを参照しないようにする
+    CACHE_FORMAT_VERSION: Final[int] = 1
+
+    def __init__(
+        self,
+        memory_max_size: int,
+        disk_max_size: int = 0,
+        cache_dir: Path | None = None,
+    ) -> None:
+        """
+        SynthesisCache のコンストラクタ
+
+        Parameters
+        ----------
+        memory_max_size : int
+            メモリ上のキャッシュの容量上限 (バイト単位、0 のときはメモリ上にキャッシュしない)
+        disk_max_size : int, default 0
+            ディスク上のキャッシュの容量上限 (バイト単位、0 のときはディスク上にキャッシュしない)
+        cache_dir : Path | None, default None
+            ディスク上のキャッシュの保存先ディレクトリ (disk_max_size が 1 以上のときは必須)
+        """
+
+        if disk_max_size > 0 and cache_dir is None:
+            raise ValueError("cache_dir must be specified when disk_max_size > 0.")
+
+        self._memory_cache: LRUCache[tuple[str, str], NDArray[np.float32]] = LRUCache(
+            max_size=memory_max_size,
+            get_size=lambda wave: wave.nbytes,
+        )
+        self.disk_max_size = disk_max_size
+        self.cache_dir = cache_dir
+        # ディスク上のキャッシュファイルのパスとサイズ (最も長く参照されていないファイルが先頭に来る)
+        self._disk_index: OrderedDict[Path, int] = OrderedDict()
+        self._disk_total_size = 0
+        self._disk_lock = threading.Lock()
+        self.disk_hits = 0
+        # メモリ上・ディスク上のいずれのキャッシュにもなかった回数
+        self.misses = 0
+
+        # 前回起動時に保存されたディスク上のキャッシュを、最終参照日時が古い順にインデックスに登録する
+        if self.disk_max_size > 0 and self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            cache_files: list[tuple[float, Path, int]] = []
+            for cache_path in self.cache_dir.glob(f"*/*.v{self.CACHE_FORMAT_VERSION}.npy"):  # fmt: skip
+                try:
+                    stat = cache_path.stat()
+                except OSError:
+                    continue
+                cache_files.append((stat.st_mtime, cache_path, stat.st_size))
+            for _, cache_path, size in sorted(cache_files):
+                self._disk_index[cache_path] = size
+                self._disk_total_size += size
+            with self._disk_lock:
+                self._enforce_disk_max_size()
+
+    @classmethod
+    def make_key(
+        cls,
+        query: AudioQuery,
+        style_id: StyleId,
+        aivm_uuid: str,
+        aivm_version: str,
+        dictionary_version: str,
+    ) -> str:
+        """
+        音声合成結果に影響する情報から、キャッシュキーとなるハッシュ値を計算する。
+        AivisSpeech Engine では音素長・モーラ音高などは音声合成時に常に無視されるため、キーには含めない。
+
+        Parameters
+        ----------
+        query : AudioQuery
+            音声合成用のクエリ
+        style_id : StyleId
+            スタイル ID
+        aivm_uuid : str
+            AIVM の UUID
+        aivm_version : str
+            AIVM のバージョン
+        dictionary_version : str
+            適用中のユーザー辞書のバージョン文字列
+
+        Returns
+        -------
+        str
+            キャッシュキー (SHA-256 ハッシュ値の 16 進数表現)
+        """
+
+        canonical: dict[str, Any] = {
+            "format_version": cls.CACHE_FORMAT_VERSION,
+            "aivm_uuid": aivm_uuid,
+            "aivm_version": aivm_version,
+            "style_id": style_id,
+            "dictionary_version": dictionary_version,
+            "kana": query.kana,
+            "accent_phrases": [
+                {
+                    "moras": [mora.text for mora in accent_phrase.moras],
+                    "accent": accent_phrase.accent,
+                    "pause_mora": accent_phrase.pause_mora is not None,
+                }
+                for accent_phrase in query.accent_phrases
+            ],
+            "speedScale": query.speedScale,
+            "intonationScale": query.intonationScale,
+            "tempoDynamicsScale": query.tempoDynamicsScale,
+            "pitchScale": query.pitchScale,
+            "volumeScale": query.volumeScale,
+            "prePhonemeLength": query.prePhonemeLength,
+            "postPhonemeLength": query.postPhonemeLength,
+            "outputSamplingRate": query.outputSamplingRate,
+            "outputStereo": query.outputStereo,
+        }
+        serialized = json.dumps(canonical, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    def get(
+        self, aivm_uuid: str, key: str, record_miss: bool = True
+    ) -> NDArray[np.float32] | None:
+        """
+        キャッシュされた音声波形を取得する。
+        メモリ上にない場合はディスク上のキャッシュを参照し、見つかればメモリ上のキャッシュにも追加する。
+
+        Parameters
+        ----------
+        aivm_uuid : str
+            AIVM の UUID
+        key : str
+            キャッシュキー
+        record_miss : bool, default True
+            キャッシュされていなかった場合にミスとして記録するかどうか
+            (続けて同じキーで改めて取得する場合に、1 回のリクエストでミスが重複して記録されないようにする)
+
+        Returns
+        -------
+        NDArray[np.float32] | None
+            キャッシュされた音声波形のコピー (キャッシュされていない場合は None)
+        """
+
+        wave = self._memory_cache.get((aivm_uuid, key))
+        if wave is not None:
+            return wave.copy()
+
+        wave = self._get_from_disk(aivm_uuid, key)
+        if wave is not None:
+            self._memory_cache.put((aivm_uuid, key), wave)
+            return wave.copy()
+        if record_miss is True:
+            with self._disk_lock:
+                self.misses += 1
+        return None
+
+    def put(self, aivm_uuid: str, key: str, wave: NDArray[np.float32]) -> None:
+        """
+        音声波形をキャッシュする。
+
+        Parameters
+        ----------
+        aivm_uuid : str
+            AIVM の UUID
+        key : str
+            キャッシュキー
+        wave : NDArray[np.float32]
+            音声波形
+        """
+
+        wave = wave.copy()
+        self._memory_cache.put((aivm_uuid, key), wave)
+        self._put_to_disk(aivm_uuid, key, wave)
+
+    def invalidate_model(self, aivm_uuid: str) -> None:
+        """
+        指定された AIVM の UUID に対応する音声合成モデルのキャッシュをすべて削除する。
+        音声合成モデルが更新・アンインストールされた際に呼び出される。
+
+        Parameters
+        ----------
+        aivm_uuid : str
+            AIVM の UUID
+        """
+
+        removed_count = self._memory_cache.remove_if(lambda key: key[0] == aivm_uuid)
+        if self.disk_max_size > 0 and self.cache_dir is not None:
+            model_cache_dir = self.cache_dir / aivm_uuid
+            with self._disk_lock:
+                for cache_path in [p for p in self._disk_index if p.parent == model_cache_dir]:  # fmt: skip
+                    self._disk_total_size -= self._disk_index.pop(cache_path)
+                    removed_count += 1
+                shutil.rmtree(model_cache_dir, ignore_errors=True)
+        if removed_count > 0:
+            logger.info(f"Synthesis cache for model {aivm_uuid} invalidated. ({removed_count} entries)")  # fmt: skip
+
+    def get_statistics(self) -> dict[str, int]:
+        """
+        キャッシュのヒット数・ミス数などの統計情報を取得する。
+
+        Returns
+        -------
+        dict[str, int]
+            統計情報
+        """
+
+        with self._disk_lock:
+            disk_entries = len(self._disk_index)
+            disk_size = self._disk_total_size
+        return {
+            "memory_hits": self._memory_cache.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "memory_entries": len(self._memory_cache),
+            "memory_size": self._memory_cache.total_size,
+            "disk_entries": disk_entries,
+            "disk_size": disk_size,
+        }
+
+    def _get_cache_path(self, aivm_uuid: str, key: str) -> Path:
+        """ディスク上のキャッシュファイルのパスを取得する。"""
+        assert self.cache_dir is not None
+        return self.cache_dir / aivm_uuid / f"{key}.v{self.CACHE_FORMAT_VERSION}.npy"
+
+    def _get_from_disk(self, aivm_uuid: str, key: str) -> NDArray[np.float32] | None:
+        """ディスク上のキャッシュから音声波形を読み込む。"""
+
+        if self.disk_max_size <= 0:
+            return None
+        cache_path = self._get_cache_path(aivm_uuid, key)
+        with self._disk_lock:
+            if cache_path not in self._disk_index:
+                return None
+            self._disk_index.move_to_end(cache_path)
+        try:
+            wave: NDArray[np.float32] = np.load(cache_path, allow_pickle=False)
+            # 最終参照日時を更新し、次回起動時にも参照順序を引き継げるようにする
+            os.utime(cache_path)
+        except (OSError, ValueError) as ex:
+            logger.warning(f"Failed to read synthesis cache {cache_path}:", exc_info=ex)  # fmt: skip
+            with self._disk_lock:
+                if cache_path in self._disk_index:
+                    self._disk_total_size -= self._disk_index.pop(cache_path)
+            cache_path.unlink(missing_ok=True)
+            return None
+        with self._disk_lock:
+            self.disk_hits += 1
+        return wave
+
+    def _put_to_disk(self, aivm_uuid: str, key: str, wave: NDArray[np.float32]) -> None:  # fmt: skip
+        """音声波形をディスク上のキャッシュに書き込む。"""
+
+        if self.disk_max_size <= 0 or wave.nbytes > self.disk_max_size:
+            return
+        cache_path = self._get_cache_path(aivm_uuid, key)
+        # 書き込み途中のファイルを読み込まないよう、一時ファイルに書き込んでからリネームする
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{uuid4()}.tmp")
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, mode="wb") as f:
+                np.save(f, wave, allow_pickle=False)
+            os.replace(tmp_path, cache_path)
+            size = cache_path.stat().st_size
+        except OSError as ex:
+            logger.warning(f"Failed to write synthesis cache {cache_path}:", exc_info=ex)  # fmt: skip
+            tmp_path.unlink(missing_ok=True)
+            return
+        with self._disk_lock:
+            self._disk_total_size -= self._disk_index.pop(cache_path, 0)
+            self._disk_index[cache_path] = size
+            self._disk_total_size += size
+            self._enforce_disk_max_size()
+
+    def _enforce_disk_max_size(self) -> None:
+        """ディスク上のキャッシュが容量上限を超えている場合、最も長く参照されていないファイルから削除する。呼び出し元でロックを取得している必要がある。"""
+        while self._disk_total_size > self.disk_max_size and len(self._disk_index) > 0:
+            cache_path, size = self._disk_index.popitem(last=False)
+            self._disk_total_size -= size
+            cache_path.unlink(missing_ok=True)
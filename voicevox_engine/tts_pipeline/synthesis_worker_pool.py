@@ -0,0 +1,432 @@
+"""音声合成処理を複数のワーカープロセスで並列に実行するワーカープール"""
+
+import os
+import queue
+import signal
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from multiprocessing import get_context, reduction
+from multiprocessing.connection import Connection
+from typing import Any
+
+from fastapi import HTTPException
+
+from ..logging import logger
+from .cancellation import CancellationToken, SynthesisCancelledError
+
+__all__ = ["SynthesisWorkerError", "SynthesisWorkerPool"]
+
+
+class SynthesisWorkerError(Exception):
+    """ワーカープロセスでの処理中にエラーが発生した、またはワーカープロセスが異常終了した。"""
+
+    pass
+
+
+@dataclass
+class _Worker:
+    """ワーカープロセスとの接続情報。"""
+
+    pid: int
+    connection: Connection
+    # 適用済みのブロードキャストの通し番号
+    synced_sequence: int = 0
+    # 同時に複数のスレッドからワーカープロセスと通信しないようにするためのロック
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class SynthesisWorkerPool:
+    """
+    音声合成処理を複数のワーカープロセスで並列に実行するワーカープール。
+
+    BERT モデルや音声合成モデルをロードし終えた親プロセスから fork() したテンプレートプロセス (zygote) を起動し、
+    ワーカープロセスはすべて zygote から fork() して生成する。これにより、ロード済みのモデルのメモリページを
+    すべてのワーカープロセスで copy-on-write で共有しつつ、GIL に縛られずに複数の CPU コアで音声合成処理を実行できる。
+    他のスレッドが動作しているプロセスから fork() すると、他のスレッドが保持していたロックが子プロセス側で解放されずに残り、
+    ハングする可能性がある。このため zygote は他のスレッドを起動する前に fork() し (動作中のスレッドがあれば起動を拒否する) 、
+    HTTP サーバーなどのスレッドが動作し始めた後のワーカープロセスの再起動も含めて、必ず zygote から fork() する。
+
+    ワーカープロセスでは、コンストラクタに渡した関数 (ハンドラー) をジョブとして名前で呼び出せる。
+    ワーカープロセスが異常終了した場合や、ジョブの実行中に制限時間を過ぎても応答しない場合、
+    定期的な死活監視に応答しなくなった場合は、自動的に新しいワーカープロセスに置き換える。
+    fork() に依存するため、Windows などの fork() をサポートしない環境では利用できない。
+    """
+
+    def __init__(
+        self,
+        handlers: dict[str, Callable[..., Any]],
+        num_workers: int,
+        job_timeout: float | None = 300.0,
+        health_check_interval: float = 10.0,
+        health_check_timeout: float = 5.0,
+    ) -> None:
+        """
+        SynthesisWorkerPool のコンストラクタ
+        この時点の親プロセスの状態が zygote に引き継がれるため、モデルのロードなどを終えてから呼び出す必要がある
+        また、呼び出し元以外のスレッドが動作していない状態で呼び出す必要がある
+
+        Parameters
+        ----------
+        handlers : dict[str, Callable[..., Any]]
+            ワーカープロセスで呼び出せる関数 (キー: ジョブ名)
+        num_workers : int
+            ワーカープロセスの数
+        job_timeout : float | None, default 300.0
+            ジョブの完了を待つ最大時間 (秒) で、超過したワーカープロセスは強制終了して置き換える (None のときは無制限)
+        health_check_interval : float, default 10.0
+            待機中のワーカープロセスの死活監視を行う間隔 (秒)
+        health_check_timeout : float, default 5.0
+            死活監視への応答を待つ最大時間 (秒)
+        """
+
+        if num_workers < 1:
+            raise ValueError("num_workers must be greater than or equal to 1.")
+        if not hasattr(os, "fork"):
+            raise RuntimeError("SynthesisWorkerPool requires os.fork().")
+        # 他のスレッドが保持しているロックが zygote に引き継がれないよう、他のスレッドが動作している場合は起動しない
+        running_threads = [
+            thread.name
+            for thread in threading.enumerate()
+            if thread is not threading.current_thread()
+        ]
+        if len(running_threads) > 0:
+            raise RuntimeError(
+                "SynthesisWorkerPool must be started before any other thread. "
+                f"(Running threads: {', '.join(running_threads)})"
+            )
+
+        self.num_workers = num_workers
+        self.job_timeout = job_timeout
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+
+        # すべてのワーカープロセスに適用する関数呼び出しの履歴
+        ## 同じキーの呼び出しは最新のもののみを保持し、新しく起動したワーカープロセスにも順に適用する
+        self._broadcasts: OrderedDict[str, tuple[int, str, tuple[Any, ...]]] = OrderedDict()  # fmt: skip
+        self._broadcast_sequence = 0
+        self._broadcast_lock = threading.Lock()
+
+        # zygote を起動する
+        ## この時点の親プロセスのメモリ (ロード済みのモデルを含む) が zygote に引き継がれる
+        self._zygote_connection, zygote_child_connection = get_context("fork").Pipe(duplex=True)  # fmt: skip
+        self._zygote_process = get_context("fork").Process(
+            target=_run_zygote,
+            args=(handlers, zygote_child_connection, self._zygote_connection),
+            daemon=True,
+        )
+        self._zygote_process.start()
+        zygote_child_connection.close()
+        self._zygote_lock = threading.Lock()
+
+        # ワーカープロセスを起動する
+        self._idle_workers: queue.Queue[_Worker] = queue.Queue()
+        for _ in range(num_workers):
+            self._idle_workers.put(self._spawn_worker())
+        logger.info(f"Synthesis worker pool started. ({num_workers} workers)")
+
+        # 待機中のワーカープロセスの死活監視を開始する
+        self._is_shutdown = threading.Event()
+        self._health_check_thread = threading.Thread(
+            target=self._run_health_check,
+            name="SynthesisWorkerHealthCheck",
+            daemon=True,
+        )
+        self._health_check_thread.start()
+
+    def call(
+        self,
+        name: str,
+        *args: Any,
+        cancellation_token: CancellationToken | None = None,
+    ) -> Any:
+        """
+        待機中のワーカープロセスで関数を呼び出し、その結果を返す。
+        待機中のワーカープロセスがない場合は、いずれかのワーカープロセスの処理が終わるまで待機する。
+
+        Parameters
+        ----------
+        name : str
+            呼び出す関数のジョブ名
+        *args : Any
+            関数に渡す引数 (pickle 可能である必要がある)
+        cancellation_token : CancellationToken | None, default None
+            キャンセル要求のトークン (処理中にキャンセルされた場合はワーカープロセスを強制終了して置き換える)
+
+        Returns
+        -------
+        Any
+            関数の戻り値
+
+        Raises
+        ------
+        SynthesisCancelledError
+            処理中にキャンセルされた場合
+        SynthesisWorkerError
+            ワーカープロセスでエラーが発生した場合、ワーカープロセスが異常終了した場合、
+            またはワーカープロセスが job_timeout を過ぎても応答しなかった場合
+        HTTPException
+            ワーカープロセスで HTTPException が送出された場合
+        """
+
+        if cancellation_token is None:
+            cancellation_token = CancellationToken()
+        cancellation_token.raise_if_cancelled()
+
+        worker = self._idle_workers.get()
+        try:
+            with worker.lock:
+                self._sync_broadcasts(worker)
+                # 処理中にキャンセルされた場合は、ワーカープロセスごと強制終了して処理を打ち切る
+                with cancellation_token.register(lambda: self._kill_worker(worker)):
+                    worker.connection.send((name, args))
+                    status, payload = self._receive(worker, self.job_timeout)
+        except TimeoutError as ex:
+            # ワーカープロセスがハングしているため、強制終了して新しいワーカープロセスに置き換える
+            self._replace_worker(worker)
+            raise SynthesisWorkerError(f"Synthesis worker (PID: {worker.pid}) did not respond within {self.job_timeout} seconds.") from ex  # fmt: skip
+        except (EOFError, OSError) as ex:
+            # ワーカープロセスが異常終了したため、新しいワーカープロセスに置き換える
+            self._replace_worker(worker)
+            if cancellation_token.is_cancelled:
+                raise SynthesisCancelledError() from ex
+            raise SynthesisWorkerError(f"Synthesis worker (PID: {worker.pid}) exited unexpectedly.") from ex  # fmt: skip
+        if self._is_shutdown.is_set():
+            worker.connection.close()
+        elif cancellation_token.is_cancelled:
+            # キャンセル時のコールバックは register() のブロックを抜けた後に呼び出されることがあるため、
+            # 応答を受け取れた場合でも、強制終了されている可能性のあるワーカープロセスは待機中に戻さずに置き換える
+            self._replace_worker(worker)
+        else:
+            self._idle_workers.put(worker)
+
+        return _unwrap_result(status, payload)
+
+    def broadcast(self, key: str, name: str, *args: Any) -> None:
+        """
+        すべてのワーカープロセスで関数を呼び出す。
+        各ワーカープロセスでは次のジョブを実行する前に呼び出され、今後新しく起動するワーカープロセスでも呼び出される。
+        同じキーで複数回呼び出した場合は、最後に呼び出した内容のみが適用される。
+
+        Parameters
+        ----------
+        key : str
+            呼び出しを識別するキー
+        name : str
+            呼び出す関数のジョブ名
+        *args : Any
+            関数に渡す引数 (pickle 可能である必要がある)
+        """
+
+        with self._broadcast_lock:
+            self._broadcast_sequence += 1
+            self._broadcasts.pop(key, None)
+            self._broadcasts[key] = (self._broadcast_sequence, name, args)
+
+    def shutdown(self) -> None:
+        """待機中のワーカープロセスと zygote を終了する。実行中のジョブがある場合、そのワーカープロセスはジョブの終了後に終了する。"""
+
+        self._is_shutdown.set()
+        while True:
+            try:
+                worker = self._idle_workers.get_nowait()
+            except queue.Empty:
+                break
+            # 接続を閉じると、ワーカープロセスは EOF を受け取って終了する
+            worker.connection.close()
+        self._zygote_connection.close()
+        self._zygote_process.join(timeout=5.0)
+        self._health_check_thread.join(timeout=self.health_check_timeout)
+
+    def _sync_broadcasts(self, worker: _Worker) -> None:
+        """ワーカープロセスにまだ適用されていない関数呼び出しを適用する。呼び出し元で worker.lock を取得している必要がある。"""
+
+        with self._broadcast_lock:
+            pending = [
+                broadcast
+                for broadcast in self._broadcasts.values()
+                if broadcast[0] > worker.synced_sequence
+            ]
+        for sequence, name, args in pending:
+            worker.connection.send((name, args))
+            status, payload = self._receive(worker, self.job_timeout)
+            if status != "ok":
+                logger.error(f"Synthesis worker (PID: {worker.pid}) failed to apply {name}: {payload}")  # fmt: skip
+            worker.synced_sequence = sequence
+
+    def _receive(self, worker: _Worker, timeout: float | None) -> Any:
+        """
+        ワーカープロセスからの応答を受け取る。呼び出し元で worker.lock を取得している必要がある。
+
+        Parameters
+        ----------
+        worker : _Worker
+            応答を受け取るワーカープロセス
+        timeout : float | None
+            応答を待つ最大時間 (秒、None のときは無制限)
+
+        Returns
+        -------
+        Any
+            ワーカープロセスからの応答
+
+        Raises
+        ------
+        TimeoutError
+            timeout を過ぎても応答がなかった場合
+        EOFError
+            ワーカープロセスが異常終了した場合
+        """
+
+        # ワーカープロセスが終了した場合も poll() は True を返し、続く recv() で EOFError が送出される
+        if timeout is not None and not worker.connection.poll(timeout):
+            raise TimeoutError()
+        return worker.connection.recv()
+
+    def _spawn_worker(self) -> _Worker:
+        """zygote から新しいワーカープロセスを fork() する。"""
+
+        with self._zygote_lock:
+            self._zygote_connection.send("spawn")
+            pid: int = self._zygote_connection.recv()
+            # ワーカープロセスとの接続は zygote 側で作成されるため、ファイルディスクリプタを受け取る
+            fd = reduction.recv_handle(self._zygote_connection)
+        logger.info(f"Synthesis worker (PID: {pid}) started.")
+        return _Worker(pid=pid, connection=Connection(fd))
+
+    def _kill_worker(self, worker: _Worker) -> None:
+        """ワーカープロセスを強制終了する。"""
+
+        try:
+            os.kill(worker.pid, signal.SIGKILL)
+        except OSError:
+            pass
+
+    def _replace_worker(self, worker: _Worker) -> None:
+        """ワーカープロセスを強制終了し、新しいワーカープロセスに置き換える。"""
+
+        logger.warning(f"Replacing synthesis worker (PID: {worker.pid})...")
+        self._kill_worker(worker)
+        worker.connection.close()
+        try:
+            self._idle_workers.put(self._spawn_worker())
+        except (EOFError, OSError) as ex:
+            logger.error("Failed to spawn synthesis worker:", exc_info=ex)
+
+    def _run_health_check(self) -> None:
+        """待機中のワーカープロセスに定期的に応答を要求し、応答しないワーカープロセスを置き換える。"""
+
+        while not self._is_shutdown.wait(self.health_check_interval):
+            for _ in range(self._idle_workers.qsize()):
+                try:
+                    worker = self._idle_workers.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    with worker.lock:
+                        worker.connection.send(("ping", ()))
+                        self._receive(worker, self.health_check_timeout)
+                except (EOFError, OSError, TimeoutError):
+                    self._replace_worker(worker)
+                    continue
+                self._idle_workers.put(worker)
+
+
+def _unwrap_result(status: str, payload: Any) -> Any:
+    """ワーカープロセスから受け取った結果を戻り値または例外に変換する。"""
+
+    if status == "ok":
+        return payload
+    if status == "http_error":
+        status_code, detail = payload
+        raise HTTPException(status_code=status_code, detail=detail)
+    raise SynthesisWorkerError(payload)
+
+
+def _run_zygote(
+    handlers: dict[str, Callable[..., Any]],
+    connection: Connection,
+    parent_connection: Connection,
+) -> None:
+    """
+    親プロセスからの要求に応じてワーカープロセスを fork() する zygote のループを実行する。
+
+    Parameters
+    ----------
+    handlers : dict[str, Callable[..., Any]]
+        ワーカープロセスで呼び出せる関数
+    connection : Connection
+        親プロセスと通信するためのコネクション
+    parent_connection : Connection
+        fork() 時に引き継がれた、親プロセス側のコネクション
+    """
+
+    # 親プロセス側のコネクションを閉じておかないと、親プロセスが終了しても EOF を受け取れない
+    parent_connection.close()
+
+    # 終了したワーカープロセスがゾンビプロセスとして残らないよう、自動的に回収させる
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+
+    while True:
+        try:
+            command = connection.recv()
+        except EOFError:
+            return
+        if command != "spawn":
+            return
+
+        parent_connection, child_connection = get_context("fork").Pipe(duplex=True)
+        pid = os.fork()
+        if pid == 0:
+            # ワーカープロセス
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            connection.close()
+            parent_connection.close()
+            exit_code = 0
+            try:
+                _run_worker(handlers, child_connection)
+            except BaseException:
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+
+        # ワーカープロセスとの接続のファイルディスクリプタを親プロセスに渡す
+        child_connection.close()
+        connection.send(pid)
+        reduction.send_handle(connection, parent_connection.fileno(), os.getppid())
+        parent_connection.close()
+
+
+def _run_worker(handlers: dict[str, Callable[..., Any]], connection: Connection) -> None:  # fmt: skip
+    """
+    親プロセスからの要求に応じて関数を呼び出すワーカープロセスのループを実行する。
+
+    Parameters
+    ----------
+    handlers : dict[str, Callable[..., Any]]
+        呼び出せる関数
+    connection : Connection
+        親プロセスと通信するためのコネクション
+    """
+
+    while True:
+        try:
+            name, args = connection.recv()
+        except EOFError:
+            # 親プロセスが終了した
+            return
+
+        if name == "ping":
+            connection.send(("ok", None))
+            continue
+
+        try:
+            result = handlers[name](*args)
+        except HTTPException as ex:
+            # HTTPException は pickle できないため、ステータスコードとメッセージのみを渡す
+            connection.send(("http_error", (ex.status_code, ex.detail)))
+        except Exception as ex:
+            connection.send(("error", f"{type(ex).__name__}: {ex}"))
+        else:
+            connection.send(("ok", result))
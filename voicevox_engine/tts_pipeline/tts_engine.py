@@ -2,6 +2,7 @@
 
 import copy
 import math
+import re
 from typing import Any, Final, Literal, TypeAlias
 
 import numpy as np
@@ -29,6 +30,12 @@ UPSPEAK_LENGTH = 0.15
 UPSPEAK_PITCH_ADD = 0.3
 UPSPEAK_PITCH_MAX = 6.5
 
+# 文単位のストリーミング音声合成で、文と文の間に挿入する無音時間 (秒)
+SENTENCE_PAUSE_LENGTH = 0.3
+
+# 読み上げテキストを、文末記号 (とその直後の閉じ括弧) までの 1 文ずつに分割するための正規表現
+_SENTENCE_PATTERN: Final = re.compile(r".*?(?:[。．！？!?]+[」』）)]*|$)", re.DOTALL)
+
 
 class TalkInvalidInputError(Exception):
     """Talk の不正な入力エラー"""
@@ -225,6 +232,78 @@ def _query_to_decoder_feature(
     return phoneme, f0
 
 
+def _is_sentence_end(accent_phrase: AccentPhrase) -> bool:
+    """アクセント句が文末記号のモーラで終わっているか否かを判定する"""
+    # 末尾に連続する記号モーラ (閉じ括弧に相当する "'" は読み飛ばす) を取得
+    trailing_symbols = ""
+    for mora in reversed(accent_phrase.moras):
+        if mora.text not in ("!", "?", ".", "'"):
+            break
+        trailing_symbols = mora.text + trailing_symbols
+    trailing_symbols = trailing_symbols.replace("'", "")
+    if "!" in trailing_symbols or "?" in trailing_symbols:
+        return True
+    # 三点リーダー「…」は正規化後に "..." の 3 モーラになるため、"." の数が 3 の倍数のときは文末とみなさない
+    return len(trailing_symbols) % 3 != 0
+
+
+def split_audio_query_into_sentences(query: AudioQuery) -> list[AudioQuery]:
+    """
+    音声合成用のクエリを、文末記号で区切られた 1 文ごとのクエリに分割する。
+    最初の文のクエリにのみ音声の前の無音時間を、最後の文のクエリにのみ音声の後の無音時間を設定し、
+    それ以外の文の後には SENTENCE_PAUSE_LENGTH 秒の無音を設定する。
+    アクセント句と読み上げテキスト (AudioQuery.kana) の文の数が一致しない場合は、分割せずにそのまま返す。
+
+    Parameters
+    ----------
+    query : AudioQuery
+        音声合成用のクエリ
+
+    Returns
+    -------
+    list[AudioQuery]
+        1 文ごとの音声合成用のクエリのリスト
+    """
+
+    # アクセント句を文末記号のモーラで終わるアクセント句の直後で区切る
+    accent_phrase_groups: list[list[AccentPhrase]] = [[]]
+    for accent_phrase in query.accent_phrases:
+        accent_phrase_groups[-1].append(accent_phrase)
+        if _is_sentence_end(accent_phrase):
+            accent_phrase_groups.append([])
+    if len(accent_phrase_groups[-1]) == 0:
+        accent_phrase_groups.pop()
+    if len(accent_phrase_groups) <= 1:
+        return [query]
+
+    # 読み上げテキストが指定されている場合は、同様に文末記号の直後で区切る
+    ## 記号の正規化の有無などで文の数がアクセント句と一致しない場合は、無理に分割せず 1 文として扱う
+    kana_sentences: list[str | None] = [None] * len(accent_phrase_groups)
+    if query.kana is not None and query.kana.strip() != "":
+        sentences = [
+            sentence.strip()
+            for sentence in _SENTENCE_PATTERN.findall(query.kana.strip())
+            if sentence.strip() != ""
+        ]
+        if len(sentences) != len(accent_phrase_groups):
+            return [query]
+        kana_sentences = list(sentences)
+
+    sentence_queries: list[AudioQuery] = []
+    for index, (accent_phrases, kana) in enumerate(
+        zip(accent_phrase_groups, kana_sentences, strict=True)
+    ):
+        sentence_query = copy.deepcopy(query)
+        sentence_query.accent_phrases = accent_phrases
+        sentence_query.kana = kana
+        if index > 0:
+            sentence_query.prePhonemeLength = 0.0
+        if index < len(accent_phrase_groups) - 1:
+            sentence_query.postPhonemeLength = SENTENCE_PAUSE_LENGTH
+        sentence_queries.append(sentence_query)
+    return sentence_queries
+
+
 class TTSEngine:
     """音声合成器（core）の管理/実行/プロキシと音声合成フロー"""
 
@@ -376,6 +455,14 @@ class TTSEngine:
         wave = raw_wave_to_output_wave(query, raw_wave, sr_raw_wave)
         return wave
 
+    def get_cached_wave(
+        self,
+        query: AudioQuery,
+        style_id: StyleId,
+    ) -> NDArray[np.float32] | None:
+        """同一内容の音声合成結果がキャッシュされていれば、音声合成を行わずにその音声波形を返す。キャッシュを持たない TTSEngine では常に None を返す"""
+        return None
+
     def initialize_synthesis(self, style_id: StyleId, skip_reinit: bool) -> None:
         """指定されたスタイル ID に関する合成機能を初期化する。既に初期化されていた場合は引数に応じて再初期化する。"""
         self._core.initialize_style_id_synthesis(style_id, skip_reinit=skip_reinit)
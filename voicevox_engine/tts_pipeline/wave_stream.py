@@ -0,0 +1,71 @@
+"""音声波形を WAV 形式でストリーミング配信するためのユーティリティ"""
+
+import struct
+
+import numpy as np
+from numpy.typing import NDArray
+
+# 全体の長さが不明な WAV ファイルのチャンクサイズとして用いる値
+## ffmpeg などのストリーミング出力でも用いられている慣習に倣い、RIFF / data チャンクのサイズを最大値に設定する
+_UNKNOWN_CHUNK_SIZE = 0xFFFFFFFF
+
+
+def generate_streaming_wav_header(sampling_rate: int, num_channels: int) -> bytes:
+    """
+    全体の長さが不明なストリーミング配信向けの、16bit PCM の WAV ヘッダーを生成する。
+    RIFF チャンクと data チャンクのサイズには、長さ不明を示す 0xFFFFFFFF を設定する。
+
+    Parameters
+    ----------
+    sampling_rate : int
+        サンプリングレート
+    num_channels : int
+        チャンネル数
+
+    Returns
+    -------
+    bytes
+        WAV ヘッダー (44 バイト)
+    """
+
+    bits_per_sample = 16
+    block_align = num_channels * bits_per_sample // 8
+    byte_rate = sampling_rate * block_align
+    return (
+        b"RIFF"
+        + struct.pack("<I", _UNKNOWN_CHUNK_SIZE)
+        + b"WAVE"
+        + b"fmt "
+        + struct.pack(
+            "<IHHIIHH",
+            16,  # fmt チャンクのサイズ
+            1,  # フォーマット ID (1: リニア PCM)
+            num_channels,
+            sampling_rate,
+            byte_rate,
+            block_align,
+            bits_per_sample,
+        )
+        + b"data"
+        + struct.pack("<I", _UNKNOWN_CHUNK_SIZE)
+    )
+
+
+def wave_to_pcm16_bytes(wave: NDArray[np.float32]) -> bytes:
+    """
+    -1.0 ~ 1.0 の範囲の float32 型の音声波形を、リトルエンディアンの 16bit PCM のバイト列に変換する。
+    ステレオの音声波形 (サンプル数 x チャンネル数) は、チャンネルごとにインターリーブされたバイト列になる。
+
+    Parameters
+    ----------
+    wave : NDArray[np.float32]
+        音声波形
+
+    Returns
+    -------
+    bytes
+        16bit PCM のバイト列
+    """
+
+    pcm16 = (np.clip(wave, -1.0, 1.0) * 32767.0).astype("<i2")
+    return pcm16.tobytes()
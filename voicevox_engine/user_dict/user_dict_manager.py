@@ -1,10 +1,12 @@
 """ユーザー辞書関連の処理"""
 
 import gc
+import hashlib
 import json
 import sys
 import threading
 import time
+from collections.abc import Callable
 from json import JSONDecodeError
 from pathlib import Path
 from typing import Any
@@ -35,6 +37,40 @@ DEFAULT_DICT_DIR_PATH = _resource_dir / "dictionaries"
 # ユーザー辞書保存ファイルのパス
 _USER_DICT_PATH = _save_dir / "user_dict.json"
 
+# 現在のプロセスで pyopenjtalk に適用されているユーザー辞書の内容を識別するバージョン文字列
+## ユーザー辞書の内容 (CSV 形式の辞書データ) のハッシュ値で、ユーザー辞書が一度も適用されていない場合は空文字列
+## ユーザー辞書の内容によって結果が変わる処理のキャッシュキーに含めることで、辞書の更新時にキャッシュを自動的に無効化できる
+_applied_dictionary_version = ""
+## ユーザー辞書が適用されるたびにインクリメントされる世代番号
+## 辞書の内容が以前と同じ状態に戻った場合でも必ず変わるため、辞書の適用中に処理された結果を確実に区別できる
+_applied_dictionary_generation = 0
+## ユーザー辞書が適用された際に、適用した辞書ファイルのパスのリストを渡して呼び出されるリスナーのリスト
+_dictionary_applied_listeners: list[Callable[[list[Path]], None]] = []
+
+
+def get_applied_dictionary_version() -> str:
+    """現在のプロセスで pyopenjtalk に適用されているユーザー辞書の内容を識別するバージョン文字列を取得する。"""
+    return _applied_dictionary_version
+
+
+def get_applied_dictionary_generation() -> int:
+    """現在のプロセスで pyopenjtalk にユーザー辞書が適用された回数 (世代番号) を取得する。"""
+    return _applied_dictionary_generation
+
+
+def add_dictionary_applied_listener(listener: Callable[[list[Path]], None]) -> None:
+    """
+    現在のプロセスで pyopenjtalk にユーザー辞書が適用された際に呼び出されるリスナーを登録する。
+    リスナーには適用した辞書ファイルのパスのリストが渡される (一時ファイルを含むため、リスナーの終了後に削除される) 。
+
+    Parameters
+    ----------
+    listener : Callable[[list[Path]], None]
+        適用した辞書ファイルのパスのリストを受け取るリスナー
+    """
+
+    _dictionary_applied_listeners.append(listener)
+
 
 class UserDictionaryRepository:
     """
@@ -467,6 +503,21 @@ class UserDictionary:
                 if dict_paths:  # 辞書ファイルが1つ以上存在する場合のみ実行
                     pyopenjtalk.update_global_jtalk_with_user_dict(dict_paths)
 
+                # 適用したユーザー辞書のバージョン文字列を更新する
+                ## 辞書の適用後に更新することで、古い辞書で処理された結果が新しいバージョンとして記録されるのを防ぐ
+                global _applied_dictionary_version, _applied_dictionary_generation
+                _applied_dictionary_version = hashlib.sha256(
+                    csv_text.encode("utf-8")
+                ).hexdigest()
+                _applied_dictionary_generation += 1
+
+                # 辞書ファイルの一時ファイルを削除する前に、ユーザー辞書が適用されたことをリスナーに通知する
+                for listener in _dictionary_applied_listeners:
+                    try:
+                        listener(dict_files)
+                    except Exception as ex:
+                        logger.error("Dictionary applied listener failed:", exc_info=ex)  # fmt: skip
+
                 logger.info(
                     f"User dictionary applied. ({time.time() - start_time:.2f}s)"
                 )
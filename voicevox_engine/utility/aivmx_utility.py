@@ -0,0 +1,164 @@
+"""AIVMX ファイルから AIVM メタデータを高速に読み込むためのユーティリティ"""
+
+from typing import BinaryIO
+
+import aivmlib
+from aivmlib.schemas.aivm_manifest import AivmMetadata
+
+# ONNX の ModelProto における metadata_props フィールドの番号
+_MODEL_PROTO_METADATA_PROPS_FIELD: int = 14
+
+# StringStringEntryProto における key / value フィールドの番号
+_STRING_STRING_ENTRY_KEY_FIELD: int = 1
+_STRING_STRING_ENTRY_VALUE_FIELD: int = 2
+
+# Protobuf のワイヤータイプ
+_WIRE_TYPE_VARINT: int = 0
+_WIRE_TYPE_FIXED64: int = 1
+_WIRE_TYPE_LENGTH_DELIMITED: int = 2
+_WIRE_TYPE_FIXED32: int = 5
+
+
+class _DecodeError(Exception):
+    """AIVMX (ONNX) ファイルの Protobuf としてのデコードに失敗したことを表すエラー"""
+
+    pass
+
+
+def read_aivmx_metadata(aivmx_file: BinaryIO) -> AivmMetadata:
+    """
+    AIVMX ファイルから AIVM メタデータを読み込む。
+
+    aivmlib.read_aivmx_metadata() は ONNX モデル全体 (重みを含む) を Python 上のメモリにデコードするため、
+    モデルファイルのサイズに比例した時間とメモリを消費する。
+    この関数は ModelProto のトップレベルのフィールドだけを先頭から順に走査し、グラフなどのフィールドは
+    読み込まずにシークして読み飛ばすため、メタデータ (metadata_props) 以外を読み込まずに済む。
+
+    Parameters
+    ----------
+    aivmx_file : BinaryIO
+        AIVMX ファイル (シーク可能であること)
+
+    Returns
+    -------
+    AivmMetadata
+        AIVM メタデータ
+
+    Raises
+    ------
+    aivmlib.AivmValidationError
+        AIVMX ファイルのフォーマットが不正・AIVM メタデータのバリデーションに失敗した場合
+    """
+
+    # 読み飛ばすフィールドがファイル末尾を超えていないか確認するため、ファイルサイズを取得してから先頭にシーク
+    file_size = aivmx_file.seek(0, 2)
+    aivmx_file.seek(0)
+    try:
+        raw_metadata: dict[str, str] = {}
+        while True:
+            tag = _read_varint(aivmx_file, allow_eof=True)
+            if tag is None:
+                break
+            field_number, wire_type = tag >> 3, tag & 0x07
+            if field_number == _MODEL_PROTO_METADATA_PROPS_FIELD and wire_type == _WIRE_TYPE_LENGTH_DELIMITED:  # fmt: skip
+                key, value = _parse_string_string_entry(_read_length_delimited(aivmx_file))  # fmt: skip
+                raw_metadata[key] = value
+            else:
+                _skip_field(aivmx_file, wire_type, file_size)
+    except (_DecodeError, UnicodeDecodeError) as ex:
+        raise aivmlib.AivmValidationError(
+            "Failed to decode AIVM metadata. This file is not an AIVMX (ONNX) file."
+        ) from ex
+    finally:
+        # 引数として受け取った BinaryIO のカーソルを再度先頭に戻す
+        aivmx_file.seek(0)
+
+    # バリデーションを行った上で、AivmMetadata オブジェクトを構築して返す
+    return aivmlib.validate_aivm_metadata(raw_metadata)
+
+
+def _read_varint(file: BinaryIO, allow_eof: bool = False) -> int | None:
+    """Protobuf の可変長整数を読み込む。allow_eof が True の場合、読み込み開始位置がファイル末尾なら None を返す。"""
+
+    result = 0
+    for shift in range(0, 64, 7):
+        byte = file.read(1)
+        if not byte:
+            if allow_eof is True and shift == 0:
+                return None
+            raise _DecodeError("Unexpected end of file while reading varint.")
+        result |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return result
+    raise _DecodeError("Varint is too long.")
+
+
+def _read_length_delimited(file: BinaryIO) -> bytes:
+    """Protobuf の長さ付きフィールドの内容を読み込む。"""
+
+    length = _read_varint(file)
+    assert length is not None
+    data = file.read(length)
+    if len(data) != length:
+        raise _DecodeError("Unexpected end of file while reading field.")
+    return data
+
+
+def _skip_field(file: BinaryIO, wire_type: int, file_size: int) -> None:
+    """Protobuf のフィールドの内容を読み込まずに読み飛ばす。"""
+
+    if wire_type == _WIRE_TYPE_VARINT:
+        _read_varint(file)
+        return
+    if wire_type == _WIRE_TYPE_FIXED64:
+        length = 8
+    elif wire_type == _WIRE_TYPE_FIXED32:
+        length = 4
+    elif wire_type == _WIRE_TYPE_LENGTH_DELIMITED:
+        varint = _read_varint(file)
+        assert varint is not None
+        length = varint
+    else:
+        raise _DecodeError(f"Unsupported wire type: {wire_type}")
+
+    if file.tell() + length > file_size:
+        raise _DecodeError("Unexpected end of file while skipping field.")
+    file.seek(length, 1)
+
+
+def _parse_string_string_entry(data: bytes) -> tuple[str, str]:
+    """ONNX の StringStringEntryProto (metadata_props の要素) をデコードする。"""
+
+    key = ""
+    value = ""
+    offset = 0
+    while offset < len(data):
+        tag, offset = _parse_varint(data, offset)
+        field_number, wire_type = tag >> 3, tag & 0x07
+        if wire_type != _WIRE_TYPE_LENGTH_DELIMITED:
+            raise _DecodeError(f"Unexpected wire type in metadata_props: {wire_type}")
+        length, offset = _parse_varint(data, offset)
+        if offset + length > len(data):
+            raise _DecodeError("Metadata entry is truncated.")
+        string = data[offset : offset + length].decode("utf-8")
+        offset += length
+        if field_number == _STRING_STRING_ENTRY_KEY_FIELD:
+            key = string
+        elif field_number == _STRING_STRING_ENTRY_VALUE_FIELD:
+            value = string
+    return key, value
+
+
+def _parse_varint(data: bytes, offset: int) -> tuple[int, int]:
+    """バイト列の指定位置から Protobuf の可変長整数をデコードし、値と次の位置を返す。"""
+
+    result = 0
+    for shift in range(0, 64, 7):
+        if offset >= len(data):
+            raise _DecodeError("Unexpected end of data while reading varint.")
+        byte = data[offset]
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, offset
+    raise _DecodeError("Varint is too long.")
@@ -0,0 +1,204 @@
+"""ディレクトリ内のファイルの追加・変更・削除を監視する utility"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Final
+
+from voicevox_engine.logging import logger
+
+__all__ = ["DirectoryWatcher"]
+
+# inotify のイベントの種類 (<sys/inotify.h> で定義されている値)
+_IN_CLOSE_WRITE: Final[int] = 0x00000008
+_IN_MOVED_FROM: Final[int] = 0x00000040
+_IN_MOVED_TO: Final[int] = 0x00000080
+_IN_DELETE: Final[int] = 0x00000200
+_IN_DELETE_SELF: Final[int] = 0x00000400
+_IN_MOVE_SELF: Final[int] = 0x00000800
+_IN_Q_OVERFLOW: Final[int] = 0x00004000
+
+# inotify_event 構造体のヘッダー部分 (int wd, uint32_t mask, uint32_t cookie, uint32_t len)
+_INOTIFY_EVENT_HEADER: Final[struct.Struct] = struct.Struct("iIII")
+
+
+class DirectoryWatcher:
+    """
+    ディレクトリ直下の指定された拡張子のファイルの追加・変更・削除を監視し、変更が落ち着いた時点でコールバックを呼び出すウォッチャー。
+
+    Linux では inotify でファイルの書き込み完了・移動・削除を待ち受け、それ以外の環境ではファイルサイズと更新日時を定期的に比較する。
+    ファイルのコピー中など短時間に連続して発生した変更は、最後の変更から debounce_time 秒が経過するまで 1 回の変更としてまとめる。
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        callback: Callable[[], None],
+        suffix: str,
+        debounce_time: float = 2.0,
+        poll_interval: float = 5.0,
+    ) -> None:
+        """
+        DirectoryWatcher のコンストラクタ
+
+        Parameters
+        ----------
+        directory : Path
+            監視するディレクトリ
+        callback : Callable[[], None]
+            ファイルの変更が落ち着いた時点で、監視用のスレッドから呼び出されるコールバック
+        suffix : str
+            監視するファイルの拡張子 (例: ".aivmx")
+        debounce_time : float, default 2.0
+            最後の変更からコールバックを呼び出すまでの待機時間 (秒)
+        poll_interval : float, default 5.0
+            inotify を利用できない環境で、ファイルの変更を確認する間隔 (秒)
+        """
+
+        self.directory = directory
+        self.suffix = suffix
+        self.debounce_time = debounce_time
+        self.poll_interval = poll_interval
+        self._callback = callback
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._inotify_fd: int | None = None
+        self._snapshot: dict[str, tuple[int, int]] = {}
+
+    def start(self) -> None:
+        """監視用のスレッドを開始する。"""
+
+        if self._thread is not None:
+            return
+        self._inotify_fd = self._init_inotify()
+        if self._inotify_fd is None:
+            self._snapshot = self._take_snapshot()
+        logger.info(
+            f"Watching {self.directory} for changes. "
+            f"(Backend: {'inotify' if self._inotify_fd is not None else 'polling'})"
+        )
+        self._thread = threading.Thread(
+            target=self._run, name="directory_watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """監視用のスレッドを停止し、その終了を待機する。"""
+
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._inotify_fd is not None:
+            os.close(self._inotify_fd)
+            self._inotify_fd = None
+
+    def _run(self) -> None:
+        """変更を待ち受け、最後の変更から debounce_time 秒が経過した時点でコールバックを呼び出す。"""
+
+        last_changed_at: float | None = None
+        while not self._stop_event.is_set():
+            # 変更の待ち受けが終わり次第コールバックを呼び出せるよう、待機時間は変更がまとまるまでの残り時間以下にする
+            timeout = self.poll_interval if self._inotify_fd is None else 1.0
+            if last_changed_at is not None:
+                remaining = last_changed_at + self.debounce_time - time.monotonic()
+                timeout = max(min(timeout, remaining), 0.0)
+
+            try:
+                changed = self._wait_for_changes(timeout)
+            except Exception as ex:
+                logger.error(f"Failed to watch {self.directory}:", exc_info=ex)
+                return
+            if changed is True:
+                last_changed_at = time.monotonic()
+
+            if (
+                last_changed_at is not None
+                and time.monotonic() - last_changed_at >= self.debounce_time
+            ):
+                last_changed_at = None
+                try:
+                    self._callback()
+                except Exception as ex:
+                    logger.error(f"Failed to handle changes in {self.directory}:", exc_info=ex)  # fmt: skip
+
+    def _wait_for_changes(self, timeout: float) -> bool:
+        """最大 timeout 秒待機し、その間に監視対象のファイルが変更されたかどうかを返す。"""
+
+        # inotify を利用できない環境では、前回確認した時点のファイルサイズと更新日時と比較する
+        if self._inotify_fd is None:
+            self._stop_event.wait(timeout)
+            snapshot = self._take_snapshot()
+            changed = snapshot != self._snapshot
+            self._snapshot = snapshot
+            return changed
+
+        readable, _, _ = select.select([self._inotify_fd], [], [], timeout)
+        if len(readable) == 0:
+            return False
+        try:
+            buffer = os.read(self._inotify_fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+
+        changed = False
+        offset = 0
+        while offset + _INOTIFY_EVENT_HEADER.size <= len(buffer):
+            _, mask, _, name_length = _INOTIFY_EVENT_HEADER.unpack_from(buffer, offset)
+            offset += _INOTIFY_EVENT_HEADER.size
+            name = buffer[offset : offset + name_length].rstrip(b"\0").decode(errors="replace")  # fmt: skip
+            offset += name_length
+            if mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+                raise RuntimeError(f"{self.directory} was deleted or moved.")
+            # イベントの取りこぼしが発生した場合は、何らかの変更があったものとみなす
+            if mask & _IN_Q_OVERFLOW or name.endswith(self.suffix):
+                changed = True
+        return changed
+
+    def _take_snapshot(self) -> dict[str, tuple[int, int]]:
+        """監視対象のファイルごとのファイルサイズと更新日時を取得する。"""
+
+        snapshot: dict[str, tuple[int, int]] = {}
+        for file_path in self.directory.glob(f"*{self.suffix}"):
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+            snapshot[file_path.name] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def _init_inotify(self) -> int | None:
+        """inotify を初期化して監視を開始し、そのファイルディスクリプタを返す。inotify を利用できない場合は None を返す。"""
+
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)  # fmt: skip
+            # IN_NONBLOCK・IN_CLOEXEC は O_NONBLOCK・O_CLOEXEC と同じ値
+            fd: int = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_init1() failed")
+            # ファイルの作成時ではなく書き込みの完了時に通知されるよう、IN_CREATE・IN_MODIFY は監視しない
+            mask = (
+                _IN_CLOSE_WRITE
+                | _IN_MOVED_FROM
+                | _IN_MOVED_TO
+                | _IN_DELETE
+                | _IN_DELETE_SELF
+                | _IN_MOVE_SELF
+            )
+            if libc.inotify_add_watch(fd, os.fsencode(self.directory), mask) < 0:
+                errno = ctypes.get_errno()
+                os.close(fd)
+                raise OSError(errno, "inotify_add_watch() failed")
+        except (AttributeError, OSError) as ex:
+            logger.warning("inotify is not available. Falling back to polling:", exc_info=ex)  # fmt: skip
+            return None
+        return fd
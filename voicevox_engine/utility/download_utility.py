@@ -0,0 +1,252 @@
+"""HTTP でファイルを少しずつディスクに書き込みながらダウンロードする utility"""
+
+import base64
+import binascii
+import hashlib
+import re
+import time
+from pathlib import Path
+from typing import BinaryIO, Final
+
+import httpx
+
+from voicevox_engine.logging import logger
+
+__all__ = ["DownloadIntegrityError", "download_file"]
+
+# リトライしても結果が変わらないため、すぐにダウンロードを中止する HTTP ステータスコード
+_NON_RETRYABLE_STATUS_CODES: Final[frozenset[int]] = frozenset({403, 404})
+
+# Content-Range ヘッダー (例: "bytes 100-199/200") の形式
+_CONTENT_RANGE_PATTERN: Final[re.Pattern[str]] = re.compile(r"bytes (\d+)-\d+/(\d+|\*)")
+
+
+class DownloadIntegrityError(Exception):
+    """ダウンロードしたファイルのサイズまたはハッシュ値が、期待される値と一致しなかった。"""
+
+    pass
+
+
+def download_file(
+    url: str,
+    file_path: Path,
+    headers: dict[str, str] | None = None,
+    timeout: httpx.Timeout | None = None,
+    max_retries: int = 3,
+    retry_interval: float = 1.0,
+    expected_sha256: str | None = None,
+) -> None:
+    """
+    指定された URL からファイルをダウンロードし、レスポンスを少しずつ file_path に書き込む。
+
+    ダウンロード中に通信エラーが発生した場合は、サーバーが対応していれば Range リクエストで途中から再開する。
+    ダウンロード完了後、ファイルサイズと SHA-256 ハッシュ値 (expected_sha256 が指定されていない場合は、
+    サーバーが Repr-Digest / Digest ヘッダーで通知した値) を検証する。
+    メモリ上にはレスポンスの一部のみを保持するため、ファイルサイズにかかわらずメモリ使用量は一定になる。
+
+    Parameters
+    ----------
+    url : str
+        ダウンロードするファイルの URL
+    file_path : Path
+        ダウンロードしたファイルの保存先 (既にファイルが存在する場合は上書きされる)
+    headers : dict[str, str] | None, default None
+        リクエストに付与する HTTP ヘッダー
+    timeout : httpx.Timeout | None, default None
+        タイムアウト (省略時は接続タイムアウト 10 秒・読み取りタイムアウト 300 秒)
+    max_retries : int, default 3
+        最大試行回数
+    retry_interval : float, default 1.0
+        リトライ前の待機時間 (秒)
+    expected_sha256 : str | None, default None
+        ダウンロードしたファイルの SHA-256 ハッシュ値 (16 進数表記)
+
+    Raises
+    ------
+    httpx.HTTPError
+        ダウンロードに失敗した場合 (403 Forbidden・404 Not Found の場合はリトライせずに送出する)
+    DownloadIntegrityError
+        最大試行回数までリトライしても、ファイルサイズまたはハッシュ値が一致しなかった場合
+    OSError
+        ファイルの書き込みに失敗した場合 (リトライせずに送出する)
+    """
+
+    if timeout is None:
+        timeout = httpx.Timeout(10.0, read=300.0)
+    expected_digest = (
+        bytes.fromhex(expected_sha256) if expected_sha256 is not None else None
+    )
+
+    with (
+        open(file_path, mode="wb") as file,
+        httpx.Client(
+            # リダイレクトを追跡する
+            follow_redirects=True,
+            timeout=timeout,
+        ) as client,
+    ):
+        download = _ResumableDownload(client, url, headers or {}, file)
+        last_exception: Exception | None = None
+        for attempt in range(1, max_retries + 1):
+            try:
+                if download.downloaded_size > 0:
+                    logger.info(
+                        f"Resuming download from {url} at {download.downloaded_size} bytes "
+                        f"(Attempt {attempt}/{max_retries})..."
+                    )
+                download.resume()
+                download.verify(expected_digest)
+                return
+            except httpx.HTTPStatusError as ex:
+                if ex.response.status_code in _NON_RETRYABLE_STATUS_CODES:
+                    raise
+                # 416 Range Not Satisfiable の場合は、次の試行で最初からダウンロードし直す
+                if ex.response.status_code == 416:
+                    download.reset()
+                last_exception = ex
+            except httpx.HTTPError as ex:
+                # 通信エラーの場合は、次の試行でダウンロード済みの部分の続きから再開する
+                last_exception = ex
+            except DownloadIntegrityError as ex:
+                # ダウンロード済みの部分が壊れている可能性があるため、次の試行で最初からダウンロードし直す
+                download.reset()
+                last_exception = ex
+
+            logger.warning(
+                f"Failed to download {url} (Attempt {attempt}/{max_retries}).",
+                exc_info=last_exception,
+            )
+            if attempt < max_retries:
+                time.sleep(retry_interval)
+
+    assert last_exception is not None
+    raise last_exception
+
+
+class _ResumableDownload:
+    """複数回の試行にまたがって、ダウンロード済みのサイズ・ハッシュ値・再開に必要な情報を保持する。"""
+
+    def __init__(
+        self,
+        client: httpx.Client,
+        url: str,
+        headers: dict[str, str],
+        file: BinaryIO,
+    ) -> None:
+        self.client = client
+        self.url = url
+        self.headers = headers
+        self.file = file
+        self.downloaded_size = 0
+        # サーバーから通知されたファイル全体のサイズ・ハッシュ値
+        self.total_size: int | None = None
+        self.server_digest: bytes | None = None
+        # 途中から再開する際に、ファイルが変更されていないことをサーバーに確認するための ETag / Last-Modified
+        self._validator: str | None = None
+        self._hash = hashlib.sha256()
+
+    def reset(self) -> None:
+        """ダウンロード済みの部分を破棄し、次の試行で最初からダウンロードし直すようにする。"""
+
+        self.file.seek(0)
+        self.file.truncate()
+        self.downloaded_size = 0
+        self.total_size = None
+        self.server_digest = None
+        self._validator = None
+        self._hash = hashlib.sha256()
+
+    def resume(self) -> None:
+        """ダウンロード済みの部分の続きから (再開できない場合は最初から) ファイルの末尾までダウンロードする。"""
+
+        headers = {
+            **self.headers,
+            # Range リクエストのオフセットがデコード前のデータを指すことがないよう、圧縮を無効化する
+            "Accept-Encoding": "identity",
+        }
+        # ファイルが変更されていれば、サーバーは If-Range に従い 206 Partial Content ではなく 200 OK でファイル全体を返す
+        if self.downloaded_size > 0 and self._validator is not None:
+            headers["Range"] = f"bytes={self.downloaded_size}-"
+            headers["If-Range"] = self._validator
+
+        with self.client.stream("GET", self.url, headers=headers) as response:
+            response.raise_for_status()
+
+            if response.status_code == 206:
+                match = _CONTENT_RANGE_PATTERN.fullmatch(response.headers.get("Content-Range", ""))  # fmt: skip
+                if match is None or int(match.group(1)) != self.downloaded_size:
+                    raise DownloadIntegrityError(
+                        f"Unexpected Content-Range: {response.headers.get('Content-Range')}"
+                    )
+                if match.group(2) != "*":
+                    self.total_size = int(match.group(2))
+            else:
+                # サーバーが Range リクエストに対応していない場合や、ファイルが変更された場合は最初から書き込み直す
+                if self.downloaded_size > 0:
+                    logger.info(f"{self.url} cannot be resumed. Restarting download...")  # fmt: skip
+                self.reset()
+                content_length = response.headers.get("Content-Length")
+                if content_length is not None and "Content-Encoding" not in response.headers:  # fmt: skip
+                    self.total_size = int(content_length)
+
+            etag = response.headers.get("ETag")
+            # 弱い ETag はバイト単位での一致を保証しないため、Range リクエストの再開には利用できない
+            if etag is not None and not etag.startswith("W/"):
+                validator: str | None = etag
+            else:
+                validator = response.headers.get("Last-Modified")
+            if validator is not None:
+                self._validator = validator
+            server_digest = _parse_sha256_digest(response.headers)
+            if server_digest is not None:
+                self.server_digest = server_digest
+
+            # 通信エラーが発生した際に受信済みのデータを失わないよう、バッファリングせずに受信した分から書き込む
+            for chunk in response.iter_bytes():
+                self.file.write(chunk)
+                self._hash.update(chunk)
+                self.downloaded_size += len(chunk)
+            self.file.flush()
+
+    def verify(self, expected_digest: bytes | None) -> None:
+        """ダウンロードしたファイルのサイズ・ハッシュ値を検証する。"""
+
+        if self.total_size is not None and self.downloaded_size != self.total_size:
+            raise DownloadIntegrityError(
+                f"Size mismatch: expected {self.total_size} bytes, got {self.downloaded_size} bytes."
+            )
+        if expected_digest is None:
+            expected_digest = self.server_digest
+        if expected_digest is not None and self._hash.digest() != expected_digest:
+            raise DownloadIntegrityError(
+                f"SHA-256 mismatch: expected {expected_digest.hex()}, got {self._hash.hexdigest()}."
+            )
+
+
+def _parse_sha256_digest(headers: httpx.Headers) -> bytes | None:
+    """
+    Repr-Digest ヘッダー (RFC 9530) または Digest ヘッダー (RFC 3230) から、ファイル全体の SHA-256 ハッシュ値を取得する。
+
+    Content-Digest ヘッダーは 206 Partial Content ではレスポンスに含まれる部分のみのハッシュ値になるため利用しない。
+    """
+
+    # 例: Repr-Digest: sha-256=:X48E9qOokqqrvdts8nOJRJN3OWDUoyWxBf7kbu9DBPE=:
+    for item in headers.get("Repr-Digest", "").split(","):
+        algorithm, _, value = item.strip().partition("=")
+        if algorithm.lower() == "sha-256" and value.startswith(":") and value.endswith(":"):  # fmt: skip
+            return _decode_base64(value[1:-1])
+    # 例: Digest: SHA-256=X48E9qOokqqrvdts8nOJRJN3OWDUoyWxBf7kbu9DBPE=
+    for item in headers.get("Digest", "").split(","):
+        algorithm, _, value = item.strip().partition("=")
+        if algorithm.lower() == "sha-256":
+            return _decode_base64(value)
+    return None
+
+
+def _decode_base64(value: str) -> bytes | None:
+    """Base64 文字列をデコードする。不正な文字列の場合は None を返す。"""
+
+    try:
+        return base64.b64decode(value, validate=True)
+    except binascii.Error:
+        return None
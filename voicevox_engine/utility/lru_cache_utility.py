@@ -0,0 +1,174 @@
+"""スレッドセーフな LRU キャッシュに関する utility"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+__all__ = ["LRUCache"]
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """
+    エントリ数・合計サイズの上限を超えた際に、最も長く参照されていないエントリから破棄するスレッドセーフな LRU キャッシュ。
+    キャッシュのヒット数・ミス数を記録する。
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        max_size: int | None = None,
+        get_size: Callable[[V], int] | None = None,
+    ) -> None:
+        """
+        LRUCache のコンストラクタ
+
+        Parameters
+        ----------
+        max_entries : int | None, default None
+            保持するエントリ数の上限 (None のときは無制限)
+        max_size : int | None, default None
+            保持するエントリの合計サイズの上限 (None のときは無制限)
+        get_size : Callable[[V], int] | None, default None
+            エントリのサイズを返す関数 (max_size を指定する場合は必須)
+        """
+
+        if max_entries is not None and max_entries < 0:
+            raise ValueError("max_entries must be greater than or equal to 0.")
+        if max_size is not None and max_size < 0:
+            raise ValueError("max_size must be greater than or equal to 0.")
+        if max_size is not None and get_size is None:
+            raise ValueError("get_size must be specified when max_size is specified.")
+
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self._get_size = get_size
+        self._entries: OrderedDict[K, tuple[V, int]] = OrderedDict()
+        self._total_size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """保持しているエントリ数を返す。"""
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        """指定されたキーのエントリを保持しているかどうかを返す (ヒット数・ミス数や参照順序には影響しない) 。"""
+        with self._lock:
+            return key in self._entries
+
+    @property
+    def total_size(self) -> int:
+        """保持しているエントリの合計サイズを返す。"""
+        with self._lock:
+            return self._total_size
+
+    def get(self, key: K) -> V | None:
+        """
+        指定されたキーのエントリを取得する。
+
+        Parameters
+        ----------
+        key : K
+            キー
+
+        Returns
+        -------
+        V | None
+            エントリの値 (存在しない場合は None)
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: K, value: V) -> None:
+        """
+        エントリを追加する。上限を超えた場合は、最も長く参照されていないエントリから破棄する。
+        単独で合計サイズの上限を超えるエントリは追加しない。
+
+        Parameters
+        ----------
+        key : K
+            キー
+        value : V
+            エントリの値
+        """
+
+        size = self._get_size(value) if self._get_size is not None else 0
+        with self._lock:
+            self._pop(key)
+            if self.max_entries == 0 or (
+                self.max_size is not None and size > self.max_size
+            ):
+                return
+            self._entries[key] = (value, size)
+            self._total_size += size
+            while (
+                self.max_entries is not None and len(self._entries) > self.max_entries
+            ) or (self.max_size is not None and self._total_size > self.max_size):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_size -= evicted_size
+
+    def pop(self, key: K) -> V | None:
+        """
+        指定されたキーのエントリを削除する。
+
+        Parameters
+        ----------
+        key : K
+            キー
+
+        Returns
+        -------
+        V | None
+            削除されたエントリの値 (存在しない場合は None)
+        """
+
+        with self._lock:
+            return self._pop(key)
+
+    def remove_if(self, predicate: Callable[[K], bool]) -> int:
+        """
+        キーが条件に一致するエントリをすべて削除する。
+
+        Parameters
+        ----------
+        predicate : Callable[[K], bool]
+            キーを受け取り、削除する場合に True を返す関数
+
+        Returns
+        -------
+        int
+            削除されたエントリ数
+        """
+
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self._pop(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        """すべてのエントリを削除する。"""
+        with self._lock:
+            self._entries.clear()
+            self._total_size = 0
+
+    def _pop(self, key: K) -> V | None:
+        """指定されたキーのエントリを削除する。呼び出し元でロックを取得している必要がある。"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        self._total_size -= entry[1]
+        return entry[0]
@@ -0,0 +1,73 @@
+"""ZIP ファイルを先頭から順にストリーミング配信するためのユーティリティ"""
+
+import io
+import zipfile
+
+
+class _ChunkBuffer(io.RawIOBase):
+    """書き込まれたバイト列を、読み出されるまで保持するだけのシーク不可能なバッファ。"""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        """書き込み可能であることを返す。"""
+        return True
+
+    def write(self, data: bytes) -> int:  # type: ignore[override]
+        """バイト列をバッファに追加する。"""
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        """これまでに書き込まれたバイト列を取り出し、バッファを空にする。"""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ZipStreamWriter:
+    """
+    ZIP ファイルを先頭から順に生成するストリーミング ZIP ライター。
+
+    書き込み先をシーク不可能なストリームとして扱うことで、zipfile モジュールに各エントリのサイズと CRC を
+    エントリの後ろのデータディスクリプタに書き出させる。これにより、ZIP ファイル全体をメモリ上に保持することなく、
+    エントリを追加するたびに生成された部分から順にクライアントへ送信できる。
+    """
+
+    def __init__(self) -> None:
+        self._buffer = _ChunkBuffer()
+        self._zip_file = zipfile.ZipFile(self._buffer, mode="w")  # type: ignore[arg-type]
+
+    def write_file(self, name: str, data: bytes | memoryview) -> bytes:
+        """
+        ZIP ファイルにエントリを追加し、追加したエントリの分の ZIP ファイルのバイト列を返す。
+
+        Parameters
+        ----------
+        name : str
+            エントリのファイル名
+        data : bytes | memoryview
+            エントリの内容
+
+        Returns
+        -------
+        bytes
+            前回の呼び出し以降に生成された ZIP ファイルのバイト列
+        """
+
+        self._zip_file.writestr(name, data)
+        return self._buffer.drain()
+
+    def close(self) -> bytes:
+        """
+        ZIP ファイルの末尾 (セントラルディレクトリ) を書き込み、残りの ZIP ファイルのバイト列を返す。
+
+        Returns
+        -------
+        bytes
+            前回の呼び出し以降に生成された ZIP ファイルのバイト列
+        """
+
+        self._zip_file.close()
+        return self._buffer.drain()